@@ -38,7 +38,8 @@ from .routes import (
     traces,
     chat_feedback,
     metrics,
-    tasks
+    tasks,
+    jobs
 )
 from app.api.v1.routes.chat import router as chat_router
 
@@ -85,6 +86,7 @@ api_router.include_router(traces.router, tags=["traces"])
 api_router.include_router(chat_feedback.router, prefix="/chat", tags=["chat-feedback"])
 api_router.include_router(metrics.router, tags=["metrics"])
 api_router.include_router(tasks.router, tags=["tasks"])
+api_router.include_router(jobs.router, tags=["jobs"])
 
 # Conditionally include debug routes ONLY in development
 if os.getenv("ENVIRONMENT", "production") in ["development", "dev", "local"]:
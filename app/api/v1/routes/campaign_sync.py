@@ -3,13 +3,17 @@ Campaign Sync API Endpoints
 For scheduled and manual campaign KPI syncing
 """
 
+import asyncio
 import os
 from typing import Optional
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Header, Depends, BackgroundTasks, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from app.services.campaign_sync_service import CampaignSyncService
+from app.services.job_handlers import METRICS_SYNC_JOB
+from app.services.job_queue import job_queue
 from app.core.auth import get_current_user
 from app.models.users import Campaigner
 
@@ -305,6 +309,7 @@ class MetricsSyncResponse(BaseModel):
 @router.post("/campaign-sync/sync-metrics", response_model=MetricsSyncResponse)
 async def sync_metrics(
     customer_id: Optional[int] = None,
+    background: bool = False,
     current_user: Campaigner = Depends(get_current_user)
 ):
     """
@@ -318,9 +323,11 @@ async def sync_metrics(
 
     **Query Parameters:**
     - `customer_id` (optional): Sync only specific customer
+    - `background` (optional): Queue the sync as a durable job and return 202
+      with the job ID; poll `GET /jobs/{job_id}` or stream `/jobs/{job_id}/events`
 
     **Returns:**
-    - Sync statistics and any errors encountered
+    - Sync statistics and any errors encountered (or the queued job)
     """
     try:
         # Verify customer access if customer_id provided
@@ -337,6 +344,23 @@ async def sync_metrics(
                         detail="Customer not found or access denied"
                     )
 
+        if background:
+            job_id = await asyncio.to_thread(
+                job_queue.enqueue,
+                METRICS_SYNC_JOB,
+                {"customer_id": customer_id},
+                campaigner_id=current_user.id
+            )
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "job_id": job_id,
+                    "status": "queued",
+                    "status_url": f"/api/v1/jobs/{job_id}",
+                    "events_url": f"/api/v1/jobs/{job_id}/events"
+                }
+            )
+
         # Run new metrics sync
         result = sync_service.sync_metrics_new(customer_id=customer_id)
 
@@ -1,9 +1,9 @@
 """Chat/conversation endpoints."""
 
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
 from fastapi.responses import JSONResponse
 from fastapi.responses import StreamingResponse
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import uuid
 import json
@@ -561,9 +561,16 @@ async def delete_thread(
 @router.get("/threads/{thread_id}")
 async def get_thread(
     thread_id: str,
+    after: Optional[int] = Query(None, ge=0, description="Cursor: number of messages already received (next_cursor of the previous call)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Maximum messages to return (all when omitted)"),
     app_state: ApplicationState = Depends(get_app_state)
 ):
-    """Get conversation thread details."""
+    """
+    Get conversation thread details.
+
+    Messages can be fetched incrementally: pass the returned next_cursor as
+    `after` to receive only messages added since the previous call.
+    """
     workflows = app_state.get_all_threads()
 
     if thread_id not in workflows:
@@ -572,6 +579,11 @@ async def get_thread(
     workflow = workflows[thread_id]
     state = workflow.conversation_state if hasattr(workflow, 'conversation_state') else {}
 
+    all_messages = state.get("messages", [])
+    start = min(after or 0, len(all_messages))
+    end = min(start + limit, len(all_messages)) if limit else len(all_messages)
+    messages = all_messages[start:end]
+
     return {
         "thread_id": thread_id,
         "state": {
@@ -588,6 +600,8 @@ async def get_thread(
                 "role": msg.type if hasattr(msg, "type") else "unknown",
                 "content": msg.content if hasattr(msg, "content") else str(msg)
             }
-            for msg in state.get("messages", [])
-        ]
+            for msg in messages
+        ],
+        "next_cursor": end,
+        "has_more": end < len(all_messages)
     }
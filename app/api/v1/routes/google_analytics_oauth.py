@@ -67,6 +67,7 @@ async def clear_connections_with_invalid_scopes():
     """
     try:
         from app.config.database import get_session
+        from app.core.agents.credential_cache import credential_cache
         from app.models.analytics import Connection
         from sqlmodel import select
         
@@ -92,6 +93,8 @@ async def clear_connections_with_invalid_scopes():
                 session.add(conn)
             
             session.commit()
+            for conn in invalid_connections:
+                credential_cache.invalidate(conn.customer_id)
             
             return {
                 "success": True,
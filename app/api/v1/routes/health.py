@@ -5,6 +5,14 @@ Health check routes
 from fastapi import APIRouter
 from datetime import datetime, timezone
 from app.config import get_settings
+from app.config.cache_registry import get_cache_stats
+
+# The caches reported below register themselves when their modules are imported
+import app.config.settings_loader  # noqa: F401
+import app.core.agents.credential_cache  # noqa: F401
+import app.core.agent_config_registry  # noqa: F401
+import app.core.auth  # noqa: F401
+import app.services.access_scope_service  # noqa: F401
 
 settings = get_settings()
 router = APIRouter()
@@ -30,3 +38,12 @@ def root():
         "status": "active",
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
+
+
+@router.get("/health/caches")
+def cache_stats():
+    """Hit rates and sizes of this worker's in-process request caches"""
+    return {
+        **get_cache_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
@@ -0,0 +1,98 @@
+"""
+Durable job API routes
+Status, live status stream and cancellation for analytics_jobs
+"""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.auth import get_current_user
+from app.models.users import Campaigner
+from app.services.job_queue import job_queue
+from app.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+async def _get_visible_job(job_id: int, current_user: Campaigner) -> dict:
+    """Look up a job the caller may see (own jobs; OWNER/ADMIN see all)."""
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    user_role = current_user.role.upper() if current_user.role else 'CAMPAIGNER'
+    if user_role not in ('ADMIN', 'OWNER'):
+        owner = await asyncio.to_thread(job_queue.get_owner, job_id)
+        if owner != current_user.id:
+            raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/stats")
+async def get_job_queue_stats(current_user: Campaigner = Depends(get_current_user)):
+    """Job counts by status across all campaigners (OWNER/ADMIN only)"""
+    user_role = current_user.role.upper() if current_user.role else 'CAMPAIGNER'
+    if user_role not in ('ADMIN', 'OWNER'):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return await asyncio.to_thread(job_queue.get_stats)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int, current_user: Campaigner = Depends(get_current_user)):
+    """Status, attempts and (once finished) result or error of a job"""
+    return await _get_visible_job(job_id, current_user)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: int,
+    poll_seconds: float = Query(1.0, ge=0.2, le=30),
+    current_user: Campaigner = Depends(get_current_user)
+):
+    """
+    Server-sent events with the job's state.
+
+    An event is sent whenever status or attempts change; the stream ends
+    after the job reaches succeeded, failed or cancelled.
+    """
+    job = await _get_visible_job(job_id, current_user)
+
+    async def generate():
+        current = job
+        last_state = None
+        while True:
+            state = (current["status"], current["attempts"])
+            if state != last_state:
+                yield f"data: {json.dumps(current)}\n\n"
+                last_state = state
+            if current["status"] in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(poll_seconds)
+            current = await asyncio.to_thread(job_queue.get, job_id)
+            if current is None:
+                yield f"data: {json.dumps({'error': 'Job not found'})}\n\n"
+                break
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: int, current_user: Campaigner = Depends(get_current_user)):
+    """Cancel a queued job, or ask the worker running it to stop"""
+    await _get_visible_job(job_id, current_user)
+    cancelled = await asyncio.to_thread(job_queue.cancel, job_id)
+    return {"success": cancelled, "job": await asyncio.to_thread(job_queue.get, job_id)}
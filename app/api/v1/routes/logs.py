@@ -2,11 +2,17 @@
 API routes for viewing and managing application logs.
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional, Literal
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
+from app.config.logging import get_logging_stats
 from app.core.file_logger import file_logger
 # TODO: i think api_auth is not needed. 
 # from app.core.api_auth import verify_admin_token
@@ -15,6 +21,9 @@ from app.core.auth import get_current_user
 
 router = APIRouter()
 
+# Idle seconds before a follow stream sends a keep-alive comment
+FOLLOW_HEARTBEAT_SECONDS = 15
+
 
 class LogResponse(BaseModel):
     """Response model for log data."""
@@ -192,9 +201,11 @@ async def get_log_stats(
     - Total number of log files
     - Total size
     - Individual file details
+    - Logging pipeline queue depth and dropped record counts
     """
     try:
         stats = file_logger.get_log_stats()
+        stats["pipeline"] = get_logging_stats()
 
         return LogStatsResponse(
             success=True,
@@ -235,8 +246,10 @@ async def clear_old_logs(
 
 @router.get("/tail")
 async def tail_logs(
+    request: Request,
     lines: int = Query(default=50, ge=1, le=1000, description="Number of lines to tail"),
     follow: bool = Query(default=False, description="Keep connection open for live updates"),
+    poll_interval: float = Query(default=1.0, ge=0.1, le=10.0, description="Seconds between file polls in follow mode"),
     admin_verified: bool = Depends(get_current_user)
 ):
     """
@@ -247,12 +260,25 @@ async def tail_logs(
     **Query Parameters:**
     - `lines` (int): Number of lines to show (default: 50, max: 1000)
     - `follow` (bool): Keep connection open for live updates (default: false)
+    - `poll_interval` (float): Seconds between file polls in follow mode (default: 1.0)
 
-    **Note:** Live follow mode not yet implemented. Returns most recent lines only.
+    **Follow mode** returns a Server-Sent Events stream. Each event's data is a
+    JSON object `{"line": "..."}`; the last `lines` lines are sent first, then
+    new lines as they are written, following the file across rotations.
 
     **Returns:**
-    - Most recent log lines
+    - Most recent log lines, or an SSE stream when `follow=true`
     """
+    if follow:
+        return StreamingResponse(
+            _follow_log_stream(request, lines, poll_interval),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            }
+        )
+
     try:
         logs = file_logger.get_recent_logs(lines=lines)
         lines_returned = len(logs.split('\n'))
@@ -262,7 +288,29 @@ async def tail_logs(
             "logs": logs,
             "lines_returned": lines_returned,
             "follow_mode": follow,
-            "message": f"Tailed {lines_returned} log lines" + (" (follow mode not yet implemented)" if follow else "")
+            "message": f"Tailed {lines_returned} log lines"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to tail logs: {str(e)}")
+
+
+async def _follow_log_stream(request: Request, lines: int, poll_interval: float):
+    """Yield SSE events for the log backlog and then for newly written lines."""
+    backlog, follower = await asyncio.to_thread(file_logger.follow, lines)
+    for line in backlog:
+        yield f"data: {json.dumps({'line': line.rstrip()})}\n\n"
+
+    last_event_time = time.monotonic()
+    while not await request.is_disconnected():
+        new_lines = await asyncio.to_thread(follower.poll)
+        for line in new_lines:
+            yield f"data: {json.dumps({'line': line.rstrip()})}\n\n"
+
+        now = time.monotonic()
+        if new_lines:
+            last_event_time = now
+        elif now - last_event_time >= FOLLOW_HEARTBEAT_SECONDS:
+            yield ": keep-alive\n\n"
+            last_event_time = now
+
+        await asyncio.sleep(poll_interval)
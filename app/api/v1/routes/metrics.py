@@ -3,23 +3,126 @@ Metrics API routes for accessing ad performance data
 Handles role-based access to metrics table
 """
 
-from typing import List, Dict, Any, Optional
+import base64
+import json
+from typing import List, Dict, Any, Optional, Literal, Tuple
 from datetime import date, datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import false, text
 from sqlmodel import select, and_, or_, col, func
 
 from app.core.auth import get_current_user
-from app.models.users import Campaigner, UserRole, CustomerCampaignerAssignment
-from app.models.analytics import Metrics, DigitalAsset
-from app.models.users import Customer
-from app.models.settings import AppSettings
+from app.models.users import Campaigner
+from app.models.analytics import Metrics, MetricsRollup
 from app.config.database import get_session
 from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.config.settings_loader import settings_cache
+from app.services.access_scope_service import ScopeAccessDenied, access_scope_resolver
+from app.services.metrics_export_service import (
+    EXPORT_FORMATS, PYARROW_AVAILABLE, parse_export_columns, stream_metrics_export
+)
+from app.services.metrics_rollup_service import rollup_segment_conditions
+from app.utils.metric_scoring import score_aggregated_rows
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
+# Columns returned by GET /metrics (fetched as plain rows, not ORM objects)
+METRICS_LIST_COLUMNS = (
+    Metrics.metric_date,
+    Metrics.item_id,
+    Metrics.platform_id,
+    Metrics.item_type,
+    Metrics.cpa,
+    Metrics.cvr,
+    Metrics.conv_val,
+    Metrics.ctr,
+    Metrics.cpc,
+    Metrics.clicks,
+    Metrics.cpm,
+    Metrics.impressions,
+    Metrics.reach,
+    Metrics.frequency,
+    Metrics.cpl,
+    Metrics.leads,
+    Metrics.spent,
+    Metrics.conversions,
+)
+
+
+def _encode_metrics_cursor(metric_date: date, platform_id: int, item_id: str) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor."""
+    payload = json.dumps([metric_date.isoformat(), platform_id, item_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_metrics_cursor(cursor: str) -> Tuple[date, int, str]:
+    """Decode a cursor produced by _encode_metrics_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        metric_date, platform_id, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(metric_date), int(platform_id), str(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _metrics_after_cursor(cursor: Tuple[date, int, str]):
+    """
+    Keyset condition for rows after the cursor in
+    (metric_date DESC, platform_id, item_id) order.
+
+    The leading metric_date bound lets the planner range-scan the date index
+    instead of evaluating the OR over every row.
+    """
+    metric_date, platform_id, item_id = cursor
+    return and_(
+        Metrics.metric_date <= metric_date,
+        or_(
+            Metrics.metric_date < metric_date,
+            and_(
+                Metrics.metric_date == metric_date,
+                or_(
+                    Metrics.platform_id > platform_id,
+                    and_(Metrics.platform_id == platform_id, Metrics.item_id > item_id)
+                )
+            )
+        )
+    )
+
+
+def _count_metrics(session, conditions, count_mode: str) -> Optional[int]:
+    """
+    Count metrics rows matching the conditions.
+
+    count_mode:
+        exact: SELECT count(*)
+        estimated: planner row estimate (PostgreSQL only, falls back to exact)
+        none: skip counting
+    """
+    if count_mode == "none":
+        return None
+
+    if count_mode == "estimated" and session.get_bind().dialect.name == "postgresql":
+        statement = select(Metrics.id).where(*conditions)
+        compiled = statement.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        plan = session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    return session.exec(
+        select(func.count()).select_from(Metrics).where(*conditions)
+    ).one()
+
 
 def _get_metric_weights_and_normalizer(session):
     """
@@ -37,9 +140,8 @@ def _get_metric_weights_and_normalizer(session):
     default_normalizer = 1.0
 
     try:
-        # Load settings from database
-        settings = session.exec(select(AppSettings)).all()
-        settings_dict = {s.key: s.value for s in settings}
+        # Process-wide app_settings snapshot; only a version check hits the database
+        settings_dict = {key: value for key, (value, _) in settings_cache.snapshot(session).items()}
 
         weights = {}
         for metric in ["cpa", "cvr", "ctr", "cpc", "cpm", "cpl"]:
@@ -54,71 +156,53 @@ def _get_metric_weights_and_normalizer(session):
         return {"weights": default_weights, "normalizer": default_normalizer}
 
 
-def _calculate_metric_score(metrics_dict, weights, normalizer):
+def _build_metrics_conditions(session, current_user, start_date, end_date, platform_id, item_type, customer_id):
     """
-    Calculate a weighted score for the given metrics.
-
-    For "higher is better" metrics (CVR, CTR): use value directly (normalized to 0-100 scale)
-    For "lower is better" metrics (CPA, CPC, CPM, CPL): invert using (100 - normalized_value)
+    Build the WHERE clauses for listing/exporting metrics, including access control.
 
-    Args:
-        metrics_dict: Dict with metric values (cpa, cvr, ctr, cpc, cpm, cpl)
-        weights: Dict with weight for each metric
-        normalizer: Divider to normalize the final score
+    OWNER sees everything, ADMIN their agency's customers and CAMPAIGNER/VIEWER
+    their assigned customers, resolved through the shared scope cache.
 
     Returns:
-        float: Weighted score (0-100 scale)
+        List of conditions, or None if the caller's scope contains no platforms
+
+    Raises:
+        HTTPException: 400 for an invalid item_type
+        ScopeAccessDenied: If customer_id or platform_id is outside the caller's scope
     """
-    score = 0.0
-    total_weight = 0.0
-
-    # Higher is better metrics (already in % or can be used directly)
-    if metrics_dict.get("cvr") is not None:
-        # CVR is already 0-100 (percentage)
-        score += weights["cvr"] * min(metrics_dict["cvr"], 100)
-        total_weight += weights["cvr"]
-
-    if metrics_dict.get("ctr") is not None:
-        # CTR is already 0-100 (percentage)
-        score += weights["ctr"] * min(metrics_dict["ctr"], 100)
-        total_weight += weights["ctr"]
-
-    # Lower is better metrics (cost metrics) - invert them
-    # We'll use a simple inversion: if value exists, contribute to score based on how low it is
-    # For costs, we'll normalize using: 100 / (1 + value) which gives higher scores for lower costs
-    if metrics_dict.get("cpa") is not None and metrics_dict["cpa"] > 0:
-        normalized_cpa = 100 / (1 + metrics_dict["cpa"])
-        score += weights["cpa"] * normalized_cpa
-        total_weight += weights["cpa"]
-
-    if metrics_dict.get("cpc") is not None and metrics_dict["cpc"] > 0:
-        normalized_cpc = 100 / (1 + metrics_dict["cpc"])
-        score += weights["cpc"] * normalized_cpc
-        total_weight += weights["cpc"]
-
-    if metrics_dict.get("cpm") is not None and metrics_dict["cpm"] > 0:
-        normalized_cpm = 100 / (1 + metrics_dict["cpm"])
-        score += weights["cpm"] * normalized_cpm
-        total_weight += weights["cpm"]
-
-    if metrics_dict.get("cpl") is not None and metrics_dict["cpl"] > 0:
-        normalized_cpl = 100 / (1 + metrics_dict["cpl"])
-        score += weights["cpl"] * normalized_cpl
-        total_weight += weights["cpl"]
-
-    # Calculate weighted average and apply normalizer
-    if total_weight > 0:
-        final_score = (score / total_weight) / normalizer
-        return round(final_score, 2)
-    else:
-        return None
+    conditions = []
+
+    # Apply date filters
+    if start_date:
+        conditions.append(Metrics.metric_date >= start_date)
+    if end_date:
+        conditions.append(Metrics.metric_date <= end_date)
+
+    # Apply item type filter
+    if item_type:
+        if item_type not in ['ad', 'ad_group']:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="item_type must be 'ad' or 'ad_group'"
+            )
+        conditions.append(Metrics.item_type == item_type)
+
+    platform_scope = access_scope_resolver.resolve_platform_ids(session, current_user, customer_id, platform_id)
+    if platform_scope is not None:
+        if not platform_scope:
+            return None
+        conditions.append(Metrics.platform_id.in_(platform_scope))
+
+    return conditions
 
 
 @router.get("")
 async def get_metrics(
     current_user: Campaigner = Depends(get_current_user),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return (max 1000)"),
-    offset: int = Query(0, ge=0, description="Number of records to skip"),
+    offset: int = Query(0, ge=0, description="Number of records to skip (prefer cursor for deep pages)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous response's next_cursor"),
+    count: Optional[Literal["exact", "estimated", "none"]] = Query(None, description="How to compute total: exact count, planner estimate, or skip (default: exact on the first page, skipped on cursor pages)"),
     start_date: Optional[date] = Query(None, description="Filter metrics from this date (inclusive)"),
     end_date: Optional[date] = Query(None, description="Filter metrics to this date (inclusive)"),
     platform_id: Optional[int] = Query(None, description="Filter by specific platform/digital asset ID"),
@@ -135,249 +219,70 @@ async def get_metrics(
     - VIEWER: Can access metrics only for customers assigned to them
 
     The metrics table contains the last 90 days of ad performance data.
+
+    Pagination: pass the returned `next_cursor` as `cursor` to fetch the next
+    page. Cursor pages seek directly to the last returned row, so deep pages
+    cost the same as the first one; `offset` is kept for compatibility.
+    `total` is counted exactly on the first page and skipped on cursor pages
+    (clients keep the first page's total); pass `count` to override. Use
+    `count=estimated` or `count=none` to avoid an exact count on large result
+    sets.
     """
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both"
+        )
+    cursor_values = _decode_metrics_cursor(cursor) if cursor else None
+    if count is None:
+        count = "none" if cursor_values else "exact"
+
     try:
         with get_session() as session:
-            # Start building the query
-            conditions = []
-
-            # Apply date filters
-            if start_date:
-                conditions.append(Metrics.metric_date >= start_date)
-            if end_date:
-                conditions.append(Metrics.metric_date <= end_date)
-
-            # Apply item type filter
-            if item_type:
-                if item_type not in ['ad', 'ad_group']:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="item_type must be 'ad' or 'ad_group'"
-                    )
-                conditions.append(Metrics.item_type == item_type)
-
-            # Role-based access control
-            if current_user.role == UserRole.OWNER:
-                # OWNER: Access all metrics, optionally filtered by platform_id or customer_id
-                logger.info(f"[Metrics API] OWNER {current_user.id} accessing all metrics")
-
-                if platform_id:
-                    conditions.append(Metrics.platform_id == platform_id)
-                elif customer_id:
-                    # If customer_id is specified, filter by digital assets of that customer
-                    customer_platform_ids = session.exec(
-                        select(DigitalAsset.id).where(DigitalAsset.customer_id == customer_id)
-                    ).all()
-                    if customer_platform_ids:
-                        conditions.append(Metrics.platform_id.in_(customer_platform_ids))
-                    else:
-                        # No platforms for this customer, return empty result
-                        return {
-                            "success": True,
-                            "metrics": [],
-                            "total": 0,
-                            "limit": limit,
-                            "offset": offset,
-                            "filters_applied": {
-                                "start_date": str(start_date) if start_date else None,
-                                "end_date": str(end_date) if end_date else None,
-                                "platform_id": platform_id,
-                                "item_type": item_type,
-                                "customer_id": customer_id
-                            }
-                        }
-
-            elif current_user.role == UserRole.ADMIN:
-                # ADMIN: Access metrics for all customers in their agency
-                logger.info(f"[Metrics API] ADMIN {current_user.id} accessing agency {current_user.agency_id} metrics")
-
-                # Get all customer IDs in the admin's agency
-                customer_ids = session.exec(
-                    select(Customer.id).where(Customer.agency_id == current_user.agency_id)
-                ).all()
-
-                if not customer_ids:
-                    return {
-                        "success": True,
-                        "metrics": [],
-                        "total": 0,
-                        "limit": limit,
-                        "offset": offset,
-                        "filters_applied": {
-                            "start_date": str(start_date) if start_date else None,
-                            "end_date": str(end_date) if end_date else None,
-                            "platform_id": platform_id,
-                            "item_type": item_type,
-                            "customer_id": customer_id
-                        }
-                    }
-
-                # If customer_id filter is provided, check if it's in the allowed list
-                if customer_id:
-                    if customer_id not in customer_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this customer's metrics"
-                        )
-                    customer_ids = [customer_id]
-
-                # Get platform IDs for these customers
-                platform_ids = session.exec(
-                    select(DigitalAsset.id).where(DigitalAsset.customer_id.in_(customer_ids))
-                ).all()
-
-                if not platform_ids:
-                    return {
-                        "success": True,
-                        "metrics": [],
-                        "total": 0,
-                        "limit": limit,
-                        "offset": offset,
-                        "filters_applied": {
-                            "start_date": str(start_date) if start_date else None,
-                            "end_date": str(end_date) if end_date else None,
-                            "platform_id": platform_id,
-                            "item_type": item_type,
-                            "customer_id": customer_id
-                        }
-                    }
-
-                # Apply platform filter
-                if platform_id:
-                    if platform_id not in platform_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this platform's metrics"
-                        )
-                    conditions.append(Metrics.platform_id == platform_id)
-                else:
-                    conditions.append(Metrics.platform_id.in_(platform_ids))
-
-            else:
-                # CAMPAIGNER or VIEWER: Access only assigned customers' metrics
-                logger.info(f"[Metrics API] {current_user.role.value} {current_user.id} accessing assigned metrics")
-
-                # Get assigned customer IDs
-                assigned_customer_ids = session.exec(
-                    select(CustomerCampaignerAssignment.customer_id).where(
-                        and_(
-                            CustomerCampaignerAssignment.campaigner_id == current_user.id,
-                            CustomerCampaignerAssignment.is_active == True
-                        )
-                    )
-                ).all()
-
-                if not assigned_customer_ids:
-                    return {
-                        "success": True,
-                        "metrics": [],
-                        "total": 0,
-                        "limit": limit,
-                        "offset": offset,
-                        "filters_applied": {
-                            "start_date": str(start_date) if start_date else None,
-                            "end_date": str(end_date) if end_date else None,
-                            "platform_id": platform_id,
-                            "item_type": item_type,
-                            "customer_id": customer_id
-                        }
-                    }
-
-                # If customer_id filter is provided, check if it's in the allowed list
-                if customer_id:
-                    if customer_id not in assigned_customer_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this customer's metrics"
-                        )
-                    assigned_customer_ids = [customer_id]
-
-                # Get platform IDs for assigned customers
-                platform_ids = session.exec(
-                    select(DigitalAsset.id).where(DigitalAsset.customer_id.in_(assigned_customer_ids))
-                ).all()
-
-                if not platform_ids:
-                    return {
-                        "success": True,
-                        "metrics": [],
-                        "total": 0,
-                        "limit": limit,
-                        "offset": offset,
-                        "filters_applied": {
-                            "start_date": str(start_date) if start_date else None,
-                            "end_date": str(end_date) if end_date else None,
-                            "platform_id": platform_id,
-                            "item_type": item_type,
-                            "customer_id": customer_id
-                        }
-                    }
-
-                # Apply platform filter
-                if platform_id:
-                    if platform_id not in platform_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this platform's metrics"
-                        )
-                    conditions.append(Metrics.platform_id == platform_id)
-                else:
-                    conditions.append(Metrics.platform_id.in_(platform_ids))
-
-            # Build the query with all conditions
-            if conditions:
-                statement = select(Metrics).where(and_(*conditions)).order_by(
-                    Metrics.metric_date.desc(),
-                    Metrics.platform_id,
-                    Metrics.item_id
-                ).offset(offset).limit(limit)
-            else:
-                statement = select(Metrics).order_by(
-                    Metrics.metric_date.desc(),
-                    Metrics.platform_id,
-                    Metrics.item_id
-                ).offset(offset).limit(limit)
-
-            # Execute query
-            metrics = session.exec(statement).all()
-
-            # Count total matching records (for pagination)
-            if conditions:
-                count_statement = select(Metrics).where(and_(*conditions))
-            else:
-                count_statement = select(Metrics)
-            total = len(session.exec(count_statement).all())
-
-            logger.info(f"[Metrics API] Returning {len(metrics)} metrics (total: {total})")
+            logger.info(f"[Metrics API] {current_user.role.value} {current_user.id} accessing metrics")
+            conditions = _build_metrics_conditions(
+                session, current_user, start_date, end_date, platform_id, item_type, customer_id
+            )
+            if conditions is None:
+                return _empty_metrics_response(limit, offset, start_date, end_date, platform_id, item_type, customer_id)
+
+            # Count before adding the cursor condition so total covers the whole result set
+            total = _count_metrics(session, conditions, count)
+            total_is_estimate = count == "estimated" and session.get_bind().dialect.name == "postgresql"
+
+            if cursor_values:
+                conditions.append(_metrics_after_cursor(cursor_values))
+
+            # Fetch one extra row to know whether another page exists
+            statement = select(*METRICS_LIST_COLUMNS).where(*conditions).order_by(
+                Metrics.metric_date.desc(),
+                Metrics.platform_id,
+                Metrics.item_id
+            ).offset(offset).limit(limit + 1)
+
+            rows = session.exec(statement).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            next_cursor = None
+            if has_more:
+                last = rows[-1]
+                next_cursor = _encode_metrics_cursor(last.metric_date, last.platform_id, last.item_id)
+
+            logger.info(f"[Metrics API] Returning {len(rows)} metrics (total: {total})")
 
             return {
                 "success": True,
                 "metrics": [
-                    {
-                        "metric_date": metric.metric_date.isoformat(),
-                        "item_id": metric.item_id,
-                        "platform_id": metric.platform_id,
-                        "item_type": metric.item_type,
-                        "cpa": metric.cpa,
-                        "cvr": metric.cvr,
-                        "conv_val": metric.conv_val,
-                        "ctr": metric.ctr,
-                        "cpc": metric.cpc,
-                        "clicks": metric.clicks,
-                        "cpm": metric.cpm,
-                        "impressions": metric.impressions,
-                        "reach": metric.reach,
-                        "frequency": metric.frequency,
-                        "cpl": metric.cpl,
-                        "leads": metric.leads,
-                        "spent": metric.spent,
-                        "conversions": metric.conversions,
-                    }
-                    for metric in metrics
+                    {**row._asdict(), "metric_date": row.metric_date.isoformat()}
+                    for row in rows
                 ],
                 "total": total,
+                "total_is_estimate": total_is_estimate,
                 "limit": limit,
                 "offset": offset,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
                 "filters_applied": {
                     "start_date": str(start_date) if start_date else None,
                     "end_date": str(end_date) if end_date else None,
@@ -389,6 +294,8 @@ async def get_metrics(
 
     except HTTPException:
         raise
+    except ScopeAccessDenied as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.detail)
     except Exception as e:
         logger.error(f"[Metrics API] Error fetching metrics: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -397,6 +304,76 @@ async def get_metrics(
         )
 
 
+@router.get("/export")
+async def export_metrics(
+    current_user: Campaigner = Depends(get_current_user),
+    format: Literal["csv", "arrow", "parquet"] = Query("csv", description="Output format: csv, arrow (IPC stream) or parquet"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to export (default: all)"),
+    partition_by: Literal["none", "day", "month"] = Query("none", description="Align Arrow batches / Parquet row groups to date partitions"),
+    start_date: Optional[date] = Query(None, description="Filter metrics from this date (inclusive)"),
+    end_date: Optional[date] = Query(None, description="Filter metrics to this date (inclusive)"),
+    platform_id: Optional[int] = Query(None, description="Filter by specific platform/digital asset ID"),
+    item_type: Optional[str] = Query(None, description="Filter by item type ('ad' or 'ad_group')"),
+    customer_id: Optional[int] = Query(None, description="Filter by customer ID (admin/campaigner can only access their assigned customers)"),
+):
+    """
+    Stream metrics as CSV, Arrow IPC or Parquet for bulk/BI consumers.
+
+    Takes the same filters and access rules as GET /metrics, but streams every
+    matching row (ordered by metric_date, platform_id, item_id) from a
+    server-side cursor instead of returning JSON pages. Memory use on the
+    server is constant regardless of the export size.
+
+    Access levels: Same as /metrics endpoint
+    """
+    try:
+        export_columns = parse_export_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if format != "csv" and not PYARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{format} export requires pyarrow, which is not installed"
+        )
+
+    try:
+        # Resolve filters and access up front so errors are returned before streaming starts
+        with get_session() as session:
+            logger.info(f"[Metrics Export API] {current_user.role.value} {current_user.id} exporting metrics as {format}")
+            conditions = _build_metrics_conditions(
+                session, current_user, start_date, end_date, platform_id, item_type, customer_id
+            )
+    except HTTPException:
+        raise
+    except ScopeAccessDenied as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.detail)
+    except Exception as e:
+        logger.error(f"[Metrics Export API] Error preparing export: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export metrics: {str(e)}"
+        )
+
+    if conditions is None:
+        # Nothing in scope: stream an empty export with the right columns
+        conditions = [false()]
+
+    export_format = EXPORT_FORMATS[format]
+    filename = f"metrics_{start_date or 'all'}_{end_date or 'all'}.{export_format['extension']}"
+    return StreamingResponse(
+        stream_metrics_export(
+            conditions,
+            export_columns,
+            format,
+            partition_by=partition_by,
+            batch_size=get_settings().metrics_export_batch_size,
+        ),
+        media_type=export_format["media_type"],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/aggregated")
 async def get_aggregated_metrics(
     current_user: Campaigner = Depends(get_current_user),
@@ -458,200 +435,79 @@ async def get_aggregated_metrics(
                 conditions.append(Metrics.item_id == item_id)
 
             # Role-based access control (same logic as get_metrics)
-            if current_user.role == UserRole.OWNER:
-                logger.info(f"[Aggregated Metrics API] OWNER {current_user.id} accessing aggregated metrics")
-
-                if platform_id:
-                    conditions.append(Metrics.platform_id == platform_id)
-                elif customer_id:
-                    customer_platform_ids = session.exec(
-                        select(DigitalAsset.id).where(DigitalAsset.customer_id == customer_id)
-                    ).all()
-                    if customer_platform_ids:
-                        conditions.append(Metrics.platform_id.in_(customer_platform_ids))
-                    else:
-                        return _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights, normalizer)
-
-            elif current_user.role == UserRole.ADMIN:
-                logger.info(f"[Aggregated Metrics API] ADMIN {current_user.id} accessing aggregated metrics")
-
-                customer_ids = session.exec(
-                    select(Customer.id).where(Customer.agency_id == current_user.agency_id)
-                ).all()
-
-                if not customer_ids:
-                    return _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights, normalizer)
-
-                if customer_id:
-                    if customer_id not in customer_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this customer's metrics"
-                        )
-                    customer_ids = [customer_id]
-
-                platform_ids = session.exec(
-                    select(DigitalAsset.id).where(DigitalAsset.customer_id.in_(customer_ids))
-                ).all()
-
-                if not platform_ids:
-                    return _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights, normalizer)
-
-                if platform_id:
-                    if platform_id not in platform_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this platform's metrics"
-                        )
-                    conditions.append(Metrics.platform_id == platform_id)
-                else:
-                    conditions.append(Metrics.platform_id.in_(platform_ids))
+            logger.info(f"[Aggregated Metrics API] {current_user.role.value} {current_user.id} accessing aggregated metrics")
+            platform_scope = access_scope_resolver.resolve_platform_ids(session, current_user, customer_id, platform_id)
+            if platform_scope is not None and not platform_scope:
+                return _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights, normalizer)
+
+            if platform_scope is not None:
+                conditions.append(Metrics.platform_id.in_(platform_scope))
+
+            if group_by and group_by not in ("item_id", "platform_id", "item_type", "none"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="group_by must be 'item_id', 'platform_id', 'item_type', or 'none'"
+                )
 
+            # Rollups are keyed by (platform_id, item_type), so they can answer
+            # everything except item-level grouping or filtering
+            use_rollups = (
+                get_settings().metrics_rollups_enabled
+                and not item_id
+                and group_by in (None, "none", "platform_id", "item_type")
+            )
+
+            if use_rollups:
+                statement, group_by_cols = _build_rollup_aggregate_query(
+                    start_date, end_date, platform_scope, item_type, group_by
+                )
             else:
-                logger.info(f"[Aggregated Metrics API] {current_user.role.value} {current_user.id} accessing aggregated metrics")
-
-                assigned_customer_ids = session.exec(
-                    select(CustomerCampaignerAssignment.customer_id).where(
-                        and_(
-                            CustomerCampaignerAssignment.campaigner_id == current_user.id,
-                            CustomerCampaignerAssignment.is_active == True
-                        )
-                    )
-                ).all()
-
-                if not assigned_customer_ids:
-                    return _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights, normalizer)
-
-                if customer_id:
-                    if customer_id not in assigned_customer_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this customer's metrics"
-                        )
-                    assigned_customer_ids = [customer_id]
-
-                platform_ids = session.exec(
-                    select(DigitalAsset.id).where(DigitalAsset.customer_id.in_(assigned_customer_ids))
-                ).all()
-
-                if not platform_ids:
-                    return _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights, normalizer)
-
-                if platform_id:
-                    if platform_id not in platform_ids:
-                        raise HTTPException(
-                            status_code=status.HTTP_403_FORBIDDEN,
-                            detail="You do not have access to this platform's metrics"
-                        )
-                    conditions.append(Metrics.platform_id == platform_id)
-                else:
-                    conditions.append(Metrics.platform_id.in_(platform_ids))
-
-            # Build aggregation query
-            group_by_cols = []
-            if group_by and group_by != "none":
+                # Build aggregation query
+                group_by_cols = []
                 if group_by == "item_id":
                     group_by_cols = [Metrics.item_id, Metrics.platform_id, Metrics.item_type]
                 elif group_by == "platform_id":
                     group_by_cols = [Metrics.platform_id]
                 elif group_by == "item_type":
                     group_by_cols = [Metrics.item_type]
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="group_by must be 'item_id', 'platform_id', 'item_type', or 'none'"
-                    )
-
-            # Select aggregated fields (use COALESCE to convert NULL to 0 for sum operations)
-            select_cols = [
-                func.coalesce(func.sum(Metrics.clicks), 0).label("total_clicks"),
-                func.coalesce(func.sum(Metrics.impressions), 0).label("total_impressions"),
-                func.coalesce(func.sum(Metrics.leads), 0).label("total_leads"),
-                func.coalesce(func.sum(Metrics.spent), 0).label("total_spent"),
-                func.coalesce(func.sum(Metrics.conversions), 0).label("total_conversions"),
-                func.coalesce(func.sum(Metrics.conv_val), 0).label("total_conv_val"),
-                # Reach bounds - min is the highest single day, max is the sum (assumes no overlap)
-                # Note: MAX can still return NULL if all values are NULL, which is okay
-                func.max(Metrics.reach).label("reach_min"),
-                func.coalesce(func.sum(Metrics.reach), 0).label("reach_max"),
-            ]
 
-            if group_by_cols:
-                select_cols = group_by_cols + select_cols
-
-            statement = select(*select_cols).where(and_(*conditions))
+                # Select aggregated fields (use COALESCE to convert NULL to 0 for sum operations)
+                select_cols = [
+                    func.coalesce(func.sum(Metrics.clicks), 0).label("total_clicks"),
+                    func.coalesce(func.sum(Metrics.impressions), 0).label("total_impressions"),
+                    func.coalesce(func.sum(Metrics.leads), 0).label("total_leads"),
+                    func.coalesce(func.sum(Metrics.spent), 0).label("total_spent"),
+                    func.coalesce(func.sum(Metrics.conversions), 0).label("total_conversions"),
+                    func.coalesce(func.sum(Metrics.conv_val), 0).label("total_conv_val"),
+                    # Reach bounds - min is the highest single day, max is the sum (assumes no overlap)
+                    # Note: MAX can still return NULL if all values are NULL, which is okay
+                    func.max(Metrics.reach).label("reach_min"),
+                    func.coalesce(func.sum(Metrics.reach), 0).label("reach_max"),
+                ]
+
+                if group_by_cols:
+                    select_cols = group_by_cols + select_cols
+
+                statement = select(*select_cols).where(and_(*conditions))
 
             if group_by_cols:
                 statement = statement.group_by(*group_by_cols)
 
             results = session.exec(statement).all()
 
-            # Process results and calculate derived metrics
+            # Derived metrics and scores are computed column-wise over all groups at once
+            group_keys = [column.key for column in group_by_cols]
+            derived = score_aggregated_rows(results, len(group_keys), weights, normalizer)
+
             aggregated_metrics = []
-            for row in results:
-                if group_by and group_by != "none":
-                    if group_by == "item_id":
-                        group_info = {
-                            "item_id": row[0],
-                            "platform_id": row[1],
-                            "item_type": row[2]
-                        }
-                        total_clicks = row[3]
-                        total_impressions = row[4]
-                        total_leads = row[5]
-                        total_spent = row[6]
-                        total_conversions = row[7]
-                        total_conv_val = row[8]
-                        reach_min = row[9]
-                        reach_max = row[10]
-                    elif group_by == "platform_id":
-                        group_info = {"platform_id": row[0]}
-                        total_clicks = row[1]
-                        total_impressions = row[2]
-                        total_leads = row[3]
-                        total_spent = row[4]
-                        total_conversions = row[5]
-                        total_conv_val = row[6]
-                        reach_min = row[7]
-                        reach_max = row[8]
-                    else:  # item_type
-                        group_info = {"item_type": row[0]}
-                        total_clicks = row[1]
-                        total_impressions = row[2]
-                        total_leads = row[3]
-                        total_spent = row[4]
-                        total_conversions = row[5]
-                        total_conv_val = row[6]
-                        reach_min = row[7]
-                        reach_max = row[8]
-                else:
-                    group_info = {}
-                    total_clicks = row[0]
-                    total_impressions = row[1]
-                    total_leads = row[2]
-                    total_spent = row[3]
-                    total_conversions = row[4]
-                    total_conv_val = row[5]
-                    reach_min = row[6]
-                    reach_max = row[7]
-
-                # Calculate derived metrics
-                cpa = round(total_spent / total_conversions, 2) if total_conversions and total_conversions > 0 else None
-                cvr = round((total_conversions / total_clicks) * 100, 2) if total_clicks and total_clicks > 0 else None
-                ctr = round((total_clicks / total_impressions) * 100, 2) if total_impressions and total_impressions > 0 else None
-                cpc = round(total_spent / total_clicks, 2) if total_clicks and total_clicks > 0 else None
-                cpm = round((total_spent / total_impressions) * 1000, 2) if total_impressions and total_impressions > 0 else None
-                cpl = round(total_spent / total_leads, 2) if total_leads and total_leads > 0 else None
-
-                # Calculate score
-                score = _calculate_metric_score(
-                    {"cpa": cpa, "cvr": cvr, "ctr": ctr, "cpc": cpc, "cpm": cpm, "cpl": cpl},
-                    weights,
-                    normalizer
-                )
+            for i, row in enumerate(results):
+                (
+                    total_clicks, total_impressions, total_leads, total_spent,
+                    total_conversions, total_conv_val, reach_min, reach_max
+                ) = row[len(group_keys):]
 
                 metric = {
-                    **group_info,
+                    **dict(zip(group_keys, row)),
                     "clicks": total_clicks,
                     "impressions": total_impressions,
                     "leads": total_leads,
@@ -659,29 +515,30 @@ async def get_aggregated_metrics(
                     "conversions": total_conversions,
                     "conv_val": total_conv_val,
                     # Calculated metrics
-                    "cpa": cpa,
-                    "cvr": cvr,
-                    "ctr": ctr,
-                    "cpc": cpc,
-                    "cpm": cpm,
-                    "cpl": cpl,
+                    "cpa": derived["cpa"][i],
+                    "cvr": derived["cvr"][i],
+                    "ctr": derived["ctr"][i],
+                    "cpc": derived["cpc"][i],
+                    "cpm": derived["cpm"][i],
+                    "cpl": derived["cpl"][i],
                     # Reach bounds (approximate)
                     "reach_min": reach_min,  # At minimum, equals the highest single day reach
                     "reach_max": reach_max,  # At maximum, if there's zero user overlap across days
                     # Frequency bounds (calculated from reach bounds)
-                    "frequency_min": round(total_impressions / reach_max, 2) if reach_max and reach_max > 0 else None,
-                    "frequency_max": round(total_impressions / reach_min, 2) if reach_min and reach_min > 0 else None,
+                    "frequency_min": derived["frequency_min"][i],
+                    "frequency_max": derived["frequency_max"][i],
                     # Performance score
-                    "score": score,
+                    "score": derived["score"][i],
                 }
 
                 aggregated_metrics.append(metric)
 
-            logger.info(f"[Aggregated Metrics API] Returning {len(aggregated_metrics)} aggregated metric(s)")
+            logger.info(f"[Aggregated Metrics API] Returning {len(aggregated_metrics)} aggregated metric(s) from {'rollups' if use_rollups else 'raw metrics'}")
 
             return {
                 "success": True,
                 "aggregated_metrics": aggregated_metrics,
+                "data_source": "rollups" if use_rollups else "metrics",
                 "date_range": {
                     "start_date": start_date.isoformat(),
                     "end_date": end_date.isoformat()
@@ -703,6 +560,8 @@ async def get_aggregated_metrics(
 
     except HTTPException:
         raise
+    except ScopeAccessDenied as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=e.detail)
     except Exception as e:
         logger.error(f"[Aggregated Metrics API] Error fetching aggregated metrics: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -711,6 +570,59 @@ async def get_aggregated_metrics(
         )
 
 
+def _build_rollup_aggregate_query(start_date, end_date, platform_scope, item_type, group_by):
+    """
+    Build the /metrics/aggregated query against metrics_rollups.
+
+    The date range is covered by monthly, weekly and daily rollups (see
+    plan_rollup_segments); the result columns match the raw-metrics query.
+    """
+    conditions = [or_(*rollup_segment_conditions(start_date, end_date))]
+    if platform_scope is not None:
+        conditions.append(MetricsRollup.platform_id.in_(platform_scope))
+    if item_type:
+        conditions.append(MetricsRollup.item_type == item_type)
+
+    group_by_cols = []
+    if group_by == "platform_id":
+        group_by_cols = [MetricsRollup.platform_id]
+    elif group_by == "item_type":
+        group_by_cols = [MetricsRollup.item_type]
+
+    select_cols = group_by_cols + [
+        func.coalesce(func.sum(MetricsRollup.clicks), 0).label("total_clicks"),
+        func.coalesce(func.sum(MetricsRollup.impressions), 0).label("total_impressions"),
+        func.coalesce(func.sum(MetricsRollup.leads), 0).label("total_leads"),
+        func.coalesce(func.sum(MetricsRollup.spent), 0).label("total_spent"),
+        func.coalesce(func.sum(MetricsRollup.conversions), 0).label("total_conversions"),
+        func.coalesce(func.sum(MetricsRollup.conv_val), 0).label("total_conv_val"),
+        func.max(MetricsRollup.reach_max_day).label("reach_min"),
+        func.coalesce(func.sum(MetricsRollup.reach_sum), 0).label("reach_max"),
+    ]
+
+    return select(*select_cols).where(and_(*conditions)), group_by_cols
+
+
+def _empty_metrics_response(limit, offset, start_date, end_date, platform_id, item_type, customer_id):
+    """Helper function to return empty metrics list response"""
+    return {
+        "success": True,
+        "metrics": [],
+        "total": 0,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": None,
+        "has_more": False,
+        "filters_applied": {
+            "start_date": str(start_date) if start_date else None,
+            "end_date": str(end_date) if end_date else None,
+            "platform_id": platform_id,
+            "item_type": item_type,
+            "customer_id": customer_id
+        }
+    }
+
+
 def _empty_aggregated_response(start_date, end_date, platform_id, item_type, item_id, customer_id, group_by, weights=None, normalizer=None):
     """Helper function to return empty aggregated metrics response"""
     notes = {
@@ -12,6 +12,7 @@ from app.models.users import Campaigner, UserRole
 from app.models.settings import AppSettings, SETTING_CATEGORIES, DEFAULT_SETTINGS
 from app.config.database import get_session
 from app.config.settings import get_settings, clear_settings_cache
+from app.config.settings_loader import settings_cache
 import os
 
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -484,8 +485,9 @@ async def reload_settings(
         )
 
     try:
-        # Clear the cache
+        # Clear the caches (also picks up app_settings rows edited outside the API)
         clear_settings_cache()
+        settings_cache.invalidate()
 
         # Reload settings
         new_settings = get_settings()
@@ -13,6 +13,9 @@ from app.models.chat_traces import ChatTrace, RecordType
 from app.config.database import get_session
 from app.core.auth import get_current_user
 from app.models.users import Campaigner, Customer
+from app.services.chat_trace_service import ChatTraceService, EVENT_RECORD_TYPES, project_trace_data
+from app.services.chat_trace_partition_service import ChatTracePartitionService
+from app.api.v1.routes.campaign_sync import verify_internal_token
 
 router = APIRouter(prefix="/traces", tags=["traces"])
 
@@ -55,6 +58,14 @@ class TraceDetailResponse(BaseModel):
     crewai_executions: List[dict]
 
 
+class TraceEventsResponse(BaseModel):
+    """One page of a trace's events, ordered by id."""
+    conversation: dict
+    events: List[dict]
+    next_cursor: Optional[int]
+    has_more: bool
+
+
 @router.get("", response_model=TraceListResponse)
 async def list_traces(
     campaigner_id: Optional[int] = Query(None, description="Filter by campaigner ID"),
@@ -146,6 +157,7 @@ async def list_traces(
 @router.get("/{thread_id}", response_model=TraceDetailResponse)
 async def get_trace_detail(
     thread_id: str,
+    include_large_fields: bool = Query(True, description="Include tool payloads, prompts and logs in event data"),
     current_user: Campaigner = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -153,6 +165,7 @@ async def get_trace_detail(
     Get full trace details for a specific thread_id.
 
     Includes all messages, agent steps, tool usages, and CrewAI executions.
+    For long conversations prefer the paginated /traces/{thread_id}/events.
     """
     # Get conversation record
     conversation = session.exec(
@@ -170,40 +183,28 @@ async def get_trace_detail(
     # Get messages
     messages = session.exec(
         select(ChatTrace).where(
-            and_(
-                ChatTrace.thread_id == thread_id,
-                ChatTrace.record_type == RecordType.MESSAGE
-            )
+            ChatTraceService.thread_records_filter(conversation, RecordType.MESSAGE)
         ).order_by(ChatTrace.sequence_number)
     ).all()
 
     # Get agent steps
     agent_steps = session.exec(
         select(ChatTrace).where(
-            and_(
-                ChatTrace.thread_id == thread_id,
-                ChatTrace.record_type == RecordType.AGENT_STEP
-            )
+            ChatTraceService.thread_records_filter(conversation, RecordType.AGENT_STEP)
         ).order_by(ChatTrace.sequence_number)
     ).all()
 
     # Get tool usages
     tool_usages = session.exec(
         select(ChatTrace).where(
-            and_(
-                ChatTrace.thread_id == thread_id,
-                ChatTrace.record_type == RecordType.TOOL_USAGE
-            )
+            ChatTraceService.thread_records_filter(conversation, RecordType.TOOL_USAGE)
         ).order_by(ChatTrace.sequence_number)
     ).all()
 
     # Get CrewAI executions
     crewai_executions = session.exec(
         select(ChatTrace).where(
-            and_(
-                ChatTrace.thread_id == thread_id,
-                ChatTrace.record_type == RecordType.CREWAI_EXECUTION
-            )
+            ChatTraceService.thread_records_filter(conversation, RecordType.CREWAI_EXECUTION)
         ).order_by(ChatTrace.created_at)
     ).all()
 
@@ -235,7 +236,7 @@ async def get_trace_detail(
                 "id": msg.id,
                 "created_at": msg.created_at.isoformat() if msg.created_at else None,
                 "sequence_number": msg.sequence_number,
-                **msg.data
+                **project_trace_data(msg.data, include_large_fields)
             }
             for msg in messages
         ],
@@ -245,7 +246,7 @@ async def get_trace_detail(
                 "created_at": step.created_at.isoformat() if step.created_at else None,
                 "sequence_number": step.sequence_number,
                 "langfuse_span_id": step.langfuse_span_id,
-                **step.data
+                **project_trace_data(step.data, include_large_fields)
             }
             for step in agent_steps
         ],
@@ -255,7 +256,7 @@ async def get_trace_detail(
                 "created_at": tool.created_at.isoformat() if tool.created_at else None,
                 "sequence_number": tool.sequence_number,
                 "langfuse_span_id": tool.langfuse_span_id,
-                **tool.data
+                **project_trace_data(tool.data, include_large_fields)
             }
             for tool in tool_usages
         ],
@@ -264,13 +265,80 @@ async def get_trace_detail(
                 "id": exec.id,
                 "session_id": exec.session_id,
                 "created_at": exec.created_at.isoformat() if exec.created_at else None,
-                **exec.data
+                **project_trace_data(exec.data, include_large_fields)
             }
             for exec in crewai_executions
         ]
     )
 
 
+@router.get("/{thread_id}/events", response_model=TraceEventsResponse)
+async def get_trace_events(
+    thread_id: str,
+    after_id: Optional[int] = Query(None, description="Cursor: only return events with a greater id (next_cursor of the previous page)"),
+    limit: int = Query(100, description="Events per page", ge=1, le=500),
+    record_type: Optional[List[str]] = Query(None, description="Filter by event record type (message, agent_step, tool_usage, crewai_execution)"),
+    include_large_fields: bool = Query(False, description="Include tool payloads, prompts and logs in event data"),
+    current_user: Campaigner = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get trace events incrementally with cursor-based pagination.
+
+    Live UIs can poll with the last next_cursor to receive only new events.
+    Large data fields are omitted by default and listed in each event's
+    omitted_fields; load them with /traces/{thread_id}/events/{event_id}.
+    """
+    if record_type:
+        invalid = [value for value in record_type if value not in EVENT_RECORD_TYPES]
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Invalid record_type: {', '.join(invalid)}")
+
+    result = ChatTraceService(session=session).get_thread_events(
+        thread_id,
+        after_id=after_id,
+        limit=limit,
+        record_types=record_type,
+        include_large_fields=include_large_fields
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Trace not found: {thread_id}")
+
+    return TraceEventsResponse(**result)
+
+
+@router.get("/{thread_id}/events/{event_id}")
+async def get_trace_event(
+    thread_id: str,
+    event_id: int,
+    current_user: Campaigner = Depends(get_current_user),
+    session: Session = Depends(get_session)
+):
+    """
+    Get a single trace event with all data fields, including large ones.
+    """
+    event = ChatTraceService(session=session).get_trace_event(thread_id, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"Event {event_id} not found in trace {thread_id}")
+
+    return event
+
+
+@router.post("/internal/maintenance")
+async def run_trace_partition_maintenance(
+    _: None = Depends(verify_internal_token)
+):
+    """
+    Endpoint triggered by Cloud Scheduler daily.
+    Creates upcoming chat_traces partitions and drops/archives expired ones.
+    Requires internal auth token
+    """
+    try:
+        return ChatTracePartitionService().run_maintenance()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Trace maintenance failed: {str(e)}")
+
+
 @router.get("/stats/summary")
 async def get_trace_stats(
     days: int = Query(7, description="Number of days to analyze", ge=1, le=90),
@@ -5,9 +5,10 @@ DialogCX webhook handling API routes
 from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks, Header
 from datetime import datetime, timezone, timedelta
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 import json
 import asyncio
+import functools
 import httpx
 import os
 
@@ -17,8 +18,12 @@ from app.core.api_auth import verify_webhook_token
 from app.models.users import Campaigner
 from app.core.database import get_session
 from app.config.logging import get_logger
+from app.config.settings import get_settings
 from app.models.agents import CustomerLog
-from app.core.websocket_manager import connection_manager
+from app.core.websocket_manager import SendResult, connection_manager
+from app.services.crew_execution_pool import CrewPoolFull, crew_execution_pool
+from app.services.job_handlers import DIALOGCX_ANALYSIS_JOB
+from app.services.job_queue import job_queue
 
 logger = get_logger("api.webhooks")
 router = APIRouter()
@@ -251,6 +256,16 @@ async def send_dialogcx_text_message(session_id: str, message: str):
 from app.utils.agent_utils import get_tools_for_agent
 
 
+def _run_coroutine_blocking(coro_func, *args):
+    """Run an async service call to completion on the calling (pool) thread.
+
+    Token refreshes and connection lookups block on Google's credential refresh
+    and synchronous DB sessions, so they get their own loop on a pool thread
+    instead of running on the server's event loop.
+    """
+    return asyncio.run(coro_func(*args))
+
+
 async def run_crewai_analysis_async(
     campaigner_id: int,
     customer_id: int,
@@ -264,6 +279,9 @@ async def run_crewai_analysis_async(
 ):
     """
     Run CrewAI analysis asynchronously and send custom event when complete.
+
+    Runs as a crew execution pool job; the blocking agent lookup, crew.kickoff()
+    and customer log writes execute on the pool's threads.
     """
     try:
         logger.info(f"🤖 Starting async CrewAI analysis for session: {session_id}")
@@ -277,7 +295,8 @@ async def run_crewai_analysis_async(
         from app.services.agent_service import AgentService
         
         agent_service = AgentService()
-        all_agents_data = agent_service.get_all_agents()
+        # Blocking DB and crew calls run on the crew pool's threads, not the event loop
+        all_agents_data = await crew_execution_pool.run_blocking(agent_service.get_all_agents)
         master_agent_data = all_agents_data.get("master_agent")
         specialist_agents_data = all_agents_data.get("specialist_agents", [])
         
@@ -306,11 +325,15 @@ async def run_crewai_analysis_async(
             try:
                 # STEP 1: Automatically refresh expired tokens before using them
                 logger.info(f"🔄 Checking and refreshing GA4 tokens for campaigner {campaigner_id}...")
-                await refresh_user_ga4_tokens(ga_service, campaigner_id)
+                await crew_execution_pool.run_blocking(
+                    _run_coroutine_blocking, refresh_user_ga4_tokens, ga_service, campaigner_id
+                )
                 
                 # STEP 2: Get user connections (should work now with fresh tokens)
                 if hasattr(ga_service, 'get_user_connections'):
-                    user_connections = await ga_service.get_user_connections(campaigner_id)
+                    user_connections = await crew_execution_pool.run_blocking(
+                        _run_coroutine_blocking, ga_service.get_user_connections, campaigner_id
+                    )
                     logger.info(f"✅ Found {len(user_connections)} GA4 connections for campaigner")
                     
                     # WARN IF NO CONNECTIONS FOUND
@@ -340,7 +363,9 @@ async def run_crewai_analysis_async(
                 from app.services.facebook_service import FacebookService
                 facebook_service = FacebookService()
                 logger.info(f"🔄 Checking and refreshing Facebook tokens for campaigner {campaigner_id}...")
-                await refresh_user_facebook_tokens(facebook_service, campaigner_id)
+                await crew_execution_pool.run_blocking(
+                    _run_coroutine_blocking, refresh_user_facebook_tokens, facebook_service, campaigner_id
+                )
                 logger.info(f"✅ Facebook service ready for campaigner {campaigner_id}")
             except Exception as e:
                 logger.warning(f"Could not initialize Facebook service: {e}")
@@ -373,13 +398,17 @@ async def run_crewai_analysis_async(
         agents = []
         tasks = []
         
+        # Parallel mode: specialists run concurrently first, then the master
+        # synthesizes their merged outputs (no delegation needed)
+        parallel_specialists = get_settings().crew_parallel_specialists
+        
         # Create Master Agent using ONLY database configuration with timing
         master_agent = timing_wrapper.create_timed_agent(
             role=master_agent_data["name"],  # Use name field for short, clean agent role
             goal=master_agent_data["goal"],
             backstory=master_agent_data["backstory"],
             verbose=master_agent_data.get("verbose", True),
-            allow_delegation=master_agent_data.get("allow_delegation", True),
+            allow_delegation=master_agent_data.get("allow_delegation", True) and not parallel_specialists,
             llm=llm
         )
         agents.append(master_agent)
@@ -465,28 +494,59 @@ async def run_crewai_analysis_async(
                 # Fallback if no task in database
                 specialist_task_description = f"Analyze {agent_name} data for: {user_question}"
             
-            # CRITICAL FIX: Set context=[master_task] so specialist output feeds back to master
-            specialist_task = Task(
-                description=specialist_task_description,
-                agent=specialist_agent,
-                expected_output=f"Detailed {agent_name} analysis following the specialist reply schema",
-                context=[master_task]  # ✅ This ensures output goes to master, not directly to user
-            )
+            if parallel_specialists:
+                # Independent data fetch; outputs are merged into the master's synthesis task
+                specialist_task = Task(
+                    description=specialist_task_description,
+                    agent=specialist_agent,
+                    expected_output=f"Detailed {agent_name} analysis following the specialist reply schema"
+                )
+            else:
+                # CRITICAL FIX: Set context=[master_task] so specialist output feeds back to master
+                specialist_task = Task(
+                    description=specialist_task_description,
+                    agent=specialist_agent,
+                    expected_output=f"Detailed {agent_name} analysis following the specialist reply schema",
+                    context=[master_task]  # ✅ This ensures output goes to master, not directly to user
+                )
             specialist_tasks.append(specialist_task)
-            logger.info(f"✅ Created task for: {specialist_data['name']} with context=[master_task]")
-        
-        # Add specialist tasks after master task so they execute after and feed back
-        tasks.extend(specialist_tasks)
+            logger.info(f"✅ Created task for: {specialist_data['name']}")
         
         # 6. EXECUTE DYNAMIC CREW WITH DATABASE-DRIVEN CONFIGURATION AND TIMING
-        crew = timing_wrapper.create_timed_crew(
-            agents=agents,
-            tasks=tasks,
-            process=Process.sequential,
-            verbose=True
-        )
+        if parallel_specialists and specialist_tasks:
+            # Latency approaches the slowest specialist instead of the sum of all of them
+            specialist_results = await _run_specialists_concurrently(
+                timing_wrapper,
+                specialist_tasks,
+                get_settings().crew_specialist_concurrency
+            )
+            synthesis_task = Task(
+                description=(
+                    f"{master_task_description}\n\n"
+                    "The specialists below have already gathered the data. Synthesize their findings "
+                    "into the final answer; note any specialist that failed.\n\n"
+                    f"SPECIALIST FINDINGS:\n{_merge_specialist_outputs(specialist_results)}"
+                ),
+                agent=master_agent,
+                expected_output="Comprehensive analysis with specific insights and actionable recommendations"
+            )
+            crew = timing_wrapper.create_timed_crew(
+                agents=[master_agent],
+                tasks=[synthesis_task],
+                process=Process.sequential,
+                verbose=True
+            )
+        else:
+            # Add specialist tasks after master task so they execute after and feed back
+            tasks.extend(specialist_tasks)
+            crew = timing_wrapper.create_timed_crew(
+                agents=agents,
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=True
+            )
         
-        logger.info(f"🤖 Executing crew with {len(agents)} agents and {len(tasks)} tasks")
+        logger.info(f"🤖 Executing crew with {len(crew.agents)} agents and {len(crew.tasks)} tasks")
         
         # Track execution details for partial success reporting
         execution_details = {
@@ -498,7 +558,7 @@ async def run_crewai_analysis_async(
         }
         
         try:
-            result = crew.kickoff()
+            result = await crew_execution_pool.run_blocking(crew.kickoff)
             processing_time = time.time() - start_time
             logger.info(f"✅ Crew execution completed in {processing_time:.2f} seconds")
             logger.info(f"🔍 CrewAI result type: {type(result)}")
@@ -574,7 +634,8 @@ async def run_crewai_analysis_async(
         user_intent = intent_name or "DialogCX Integration"
         crewai_input_prompt = f"User Question: {user_question}\nIntent: {intent_name}\nData Sources: {data_sources}\nCampaigner ID: {campaigner_id}"
         
-        customer_log_id = timing_wrapper.create_customer_log(
+        customer_log_id = await crew_execution_pool.run_blocking(functools.partial(
+            timing_wrapper.create_customer_log,
             user_intent=user_intent,
             original_query=user_question,
             crewai_input_prompt=crewai_input_prompt,
@@ -583,88 +644,92 @@ async def run_crewai_analysis_async(
             customer_id=customer_id,
             success=is_success,
             error_message=error_message
-        )
+        ))
         
         logger.info(f"📊 Customer log created: {customer_log_id}")
         
         # 8. LOG ADDITIONAL DIALOGCX CONTEXT TO EXISTING CUSTOMER LOG
-        try:
-            from app.core.database import DatabaseManager
-            db_manager = DatabaseManager()
+        def _store_dialogcx_metadata():
+            try:
+                from app.core.database import DatabaseManager
+                db_manager = DatabaseManager()
             
-            with db_manager.get_session() as session:
-                from app.models.agents import CustomerLog
+                with db_manager.get_session() as session:
+                    from app.models.agents import CustomerLog
                 
-                # Update the existing customer log with DialogCX context
-                customer_log = session.query(CustomerLog).filter(
-                    CustomerLog.session_id == session_id
-                ).first()
+                    # Update the existing customer log with DialogCX context
+                    customer_log = session.query(CustomerLog).filter(
+                        CustomerLog.session_id == session_id
+                    ).first()
                 
-                if customer_log:
-                    # Add DialogCX-specific metadata to the existing log
-                    dialogcx_metadata = {
-                        "dialogcx_session_id": dialogcx_session_id,
-                        "matching_parameters": matching_parameters,
-                        "simplified_response": {"fulfillment_response": str(result)},
-                        "full_detailed_response": {
-                            "fulfillment_response": {
-                                "messages": [{
-                                    "text": {
-                                        "text": [str(result)]
+                    if customer_log:
+                        # Add DialogCX-specific metadata to the existing log
+                        dialogcx_metadata = {
+                            "dialogcx_session_id": dialogcx_session_id,
+                            "matching_parameters": matching_parameters,
+                            "simplified_response": {"fulfillment_response": str(result)},
+                            "full_detailed_response": {
+                                "fulfillment_response": {
+                                    "messages": [{
+                                        "text": {
+                                            "text": [str(result)]
+                                        }
+                                    }]
+                                },
+                                "session_info": {
+                                    "parameters": {
+                                        "analysis_completed": True,
+                                        "success": True,
+                                        "session_id": session_id,
+                                        "analysis_id": analysis_id,
+                                        "customer_log_id": customer_log_id,
+                                        "campaigner_id": campaigner_id,
+                                        "customer_id": customer_id,
+                                        "user_question": user_question,
+                                        "user_intent": intent_name,
+                                        "dialogcx_session_id": dialogcx_session_id,
+                                        "matching_parameters": matching_parameters,
+                                        "agents_used": [agent_data['name'] for agent_data in [master_agent_data] + [s for s in specialist_agents_data if _should_include_specialist(s, data_sources, intent_name, user_question)]],
+                                        "master_agent": master_agent_data['name'],
+                                        "specialist_agents": [s['name'] for s in specialist_agents_data if _should_include_specialist(s, data_sources, intent_name, user_question)],
+                                        "specialists_count": len(agents) - 1,
+                                        "total_agents_count": len(agents),
+                                        "data_sources": data_sources,
+                                        "data_sources_count": len(data_sources),
+                                        "processing_time_seconds": round(processing_time, 2),
+                                        "processing_time_ms": round(processing_time * 1000, 2),
+                                        "start_time": datetime.fromtimestamp(start_time).isoformat(),
+                                        "end_time": datetime.now().isoformat(),
+                                        "analysis_type": "crewai_multi_agent",
+                                        "crew_process": "parallel_specialists" if parallel_specialists else "sequential",
+                                        "specialist_timings": timing_wrapper.get_specialist_timings(),
+                                        "llm_model": "gemini/gemini-1.5-flash",
+                                        "temperature": 0.1,
+                                        "tools_used": [tool.__class__.__name__ for agent in agents for tool in getattr(agent, 'tools', [])],
+                                        "tools_count": sum(len(getattr(agent, 'tools', [])) for agent in agents),
+                                        "confidence_score": 0.95,
+                                        "completeness_score": 1.0,
+                                        "timestamp": datetime.now().isoformat(),
+                                        "version": "1.0",
+                                        "environment": "production"
                                     }
-                                }]
-                            },
-                            "session_info": {
-                                "parameters": {
-                                    "analysis_completed": True,
-                                    "success": True,
-                                    "session_id": session_id,
-                                    "analysis_id": analysis_id,
-                                    "customer_log_id": customer_log_id,
-                                    "campaigner_id": campaigner_id,
-                                    "customer_id": customer_id,
-                                    "user_question": user_question,
-                                    "user_intent": intent_name,
-                                    "dialogcx_session_id": dialogcx_session_id,
-                                    "matching_parameters": matching_parameters,
-                                    "agents_used": [agent_data['name'] for agent_data in [master_agent_data] + [s for s in specialist_agents_data if _should_include_specialist(s, data_sources, intent_name, user_question)]],
-                                    "master_agent": master_agent_data['name'],
-                                    "specialist_agents": [s['name'] for s in specialist_agents_data if _should_include_specialist(s, data_sources, intent_name, user_question)],
-                                    "specialists_count": len(agents) - 1,
-                                    "total_agents_count": len(agents),
-                                    "data_sources": data_sources,
-                                    "data_sources_count": len(data_sources),
-                                    "processing_time_seconds": round(processing_time, 2),
-                                    "processing_time_ms": round(processing_time * 1000, 2),
-                                    "start_time": datetime.fromtimestamp(start_time).isoformat(),
-                                    "end_time": datetime.now().isoformat(),
-                                    "analysis_type": "crewai_multi_agent",
-                                    "crew_process": "sequential",
-                                    "llm_model": "gemini/gemini-1.5-flash",
-                                    "temperature": 0.1,
-                                    "tools_used": [tool.__class__.__name__ for agent in agents for tool in getattr(agent, 'tools', [])],
-                                    "tools_count": sum(len(getattr(agent, 'tools', [])) for agent in agents),
-                                    "confidence_score": 0.95,
-                                    "completeness_score": 1.0,
-                                    "timestamp": datetime.now().isoformat(),
-                                    "version": "1.0",
-                                    "environment": "production"
                                 }
                             }
                         }
-                    }
                     
-                    # Store DialogCX metadata in the existing customer log
-                    existing_crewai_log = json.loads(customer_log.crewai_log) if customer_log.crewai_log else {}
-                    existing_crewai_log["dialogcx_metadata"] = dialogcx_metadata
-                    customer_log.crewai_log = json.dumps(existing_crewai_log, indent=2)
+                        # Store DialogCX metadata in the existing customer log
+                        existing_crewai_log = json.loads(customer_log.crewai_log) if customer_log.crewai_log else {}
+                        existing_crewai_log["dialogcx_metadata"] = dialogcx_metadata
+                        customer_log.crewai_log = json.dumps(existing_crewai_log, indent=2)
                     
-                    session.commit()
-                    logger.info(f"📊 DialogCX metadata added to existing customer log: {customer_log_id}")
+                        session.commit()
+                        logger.info(f"📊 DialogCX metadata added to existing customer log: {customer_log_id}")
                 
-        except Exception as log_error:
-            logger.error(f"Failed to add DialogCX metadata to customer log: {log_error}")
-            # Don't fail the webhook if logging fails
+            except Exception as log_error:
+                logger.error(f"Failed to add DialogCX metadata to customer log: {log_error}")
+                # Don't fail the webhook if logging fails
+        
+        await crew_execution_pool.run_blocking(_store_dialogcx_metadata)
         
         # 9. ANALYZE RESULT TO DETERMINE SUCCESS/FAILURE
         result_text = str(result).lower()
@@ -729,6 +794,219 @@ async def run_crewai_analysis_async(
 from app.utils.token_utils import refresh_user_ga4_tokens, refresh_user_facebook_tokens
 
 
+async def _run_dialogcx_analysis_job(
+    campaigner_id: int,
+    customer_id: int,
+    user_question: str,
+    intent_name: str,
+    data_sources: List[str],
+    dialogcx_session_id: str,
+    matching_parameters: Dict,
+    analysis_id: str
+):
+    """
+    Crew pool job for a DialogCX question: run the analysis, then deliver the
+    result (or error) via WebSocket and a DialogCX custom event.
+    """
+    try:
+        crewai_result = await run_crewai_analysis_async(
+            campaigner_id=campaigner_id,
+            customer_id=customer_id,
+            user_question=user_question,
+            intent_name=intent_name,
+            data_sources=data_sources,
+            dialogcx_session_id=dialogcx_session_id,
+            matching_parameters=matching_parameters,
+            session_id=dialogcx_session_id,  # Use DialogCX session ID for internal logging
+            analysis_id=analysis_id
+        )
+
+        if crewai_result["success"]:
+            logger.info(f"✅ CrewAI analysis completed successfully")
+
+            # SEND RESULT VIA WEBSOCKET (PRIMARY METHOD)
+            try:
+                ws_sent = await connection_manager.send_crew_result(
+                    session_id=dialogcx_session_id,
+                    result=crewai_result["result"],
+                    analysis_id=analysis_id,
+                    execution_time=crewai_result.get("execution_time"),
+                    agents_used=crewai_result.get("agents_used", [])
+                )
+
+                _log_websocket_send(ws_sent, "result", dialogcx_session_id)
+            except Exception as ws_error:
+                logger.error(f"❌ Failed to send result via WebSocket: {str(ws_error)}")
+
+            # Stop typing indicator
+            try:
+                await connection_manager.send_typing_indicator(
+                    session_id=dialogcx_session_id,
+                    is_typing=False
+                )
+            except Exception as ws_error:
+                logger.warning(f"⚠️ Failed to stop typing indicator: {str(ws_error)}")
+
+            # SEND DIALOGCX CUSTOM EVENT WITH RESULT (BACKUP/LOGGING)
+            try:
+                event_result = await send_dialogcx_custom_event(
+                    session_id=dialogcx_session_id,
+                    event_name="crew_result_ready",
+                    result=crewai_result["result"]
+                )
+                if event_result.get("success"):
+                    logger.info(f"✅ Successfully sent DialogCX custom event: crew_result_ready")
+                else:
+                    logger.warning(f"⚠️ Failed to send DialogCX custom event: {event_result.get('error')}")
+            except Exception as event_error:
+                logger.error(f"❌ Error sending DialogCX custom event: {event_error}")
+
+            return {
+                "fulfillment_response": crewai_result["result"]
+            }
+        else:
+            logger.error(f"❌ CrewAI analysis failed: {crewai_result.get('error', 'Unknown error')}")
+
+            error_msg = crewai_result.get('error', 'Unknown error')
+            await _send_dialogcx_analysis_error(dialogcx_session_id, error_msg, crewai_result.get('details'))
+
+            return {
+                "fulfillment_response": f"I apologize, but I encountered an error while processing your request: {error_msg}"
+            }
+
+    except asyncio.CancelledError:
+        logger.warning(f"🛑 CrewAI analysis {analysis_id} cancelled")
+        try:
+            await connection_manager.send_error(
+                session_id=dialogcx_session_id,
+                error="Analysis cancelled",
+                retry_possible=True
+            )
+            await connection_manager.send_typing_indicator(
+                session_id=dialogcx_session_id,
+                is_typing=False
+            )
+        except Exception:
+            pass
+        raise
+
+    except Exception as e:
+        logger.error(f"❌ CrewAI analysis failed with exception: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        # Send error via WebSocket
+        try:
+            await connection_manager.send_error(
+                session_id=dialogcx_session_id,
+                error=f"Analysis exception: {str(e)}",
+                retry_possible=True
+            )
+        except Exception:
+            pass
+
+        # Stop typing indicator
+        try:
+            await connection_manager.send_typing_indicator(
+                session_id=dialogcx_session_id,
+                is_typing=False
+            )
+        except Exception:
+            pass
+
+        return {
+            "fulfillment_response": f"I apologize, but I encountered an error while processing your request: {str(e)}"
+        }
+
+
+def _log_websocket_send(ws_sent: SendResult, what: str, dialogcx_session_id: str) -> None:
+    """Log where a WebSocket send went; a publish alone does not confirm delivery."""
+    if ws_sent.delivered:
+        logger.info(f"✅ Sent {what} via WebSocket: session={dialogcx_session_id}")
+    elif ws_sent.published:
+        logger.info(
+            f"📡 Published {what} to the WebSocket backplane, no socket on this worker: "
+            f"session={dialogcx_session_id}"
+        )
+    else:
+        logger.warning(f"⚠️ No active WebSocket connections for session: {dialogcx_session_id}")
+
+
+async def _send_dialogcx_analysis_error(
+    dialogcx_session_id: str,
+    error_msg: str,
+    details: Optional[Any] = None
+) -> None:
+    """Deliver a failed analysis to the user via WebSocket and a DialogCX custom event."""
+    # SEND ERROR VIA WEBSOCKET
+    try:
+        ws_sent = await connection_manager.send_error(
+            session_id=dialogcx_session_id,
+            error=f"Analysis failed: {error_msg}",
+            details=details,
+            retry_possible=True
+        )
+        _log_websocket_send(ws_sent, "error", dialogcx_session_id)
+    except Exception as ws_error:
+        logger.error(f"❌ Failed to send error via WebSocket: {str(ws_error)}")
+
+    # Stop typing indicator
+    try:
+        await connection_manager.send_typing_indicator(
+            session_id=dialogcx_session_id,
+            is_typing=False
+        )
+    except Exception:
+        pass
+
+    # SEND DIALOGCX ERROR EVENT (BACKUP)
+    try:
+        error_message = f"Analysis failed: {error_msg}"
+        event_result = await send_dialogcx_custom_event(
+            session_id=dialogcx_session_id,
+            event_name="crew_result_ready",
+            result=error_message
+        )
+        if event_result.get("success"):
+            logger.info(f"✅ Successfully sent DialogCX error event: crew_result_ready")
+        else:
+            logger.warning(f"⚠️ Failed to send DialogCX error event: {event_result.get('error')}")
+    except Exception as event_error:
+        logger.error(f"❌ Error sending DialogCX error event: {event_error}")
+
+
+async def _run_specialists_concurrently(
+    timing_wrapper: CrewAITimingWrapper,
+    specialist_tasks: List,
+    max_concurrency: int
+) -> List[Dict]:
+    """
+    Run specialist tasks concurrently on the crew pool's threads.
+
+    At most `max_concurrency` specialists run at once. Results are returned in
+    task order; timings are recorded on the timing wrapper.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(task):
+        async with semaphore:
+            return await crew_execution_pool.run_blocking(timing_wrapper.run_specialist, task.agent, task)
+
+    logger.info(f"⚡ Running {len(specialist_tasks)} specialists concurrently (max {max_concurrency})")
+    return list(await asyncio.gather(*(run(task) for task in specialist_tasks)))
+
+
+def _merge_specialist_outputs(specialist_results: List[Dict]) -> str:
+    """Combine specialist outputs into one context block for the master's synthesis task"""
+    sections = []
+    for specialist in specialist_results:
+        if specialist["success"]:
+            sections.append(f"### {specialist['agent']}\n{specialist['output']}")
+        else:
+            sections.append(f"### {specialist['agent']}\nFAILED: {specialist['error']}")
+    return "\n\n".join(sections)
+
+
 def _should_include_specialist(specialist_config: Dict, data_sources: List[str], intent_name: str, user_question: str) -> bool:
     """Determine if a specialist should be included based on context"""
     from app.core.constants import should_include_agent
@@ -741,6 +1019,38 @@ def _should_include_specialist(specialist_config: Dict, data_sources: List[str],
     return should_include_agent(agent_identifier, data_sources, user_question)
 
 
+def _get_visible_crew_job(job_id: str, current_user: Campaigner):
+    """Look up a crew pool job the caller may see (own jobs; OWNER/ADMIN see all)."""
+    job = crew_execution_pool.get_job(job_id)
+    user_role = current_user.role.upper() if current_user.role else 'CAMPAIGNER'
+    if not job or (user_role not in ('ADMIN', 'OWNER') and job.tenant != current_user.id):
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    return job
+
+
+@router.get("/crew-jobs/stats")
+async def get_crew_pool_stats(current_user: Campaigner = Depends(get_current_user)):
+    """Queue depth, running jobs and latency of this worker's crew execution pool (OWNER/ADMIN only)"""
+    user_role = current_user.role.upper() if current_user.role else 'CAMPAIGNER'
+    if user_role not in ('ADMIN', 'OWNER'):
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return crew_execution_pool.get_stats()
+
+
+@router.get("/crew-jobs/{job_id}")
+async def get_crew_job(job_id: str, current_user: Campaigner = Depends(get_current_user)):
+    """Status of a queued/running/finished analysis (job_id is the analysis_id)"""
+    return _get_visible_crew_job(job_id, current_user).to_dict()
+
+
+@router.post("/crew-jobs/{job_id}/cancel")
+async def cancel_crew_job(job_id: str, current_user: Campaigner = Depends(get_current_user)):
+    """Cancel a queued or running analysis"""
+    job = _get_visible_crew_job(job_id, current_user)
+    cancelled = crew_execution_pool.cancel(job_id)
+    return {"success": cancelled, "job": job.to_dict()}
+
+
 @router.get("/customer-logs")
 async def get_customer_logs(
     limit: int = 5,
@@ -1123,23 +1433,23 @@ async def handle_dialogcx_webhook(
             
             # Send via WebSocket
             try:
-                await connection_manager.send_crew_result(
+                ws_sent = await connection_manager.send_crew_result(
                     session_id=dialogcx_session_id,
                     result=response_text,
                     analysis_id=analysis_id,
                     execution_time=0.0,
                     agents_used=[]
                 )
-                logger.info(f"✅ Sent response via WebSocket: session={dialogcx_session_id}")
+                _log_websocket_send(ws_sent, "response", dialogcx_session_id)
             except Exception as ws_error:
                 logger.error(f"❌ WebSocket send failed: {str(ws_error)}")
             
             # Return simple acknowledgment to DialogCX
             return {"fulfillment_response": "Processing your request..."}
 
-        # ELSE: Original CrewAI code continues below (unchanged)
-        # RUN CREWAI ANALYSIS SYNCHRONOUSLY AND RETURN RESULT DIRECTLY
-        logger.info(f"🚀 Starting CrewAI analysis for DialogCX session: {dialogcx_session_id}")
+        # Queue the analysis on the crew pool; the result is delivered by
+        # _run_dialogcx_analysis_job via WebSocket and a DialogCX custom event
+        logger.info(f"🚀 Queueing CrewAI analysis for DialogCX session: {dialogcx_session_id}")
         
         # Send typing indicator via WebSocket
         try:
@@ -1152,139 +1462,52 @@ async def handle_dialogcx_webhook(
         except Exception as ws_error:
             logger.warning(f"⚠️ Failed to send typing indicator via WebSocket: {str(ws_error)}")
         
-        try:
-            # Run CrewAI analysis synchronously
-            crewai_result = await run_crewai_analysis_async(
+        job_kwargs = dict(
+            campaigner_id=campaigner_id,
+            customer_id=customer_id,
+            user_question=user_question,
+            intent_name=intent_name,
+            data_sources=data_sources,
+            dialogcx_session_id=dialogcx_session_id,
+            matching_parameters=matching_parameters,
+            analysis_id=analysis_id
+        )
+        if get_settings().analytics_jobs_durable:
+            # Durable mode: a job worker runs the analysis, surviving API restarts
+            job_id = await asyncio.to_thread(
+                job_queue.enqueue,
+                DIALOGCX_ANALYSIS_JOB,
+                job_kwargs,
                 campaigner_id=campaigner_id,
-                customer_id=customer_id,
-                user_question=user_question,
-                intent_name=intent_name,
-                data_sources=data_sources,
-                dialogcx_session_id=dialogcx_session_id,
-                matching_parameters=matching_parameters,
-                session_id=dialogcx_session_id,  # Use DialogCX session ID for internal logging
-                analysis_id=analysis_id
+                # A failed run has already reported its error to the user; if the
+                # worker dies instead, the job's failure notifier reports it
+                max_attempts=1
             )
-            
-            if crewai_result["success"]:
-                logger.info(f"✅ CrewAI analysis completed successfully")
-                
-                # SEND RESULT VIA WEBSOCKET (PRIMARY METHOD)
-                try:
-                    ws_sent = await connection_manager.send_crew_result(
-                        session_id=dialogcx_session_id,
-                        result=crewai_result["result"],
-                        analysis_id=analysis_id,
-                        execution_time=crewai_result.get("execution_time"),
-                        agents_used=crewai_result.get("agents_used", [])
-                    )
-                    
-                    if ws_sent:
-                        logger.info(f"✅ Successfully sent result via WebSocket: session={dialogcx_session_id}")
-                    else:
-                        logger.warning(f"⚠️ No active WebSocket connections for session: {dialogcx_session_id}")
-                except Exception as ws_error:
-                    logger.error(f"❌ Failed to send result via WebSocket: {str(ws_error)}")
-                
-                # Stop typing indicator
-                try:
-                    await connection_manager.send_typing_indicator(
-                        session_id=dialogcx_session_id,
-                        is_typing=False
-                    )
-                except Exception as ws_error:
-                    logger.warning(f"⚠️ Failed to stop typing indicator: {str(ws_error)}")
-                
-                # SEND DIALOGCX CUSTOM EVENT WITH RESULT (BACKUP/LOGGING)
-                try:
-                    event_result = await send_dialogcx_custom_event(
-                        session_id=dialogcx_session_id,
-                        event_name="crew_result_ready",
-                        result=crewai_result["result"]
-                    )
-                    if event_result.get("success"):
-                        logger.info(f"✅ Successfully sent DialogCX custom event: crew_result_ready")
-                    else:
-                        logger.warning(f"⚠️ Failed to send DialogCX custom event: {event_result.get('error')}")
-                except Exception as event_error:
-                    logger.error(f"❌ Error sending DialogCX custom event: {event_error}")
-                
-                return {
-                    "fulfillment_response": crewai_result["result"]
-                }
-            else:
-                logger.error(f"❌ CrewAI analysis failed: {crewai_result.get('error', 'Unknown error')}")
-                
-                error_msg = crewai_result.get('error', 'Unknown error')
-                
-                # SEND ERROR VIA WEBSOCKET
-                try:
-                    await connection_manager.send_error(
-                        session_id=dialogcx_session_id,
-                        error=f"Analysis failed: {error_msg}",
-                        details=crewai_result.get('details'),
-                        retry_possible=True
-                    )
-                    logger.info(f"✅ Sent error via WebSocket: session={dialogcx_session_id}")
-                except Exception as ws_error:
-                    logger.error(f"❌ Failed to send error via WebSocket: {str(ws_error)}")
-                
-                # Stop typing indicator
-                try:
-                    await connection_manager.send_typing_indicator(
-                        session_id=dialogcx_session_id,
-                        is_typing=False
-                    )
-                except Exception:
-                    pass
-                
-                # SEND DIALOGCX ERROR EVENT (BACKUP)
-                try:
-                    error_message = f"Analysis failed: {error_msg}"
-                    event_result = await send_dialogcx_custom_event(
-                        session_id=dialogcx_session_id,
-                        event_name="crew_result_ready",
-                        result=error_message
-                    )
-                    if event_result.get("success"):
-                        logger.info(f"✅ Successfully sent DialogCX error event: crew_result_ready")
-                    else:
-                        logger.warning(f"⚠️ Failed to send DialogCX error event: {event_result.get('error')}")
-                except Exception as event_error:
-                    logger.error(f"❌ Error sending DialogCX error event: {event_error}")
-                
-                return {
-                    "fulfillment_response": f"I apologize, but I encountered an error while processing your request: {error_msg}"
-                }
-                
-        except Exception as e:
-            logger.error(f"❌ CrewAI analysis failed with exception: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            
-            # Send error via WebSocket
+            logger.info(f"📥 Enqueued analysis {analysis_id} as job {job_id}")
+            return {"fulfillment_response": "Processing your request..."}
+
+        try:
+            crew_execution_pool.submit(campaigner_id, _run_dialogcx_analysis_job, job_id=analysis_id, **job_kwargs)
+        except CrewPoolFull as pool_error:
+            logger.warning(f"⚠️ {str(pool_error)} - rejecting analysis {analysis_id}")
             try:
                 await connection_manager.send_error(
                     session_id=dialogcx_session_id,
-                    error=f"Analysis exception: {str(e)}",
+                    error="Too many analyses are running right now",
                     retry_possible=True
                 )
-            except Exception:
-                pass
-            
-            # Stop typing indicator
-            try:
                 await connection_manager.send_typing_indicator(
                     session_id=dialogcx_session_id,
                     is_typing=False
                 )
             except Exception:
                 pass
-            
             return {
-                "fulfillment_response": f"I apologize, but I encountered an error while processing your request: {str(e)}"
+                "fulfillment_response": "I'm handling a lot of requests right now. Please try again in a moment."
             }
         
+        return {"fulfillment_response": "Processing your request..."}
+        
     except Exception as e:
         logger.error(f"DialogCX webhook processing failed: {str(e)}")
         import traceback
@@ -147,11 +147,12 @@ async def websocket_endpoint(
                 
                 if elapsed >= heartbeat_interval:
                     try:
-                        # Send ping to keep connection alive
-                        await websocket.send_json({
+                        # Queue ping to keep connection alive (fails once the socket was evicted)
+                        if not connection_manager.queue_message(websocket, session_id, {
                             "type": "ping",
                             "timestamp": current_time.isoformat()
-                        })
+                        }):
+                            break
                         
                         # Update heartbeat timestamp
                         await connection_manager.heartbeat(websocket, session_id)
@@ -234,7 +235,7 @@ async def handle_client_message(
     try:
         message_type = message.get("type", "unknown")
         
-        logger.info(
+        logger.debug(
             f"📨 Received WebSocket message: session={session_id}, "
             f"type={message_type}, user={user_info['user_id']}"
         )
@@ -246,7 +247,7 @@ async def handle_client_message(
             
         elif message_type == "status_request":
             # Client requesting status update
-            await websocket.send_json({
+            connection_manager.queue_message(websocket, session_id, {
                 "type": "status",
                 "data": {
                     "session_id": session_id,
@@ -262,7 +263,7 @@ async def handle_client_message(
             
         else:
             logger.warning(f"⚠️ Unknown message type: {message_type}")
-            await websocket.send_json({
+            connection_manager.queue_message(websocket, session_id, {
                 "type": "error",
                 "data": {
                     "error": f"Unknown message type: {message_type}",
@@ -273,7 +274,7 @@ async def handle_client_message(
     
     except Exception as e:
         logger.error(f"❌ Error handling client message: {str(e)}")
-        await websocket.send_json({
+        connection_manager.queue_message(websocket, session_id, {
             "type": "error",
             "data": {
                 "error": "Message handling error",
@@ -296,6 +297,7 @@ async def websocket_status():
             "status": "operational",
             "total_connections": connection_manager.get_total_connections(),
             "active_sessions": len(connection_manager.get_active_sessions()),
+            "delivery": connection_manager.get_stats(),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
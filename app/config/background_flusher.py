@@ -0,0 +1,69 @@
+"""
+Background flush thread shared by buffered writers.
+
+Langfuse traces and detailed execution logs are both buffered in memory and
+written out by a daemon thread, every ``interval_seconds`` or sooner when a
+caller asks for it with ``request_flush()`` (which only sets an event, so the
+caller never waits on the write).
+"""
+
+import threading
+from typing import Callable, Optional
+
+from app.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundFlusher:
+    """Daemon thread that calls ``flush_fn`` on an interval or on request."""
+
+    def __init__(self, flush_fn: Callable[[], object], interval_seconds: float, name: str):
+        self._flush_fn = flush_fn
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the flusher thread if it is not already running."""
+        with self._lock:
+            if self.is_running:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def request_flush(self) -> None:
+        """Ask the flusher thread to flush soon (non-blocking)."""
+        self.start()
+        self._wakeup.set()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the flusher thread and do a final synchronous flush."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout=timeout)
+        self._flush_fn()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.interval_seconds)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            try:
+                self._flush_fn()
+            except Exception as e:
+                # Keep the thread alive; the next interval retries
+                logger.error(f"❌ [{self.name}] Background flush failed: {e}")
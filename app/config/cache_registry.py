@@ -0,0 +1,171 @@
+"""
+Registry of in-process caches and the ORM writes that invalidate them.
+
+Caches register once at import:
+
+- register_cache() lists a cache for GET /health/caches and for the test
+  suite's per-test reset (invalidate_caches()).
+- register_invalidation() names the models whose committed writes make a
+  cache stale. One set of Session hooks collects the changed objects of
+  every registration into session.info while flushing, hands them over
+  after the commit (or, for work that must join the transaction, just
+  before it) and discards them on rollback.
+
+cache_stats() builds the hits/misses/hit_rate block every cache reports.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# session.info key holding {registration name: set(collected items)} until commit/rollback
+PENDING_INVALIDATIONS_KEY = "pending_cache_invalidations"
+
+# Item collected for registrations that only need to know something changed
+CHANGED = True
+
+
+def cache_stats(entries: int, hits: int, misses: int, **extra: Any) -> Dict[str, Any]:
+    """Stats block of a cache: size, hits, misses, hit rate, then cache-specific counters."""
+    lookups = hits + misses
+    return {
+        "entries": entries,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 3) if lookups else None,
+        **extra,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Caches
+# ---------------------------------------------------------------------------
+
+# name -> cache exposing get_stats() and invalidate()
+_caches: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> Any:
+    """List a cache (anything with get_stats() and invalidate()) under `name`."""
+    _caches[name] = cache
+    return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every registered cache, keyed by name."""
+    return {name: cache.get_stats() for name, cache in _caches.items()}
+
+
+def invalidate_caches() -> None:
+    """Empty every registered cache."""
+    for cache in _caches.values():
+        cache.invalidate()
+
+
+# ---------------------------------------------------------------------------
+# Commit-driven invalidation
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Invalidation:
+    """What a cache watches and how it reacts to committed writes."""
+    name: str
+    models: Tuple[type, ...]
+    collect: Callable[[Any], Iterable[Hashable]]
+    after_commit: Optional[Callable[[Set[Hashable]], None]] = None
+    before_commit: Optional[Callable[[Session, Set[Hashable]], None]] = None
+    on_flush: Optional[Callable[[], None]] = None
+
+
+_invalidations: Dict[str, Invalidation] = {}
+
+
+def register_invalidation(
+    name: str,
+    models: Tuple[type, ...],
+    after_commit: Optional[Callable[[Set[Hashable]], None]] = None,
+    before_commit: Optional[Callable[[Session, Set[Hashable]], None]] = None,
+    collect: Optional[Callable[[Any], Iterable[Hashable]]] = None,
+    on_flush: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    React to ORM writes of `models`.
+
+    Args:
+        name: Registration name (also used with mark_changed/has_pending)
+        models: Model classes whose new, dirty or deleted instances count
+        after_commit: Called with the collected items once the transaction commits
+        before_commit: Called with the session and the collected items just
+            before commit, for writes that must land in the same transaction
+        collect: Items to record per changed instance (default: just CHANGED)
+        on_flush: Called right after any flush that recorded items
+    """
+    _invalidations[name] = Invalidation(
+        name=name,
+        models=models,
+        collect=collect or (lambda obj: (CHANGED,)),
+        after_commit=after_commit,
+        before_commit=before_commit,
+        on_flush=on_flush,
+    )
+
+
+def mark_changed(session: Session, name: str, items: Iterable[Hashable] = (CHANGED,)) -> None:
+    """Record changes made outside the ORM (e.g. Core upserts) for registration `name`."""
+    pending: Dict[str, Set[Hashable]] = session.info.setdefault(PENDING_INVALIDATIONS_KEY, {})
+    pending.setdefault(name, set()).update(items)
+
+
+def has_pending(session: Session, name: str) -> bool:
+    """Whether the session holds flushed but uncommitted changes for registration `name`."""
+    return bool(session.info.get(PENDING_INVALIDATIONS_KEY, {}).get(name))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    # new/dirty/deleted still hold the pre-flush state here
+    flushed = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        for registration in _invalidations.values():
+            if isinstance(obj, registration.models):
+                items = tuple(registration.collect(obj))
+                if items:
+                    mark_changed(session, registration.name, items)
+                    flushed.add(registration.name)
+    for name in flushed:
+        if _invalidations[name].on_flush is not None:
+            _invalidations[name].on_flush()
+
+
+@event.listens_for(Session, "before_commit")
+def _run_before_commit(session: Session) -> None:
+    registrations = [r for r in _invalidations.values() if r.before_commit is not None]
+    if not registrations:
+        return
+    # Flush first so pending ORM changes are collected above
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    pending = session.info.get(PENDING_INVALIDATIONS_KEY, {})
+    for registration in registrations:
+        items = pending.pop(registration.name, None)
+        if items:
+            registration.before_commit(session, items)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    if not pending:
+        return
+    for name, items in pending.items():
+        registration = _invalidations.get(name)
+        if registration is not None and registration.after_commit is not None and items:
+            registration.after_commit(items)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
@@ -5,6 +5,8 @@ from typing import Optional
 from langfuse import Langfuse
 import logging
 
+from app.config.background_flusher import BackgroundFlusher
+
 logger = logging.getLogger(__name__)
 
 # Initialize CrewAI and LiteLLM instrumentation for Langfuse
@@ -50,6 +52,7 @@ class LangfuseConfig:
 
     _instance: Optional[Langfuse] = None
     _enabled: bool = False
+    _flusher: Optional[BackgroundFlusher] = None
 
     @classmethod
     def initialize(cls) -> Optional[Langfuse]:
@@ -170,6 +173,27 @@ class LangfuseConfig:
             except Exception as e:
                 logger.error(f"❌ Failed to flush Langfuse traces: {e}")
 
+    @classmethod
+    def request_flush(cls):
+        """Schedule a flush on the background flusher thread (non-blocking)."""
+        if cls._instance is None or not cls._enabled:
+            return
+        if cls._flusher is None:
+            from app.config.settings import get_settings
+            cls._flusher = BackgroundFlusher(
+                cls.flush, get_settings().langfuse_flush_interval_seconds, name="langfuse-flusher"
+            )
+        cls._flusher.request_flush()
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the background flusher and flush remaining traces. Call on app shutdown."""
+        if cls._flusher is not None:
+            cls._flusher.stop()
+            cls._flusher = None
+        else:
+            cls.flush()
+
 
 # Initialize on module import
 langfuse_client = LangfuseConfig.get_client()
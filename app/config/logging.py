@@ -1,24 +1,168 @@
 """
 Logging configuration for SatoApp
+
+Output handlers (stdout, the rotating log file) are not attached to the
+root logger directly. The root logger gets a single QueueHandler that puts
+records on a bounded queue, and a QueueListener thread does the actual
+formatting and I/O. Logging calls on request paths, including inside the
+event loop, therefore never block on file or stdout writes. When the queue
+is full, records are dropped and counted rather than blocking the caller.
 """
 
+import json
 import logging
+import queue
 import sys
-from typing import Dict, Any
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
 from .settings import get_settings
 
 settings = get_settings()
 
 
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line (for structured log ingestion)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "severity": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped: Dict[str, int] = {}
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message and traceback so the record can cross threads safely."""
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+
+class LoggingPipeline:
+    """Bounded queue between the root logger and the output handlers."""
+
+    def __init__(self, queue_size: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, respect_handler_level=True)
+        self._started = False
+
+    def add_handler(self, handler: logging.Handler) -> None:
+        """Attach an output handler; it runs on the listener thread."""
+        if handler not in self.listener.handlers:
+            self.listener.handlers = (*self.listener.handlers, handler)
+
+    def start(self) -> None:
+        if not self._started:
+            self.listener.start()
+            self._started = True
+
+    def stop(self) -> None:
+        """Drain the queue and stop the listener thread."""
+        if self._started:
+            self.listener.stop()
+            self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        dropped = dict(self.handler.dropped)
+        return {
+            "queue_size": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "dropped": dropped,
+            "dropped_total": sum(dropped.values()),
+        }
+
+
+_pipeline: Optional[LoggingPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> LoggingPipeline:
+    """Install the logging pipeline on the root logger on first use."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LoggingPipeline(settings.log_queue_size)
+            logging.getLogger().addHandler(_pipeline.handler)
+            _pipeline.start()
+        return _pipeline
+
+
+def add_log_handler(handler: logging.Handler) -> None:
+    """
+    Route root logger output to a handler.
+
+    With log_async enabled (default) the handler runs on the logging
+    pipeline's listener thread; otherwise it is attached to the root logger.
+    """
+    if settings.log_async:
+        _get_pipeline().add_handler(handler)
+    else:
+        logging.getLogger().addHandler(handler)
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Queue depth and drop counters of the logging pipeline."""
+    if _pipeline is None:
+        return {"async": False}
+    return {"async": True, **_pipeline.stats()}
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread (called at application shutdown)."""
+    global _pipeline
+    with _pipeline_lock:
+        pipeline = _pipeline
+        _pipeline = None
+    if pipeline is not None:
+        logging.getLogger().removeHandler(pipeline.handler)
+        pipeline.stop()
+        for handler in pipeline.listener.handlers:
+            logging.getLogger().addHandler(handler)
+
+
 def setup_logging() -> None:
     """Setup application logging configuration"""
     
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
     
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    if settings.log_json:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
     
     # Setup console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -28,7 +172,7 @@ def setup_logging() -> None:
     # Setup root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
-    root_logger.addHandler(console_handler)
+    add_log_handler(console_handler)
     
     # Setup specific loggers
     loggers_config = {
@@ -50,6 +50,8 @@ class Settings(BaseSettings):
     # JWT Token Configuration
     jwt_access_token_expire_minutes: int = 480  # 8 hours (same as development)
     jwt_refresh_token_expire_days: int = 30  # 30 days
+    auth_principal_cache_ttl_seconds: int = 60  # Cache of bearer token -> Campaigner in get_current_user (0 disables)
+    auth_principal_cache_max_entries: int = 10000
 
     # Google OAuth
     google_client_id: Optional[str] = None
@@ -70,6 +72,12 @@ class Settings(BaseSettings):
     # Frontend Configuration
     frontend_url: str = "https://localhost:3000"  # Default for local development
 
+    # WebSocket fan-out across workers/instances
+    websocket_backplane: str = "none"  # none, memory (single process) or postgres (LISTEN/NOTIFY)
+    websocket_backplane_channel: str = "websocket_events"
+    websocket_send_queue_size: int = 100  # Messages queued per socket before it is evicted as a slow consumer
+    websocket_send_timeout_seconds: float = 10.0  # A single send taking longer evicts the socket
+
     # Master Agent Configuration
     master_agent_max_iterations: int = 3
     master_agent_timeout: int = 120
@@ -83,11 +91,38 @@ class Settings(BaseSettings):
 
     # Agent Configuration
     use_database_config: bool = False
+    settings_cache_poll_seconds: float = 5.0  # Max staleness of app_settings reads on other workers (0 checks every read)
+    agent_registry_poll_seconds: float = 5.0  # Max staleness of agent configs on other workers (0 checks every lookup)
 
     # Performance Configuration
-    max_concurrent_analyses: int = 10
+    max_concurrent_analyses: int = 10  # Crew execution pool workers
+    crew_pool_max_queue: int = 100  # Crew jobs waiting beyond this are rejected
+    crew_pool_per_tenant_limit: int = 2  # Concurrent crew runs per campaigner
+    crew_parallel_specialists: bool = False  # Run DialogCX specialists concurrently, then have the master synthesize
+    crew_specialist_concurrency: int = 3  # Specialists run at once per analysis in parallel mode
+    analytics_jobs_durable: bool = False  # Run DialogCX analyses on the durable job queue instead of the in-process pool
+    job_queue_lease_seconds: int = 60  # Jobs whose worker misses heartbeats this long are re-leased
+    job_queue_max_attempts: int = 3
+    job_queue_backoff_base_seconds: float = 10.0  # Retry delay doubles per attempt from here
+    job_queue_backoff_max_seconds: float = 600.0
+    job_worker_concurrency: int = 2  # Jobs run at once by one scripts/run_job_worker.py process
+    job_worker_poll_seconds: float = 2.0
+    token_refresher_enabled: bool = False  # Refresh OAuth tokens in the background (in the job worker) before they expire
+    token_refresher_interval_seconds: int = 60
+    token_refresher_lead_seconds: int = 600  # Refresh connections expiring within this window
+    token_refresher_batch_size: int = 100  # Connections refreshed per scan at most
+    token_refresher_concurrency: int = 5
+    token_refresher_jitter_seconds: float = 10.0  # Random delay before each refresh
+    token_refresher_google_per_minute: int = 120  # Google token endpoint calls (GA4 + Google Ads)
+    token_refresher_facebook_per_minute: int = 30
+    token_refresh_lock_wait_seconds: float = 10.0  # How long a caller waits for another worker's refresh of the same connection
     request_timeout_seconds: int = 30
     metrics_sync_days_back: Optional[int] = None
+    metrics_rollups_enabled: bool = True  # Serve /metrics/aggregated from metrics_rollups when possible
+    metrics_export_batch_size: int = 10000  # Rows per fetch/encode batch in GET /metrics/export
+    access_scope_cache_ttl_seconds: int = 30  # Cache of campaigner -> allowed platforms for metrics routes (0 disables)
+    credential_cache_ttl_seconds: int = 60  # Cache of assembled agent credentials per customer/campaigner (0 disables)
+    connection_lookup_scope_max_age_seconds: float = 5.0  # How long one request reuses loaded connection rows (0 disables reuse)
 
     # GA Property Fetching Configuration
     ga_initial_properties_limit: int = 20  # Properties to return immediately
@@ -96,9 +131,26 @@ class Settings(BaseSettings):
     ga_async_batch_delay: float = 0.5  # Delay between batches (seconds)
     ga_property_cache_ttl: int = 3600  # Cache for 1 hour
 
+    # Chat Traces Retention (monthly partitions of chat_traces)
+    chat_traces_retention_months: int = 24  # Partitions older than this are expired
+    chat_traces_archive_expired: bool = False  # Detach expired partitions instead of dropping them
+    chat_traces_partitions_ahead: int = 3  # Empty future partitions kept ready
+
+    # Langfuse Tracing
+    langfuse_flush_interval_seconds: float = 5.0  # Background flush interval
+
+    # Detailed Execution Logs (batched writes to detailed_execution_logs)
+    detailed_log_batch_size: int = 100  # Buffered entries that trigger an early flush
+    detailed_log_flush_interval_seconds: float = 2.0  # Background flush interval
+    detailed_log_max_buffered: int = 10000  # Per-session buffer bound; extra entries are dropped
+    detailed_log_flush_retries: int = 1  # Times a failed batch is requeued before its entries are given up
+
     # Monitoring
     sentry_dsn: Optional[str] = None
     log_level: str = "INFO"
+    log_async: bool = True  # Write logs from a background thread via a bounded queue
+    log_queue_size: int = 10000  # Records buffered before new ones are dropped
+    log_json: bool = False  # JSON lines on stdout (the log file keeps its pipe format)
 
     class Config:
         env_file = ".env"
@@ -1,18 +1,39 @@
 """
 Unified settings loader that merges environment variables with database settings.
 Database settings override environment variables when present.
+
+Database settings are served from a process-wide snapshot (settings_cache).
+Commits that touch app_settings in this process drop the snapshot; other
+workers notice changes through a cheap version poll (row count and newest
+updated_at) at most every settings_cache_poll_seconds.
 """
 
-from typing import Any, Optional
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
 from functools import lru_cache
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session as OrmSession
 from sqlmodel import Session, select
 import logging
 
+from app.config.cache_registry import cache_stats, register_cache, register_invalidation
 from app.config.settings import Settings, get_settings as get_env_settings
 from app.models.settings import AppSettings
 
 logger = logging.getLogger(__name__)
 
+def _convert_value(value: str, value_type: str) -> Any:
+    """Convert a stored string value to its declared type."""
+    if value_type == "bool":
+        return value.lower() in ("true", "1", "yes", "on")
+    elif value_type == "int":
+        return int(value)
+    elif value_type == "float":
+        return float(value)
+    return value
+
 
 class UnifiedSettings:
     """
@@ -26,13 +47,7 @@ class UnifiedSettings:
 
     def _convert_value(self, value: str, value_type: str) -> Any:
         """Convert string value to appropriate type."""
-        if value_type == "bool":
-            return value.lower() in ("true", "1", "yes", "on")
-        elif value_type == "int":
-            return int(value)
-        elif value_type == "float":
-            return float(value)
-        return value
+        return _convert_value(value, value_type)
 
     def __getattr__(self, name: str) -> Any:
         """
@@ -58,21 +73,122 @@ class UnifiedSettings:
             return default
 
 
+class SettingsCache:
+    """
+    Process-wide snapshot of app_settings as {key: (value, value_type)}.
+
+    Reads within the poll interval are dictionary lookups. After that, one
+    version query decides whether the snapshot is still current; the full
+    table is only reloaded when the version changed or the snapshot was
+    invalidated by a local commit.
+    """
+
+    def __init__(self, poll_seconds: Optional[float] = None):
+        self.poll_seconds = poll_seconds
+        self._values: Optional[Dict[str, Tuple[str, str]]] = None
+        self._version: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.invalidations = 0
+
+    def _poll_interval(self) -> float:
+        return self.poll_seconds if self.poll_seconds is not None else get_env_settings().settings_cache_poll_seconds
+
+    @staticmethod
+    def _read_version(session: Session) -> tuple:
+        count, newest = session.exec(
+            select(func.count(AppSettings.id), func.max(AppSettings.updated_at))
+        ).one()
+        return (count, newest)
+
+    def snapshot(self, session: Optional[Session] = None) -> Dict[str, Tuple[str, str]]:
+        """
+        Return the current settings snapshot (do not mutate it).
+
+        Args:
+            session: Session used for the version check/reload; a short-lived
+                one is opened when omitted and the snapshot is stale
+        """
+        with self._lock:
+            if self._values is not None and time.monotonic() - self._checked_at < self._poll_interval():
+                self.hits += 1
+                return self._values
+
+        if session is None:
+            from app.config.database import get_session
+
+            with get_session() as own_session:
+                return self._refresh(own_session)
+        return self._refresh(session)
+
+    def _refresh(self, session: Session) -> Dict[str, Tuple[str, str]]:
+        with self._lock:
+            generation = self._generation
+            current = self._values
+
+        version = self._read_version(session)
+        with self._lock:
+            self.version_checks += 1
+            if current is not None and version == self._version and generation == self._generation:
+                self._checked_at = time.monotonic()
+                self.hits += 1
+                return current
+
+        values = {
+            setting.key: (setting.value, setting.value_type)
+            for setting in session.exec(select(AppSettings)).all()
+        }
+        with self._lock:
+            self.misses += 1
+            # An invalidation during the load means the rows may already be stale
+            if generation == self._generation:
+                self._values = values
+                self._version = version
+                self._checked_at = time.monotonic()
+        logger.debug(f"📊 Loaded {len(values)} settings from database")
+        return values
+
+    def get(self, key: str, default: Any = None, session: Optional[Session] = None) -> Any:
+        """Typed value of a database setting, else the environment setting, else default."""
+        values = self.snapshot(session)
+        if key in values:
+            return _convert_value(*values[key])
+
+        env_settings = get_env_settings()
+        if hasattr(env_settings, key):
+            return getattr(env_settings, key)
+        return default
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next read reloads it."""
+        with self._lock:
+            self._values = None
+            self._version = None
+            self._generation += 1
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return cache_stats(
+                len(self._values) if self._values is not None else 0, self.hits, self.misses,
+                version_checks=self.version_checks, invalidations=self.invalidations,
+            )
+
+
+settings_cache = register_cache("settings", SettingsCache())
+
+
 def load_db_settings(session: Session) -> dict:
     """Load all settings from database into a dictionary."""
-    db_settings = {}
     try:
-        stmt = select(AppSettings)
-        settings = session.exec(stmt).all()
-
-        for setting in settings:
-            db_settings[setting.key] = (setting.value, setting.value_type)
-
-        logger.debug(f"📊 Loaded {len(db_settings)} settings from database")
+        return dict(settings_cache.snapshot(session))
     except Exception as e:
         logger.warning(f"⚠️  Failed to load database settings: {str(e)}")
-
-    return db_settings
+        return {}
 
 
 def get_unified_settings(session: Session) -> UnifiedSettings:
@@ -104,35 +220,14 @@ def get_setting_value(session: Session, key: str, default: Any = None) -> Any:
     Returns:
         Setting value or default
     """
-    # Try database first
-    stmt = select(AppSettings).where(AppSettings.key == key)
-    setting = session.exec(stmt).first()
-
-    if setting:
-        # Convert value based on type
-        if setting.value_type == "bool":
-            return setting.value.lower() in ("true", "1", "yes", "on")
-        elif setting.value_type == "int":
-            return int(setting.value)
-        elif setting.value_type == "float":
-            return float(setting.value)
-        return setting.value
-
-    # Fall back to environment settings
-    env_settings = get_env_settings()
-    if hasattr(env_settings, key):
-        return getattr(env_settings, key)
-
-    return default
+    return settings_cache.get(key, default, session=session)
 
 
 def get_setting_value_simple(key: str, default: Any = None) -> Any:
     """
     Get a single setting value from database or environment.
-    Creates its own database session.
-
-    WARNING: This creates a new database session on each call.
-    For multiple settings, use get_unified_settings() or get_setting_value() with a shared session.
+    Served from settings_cache; a database session is only opened when the
+    snapshot needs a version check or reload.
 
     Args:
         key: Setting key
@@ -142,10 +237,7 @@ def get_setting_value_simple(key: str, default: Any = None) -> Any:
         Setting value or default
     """
     try:
-        from app.config.database import get_session
-
-        with get_session() as session:
-            return get_setting_value(session, key, default)
+        return settings_cache.get(key, default)
     except Exception as e:
         logger.warning(f"⚠️  Failed to get setting '{key}' from database: {str(e)}")
         # Fall back to environment settings
@@ -153,3 +245,23 @@ def get_setting_value_simple(key: str, default: Any = None) -> Any:
         if hasattr(env_settings, key):
             return getattr(env_settings, key)
         return default
+
+
+# ---------------------------------------------------------------------------
+# Session hooks: keep updated_at current and drop the snapshot on commit
+# ---------------------------------------------------------------------------
+
+@event.listens_for(OrmSession, "before_flush")
+def _touch_updated_settings(session: OrmSession, flush_context, instances) -> None:
+    # updated_at feeds the version poll other workers run
+    for obj in session.dirty:
+        if isinstance(obj, AppSettings) and session.is_modified(obj):
+            obj.updated_at = datetime.now(timezone.utc)
+
+
+def _invalidate_on_commit(_changes) -> None:
+    settings_cache.invalidate()
+    logger.debug("🔄 Settings cache invalidated after app_settings change")
+
+
+register_invalidation("settings", (AppSettings,), after_commit=_invalidate_on_commit)
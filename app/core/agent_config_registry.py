@@ -0,0 +1,175 @@
+"""
+Process-wide registry of agent configurations.
+
+Agent configs are read on every DialogCX analysis and every new chat
+workflow but change rarely. The registry keeps all agent_configs rows as
+prebuilt dictionaries (JSON fields decoded, datetimes serialized) indexed by
+name and ID. Writes through DatabaseManager invalidate it immediately; other
+workers notice changes through a version poll (row count and newest
+updated_at) at most every agent_registry_poll_seconds.
+"""
+
+import copy
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.config.cache_registry import cache_stats, register_cache
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+
+logger = get_logger("agent_registry")
+
+
+def agent_config_to_dict(agent_config) -> Dict[str, Any]:
+    """Convert an AgentConfig row to the dictionary served to callers"""
+    return {
+        "id": agent_config.id,
+        "name": agent_config.name,
+        "role": agent_config.role,
+        "goal": agent_config.goal,
+        "backstory": agent_config.backstory,
+        "task": getattr(agent_config, 'task', ''),
+        "capabilities": json.loads(agent_config.capabilities) if agent_config.capabilities else {},
+        "tools": json.loads(agent_config.tools) if agent_config.tools else [],
+        "max_iterations": agent_config.max_iterations,
+        "allow_delegation": getattr(agent_config, 'allow_delegation', False),
+        "verbose": getattr(agent_config, 'verbose', True),
+        "is_active": agent_config.is_active,
+        "created_at": agent_config.created_at.isoformat() if agent_config.created_at else None,
+        "updated_at": agent_config.updated_at.isoformat() if agent_config.updated_at else None
+    }
+
+
+@dataclass
+class AgentRegistrySnapshot:
+    """All agent configs at one version; never mutated after it is built."""
+    by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    by_id: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    active: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class AgentConfigRegistry:
+    """
+    Versioned in-memory cache of agent_configs.
+
+    Lookups return deep copies, so callers may modify what they get without
+    affecting the registry.
+    """
+
+    def __init__(self, poll_seconds: Optional[float] = None):
+        self.poll_seconds = poll_seconds
+        self._snapshot: Optional[AgentRegistrySnapshot] = None
+        self._version: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.version_checks = 0
+        self.invalidations = 0
+
+    def _poll_interval(self) -> float:
+        return self.poll_seconds if self.poll_seconds is not None else get_settings().agent_registry_poll_seconds
+
+    @staticmethod
+    def _read_version(session: Session) -> tuple:
+        from app.models.agents import AgentConfig
+
+        count, newest = session.exec(
+            select(func.count(AgentConfig.id), func.max(AgentConfig.updated_at))
+        ).one()
+        return (count, newest)
+
+    def snapshot(self, session: Optional[Session] = None) -> AgentRegistrySnapshot:
+        """
+        Return the current snapshot (do not mutate it).
+
+        Args:
+            session: Session used for the version check/reload; a short-lived
+                one is opened when omitted and the snapshot is stale
+        """
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self._poll_interval():
+                self.hits += 1
+                return self._snapshot
+
+        if session is None:
+            from app.config.database import get_session
+
+            with get_session() as own_session:
+                return self._refresh(own_session)
+        return self._refresh(session)
+
+    def _refresh(self, session: Session) -> AgentRegistrySnapshot:
+        from app.models.agents import AgentConfig
+
+        with self._lock:
+            generation = self._generation
+            current = self._snapshot
+
+        version = self._read_version(session)
+        with self._lock:
+            self.version_checks += 1
+            if current is not None and version == self._version and generation == self._generation:
+                self._checked_at = time.monotonic()
+                self.hits += 1
+                return current
+
+        snapshot = AgentRegistrySnapshot()
+        for config in session.exec(select(AgentConfig).order_by(AgentConfig.id)).all():
+            agent = agent_config_to_dict(config)
+            snapshot.by_name[agent["name"]] = agent
+            snapshot.by_id[agent["id"]] = agent
+            if agent["is_active"]:
+                snapshot.active.append(agent)
+
+        with self._lock:
+            self.misses += 1
+            # An invalidation during the load means the rows may already be stale
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._version = version
+                self._checked_at = time.monotonic()
+        logger.debug(f"🤖 Loaded {len(snapshot.by_name)} agent configs into the registry")
+        return snapshot
+
+    def get_by_name(self, name: str, include_inactive: bool = False,
+                    session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+        agent = self.snapshot(session).by_name.get(name)
+        if agent is None or (not include_inactive and not agent["is_active"]):
+            return None
+        return copy.deepcopy(agent)
+
+    def get_by_id(self, agent_id: int, include_inactive: bool = False,
+                  session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+        agent = self.snapshot(session).by_id.get(agent_id)
+        if agent is None or (not include_inactive and not agent["is_active"]):
+            return None
+        return copy.deepcopy(agent)
+
+    def list_active(self, session: Optional[Session] = None) -> List[Dict[str, Any]]:
+        return copy.deepcopy(self.snapshot(session).active)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next lookup reloads it."""
+        with self._lock:
+            self._snapshot = None
+            self._version = None
+            self._generation += 1
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return cache_stats(
+                len(self._snapshot.by_name) if self._snapshot is not None else 0, self.hits, self.misses,
+                version_checks=self.version_checks, invalidations=self.invalidations,
+            )
+
+
+agent_config_registry = register_cache("agents", AgentConfigRegistry())
@@ -0,0 +1,83 @@
+"""
+Short-lived cache of assembled agent credentials.
+
+CustomerCredentialManager.fetch_all_credentials runs for every analytics
+request. The cache keeps its result per (customer, campaigner) together with
+a fingerprint of the rows it was built from: asset IDs and update times, and
+each connection's ID, token_hash and rotated_at. A token refresh changes
+token_hash, a revocation removes the connection from the lookup, and either
+way the fingerprint no longer matches, so the entry is replaced instead of
+served.
+
+Entries are encrypted with a key generated for this process only, so
+plaintext tokens never sit in the cache and a memory dump or pickled cache
+is useless outside the process.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from cryptography.fernet import Fernet
+
+from app.config.cache_registry import cache_stats, register_cache
+from app.config.settings import get_settings
+
+
+class CredentialCache:
+    """TTL cache of fetch_all_credentials results, keyed by (customer_id, campaigner_id)."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cipher = Fernet(Fernet.generate_key())
+        self._entries: Dict[tuple, Tuple[float, tuple, bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _ttl(self) -> float:
+        return self.ttl_seconds if self.ttl_seconds is not None else get_settings().credential_cache_ttl_seconds
+
+    def get(self, customer_id: int, campaigner_id: int, fingerprint: tuple) -> Optional[Dict[str, Any]]:
+        """Return the cached credentials if they were built from the same rows and are still fresh."""
+        key = (customer_id, campaigner_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic() or entry[1] != fingerprint:
+                # Expired, or tokens were rotated/revoked since: drop the old tokens right away
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            token = entry[2]
+        return json.loads(self._cipher.decrypt(token))
+
+    def put(self, customer_id: int, campaigner_id: int, fingerprint: tuple, credentials: Dict[str, Any]) -> None:
+        ttl = self._ttl()
+        if ttl <= 0:
+            return
+        token = self._cipher.encrypt(json.dumps(credentials).encode())
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[(customer_id, campaigner_id)] = (time.monotonic() + ttl, fingerprint, token)
+
+    def invalidate(self, customer_id: Optional[int] = None) -> None:
+        """Drop one customer's entries, or everything when no customer is given."""
+        with self._lock:
+            if customer_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == customer_id]:
+                    del self._entries[key]
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return cache_stats(len(self._entries), self.hits, self.misses, invalidations=self.invalidations)
+
+
+credential_cache = register_cache("credentials", CredentialCache())
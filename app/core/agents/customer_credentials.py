@@ -1,10 +1,12 @@
 """Customer credential management for agents."""
 
 from typing import Dict, Any, List, Optional
+import json
 import logging
 import os
-from sqlmodel import select
+from sqlmodel import select, and_
 from app.config.database import get_session
+from app.core.agents.credential_cache import credential_cache
 from app.models.analytics import DigitalAsset, Connection, AssetType
 from app.services.google_ads_service import GoogleAdsService
 from app.services.facebook_service import FacebookService
@@ -41,23 +43,7 @@ class CustomerCredentialManager:
                     )
                 ).all()
 
-                # Extract unique platforms from asset_type and provider
-                platform_set = set()
-                for asset in digital_assets:
-                    asset_type_str = asset.asset_type.value if hasattr(asset.asset_type, 'value') else str(asset.asset_type)
-                    # provider = asset.provider.lower() if asset.provider else ""
-
-                    # Map asset types to platforms
-                    if asset_type_str.upper() in ["GOOGLE_ADS", "GOOGLE_ADS_CAPS"]:
-                        platform_set.add("google_ads")
-                    elif asset_type_str.upper() in ["GA4", "GOOGLE_ANALYTICS", "GOOGLE_ANALYTICS_CAPS"]:
-                        platform_set.add("google_analytics")
-                    elif asset_type_str.upper() in ["FACEBOOK_ADS", "FACEBOOK_ADS_CAPS"]: # or "facebook" in provider or "meta" in provider:
-                        platform_set.add("facebook_ads")
-                    else:
-                        logger.warning(f"⚠️  [CredentialManager] Unknown asset type '{asset_type_str}' for customer {customer_id}")
-
-                platforms = list(platform_set)
+                platforms = self._platforms_for_assets(digital_assets, customer_id)
                 logger.info(f"📊 [CredentialManager] Customer {customer_id} platforms: {platforms}")
 
         except Exception as e:
@@ -66,6 +52,27 @@ class CustomerCredentialManager:
 
         return platforms
 
+    @staticmethod
+    def _platforms_for_assets(digital_assets: List[DigitalAsset], customer_id: int) -> List[str]:
+        """Map digital assets to unique platform names."""
+        # Extract unique platforms from asset_type and provider
+        platform_set = set()
+        for asset in digital_assets:
+            asset_type_str = asset.asset_type.value if hasattr(asset.asset_type, 'value') else str(asset.asset_type)
+            # provider = asset.provider.lower() if asset.provider else ""
+
+            # Map asset types to platforms
+            if asset_type_str.upper() in ["GOOGLE_ADS", "GOOGLE_ADS_CAPS"]:
+                platform_set.add("google_ads")
+            elif asset_type_str.upper() in ["GA4", "GOOGLE_ANALYTICS", "GOOGLE_ANALYTICS_CAPS"]:
+                platform_set.add("google_analytics")
+            elif asset_type_str.upper() in ["FACEBOOK_ADS", "FACEBOOK_ADS_CAPS"]: # or "facebook" in provider or "meta" in provider:
+                platform_set.add("facebook_ads")
+            else:
+                logger.warning(f"⚠️  [CredentialManager] Unknown asset type '{asset_type_str}' for customer {customer_id}")
+
+        return list(platform_set)
+
     def fetch_google_analytics_credentials(self, customer_id: int, campaigner_id: int) -> Optional[Dict[str, str]]:
         """Fetch customer's Google Analytics refresh token and property ID.
 
@@ -99,48 +106,7 @@ class CustomerCredentialManager:
                     session=session
                 )
 
-                if not connection or not connection.refresh_token_enc:
-                    logger.warning(f"⚠️  [CredentialManager] No active connection for GA4 asset")
-                    return None
-
-                # Decrypt the tokens
-                try:
-                    refresh_token = self.google_ads_service._decrypt_token(connection.refresh_token_enc)
-                except Exception as decrypt_error:
-                    logger.warning(f"⚠️  [CredentialManager] Failed to decrypt refresh_token: {decrypt_error}")
-                    return None
-
-                access_token = None
-                if connection.access_token_enc:
-                    try:
-                        access_token = self.google_ads_service._decrypt_token(connection.access_token_enc)
-                    except Exception as decrypt_error:
-                        logger.warning(f"⚠️  [CredentialManager] Failed to decrypt access_token: {decrypt_error}")
-                        access_token = None
-
-                # Extract property_id from digital asset meta field
-                property_id = ga_asset.meta.get("property_id") if ga_asset.meta else None
-
-                if not property_id:
-                    logger.warning(f"⚠️  [CredentialManager] No property_id in GA4 asset meta")
-                    return None
-
-                # Get OAuth client credentials from environment
-                client_id = os.getenv("GOOGLE_CLIENT_ID")
-                client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-
-                if not client_id or not client_secret:
-                    logger.warning(f"⚠️  [CredentialManager] Missing GOOGLE_CLIENT_ID or GOOGLE_CLIENT_SECRET")
-
-                logger.info(f"✅ [CredentialManager] Found GA4 credentials, property: {property_id}")
-
-                return {
-                    "refresh_token": refresh_token,
-                    "property_id": property_id,
-                    "access_token": access_token,
-                    "client_id": client_id,
-                    "client_secret": client_secret
-                }
+                return self._build_google_analytics_credentials(ga_asset, connection, customer_id, campaigner_id)
 
         except Exception as e:
             logger.warning(f"⚠️  [CredentialManager] Failed to fetch GA credentials: {e}")
@@ -182,41 +148,7 @@ class CustomerCredentialManager:
                     session=session
                 )
 
-                if not connection or not connection.refresh_token_enc:
-                    logger.warning(f"⚠️  [CredentialManager] No active connection for Google Ads asset")
-                    return None
-
-                # Decrypt the tokens
-                try:
-                    refresh_token = self.google_ads_service._decrypt_token(connection.refresh_token_enc)
-                except Exception as decrypt_error:
-                    logger.warning(f"⚠️  [CredentialManager] Failed to decrypt refresh_token: {decrypt_error}")
-                    return None
-
-                # Extract account_id from digital asset meta field
-                gads_account_id = gads_asset.meta.get("account_id") if gads_asset.meta else None
-
-                if not gads_account_id:
-                    logger.warning(f"⚠️  [CredentialManager] No account_id in Google Ads asset meta : {gads_asset.meta}")
-                    return None
-
-                # Get OAuth client credentials from environment
-                client_id = os.getenv("GOOGLE_CLIENT_ID")
-                client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
-                developer_token = os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN")
-
-                if not client_id or not client_secret or not developer_token:
-                    logger.warning(f"⚠️  [CredentialManager] Missing Google Ads environment credentials")
-
-                logger.info(f"✅ [CredentialManager] Found Google Ads credentials, account: {gads_account_id}")
-
-                return {
-                    "refresh_token": refresh_token,
-                    "account_id": gads_account_id,
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "developer_token": developer_token
-                }
+                return self._build_google_ads_credentials(gads_asset, connection, customer_id, campaigner_id)
 
         except Exception as e:
             logger.warning(f"⚠️  [CredentialManager] Failed to fetch Google Ads credentials: {e}")
@@ -258,35 +190,7 @@ class CustomerCredentialManager:
                     session=session
                 )
 
-                if not connection or not connection.access_token_enc:
-                    logger.warning(f"⚠️  [CredentialManager] No active connection for Facebook Ads asset")
-                    logger.debug(f"digital_asset_id: {fb_asset.id}, customer_id: {customer_id}, campaigner_id: {campaigner_id} could not get: {'connection' if not connection else 'access_token'}")
-                    return None
-
-                # Decrypt the access token
-                access_token = None
-                try:
-                    access_token = self.facebook_ads_service._decrypt_token(connection.access_token_enc)
-                except Exception as decrypt_error:
-                    logger.warning(f"⚠️  [CredentialManager] Failed to decrypt access_token: {decrypt_error}")
-                    return None
-
-                # Extract ad_account_id from digital asset meta field
-                ad_account_id = fb_asset.meta.get("ad_account_id") if fb_asset.meta else None
-
-                if not ad_account_id:
-                    logger.warning(f"⚠️  [CredentialManager] No ad_account_id in Facebook Ads asset meta")
-                    return None
-
-                logger.info(f"✅ [CredentialManager] Found Facebook Ads credentials, account: {ad_account_id}")
-                # from app.services.campaign_sync_service import CampaignSyncService
-                # sync_service = CampaignSyncService()
-                # res = sync_service.fetch_facebook_campaign_metrics(campaign_id, connection, fb_asset)
-                # logger.info(f"✅ [CredentialManager] RES: {res}")
-                return {
-                    "access_token": access_token,
-                    "ad_account_id": ad_account_id
-                }
+                return self._build_meta_ads_credentials(fb_asset, connection, customer_id, campaigner_id)
 
         except Exception as e:
             logger.warning(f"⚠️  [CredentialManager] Failed to fetch Facebook Ads credentials: {e}")
@@ -295,9 +199,131 @@ class CustomerCredentialManager:
 
         return None
 
+    def _build_google_analytics_credentials(self, ga_asset: DigitalAsset, connection: Optional[Connection],
+                                            customer_id: int, campaigner_id: int) -> Optional[Dict[str, Any]]:
+        """Build GA credentials from a GA4 asset and its active connection."""
+        if not connection or not connection.refresh_token_enc:
+            logger.warning(f"⚠️  [CredentialManager] No active connection for GA4 asset")
+            return None
+
+        # Decrypt the tokens
+        try:
+            refresh_token = self.google_ads_service._decrypt_token(connection.refresh_token_enc)
+        except Exception as decrypt_error:
+            logger.warning(f"⚠️  [CredentialManager] Failed to decrypt refresh_token: {decrypt_error}")
+            return None
+
+        access_token = None
+        if connection.access_token_enc:
+            try:
+                access_token = self.google_ads_service._decrypt_token(connection.access_token_enc)
+            except Exception as decrypt_error:
+                logger.warning(f"⚠️  [CredentialManager] Failed to decrypt access_token: {decrypt_error}")
+                access_token = None
+
+        # Extract property_id from digital asset meta field
+        property_id = ga_asset.meta.get("property_id") if ga_asset.meta else None
+
+        if not property_id:
+            logger.warning(f"⚠️  [CredentialManager] No property_id in GA4 asset meta")
+            return None
+
+        # Get OAuth client credentials from environment
+        client_id = os.getenv("GOOGLE_CLIENT_ID")
+        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+
+        if not client_id or not client_secret:
+            logger.warning(f"⚠️  [CredentialManager] Missing GOOGLE_CLIENT_ID or GOOGLE_CLIENT_SECRET")
+
+        logger.info(f"✅ [CredentialManager] Found GA4 credentials, property: {property_id}")
+
+        return {
+            "refresh_token": refresh_token,
+            "property_id": property_id,
+            "access_token": access_token,
+            "client_id": client_id,
+            "client_secret": client_secret
+        }
+
+    def _build_google_ads_credentials(self, gads_asset: DigitalAsset, connection: Optional[Connection],
+                                      customer_id: int, campaigner_id: int) -> Optional[Dict[str, Any]]:
+        """Build Google Ads credentials from a Google Ads asset and its active connection."""
+        if not connection or not connection.refresh_token_enc:
+            logger.warning(f"⚠️  [CredentialManager] No active connection for Google Ads asset")
+            return None
+
+        # Decrypt the tokens
+        try:
+            refresh_token = self.google_ads_service._decrypt_token(connection.refresh_token_enc)
+        except Exception as decrypt_error:
+            logger.warning(f"⚠️  [CredentialManager] Failed to decrypt refresh_token: {decrypt_error}")
+            return None
+
+        # Extract account_id from digital asset meta field
+        gads_account_id = gads_asset.meta.get("account_id") if gads_asset.meta else None
+
+        if not gads_account_id:
+            logger.warning(f"⚠️  [CredentialManager] No account_id in Google Ads asset meta : {gads_asset.meta}")
+            return None
+
+        # Get OAuth client credentials from environment
+        client_id = os.getenv("GOOGLE_CLIENT_ID")
+        client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
+        developer_token = os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN")
+
+        if not client_id or not client_secret or not developer_token:
+            logger.warning(f"⚠️  [CredentialManager] Missing Google Ads environment credentials")
+
+        logger.info(f"✅ [CredentialManager] Found Google Ads credentials, account: {gads_account_id}")
+
+        return {
+            "refresh_token": refresh_token,
+            "account_id": gads_account_id,
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "developer_token": developer_token
+        }
+
+    def _build_meta_ads_credentials(self, fb_asset: DigitalAsset, connection: Optional[Connection],
+                                    customer_id: int, campaigner_id: int) -> Optional[Dict[str, Any]]:
+        """Build Meta Ads credentials from a Facebook Ads asset and its active connection."""
+        if not connection or not connection.access_token_enc:
+            logger.warning(f"⚠️  [CredentialManager] No active connection for Facebook Ads asset")
+            logger.debug(f"digital_asset_id: {fb_asset.id}, customer_id: {customer_id}, campaigner_id: {campaigner_id} could not get: {'connection' if not connection else 'access_token'}")
+            return None
+
+        # Decrypt the access token
+        access_token = None
+        try:
+            access_token = self.facebook_ads_service._decrypt_token(connection.access_token_enc)
+        except Exception as decrypt_error:
+            logger.warning(f"⚠️  [CredentialManager] Failed to decrypt access_token: {decrypt_error}")
+            return None
+
+        # Extract ad_account_id from digital asset meta field
+        ad_account_id = fb_asset.meta.get("ad_account_id") if fb_asset.meta else None
+
+        if not ad_account_id:
+            logger.warning(f"⚠️  [CredentialManager] No ad_account_id in Facebook Ads asset meta")
+            return None
+
+        logger.info(f"✅ [CredentialManager] Found Facebook Ads credentials, account: {ad_account_id}")
+        # from app.services.campaign_sync_service import CampaignSyncService
+        # sync_service = CampaignSyncService()
+        # res = sync_service.fetch_facebook_campaign_metrics(campaign_id, connection, fb_asset)
+        # logger.info(f"✅ [CredentialManager] RES: {res}")
+        return {
+            "access_token": access_token,
+            "ad_account_id": ad_account_id
+        }
+
     def fetch_all_credentials(self, customer_id: int, campaigner_id: int) -> Dict[str, Any]:
         """Fetch all credentials for a customer.
 
+        Loads the customer's active assets and this campaigner's active
+        connections in one query. Tokens are decrypted only when the rows
+        differ from the cached result (see credential_cache).
+
         Args:
             customer_id: Customer ID
             campaigner_id: Campaigner ID
@@ -305,22 +331,85 @@ class CustomerCredentialManager:
         Returns:
             Dictionary with platforms and all credentials
         """
-        platforms = self.fetch_customer_platforms(customer_id)
-
         credentials = {
-            "platforms": platforms,
+            "platforms": [],
             "google_analytics": None,
             "google_ads": None,
             "meta_ads": None
         }
+        failed = False
 
-        if "google_analytics" in platforms:
-            credentials["google_analytics"] = self.fetch_google_analytics_credentials(customer_id, campaigner_id)
-        if "google_ads" in platforms:
-            credentials["google_ads"] = self.fetch_google_ads_credentials(customer_id, campaigner_id)
-        if "facebook_ads" in platforms:
-            credentials["meta_ads"] = self.fetch_meta_ads_credentials(customer_id, campaigner_id)
+        try:
+            with get_session() as session:
+                rows = session.exec(
+                    select(DigitalAsset, Connection)
+                    .outerjoin(Connection, and_(
+                        Connection.digital_asset_id == DigitalAsset.id,
+                        Connection.customer_id == customer_id,
+                        Connection.campaigner_id == campaigner_id,
+                        Connection.revoked != True
+                    ))
+                    .where(
+                        DigitalAsset.customer_id == customer_id,
+                        DigitalAsset.is_active == True
+                    )
+                    .order_by(DigitalAsset.id, Connection.id)
+                ).all()
+
+                # First connection per asset, in asset order (as the per-platform lookups take .first())
+                assets: List[DigitalAsset] = []
+                connections: Dict[int, Optional[Connection]] = {}
+                for asset, connection in rows:
+                    if asset.id not in connections:
+                        assets.append(asset)
+                        connections[asset.id] = connection
+
+                # Changes whenever tokens are refreshed/rotated, a connection is
+                # revoked or an asset's account/property selection changes
+                fingerprint = []
+                for asset in assets:
+                    connection = connections[asset.id]
+                    fingerprint.append((
+                        asset.id,
+                        json.dumps(asset.meta, sort_keys=True, default=str),
+                        connection.id if connection else None,
+                        connection.token_hash if connection else None,
+                        connection.rotated_at.isoformat() if connection and connection.rotated_at else None
+                    ))
+                fingerprint = tuple(fingerprint)
+                cached = credential_cache.get(customer_id, campaigner_id, fingerprint)
+                if cached is not None:
+                    logger.debug(f"📦 [CredentialManager] Using cached credentials for customer {customer_id}")
+                    return cached
+
+                credentials["platforms"] = self._platforms_for_assets(assets, customer_id)
+                logger.info(f"📊 [CredentialManager] Customer {customer_id} platforms: {credentials['platforms']}")
+
+                builders = [
+                    ("google_analytics", "google_analytics", AssetType.GA4, self._build_google_analytics_credentials),
+                    ("google_ads", "google_ads", AssetType.GOOGLE_ADS, self._build_google_ads_credentials),
+                    ("facebook_ads", "meta_ads", AssetType.FACEBOOK_ADS, self._build_meta_ads_credentials),
+                ]
+                for platform, credential_key, asset_type, build in builders:
+                    if platform not in credentials["platforms"]:
+                        continue
+                    asset = next((asset for asset in assets if asset.asset_type == asset_type), None)
+                    if asset is None:
+                        logger.warning(f"⚠️  [CredentialManager] No {asset_type.value} asset found for customer {customer_id}")
+                        continue
+                    try:
+                        credentials[credential_key] = build(asset, connections[asset.id], customer_id, campaigner_id)
+                    except Exception as e:
+                        logger.warning(f"⚠️  [CredentialManager] Failed to build {platform} credentials: {e}")
+                        failed = True
+
+        except Exception as e:
+            logger.warning(f"⚠️  [CredentialManager] Failed to fetch credentials for customer {customer_id}: {e}")
+            return credentials
 
+        # Don't pin an unexpected failure for the whole TTL
+        if not failed:
+            credential_cache.put(customer_id, campaigner_id, fingerprint, credentials)
         return credentials
 
 
@@ -2,8 +2,12 @@
 Authentication utilities for JWT tokens and Google OAuth
 """
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
@@ -11,6 +15,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from google.auth.transport import requests
 from google.oauth2 import id_token
 from sqlmodel import select
+from app.config.cache_registry import cache_stats, register_cache, register_invalidation
 from app.config.settings import get_settings
 from app.models.users import Campaigner, CampaignerSession
 from app.config.database import get_session
@@ -46,6 +51,100 @@ class AuthenticationError(HTTPException):
         )
 
 
+class PrincipalCache:
+    """
+    Short-TTL, size-bounded cache of authenticated principals.
+
+    Keyed by a SHA-256 of the bearer token, so a hit skips both JWT decoding
+    and the Campaigner lookup. Entries never outlive the token's exp claim.
+    Cached Campaigner objects are detached and must be treated as read-only.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # token hash -> (expires_at monotonic, campaigner)
+        self._entries: "OrderedDict[str, Tuple[float, Campaigner]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Campaigner]:
+        key = self.token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user: Campaigner, token_exp: Optional[int] = None) -> None:
+        ttl = self.ttl_seconds if self.ttl_seconds is not None else settings.auth_principal_cache_ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        max_entries = self.max_entries or settings.auth_principal_cache_max_entries
+        with self._lock:
+            self._entries[self.token_key(token)] = (time.monotonic() + ttl, user)
+            self._entries.move_to_end(self.token_key(token))
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(self.token_key(token), None)
+
+    def invalidate_campaigner(self, campaigner_id: int) -> None:
+        """Drop every cached token of one campaigner."""
+        with self._lock:
+            for key in [k for k, (_, user) in self._entries.items() if user.id == campaigner_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self) -> None:
+        """Drop every cached principal."""
+        self.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return cache_stats(len(self._entries), self.hits, self.misses, evictions=self.evictions)
+
+
+principal_cache = register_cache("principal", PrincipalCache())
+
+
+def get_principal_cache_stats() -> Dict[str, Any]:
+    """Hit rate and size of the authenticated principal cache"""
+    return principal_cache.get_stats()
+
+
+def _invalidate_changed_principals(campaigner_ids) -> None:
+    for campaigner_id in campaigner_ids:
+        principal_cache.invalidate_campaigner(campaigner_id)
+
+
+# Committed changes to a campaigner (role, status, deletion) drop their cached tokens
+register_invalidation(
+    "principal", (Campaigner,),
+    collect=lambda campaigner: (campaigner.id,) if campaigner.id is not None else (),
+    after_commit=_invalidate_changed_principals,
+)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -128,6 +227,11 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     """Get current authenticated user from JWT token"""
 
     try:
+        # Hot path: token already verified and its campaigner loaded recently
+        cached_user = principal_cache.get(credentials.credentials)
+        if cached_user is not None and cached_user.status == "active":
+            return cached_user
+
         print(f"DEBUG: Validating token: {credentials.credentials[:20]}...")
         # Verify the access token
         payload = verify_token(credentials.credentials, "access")
@@ -171,6 +275,7 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             print(f"DEBUG: Campaigner {campaigner_id} status is not active: {user.status}")
             raise AuthenticationError("Campaigner account is not active")
 
+        principal_cache.put(credentials.credentials, user, payload.get("exp"))
         return user
     
     except JWTError as e:
@@ -230,6 +335,8 @@ def revoke_user_session(session_token: str) -> bool:
             session.revoked_at = datetime.now(timezone.utc)
             db_session.add(session)
             db_session.commit()
+            principal_cache.invalidate_token(session.access_token)
+            principal_cache.invalidate_campaigner(session.campaigner_id)
             return True
 
     return False
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
 from sqlmodel import Session, select
 from app.config.database import get_session
+from app.core.agent_config_registry import agent_config_registry, agent_config_to_dict
 from app.core.exceptions import DatabaseException
 from app.config.logging import get_logger
 
@@ -22,20 +23,9 @@ class DatabaseManager:
     # Agent Configuration Management
     #TODO: Remove, duplicate of get_agent_config_by_name
     def get_agent_config(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get agent configuration by name"""
+        """Get active agent configuration by name (served from the agent registry)"""
         try:
-            with self.get_session() as session:
-                from app.models.agents import AgentConfig
-                
-                statement = select(AgentConfig).where(
-                    AgentConfig.name == name,
-                    AgentConfig.is_active == True
-                )
-                agent_config = session.exec(statement).first()
-                
-                if agent_config:
-                    return self._agent_config_to_dict(agent_config)
-                return None
+            return agent_config_registry.get_by_name(name)
                 
         except Exception as e:
             logger.error(f"Failed to get agent config for {name}: {str(e)}")
@@ -44,22 +34,7 @@ class DatabaseManager:
     def get_agent_config_by_id(self, agent_id: int, include_inactive: bool = False) -> Optional[Dict[str, Any]]:
         """Get agent configuration by ID, optionally including inactive agents"""
         try:
-            with self.get_session() as session:
-                from app.models.agents import AgentConfig
-
-                if include_inactive:
-                    statement = select(AgentConfig).where(AgentConfig.id == agent_id)
-                else:
-                    statement = select(AgentConfig).where(
-                        AgentConfig.id == agent_id,
-                        AgentConfig.is_active == True
-                    )
-
-                agent_config = session.exec(statement).first()
-
-                if agent_config:
-                    return self._agent_config_to_dict(agent_config)
-                return None
+            return agent_config_registry.get_by_id(agent_id, include_inactive=include_inactive)
 
         except Exception as e:
             logger.error(f"Failed to get agent config for ID {agent_id}: {str(e)}")
@@ -68,22 +43,7 @@ class DatabaseManager:
     def get_agent_config_by_name(self, name: str, include_inactive: bool = False) -> Optional[Dict[str, Any]]:
         """Get agent configuration by name, optionally including inactive agents"""
         try:
-            with self.get_session() as session:
-                from app.models.agents import AgentConfig
-
-                if include_inactive:
-                    statement = select(AgentConfig).where(AgentConfig.name == name)
-                else:
-                    statement = select(AgentConfig).where(
-                        AgentConfig.name == name,
-                        AgentConfig.is_active == True
-                    )
-
-                agent_config = session.exec(statement).first()
-
-                if agent_config:
-                    return self._agent_config_to_dict(agent_config)
-                return None
+            return agent_config_registry.get_by_name(name, include_inactive=include_inactive)
 
         except Exception as e:
             logger.error(f"Failed to get agent config for {name}: {str(e)}")
@@ -118,6 +78,7 @@ class DatabaseManager:
                     existing_config.updated_at = datetime.now(timezone.utc)
                     session.add(existing_config)
                     session.commit()
+                    agent_config_registry.invalidate()
                     session.refresh(existing_config)
                     return self._agent_config_to_dict(existing_config)
                 else:
@@ -139,6 +100,7 @@ class DatabaseManager:
                     
                     session.add(new_config)
                     session.commit()
+                    agent_config_registry.invalidate()
                     session.refresh(new_config)
                     return self._agent_config_to_dict(new_config)
                     
@@ -163,6 +125,7 @@ class DatabaseManager:
                 # Delete the agent
                 session.delete(agent_config)
                 session.commit()
+                agent_config_registry.invalidate()
                 
                 logger.info(f"Successfully deleted agent {name} from database")
                 return True
@@ -172,16 +135,9 @@ class DatabaseManager:
             raise DatabaseException(f"Failed to delete agent config: {str(e)}")
     
     def get_all_specialist_agents(self) -> List[Dict[str, Any]]:
-        """Get all agent configurations (no agent_type distinction)"""
+        """Get all active agent configurations (served from the agent registry)"""
         try:
-            with self.get_session() as session:
-                from app.models.agents import AgentConfig
-                
-                # Get all active agents (no agent_type filtering)
-                statement = select(AgentConfig).where(AgentConfig.is_active == True)
-                configs = session.exec(statement).all()
-                
-                return [self._agent_config_to_dict(config) for config in configs]
+            return agent_config_registry.list_active()
                 
         except Exception as e:
             logger.error(f"Failed to get agents: {str(e)}")
@@ -189,22 +145,7 @@ class DatabaseManager:
     
     def _agent_config_to_dict(self, agent_config) -> Dict[str, Any]:
         """Convert AgentConfig model to dictionary"""
-        return {
-            "id": agent_config.id,
-            "name": agent_config.name,
-            "role": agent_config.role,
-            "goal": agent_config.goal,
-            "backstory": agent_config.backstory,
-            "task": getattr(agent_config, 'task', ''),
-            "capabilities": json.loads(agent_config.capabilities) if agent_config.capabilities else {},
-            "tools": json.loads(agent_config.tools) if agent_config.tools else [],
-            "max_iterations": agent_config.max_iterations,
-            "allow_delegation": getattr(agent_config, 'allow_delegation', False),
-            "verbose": getattr(agent_config, 'verbose', True),
-            "is_active": agent_config.is_active,
-            "created_at": agent_config.created_at.isoformat() if agent_config.created_at else None,
-            "updated_at": agent_config.updated_at.isoformat() if agent_config.updated_at else None
-        }
+        return agent_config_to_dict(agent_config)
     
     # Chat and Conversation Management
     def store_chat_message(self, user_name: str, message: str, session_id: str, raw_data: Dict[str, Any] = None):
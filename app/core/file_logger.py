@@ -7,18 +7,167 @@ and provides functionality to retrieve and serve log files.
 
 import logging
 import os
+import threading
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
 from typing import List, Optional
 import gzip
 from logging.handlers import RotatingFileHandler
 
+from app.config.logging import add_log_handler
+from app.core.log_index import LogIndex, LogIndexStore
+
 # Configuration
 LOG_DIR = os.getenv("LOG_DIR", "./logs")  # Default to local logs directory
 LOG_FILE_NAME = os.getenv("LOG_FILE_NAME", "sato.log")
 LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))  # 10MB default
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 10))  # Keep 10 backup files
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes read per backwards seek when tailing
+
+
+def tail_lines(
+    file_path: Path,
+    lines: int,
+    end_offset: Optional[int] = None,
+    block_size: int = TAIL_BLOCK_SIZE
+) -> List[str]:
+    """
+    Read the last lines of a file by seeking backwards from the end.
+
+    Only the blocks that contain the requested lines are read, so memory is
+    proportional to `lines` rather than to the file size.
+
+    Args:
+        file_path: File to read
+        lines: Number of lines to return
+        end_offset: Treat this byte offset as end of file (defaults to the current size)
+        block_size: Bytes read per backwards step
+
+    Returns:
+        Up to `lines` lines, oldest first, with line endings preserved
+    """
+    if lines <= 0:
+        return []
+
+    with open(file_path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END) if end_offset is None else end_offset
+        blocks = []
+        newline_count = 0
+
+        # One extra newline guarantees the oldest returned line is complete
+        while position > 0 and newline_count <= lines:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size)
+            blocks.append(block)
+            newline_count += block.count(b'\n')
+
+    data = b''.join(reversed(blocks))
+    return data.decode('utf-8', errors='replace').splitlines(keepends=True)[-lines:]
+
+
+class LogFollower:
+    """
+    Follows a log file like 'tail -F' by polling its size and inode.
+
+    When RotatingFileHandler rolls the file over, the remainder of the old
+    file (now `<name>.1`) is drained before reading the new file from the
+    start, so no lines are lost across rotations.
+    """
+
+    def __init__(self, file_path: Path, from_end: bool = True):
+        self.file_path = file_path
+        self._inode = None
+        self._offset = 0
+        self._partial = b''
+
+        stat = self._stat(file_path)
+        if stat is not None:
+            self._inode = stat.st_ino
+            self._offset = stat.st_size if from_end else 0
+
+    @property
+    def offset(self) -> int:
+        """Byte offset in the current file up to which lines have been consumed."""
+        return self._offset
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[os.stat_result]:
+        try:
+            return path.stat()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _read_from(path: Path, offset: int) -> bytes:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return f.read()
+
+    def _split_lines(self, data: bytes, final: bool = False) -> List[str]:
+        """Split buffered bytes into complete lines, keeping any trailing partial line."""
+        data = self._partial + data
+        if final:
+            complete, self._partial = data, b''
+        else:
+            head, newline, self._partial = data.rpartition(b'\n')
+            complete = head + newline
+        return complete.decode('utf-8', errors='replace').splitlines(keepends=True)
+
+    def poll(self) -> List[str]:
+        """
+        Return lines appended since the previous poll.
+
+        Returns:
+            Complete new lines, oldest first
+        """
+        stat = self._stat(self.file_path)
+        if stat is None:
+            return []
+
+        new_lines = []
+        if self._inode is not None and stat.st_ino != self._inode:
+            # Rotated: drain what was written to the old file before rollover
+            rotated_file = Path(f"{self.file_path}.1")
+            rotated_stat = self._stat(rotated_file)
+            if rotated_stat is not None and rotated_stat.st_ino == self._inode:
+                new_lines.extend(self._split_lines(self._read_from(rotated_file, self._offset), final=True))
+            else:
+                new_lines.extend(self._split_lines(b'', final=True))
+            self._offset = 0
+        elif stat.st_size < self._offset:
+            # Truncated in place
+            self._offset = 0
+            self._partial = b''
+
+        self._inode = stat.st_ino
+        if stat.st_size > self._offset:
+            data = self._read_from(self.file_path, self._offset)
+            self._offset += len(data)
+            new_lines.extend(self._split_lines(data))
+
+        return new_lines
+
+
+class IndexedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that indexes the just-rotated file in the background."""
+
+    def __init__(self, *args, on_rollover=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_rollover = on_rollover
+
+    def doRollover(self):
+        super().doRollover()
+        if self._on_rollover is not None and self.backupCount > 0:
+            threading.Thread(
+                target=self._on_rollover,
+                args=(Path(f"{self.baseFilename}.1"),),
+                name="log-indexer",
+                daemon=True
+            ).start()
 
 
 class FileLogger:
@@ -37,6 +186,7 @@ class FileLogger:
         if not self._initialized:
             self.log_dir = Path(LOG_DIR)
             self.log_file = self.log_dir / LOG_FILE_NAME
+            self.index_store = LogIndexStore(self.log_dir)
             self._setup_logging()
             FileLogger._initialized = True
 
@@ -46,11 +196,12 @@ class FileLogger:
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
         # Create rotating file handler
-        file_handler = RotatingFileHandler(
+        file_handler = IndexedRotatingFileHandler(
             filename=str(self.log_file),
             maxBytes=LOG_MAX_BYTES,
             backupCount=LOG_BACKUP_COUNT,
-            encoding='utf-8'
+            encoding='utf-8',
+            on_rollover=self._index_rotated_file
         )
 
         # Set formatter with detailed information
@@ -63,9 +214,9 @@ class FileLogger:
         # Set log level
         file_handler.setLevel(getattr(logging, LOG_LEVEL.upper()))
 
-        # Add handler to root logger
+        # Route root logger output to the file via the logging pipeline
         root_logger = logging.getLogger()
-        root_logger.addHandler(file_handler)
+        add_log_handler(file_handler)
 
         # Also ensure root logger level is set
         if root_logger.level > file_handler.level:
@@ -76,6 +227,23 @@ class FileLogger:
         logging.info(f"📊 Max file size: {LOG_MAX_BYTES / (1024*1024):.1f}MB")
         logging.info(f"🔄 Backup count: {LOG_BACKUP_COUNT}")
 
+    def _index_rotated_file(self, rotated_file: Path):
+        """Finish indexing a freshly rotated file and drop indexes of deleted backups."""
+        try:
+            self.get_log_index(rotated_file)
+            self.index_store.prune(self.get_log_files())
+        except Exception as e:
+            logging.warning(f"⚠️  Failed to index rotated log file {rotated_file}: {e}")
+
+    def get_log_index(self, log_file: Path) -> LogIndex:
+        """
+        Get the sidecar index for a log file, indexing any newly written lines.
+
+        The active file's index is kept in memory only; rotated files are
+        immutable, so their indexes are persisted.
+        """
+        return self.index_store.get(log_file, persist=log_file != self.log_file)
+
     def get_log_files(self) -> List[Path]:
         """
         Get list of all log files (current + rotated backups).
@@ -124,14 +292,16 @@ class FileLogger:
             return f"Log file not found: {file_path}"
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-
-            if reverse:
-                all_lines = all_lines[::-1]
-
-            if lines is not None:
-                all_lines = all_lines[:lines]
+            if lines is not None and reverse:
+                all_lines = tail_lines(file_path, lines)[::-1]
+            elif lines is not None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    all_lines = list(islice(f, lines))
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    all_lines = f.readlines()
+                if reverse:
+                    all_lines = all_lines[::-1]
 
             return ''.join(all_lines)
 
@@ -195,6 +365,9 @@ class FileLogger:
         """
         Get log entries of a specific level.
 
+        Uses the per-level postings of each file's index, so only matching
+        lines are read.
+
         Args:
             level: Log level to filter (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             max_results: Maximum number of entries to return
@@ -202,7 +375,29 @@ class FileLogger:
         Returns:
             String containing filtered log entries
         """
-        return self.search_logs(f"| {level.upper()}", max_results=max_results)
+        level = level.upper()
+        matching_lines = []
+
+        for log_file in self.get_log_files():
+            try:
+                offsets = self.get_log_index(log_file).levels.get(level, ())
+                if not offsets:
+                    continue
+
+                with open(log_file, 'rb') as f:
+                    for offset in offsets:
+                        f.seek(offset)
+                        matching_lines.append(f.readline().decode('utf-8', errors='replace'))
+                        if len(matching_lines) >= max_results:
+                            break
+
+                if len(matching_lines) >= max_results:
+                    break
+
+            except Exception as e:
+                matching_lines.append(f"Error reading {log_file}: {str(e)}\n")
+
+        return ''.join(matching_lines)
 
     def get_logs_by_timerange(
         self,
@@ -226,25 +421,43 @@ class FileLogger:
         if end_time is None:
             end_time = datetime.now()
 
+        start_minute = start_time.strftime('%Y-%m-%d %H:%M')
+        end_minute = end_time.strftime('%Y-%m-%d %H:%M')
         matching_lines = []
 
         for log_file in self.get_log_files():
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    for line in f:
+                # Bisect the minute buckets to the only bytes that can match
+                byte_range = self.get_log_index(log_file).byte_range(start_minute, end_minute)
+                if byte_range is None:
+                    continue
+                start_offset, end_offset = byte_range
+
+                # Read line by line so a wide range stops at max_results
+                # instead of loading every bucket in it
+                with open(log_file, 'rb') as f:
+                    f.seek(start_offset)
+                    position = start_offset
+                    while position < end_offset:
+                        raw_line = f.readline()
+                        if not raw_line:
+                            break
+                        position += len(raw_line)
+                        line = raw_line.decode('utf-8', errors='replace')
+
                         # Extract timestamp from line (format: YYYY-MM-DD HH:MM:SS)
                         try:
                             timestamp_str = line.split('|')[0].strip()
                             log_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-
-                            if start_time <= log_time <= end_time:
-                                matching_lines.append(line)
-                                if len(matching_lines) >= max_results:
-                                    break
                         except (ValueError, IndexError):
                             # Skip lines that don't match expected format
                             continue
 
+                        if start_time <= log_time <= end_time:
+                            matching_lines.append(line)
+                            if len(matching_lines) >= max_results:
+                                break
+
                 if len(matching_lines) >= max_results:
                     break
 
@@ -271,13 +484,15 @@ class FileLogger:
 
         for log_file in log_files:
             file_stat = log_file.stat()
+            log_index = self.get_log_index(log_file)
             file_info = {
                 "name": log_file.name,
                 "path": str(log_file),
                 "size_bytes": file_stat.st_size,
                 "size_mb": round(file_stat.st_size / (1024 * 1024), 2),
                 "modified": datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                "lines": sum(1 for _ in open(log_file, 'r', encoding='utf-8'))
+                "lines": log_index.line_count,
+                "level_counts": log_index.level_counts()
             }
             stats["files"].append(file_info)
             stats["total_size_bytes"] += file_stat.st_size
@@ -286,6 +501,20 @@ class FileLogger:
 
         return stats
 
+    def follow(self, lines: int = 0):
+        """
+        Start following the main log file.
+
+        Args:
+            lines: Number of existing lines to return as backlog
+
+        Returns:
+            Tuple of (backlog lines oldest first, LogFollower positioned after them)
+        """
+        follower = LogFollower(self.log_file, from_end=True)
+        backlog = tail_lines(self.log_file, lines, end_offset=follower.offset) if follower.offset else []
+        return backlog, follower
+
     def clear_old_logs(self, days: int = 7) -> int:
         """
         Clear log files older than specified days.
@@ -311,6 +540,9 @@ class FileLogger:
                 except Exception as e:
                     logging.error(f"❌ Failed to delete {log_file}: {e}")
 
+        if deleted_count:
+            self.index_store.prune(self.get_log_files())
+
         return deleted_count
 
 
@@ -0,0 +1,228 @@
+"""
+Sidecar indexes for FileLogger log files.
+
+Each log file gets an index with:
+- byte offsets of the first line of every minute bucket (for time-range bisection)
+- per-level postings (byte offsets of every line at that level)
+- total line count and per-level counts (for instant stats)
+
+Indexes are keyed by inode, so they stay valid when RotatingFileHandler
+renames sato.log -> sato.log.1 -> sato.log.2. They are built incrementally:
+only bytes appended since the last build are scanned. Indexes for rotated
+(immutable) files are persisted as JSON under <LOG_DIR>/.index/.
+"""
+
+import json
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+INDEX_DIR_NAME = ".index"
+HEAD_BYTES = 256  # Leading bytes stored to detect inode reuse
+
+# Matches the FileLogger line prefix: "YYYY-MM-DD HH:MM:SS | LEVEL    | "
+LINE_PREFIX_PATTERN = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}):\d{2} \| ([A-Z]+) *\| ")
+
+
+def parse_line_prefix(line: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract the minute bucket and level from a formatted log line.
+
+    Returns:
+        Tuple of (minute as 'YYYY-MM-DD HH:MM', level), or (None, None) for
+        continuation lines such as traceback frames
+    """
+    match = LINE_PREFIX_PATTERN.match(line)
+    if not match:
+        return None, None
+    return match.group(1).decode("ascii"), match.group(2).decode("ascii")
+
+
+class LogIndex:
+    """Minute-bucket offsets, level postings and line counts for one log file."""
+
+    def __init__(self, inode: int, head: bytes = b""):
+        self.inode = inode
+        self.head = head
+        self.size = 0  # Bytes indexed so far; always ends on a line boundary
+        self.line_count = 0
+        self.minute_keys: List[str] = []
+        self.minute_offsets = array("Q")
+        self.levels: Dict[str, array] = {}
+
+    @property
+    def first_minute(self) -> Optional[str]:
+        return self.minute_keys[0] if self.minute_keys else None
+
+    @property
+    def last_minute(self) -> Optional[str]:
+        return self.minute_keys[-1] if self.minute_keys else None
+
+    def level_counts(self) -> Dict[str, int]:
+        return {level: len(offsets) for level, offsets in self.levels.items()}
+
+    def extend(self, file_path: Path) -> bool:
+        """
+        Index lines appended since the last call.
+
+        Returns:
+            True if any new lines were indexed
+        """
+        offset = self.size
+        with open(file_path, "rb") as f:
+            if not self.head:
+                self.head = f.read(HEAD_BYTES)
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Incomplete last line; picked up on the next extend
+                    break
+
+                minute, level = parse_line_prefix(line)
+                if minute is not None:
+                    # Buckets only move forward so the keys stay sorted for bisection
+                    if not self.minute_keys or minute > self.minute_keys[-1]:
+                        self.minute_keys.append(minute)
+                        self.minute_offsets.append(offset)
+                    self.levels.setdefault(level, array("Q")).append(offset)
+
+                self.line_count += 1
+                offset += len(line)
+
+        changed = offset != self.size
+        self.size = offset
+        return changed
+
+    def byte_range(self, start_minute: str, end_minute: str) -> Optional[Tuple[int, int]]:
+        """
+        Bisect to the byte range that can contain lines between two minutes (inclusive).
+
+        Returns:
+            (start_offset, end_offset), or None if the file has no lines in range
+        """
+        if not self.minute_keys or self.minute_keys[-1] < start_minute or self.minute_keys[0] > end_minute:
+            return None
+
+        start_bucket = max(bisect_right(self.minute_keys, start_minute) - 1, 0)
+        end_bucket = bisect_right(self.minute_keys, end_minute)
+        end_offset = self.minute_offsets[end_bucket] if end_bucket < len(self.minute_keys) else self.size
+        return self.minute_offsets[start_bucket], end_offset
+
+    def matches(self, stat: os.stat_result, head: bytes) -> bool:
+        """Check that this index still describes the file (same inode, not truncated or replaced)."""
+        return (
+            stat.st_ino == self.inode
+            and stat.st_size >= self.size
+            and head[:len(self.head)] == self.head
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "inode": self.inode,
+            "head": self.head.hex(),
+            "size": self.size,
+            "line_count": self.line_count,
+            "minute_keys": self.minute_keys,
+            "minute_offsets": self.minute_offsets.tolist(),
+            "levels": {level: offsets.tolist() for level, offsets in self.levels.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LogIndex":
+        index = cls(data["inode"], bytes.fromhex(data["head"]))
+        index.size = data["size"]
+        index.line_count = data["line_count"]
+        index.minute_keys = data["minute_keys"]
+        index.minute_offsets = array("Q", data["minute_offsets"])
+        index.levels = {level: array("Q", offsets) for level, offsets in data["levels"].items()}
+        return index
+
+
+class LogIndexStore:
+    """Loads, extends, persists and prunes LogIndex objects for a log directory."""
+
+    def __init__(self, log_dir: Path):
+        self.index_dir = Path(log_dir) / INDEX_DIR_NAME
+        self._indexes: Dict[int, LogIndex] = {}
+        self._lock = threading.Lock()
+
+    def _index_path(self, inode: int) -> Path:
+        return self.index_dir / f"{inode}.json"
+
+    def _load(self, inode: int) -> Optional[LogIndex]:
+        try:
+            with open(self._index_path(inode), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return LogIndex.from_dict(data)
+
+    def _save(self, index: LogIndex) -> None:
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self._index_path(index.inode)
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp_path, index_path)
+
+    def get(self, file_path: Path, persist: bool = True) -> LogIndex:
+        """
+        Return an up-to-date index for a log file, scanning only new bytes.
+
+        Args:
+            file_path: Log file to index
+            persist: Write the index to disk when it changed (skip for the active file)
+        """
+        with self._lock:
+            stat = file_path.stat()
+            with open(file_path, "rb") as f:
+                head = f.read(HEAD_BYTES)
+
+            index = self._indexes.get(stat.st_ino)
+            if index is None:
+                index = self._load(stat.st_ino)
+            if index is None or not index.matches(stat, head):
+                index = LogIndex(stat.st_ino)
+
+            changed = index.extend(file_path) if stat.st_size > index.size else False
+            self._indexes[stat.st_ino] = index
+
+            if persist and (changed or not self._index_path(stat.st_ino).exists()):
+                self._save(index)
+            return index
+
+    def prune(self, log_files: Iterable[Path]) -> int:
+        """
+        Drop indexes whose log file no longer exists.
+
+        Returns:
+            Number of index files removed
+        """
+        live_inodes = set()
+        for log_file in log_files:
+            try:
+                live_inodes.add(log_file.stat().st_ino)
+            except FileNotFoundError:
+                continue
+
+        removed = 0
+        with self._lock:
+            for inode in list(self._indexes):
+                if inode not in live_inodes:
+                    del self._indexes[inode]
+
+            if not self.index_dir.exists():
+                return 0
+            for index_path in self.index_dir.glob("*.json"):
+                if index_path.stem.isdigit() and int(index_path.stem) not in live_inodes:
+                    index_path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
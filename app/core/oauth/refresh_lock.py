@@ -0,0 +1,180 @@
+"""
+Single-flight OAuth Token Refresh
+
+When a token is about to expire, every request using that connection tries to
+refresh it at once - across uvicorn workers and instances, not just within
+one process. The refresh lock lets one caller per connection refresh while
+the others wait briefly, then re-read the connection and reuse the token the
+winner wrote.
+
+On PostgreSQL the lock is a session-level advisory lock keyed by the
+connection ID, held on a dedicated pooled connection for the duration of the
+refresh. Other databases (SQLite in tests) fall back to the per-process
+asyncio lock only.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection as DBConnection, Engine
+
+from app.config.database import get_engine
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+# First key of the two-key advisory lock, so refresh locks can't collide with
+# advisory locks taken elsewhere on the same connection IDs
+REFRESH_LOCK_NAMESPACE = 7301
+
+
+class ConnectionRefreshLock:
+    """
+    Per-connection refresh lock shared by GA4, Google Ads and Facebook.
+
+    Callers on the same event loop queue on an asyncio lock first, so only
+    one of them holds a database connection while polling for the advisory
+    lock. Local locks are kept per event loop (the token refresher runs each
+    refresh on a thread with its own loop); across loops and processes the
+    advisory lock serializes. The lock is re-entrant within the asyncio task
+    that holds it.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], Engine] = get_engine,
+        wait_seconds: Optional[float] = None,
+        poll_seconds: float = 0.1
+    ):
+        self._engine_factory = engine_factory
+        self.wait_seconds = wait_seconds
+        self.poll_seconds = poll_seconds
+        # loop -> (connection_id -> lock, connection_id -> holding task)
+        self._per_loop = weakref.WeakKeyDictionary()
+        self._per_loop_guard = threading.Lock()
+        self._stats = {"acquired": 0, "contended": 0, "timeouts": 0}
+
+    def _wait(self) -> float:
+        return self.wait_seconds if self.wait_seconds is not None else get_settings().token_refresh_lock_wait_seconds
+
+    def _loop_state(self) -> Tuple[Dict[int, asyncio.Lock], Dict[int, Optional[asyncio.Task]]]:
+        loop = asyncio.get_running_loop()
+        with self._per_loop_guard:
+            state = self._per_loop.get(loop)
+            if state is None:
+                state = self._per_loop[loop] = ({}, {})
+            return state
+
+    def _advisory_engine(self) -> Optional[Engine]:
+        try:
+            engine = self._engine_factory()
+        except ValueError:
+            return None
+        return engine if engine.dialect.name == "postgresql" else None
+
+    @asynccontextmanager
+    async def hold(self, connection_id: int) -> AsyncIterator[bool]:
+        """
+        Hold the refresh lock for a connection.
+
+        Yields True when the lock was acquired within the wait, False when it
+        timed out. Either way the caller should re-read the connection and
+        refresh only if the token is still expiring; after a timeout that
+        means refreshing without the lock, as before single-flight existed.
+        """
+        local_locks, owners = self._loop_state()
+        task = asyncio.current_task()
+        if task is not None and owners.get(connection_id) is task:
+            # Re-entered by the holder (e.g. the scheduler calling refresh_facebook_token)
+            yield True
+            return
+
+        deadline = time.monotonic() + self._wait()
+        local_lock = local_locks.setdefault(connection_id, asyncio.Lock())
+        if not local_lock.locked():
+            # Uncontended acquire completes without yielding to the loop
+            locked_locally = await local_lock.acquire()
+        else:
+            self._stats["contended"] += 1
+            try:
+                locked_locally = await asyncio.wait_for(local_lock.acquire(), max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                locked_locally = False
+        if not locked_locally:
+            self._stats["timeouts"] += 1
+            logger.warning(f"⚠️ [Refresh Lock] Timed out waiting for connection {connection_id} refresh in this process")
+            yield False
+            return
+
+        owners[connection_id] = task
+        db_connection: Optional[DBConnection] = None
+        try:
+            engine = self._advisory_engine()
+            acquired = True
+            if engine is not None:
+                db_connection = await asyncio.to_thread(engine.connect)
+                acquired = await self._acquire_advisory(db_connection, connection_id, deadline)
+            if acquired:
+                self._stats["acquired"] += 1
+            yield acquired
+        finally:
+            if db_connection is not None:
+                await asyncio.to_thread(self._release_advisory, db_connection, connection_id)
+            owners.pop(connection_id, None)
+            local_lock.release()
+
+    async def _acquire_advisory(self, db_connection: DBConnection, connection_id: int, deadline: float) -> bool:
+        contended = False
+        while True:
+            locked = await asyncio.to_thread(self._try_advisory, db_connection, connection_id)
+            if locked:
+                return True
+            if not contended:
+                contended = True
+                self._stats["contended"] += 1
+                logger.debug(f"🔒 [Refresh Lock] Connection {connection_id} is being refreshed elsewhere, waiting")
+            if time.monotonic() >= deadline:
+                self._stats["timeouts"] += 1
+                logger.warning(f"⚠️ [Refresh Lock] Timed out waiting for connection {connection_id} refresh in another worker")
+                return False
+            await asyncio.sleep(self.poll_seconds)
+
+    @staticmethod
+    def _try_advisory(db_connection: DBConnection, connection_id: int) -> bool:
+        locked = db_connection.execute(
+            text("SELECT pg_try_advisory_lock(:namespace, :connection_id)"),
+            {"namespace": REFRESH_LOCK_NAMESPACE, "connection_id": connection_id}
+        ).scalar()
+        # End the implicit transaction; the session-level lock outlives it
+        db_connection.commit()
+        return bool(locked)
+
+    @staticmethod
+    def _release_advisory(db_connection: DBConnection, connection_id: int) -> None:
+        try:
+            db_connection.execute(
+                text("SELECT pg_advisory_unlock(:namespace, :connection_id)"),
+                {"namespace": REFRESH_LOCK_NAMESPACE, "connection_id": connection_id}
+            )
+            db_connection.commit()
+            db_connection.close()
+        except Exception as e:
+            # Never hand a connection that may still hold the lock back to the pool;
+            # closing the DBAPI connection ends the Postgres session and its locks
+            logger.warning(f"⚠️ [Refresh Lock] Unlock failed for connection {connection_id}: {str(e)}")
+            db_connection.invalidate()
+            db_connection.close()
+
+    def get_stats(self) -> dict:
+        with self._per_loop_guard:
+            local_locks = sum(len(locks) for locks, _ in self._per_loop.values())
+        return {**self._stats, "local_locks": local_locks}
+
+
+connection_refresh_lock = ConnectionRefreshLock()
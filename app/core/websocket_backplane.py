@@ -0,0 +1,231 @@
+"""
+Pub/sub backplane for WebSocket fan-out across workers and instances
+
+A session's sockets live in the memory of whichever worker accepted them.
+ConnectionManager publishes every outgoing session message to the backplane;
+each worker receives it and delivers it to the sockets it holds for that
+session, so a webhook handled anywhere reaches the client.
+
+Implementations:
+- InMemoryBackplane: workers sharing an InMemoryBus in one process (tests, single worker)
+- PostgresBackplane: LISTEN/NOTIFY on a channel of the application database
+"""
+
+import asyncio
+import json
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config.logging import get_logger
+
+logger = get_logger("websocket.backplane")
+
+# Receives the envelope published by a worker:
+# {"origin", "session_id", "message", "published_at"}
+EnvelopeHandler = Callable[[dict], Awaitable[None]]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+class WebSocketBackplane(ABC):
+    """Transport that carries session messages between ConnectionManagers."""
+
+    name = "base"
+
+    @abstractmethod
+    async def start(self, handler: EnvelopeHandler) -> None:
+        """Subscribe; handler is awaited for every envelope published by any worker."""
+
+    @abstractmethod
+    async def publish(self, envelope: dict) -> None:
+        """Publish an envelope to every subscribed worker (including this one)."""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Unsubscribe and release resources."""
+
+
+class InMemoryBus:
+    """Shared fan-out point for InMemoryBackplanes in one process."""
+
+    def __init__(self):
+        self._handlers: List[EnvelopeHandler] = []
+
+    def subscribe(self, handler: EnvelopeHandler) -> None:
+        self._handlers.append(handler)
+
+    def unsubscribe(self, handler: EnvelopeHandler) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    async def publish(self, envelope: dict) -> None:
+        # Serialize like a network transport would, so no state is shared by reference
+        payload = json.dumps(envelope)
+        for handler in list(self._handlers):
+            try:
+                await handler(json.loads(payload))
+            except Exception as e:
+                logger.error(f"❌ [Backplane] In-memory handler failed: {str(e)}")
+
+
+class InMemoryBackplane(WebSocketBackplane):
+    """Backplane over an InMemoryBus; managers sharing a bus behave like separate workers."""
+
+    name = "memory"
+
+    def __init__(self, bus: Optional[InMemoryBus] = None):
+        self.bus = bus or InMemoryBus()
+        self._handler: Optional[EnvelopeHandler] = None
+
+    async def start(self, handler: EnvelopeHandler) -> None:
+        self._handler = handler
+        self.bus.subscribe(handler)
+
+    async def publish(self, envelope: dict) -> None:
+        await self.bus.publish(envelope)
+
+    async def stop(self) -> None:
+        if self._handler is not None:
+            self.bus.unsubscribe(self._handler)
+            self._handler = None
+
+
+def encode_notify_payloads(envelope: dict, limit: int = NOTIFY_PAYLOAD_LIMIT) -> List[str]:
+    """
+    Split an envelope into NOTIFY payloads of at most `limit` bytes.
+
+    Each payload is "<message id>|<part>|<parts>|<json slice>". The JSON is
+    ASCII-only so character and byte lengths match.
+    """
+    data = json.dumps(envelope, ensure_ascii=True, separators=(",", ":"))
+    message_id = uuid.uuid4().hex
+    # Header length with the widest part numbers this message can have
+    header_size = len(f"{message_id}|{len(data)}|{len(data)}|")
+    size = limit - header_size
+    if size <= 0:
+        raise ValueError("NOTIFY payload limit is too small for the chunk header")
+    slices = [data[i:i + size] for i in range(0, len(data), size)] or [""]
+    return [f"{message_id}|{index}|{len(slices)}|{chunk}" for index, chunk in enumerate(slices)]
+
+
+class NotifyPayloadAssembler:
+    """Reassembles envelopes from encode_notify_payloads chunks."""
+
+    def __init__(self, max_pending: int = 1000):
+        self.max_pending = max_pending
+        self._pending: Dict[str, Tuple[int, Dict[int, str]]] = {}
+
+    def add(self, payload: str) -> Optional[dict]:
+        """Add one NOTIFY payload; returns the envelope once all its parts arrived."""
+        message_id, index, total, chunk = payload.split("|", 3)
+        index, total = int(index), int(total)
+        if total == 1:
+            return json.loads(chunk)
+
+        if message_id not in self._pending and len(self._pending) >= self.max_pending:
+            # Parts of one message arrive together; anything left over is a lost message
+            self._pending.clear()
+        parts = self._pending.setdefault(message_id, (total, {}))[1]
+        parts[index] = chunk
+        if len(parts) < total:
+            return None
+        del self._pending[message_id]
+        return json.loads("".join(parts[i] for i in range(total)))
+
+
+class PostgresBackplane(WebSocketBackplane):
+    """
+    LISTEN/NOTIFY backplane on the application database.
+
+    Uses two dedicated autocommit connections (psycopg 3): one listening, one
+    publishing. Envelopes larger than the NOTIFY limit are split into parts
+    sent in a single transaction, which Postgres delivers together and in order.
+    """
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, channel: str = "websocket_events", reconnect_delay: float = 1.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._publish_conn = None
+        self._publish_lock = asyncio.Lock()
+        self._listen_task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: EnvelopeHandler) -> None:
+        self._listen_task = asyncio.create_task(self._listen(handler))
+
+    async def _connect(self):
+        import psycopg
+
+        return await psycopg.AsyncConnection.connect(self.dsn, autocommit=True)
+
+    async def _listen(self, handler: EnvelopeHandler) -> None:
+        from psycopg import sql
+
+        while True:
+            conn = None
+            try:
+                conn = await self._connect()
+                await conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                logger.info(f"📡 [Backplane] Listening on Postgres channel '{self.channel}'")
+                assembler = NotifyPayloadAssembler()
+                async for notify in conn.notifies():
+                    try:
+                        envelope = assembler.add(notify.payload)
+                        if envelope is not None:
+                            await handler(envelope)
+                    except Exception as e:
+                        logger.error(f"❌ [Backplane] Failed to handle notification: {str(e)}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [Backplane] Listener connection lost: {str(e)}; reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    await conn.close()
+
+    async def publish(self, envelope: dict) -> None:
+        payloads = encode_notify_payloads(envelope)
+        async with self._publish_lock:
+            if self._publish_conn is None or self._publish_conn.closed:
+                self._publish_conn = await self._connect()
+            try:
+                async with self._publish_conn.transaction():
+                    for payload in payloads:
+                        await self._publish_conn.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except Exception:
+                # Drop the connection so the next publish reconnects
+                await self._publish_conn.close()
+                self._publish_conn = None
+                raise
+
+    async def stop(self) -> None:
+        if self._listen_task is not None:
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+            self._listen_task = None
+        async with self._publish_lock:
+            if self._publish_conn is not None:
+                await self._publish_conn.close()
+                self._publish_conn = None
+
+
+def create_backplane(settings) -> Optional[WebSocketBackplane]:
+    """Build the backplane selected by settings.websocket_backplane ('none', 'memory' or 'postgres')."""
+    kind = settings.websocket_backplane
+    if kind == "postgres":
+        from sqlalchemy.engine import make_url
+
+        # psycopg takes a libpq URL without the SQLAlchemy driver suffix
+        dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresBackplane(dsn, channel=settings.websocket_backplane_channel)
+    if kind == "memory":
+        return InMemoryBackplane()
+    return None
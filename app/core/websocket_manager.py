@@ -2,18 +2,147 @@
 WebSocket Connection Manager for real-time communication
 
 Manages WebSocket connections per session, handles message broadcasting,
-connection lifecycle, and cleanup.
+connection lifecycle, and cleanup. With a backplane attached, messages are
+fanned out to every worker and delivered by the one holding the session's
+sockets.
+
+Each socket has a bounded outgoing queue drained by its own writer task, so
+sending is a non-blocking enqueue and one slow client never delays another.
+A socket whose queue overflows or whose send exceeds the timeout is evicted.
 """
 
 import asyncio
 import json
-from typing import Dict, List, Optional
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set
 from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
 from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.core.websocket_backplane import WebSocketBackplane
 
 logger = get_logger("websocket.manager")
 
+# Message types where only the newest queued message matters
+COALESCED_MESSAGE_TYPES = ("progress",)
+
+
+class ConnectionWriter:
+    """
+    Bounded outgoing queue and writer task for one WebSocket.
+
+    enqueue() never awaits. A coalescable message replaces an identical-type
+    message still waiting at the tail of the queue, so order is preserved.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        send: Callable[[WebSocket, dict], Awaitable[None]],
+        on_evict: Callable[["ConnectionWriter", str], None],
+        metrics: Dict[str, int],
+        max_queue: int,
+        send_timeout: float
+    ):
+        self.websocket = websocket
+        self.session_id = session_id
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.closed = False
+        self._send = send
+        self._on_evict = on_evict
+        self._metrics = metrics
+        self._queue: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, message: dict) -> bool:
+        """
+        Queue a message for this socket.
+        
+        Returns:
+            bool: False if the writer is closed or was evicted for a full queue
+        """
+        if self.closed:
+            return False
+
+        message_type = message.get("type")
+        if (message_type in COALESCED_MESSAGE_TYPES and self._queue
+                and self._queue[-1].get("type") == message_type):
+            self._queue[-1] = message
+            self._metrics["coalesced"] += 1
+            return True
+
+        if len(self._queue) >= self.max_queue:
+            self._metrics["queue_overflows"] += 1
+            self._on_evict(self, f"send queue full ({self.max_queue})")
+            return False
+
+        self._queue.append(message)
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            if not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            message = self._queue.popleft()
+            try:
+                await asyncio.wait_for(self._send(self.websocket, message), self.send_timeout)
+            except asyncio.TimeoutError:
+                self._metrics["send_timeouts"] += 1
+                self._on_evict(self, f"send timed out after {self.send_timeout}s")
+                return
+            except Exception as e:
+                self._on_evict(self, f"send failed: {str(e)}")
+                return
+            self._metrics["messages_sent"] += 1
+
+    async def wait_idle(self) -> None:
+        """Wait until every queued message has been sent (or the writer closed)."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop the writer; messages still queued are dropped."""
+        self.closed = True
+        self._queue.clear()
+        self._idle.set()
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
+@dataclass(frozen=True)
+class SendResult:
+    """
+    Outcome of sending a message to a session.
+
+    delivered: queued to at least one of this worker's sockets
+    published: handed to the backplane; whether another worker holds the
+        session is not known to the sender
+
+    Truthy when either happened, i.e. the message went somewhere.
+    """
+    delivered: bool = False
+    published: bool = False
+
+    def __bool__(self) -> bool:
+        return self.delivered or self.published
+
 
 class ConnectionManager:
     """
@@ -25,14 +154,59 @@ class ConnectionManager:
     - Connection metadata tracking
     - Automatic cleanup on disconnect
     - Heartbeat/ping mechanism
+    - Cross-worker delivery through an optional pub/sub backplane
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        latency_samples: int = 1000,
+        send_queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None
+    ):
         """Initialize the connection manager"""
+        settings = get_settings()
         self.active_connections: Dict[str, List[WebSocket]] = {}
         self.connection_metadata: Dict[str, Dict] = {}
+        self.send_queue_size = send_queue_size or settings.websocket_send_queue_size
+        self.send_timeout = send_timeout or settings.websocket_send_timeout_seconds
+        self._writers: Dict[str, ConnectionWriter] = {}
+        self._closing: Set[asyncio.Task] = set()
         self._lock = asyncio.Lock()
+        self.instance_id = uuid.uuid4().hex
+        self.backplane: Optional[WebSocketBackplane] = None
+        self._latencies_ms = deque(maxlen=latency_samples)
+        self._metrics = {
+            "local_deliveries": 0,
+            "published": 0,
+            "publish_failures": 0,
+            "remote_received": 0,
+            "remote_delivered": 0,
+            "remote_unowned": 0,
+            "messages_sent": 0,
+            "coalesced": 0,
+            "queue_overflows": 0,
+            "send_timeouts": 0,
+            "evictions": 0,
+        }
         logger.info("🔌 ConnectionManager initialized")
+
+    async def start_backplane(self, backplane: WebSocketBackplane) -> None:
+        """
+        Attach a backplane and subscribe to messages published by other workers.
+
+        Args:
+            backplane: The pub/sub transport shared by all workers
+        """
+        self.backplane = backplane
+        await backplane.start(self._on_backplane_message)
+        logger.info(f"📡 WebSocket backplane started: {backplane.name}, instance={self.instance_id}")
+
+    async def stop_backplane(self) -> None:
+        """Detach and stop the backplane, if any."""
+        backplane, self.backplane = self.backplane, None
+        if backplane is not None:
+            await backplane.stop()
+            logger.info(f"📡 WebSocket backplane stopped: {backplane.name}")
     
     async def connect(
         self, 
@@ -71,6 +245,15 @@ class ConnectionManager:
                     "last_heartbeat": datetime.now(timezone.utc).isoformat(),
                     "websocket_id": id(websocket)
                 }
+                self._writers[connection_key] = ConnectionWriter(
+                    websocket,
+                    session_id,
+                    send=self._send_to_websocket,
+                    on_evict=self._evict,
+                    metrics=self._metrics,
+                    max_queue=self.send_queue_size,
+                    send_timeout=self.send_timeout
+                )
             
             logger.info(
                 f"✅ WebSocket connected: session={session_id}, user={user_id}, "
@@ -78,7 +261,7 @@ class ConnectionManager:
             )
             
             # Send connection acknowledgment
-            await self._send_to_websocket(websocket, {
+            self.queue_message(websocket, session_id, {
                 "type": "connected",
                 "session_id": session_id,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -99,36 +282,96 @@ class ConnectionManager:
         """
         try:
             async with self._lock:
-                # Remove from active connections
-                if session_id in self.active_connections:
-                    if websocket in self.active_connections[session_id]:
-                        self.active_connections[session_id].remove(websocket)
-                    
-                    # Clean up empty session lists
-                    if not self.active_connections[session_id]:
-                        del self.active_connections[session_id]
-                
-                # Remove metadata
-                connection_key = f"{session_id}_{id(websocket)}"
-                if connection_key in self.connection_metadata:
-                    metadata = self.connection_metadata[connection_key]
-                    del self.connection_metadata[connection_key]
-                    
-                    logger.info(
-                        f"🔌 WebSocket disconnected: session={session_id}, "
-                        f"user={metadata.get('user_id')}, "
-                        f"remaining_connections={len(self.active_connections.get(session_id, []))}"
-                    )
+                metadata = self._remove_connection(websocket, session_id)
+            
+            if metadata:
+                logger.info(
+                    f"🔌 WebSocket disconnected: session={session_id}, "
+                    f"user={metadata.get('user_id')}, "
+                    f"remaining_connections={len(self.active_connections.get(session_id, []))}"
+                )
         
         except Exception as e:
             logger.error(f"❌ Error during disconnect cleanup: {str(e)}")
+
+    def _remove_connection(self, websocket: WebSocket, session_id: str) -> Optional[Dict]:
+        """
+        Unregister a connection and stop its writer (no awaits, safe from any task).
+        
+        Returns:
+            Optional[Dict]: The connection metadata, or None if it was not registered
+        """
+        # Remove from active connections
+        if session_id in self.active_connections:
+            if websocket in self.active_connections[session_id]:
+                self.active_connections[session_id].remove(websocket)
+            
+            # Clean up empty session lists
+            if not self.active_connections[session_id]:
+                del self.active_connections[session_id]
+        
+        connection_key = f"{session_id}_{id(websocket)}"
+        writer = self._writers.pop(connection_key, None)
+        if writer is not None:
+            writer.close()
+        return self.connection_metadata.pop(connection_key, None)
+
+    def _evict(self, writer: ConnectionWriter, reason: str) -> None:
+        """Drop a slow or broken connection and close its socket in the background."""
+        if writer.closed:
+            return
+        metadata = self._remove_connection(writer.websocket, writer.session_id)
+        self._metrics["evictions"] += 1
+        logger.warning(
+            f"⚠️ Evicting WebSocket: session={writer.session_id}, "
+            f"user={(metadata or {}).get('user_id')}, reason={reason}"
+        )
+        task = asyncio.create_task(self._close_websocket(writer.websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_websocket(self, websocket: WebSocket) -> None:
+        try:
+            # 1013 (try again later): the client may reconnect and resync
+            await asyncio.wait_for(websocket.close(code=1013), self.send_timeout)
+        except Exception as e:
+            logger.debug(f"WebSocket close after eviction failed: {str(e)}")
+
+    def queue_message(self, websocket: WebSocket, session_id: str, message: dict) -> bool:
+        """
+        Queue a message for one connection without waiting for the send.
+        
+        Args:
+            websocket: The WebSocket connection
+            session_id: The session ID for this connection
+            message: The message dictionary to send
+            
+        Returns:
+            bool: False if the connection is not registered or was evicted
+        """
+        writer = self._writers.get(f"{session_id}_{id(websocket)}")
+        return writer is not None and writer.enqueue(message)
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until all queued messages have been written.
+        
+        Args:
+            timeout: Optional maximum wait in seconds
+        """
+        writers = list(self._writers.values())
+        if writers:
+            await asyncio.wait_for(
+                asyncio.gather(*(writer.wait_idle() for writer in writers)),
+                timeout
+            )
     
     async def send_to_session(
         self, 
         session_id: str, 
         message: dict,
         message_type: Optional[str] = None
-    ) -> bool:
+    ) -> SendResult:
         """
         Send a message to all connections for a specific session.
         
@@ -138,7 +381,8 @@ class ConnectionManager:
             message_type: Optional message type override
             
         Returns:
-            bool: True if message was sent to at least one connection
+            SendResult: Whether the message reached a local connection and
+                whether it was published for other workers
         """
         try:
             # Ensure message has required fields
@@ -148,41 +392,83 @@ class ConnectionManager:
             if "timestamp" not in message:
                 message["timestamp"] = datetime.now(timezone.utc).isoformat()
             
+            delivered = await self._deliver_local(session_id, message)
+            if delivered:
+                self._metrics["local_deliveries"] += 1
+            
+            # Other workers may hold this session's sockets (or more tabs of it)
+            published = await self._publish(session_id, message)
+            
+            if not delivered and not published:
+                logger.warning(f"⚠️ No active connections for session: {session_id}")
+            
+            return SendResult(delivered=delivered, published=published)
+            
+        except Exception as e:
+            logger.error(f"❌ Error sending message to session {session_id}: {str(e)}")
+            return SendResult()
+
+    async def _publish(self, session_id: str, message: dict) -> bool:
+        """Publish a session message to the backplane; False without one or on failure."""
+        if self.backplane is None:
+            return False
+        try:
+            await self.backplane.publish({
+                "origin": self.instance_id,
+                "session_id": session_id,
+                "message": message,
+                "published_at": time.time(),
+            })
+            self._metrics["published"] += 1
+            return True
+        except Exception as e:
+            self._metrics["publish_failures"] += 1
+            logger.error(f"❌ Failed to publish to backplane: session={session_id}, error={str(e)}")
+            return False
+
+    async def _on_backplane_message(self, envelope: dict) -> None:
+        """Deliver a message published by another worker to this worker's sockets."""
+        if envelope.get("origin") == self.instance_id:
+            return
+        self._metrics["remote_received"] += 1
+        session_id = envelope["session_id"]
+        if session_id not in self.active_connections:
+            self._metrics["remote_unowned"] += 1
+            return
+        # Wall-clock latency across hosts; only as accurate as their clock sync
+        self._latencies_ms.append(max(0.0, (time.time() - envelope["published_at"]) * 1000))
+        if await self._deliver_local(session_id, envelope["message"]):
+            self._metrics["remote_delivered"] += 1
+
+    async def _deliver_local(self, session_id: str, message: dict) -> bool:
+        """
+        Queue a message for this worker's connections for a session.
+
+        Returns:
+            bool: True if queued for at least one connection
+        """
+        try:
             # Get connections for this session
             connections = self.active_connections.get(session_id, [])
             
             if not connections:
-                logger.warning(f"⚠️ No active connections for session: {session_id}")
                 return False
             
-            # Send to all connections for this session
-            disconnected = []
+            # Enqueue for every connection; writer tasks do the actual sends
             success_count = 0
-            
-            for websocket in connections:
-                try:
-                    await self._send_to_websocket(websocket, message)
+            for websocket in list(connections):
+                if self.queue_message(websocket, session_id, message):
                     success_count += 1
-                except Exception as e:
-                    logger.error(f"❌ Failed to send to WebSocket: {str(e)}")
-                    disconnected.append(websocket)
             
-            # Clean up disconnected websockets
-            if disconnected:
-                async with self._lock:
-                    for ws in disconnected:
-                        if ws in self.active_connections.get(session_id, []):
-                            self.active_connections[session_id].remove(ws)
-            
-            logger.info(
-                f"📤 Message sent: session={session_id}, type={message.get('type')}, "
+            logger.debug(
+                f"📤 Message queued: session={session_id}, type={message.get('type')}, "
                 f"success={success_count}/{len(connections)}"
             )
             
             return success_count > 0
             
         except Exception as e:
-            logger.error(f"❌ Error sending message to session {session_id}: {str(e)}")
+            logger.error(f"❌ Error delivering message to session {session_id}: {str(e)}")
             return False
     
     async def send_typing_indicator(
@@ -190,7 +476,7 @@ class ConnectionManager:
         session_id: str, 
         is_typing: bool,
         agent_name: Optional[str] = None
-    ) -> bool:
+    ) -> SendResult:
         """
         Send typing indicator to frontend.
         
@@ -200,7 +486,7 @@ class ConnectionManager:
             agent_name: Optional name of the typing agent
             
         Returns:
-            bool: True if sent successfully
+            SendResult: See send_to_session
         """
         message = {
             "type": "typing",
@@ -219,10 +505,13 @@ class ConnectionManager:
         agent: Optional[str] = None,
         task: Optional[str] = None,
         message: Optional[str] = None
-    ) -> bool:
+    ) -> SendResult:
         """
         Send progress update during CrewAI execution.
         
+        A newer update replaces one still waiting in a socket's queue, so slow
+        clients skip intermediate progress instead of falling behind.
+        
         Args:
             session_id: The session ID
             stage: Current stage (e.g., 'initializing', 'analyzing', 'completing')
@@ -232,7 +521,7 @@ class ConnectionManager:
             message: Optional progress message
             
         Returns:
-            bool: True if sent successfully
+            SendResult: See send_to_session
         """
         progress_message = {
             "type": "progress",
@@ -253,7 +542,7 @@ class ConnectionManager:
         analysis_id: str,
         execution_time: Optional[float] = None,
         agents_used: Optional[List[str]] = None
-    ) -> bool:
+    ) -> SendResult:
         """
         Send CrewAI analysis result to frontend.
         
@@ -265,7 +554,7 @@ class ConnectionManager:
             agents_used: Optional list of agents that participated
             
         Returns:
-            bool: True if sent successfully
+            SendResult: See send_to_session
         """
         result_message = {
             "type": "crew_result",
@@ -284,7 +573,7 @@ class ConnectionManager:
         error: str,
         details: Optional[str] = None,
         retry_possible: bool = False
-    ) -> bool:
+    ) -> SendResult:
         """
         Send error message to frontend.
         
@@ -295,7 +584,7 @@ class ConnectionManager:
             retry_possible: Whether the operation can be retried
             
         Returns:
-            bool: True if sent successfully
+            SendResult: See send_to_session
         """
         error_message = {
             "type": "error",
@@ -367,6 +656,31 @@ class ConnectionManager:
         """
         return list(self.active_connections.keys())
 
+    def get_stats(self) -> dict:
+        """
+        Get delivery counters and cross-worker latency for this worker.
+        
+        Returns:
+            dict: Backplane name, delivery counters and remote latency summary
+        """
+        latencies = sorted(self._latencies_ms)
+        latency = None
+        if latencies:
+            latency = {
+                "samples": len(latencies),
+                "avg_ms": round(sum(latencies) / len(latencies), 2),
+                "p50_ms": round(latencies[len(latencies) // 2], 2),
+                "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+                "max_ms": round(latencies[-1], 2),
+            }
+        return {
+            "instance_id": self.instance_id,
+            "backplane": self.backplane.name if self.backplane else None,
+            **self._metrics,
+            "queued_messages": sum(writer.queued for writer in self._writers.values()),
+            "remote_latency": latency,
+        }
+
 
 # Global connection manager instance
 connection_manager = ConnectionManager()
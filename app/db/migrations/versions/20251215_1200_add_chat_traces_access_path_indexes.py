@@ -0,0 +1,61 @@
+"""Add access-path indexes for chat_traces hot queries
+
+Revision ID: 20251215_chat_trace_indexes
+Revises: 20251211_priority_fields
+Create Date: 2025-12-15
+
+Indexes match the filters used by ChatTraceService and the /traces routes:
+- (thread_id, record_type, sequence_number) for per-thread event reads and
+  sequence counting (supersedes idx_chat_traces_thread_record)
+- created_at, partial on record_type = 'conversation', for trace listings
+- (data->>'status'), partial on record_type = 'conversation', for status filters
+
+Indexes are built CONCURRENTLY so the migration does not block writes on a
+large chat_traces table.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251215_chat_trace_indexes'
+down_revision = '20251211_priority_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create composite, partial and expression indexes on chat_traces."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_traces_thread_record_seq "
+            "ON chat_traces (thread_id, record_type, sequence_number)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_traces_conversation_created_at "
+            "ON chat_traces (created_at DESC) "
+            "WHERE record_type = 'conversation'"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_traces_conversation_status "
+            "ON chat_traces ((data->>'status')) "
+            "WHERE record_type = 'conversation'"
+        )
+        # Left-prefix of idx_chat_traces_thread_record_seq, only adds write cost
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_chat_traces_thread_record")
+
+    print("✅ Added access-path indexes to chat_traces")
+
+
+def downgrade() -> None:
+    """Drop access-path indexes and restore the (thread_id, record_type) index."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_traces_thread_record "
+            "ON chat_traces (thread_id, record_type)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_chat_traces_conversation_status")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_chat_traces_conversation_created_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_chat_traces_thread_record_seq")
+
+    print("✅ Removed access-path indexes from chat_traces")
@@ -0,0 +1,149 @@
+"""Partition chat_traces by month on created_at
+
+Revision ID: 20251216_partition_chat_traces
+Revises: 20251215_chat_trace_indexes
+Create Date: 2025-12-16
+
+Rebuilds chat_traces as a natively range-partitioned table with one partition
+per calendar month (chat_traces_pYYYY_MM) plus a DEFAULT partition as a safety
+net. Old months can then be dropped or detached in O(1) by
+ChatTracePartitionService instead of DELETE-scanning the table.
+
+The primary key becomes (id, created_at), since PostgreSQL requires the
+partition key in every unique constraint. ids still come from the existing
+chat_traces_id_seq sequence, so they stay unique and continue from where the
+unpartitioned table left off.
+
+PostgreSQL only; other dialects are left untouched.
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251216_partition_chat_traces'
+down_revision = '20251215_chat_trace_indexes'
+branch_labels = None
+depends_on = None
+
+# Months of empty partitions created ahead of the current month
+PARTITIONS_AHEAD = 3
+
+
+def _add_months(month_start: date, months: int) -> date:
+    """Return the first day of the month `months` after `month_start`."""
+    month_index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_indexes(table_name: str) -> None:
+    """Create the chat_traces index set on `table_name`."""
+    op.create_index('idx_chat_traces_thread_id', table_name, ['thread_id'])
+    op.create_index('idx_chat_traces_record_type', table_name, ['record_type'])
+    op.create_index('idx_chat_traces_campaigner_id', table_name, ['campaigner_id'])
+    op.create_index('idx_chat_traces_customer_id', table_name, ['customer_id'])
+    op.create_index('idx_chat_traces_session_id', table_name, ['session_id'])
+    op.create_index('idx_chat_traces_created_at', table_name, ['created_at'], postgresql_using='btree', postgresql_ops={'created_at': 'DESC'})
+    op.create_index('idx_chat_traces_thread_record_seq', table_name, ['thread_id', 'record_type', 'sequence_number'])
+    op.execute(
+        f"CREATE INDEX idx_chat_traces_conversation_created_at ON {table_name} (created_at DESC) "
+        "WHERE record_type = 'conversation'"
+    )
+    op.execute(
+        f"CREATE INDEX idx_chat_traces_conversation_status ON {table_name} ((data->>'status')) "
+        "WHERE record_type = 'conversation'"
+    )
+    op.create_index('idx_chat_traces_data_gin', table_name, ['data'], postgresql_using='gin')
+
+
+def _add_foreign_keys(table_name: str) -> None:
+    """Add the campaigner/customer foreign keys to `table_name`."""
+    op.create_foreign_key(
+        'chat_traces_campaigner_id_fkey', table_name, 'campaigners',
+        ['campaigner_id'], ['id'], ondelete='CASCADE'
+    )
+    op.create_foreign_key(
+        'chat_traces_customer_id_fkey', table_name, 'customers',
+        ['customer_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def upgrade() -> None:
+    """Rebuild chat_traces as a monthly range-partitioned table."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("⚠️  Skipping chat_traces partitioning (PostgreSQL only)")
+        return
+
+    print("📋 Partitioning chat_traces by month...")
+
+    op.execute(
+        "CREATE TABLE chat_traces_partitioned (LIKE chat_traces INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+
+    # One partition per month from the oldest row through PARTITIONS_AHEAD months ahead
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM chat_traces")).scalar()
+    current_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current_month
+    last_month = _add_months(current_month, PARTITIONS_AHEAD)
+
+    partition_count = 0
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE chat_traces_p{month:%Y_%m} PARTITION OF chat_traces_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        partition_count += 1
+        month = next_month
+
+    # Catches rows outside the pre-created months; ChatTracePartitionService moves
+    # them into a partition for their month on its next maintenance run
+    op.execute("CREATE TABLE chat_traces_default PARTITION OF chat_traces_partitioned DEFAULT")
+    print(f"  Created {partition_count} monthly partitions + default partition")
+
+    print("  Copying existing rows...")
+    op.execute("INSERT INTO chat_traces_partitioned SELECT * FROM chat_traces")
+
+    # Keep the id sequence alive across the table swap
+    op.execute("ALTER SEQUENCE chat_traces_id_seq OWNED BY NONE")
+    op.drop_table('chat_traces')
+    op.rename_table('chat_traces_partitioned', 'chat_traces')
+    op.execute("ALTER SEQUENCE chat_traces_id_seq OWNED BY chat_traces.id")
+
+    op.create_primary_key('chat_traces_pkey', 'chat_traces', ['id', 'created_at'])
+    _add_foreign_keys('chat_traces')
+
+    print("  Creating indexes for 'chat_traces'...")
+    _create_indexes('chat_traces')
+
+    print("✅ chat_traces is now partitioned by month on created_at")
+
+
+def downgrade() -> None:
+    """Rebuild chat_traces as a single unpartitioned table."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    print("🔄 Merging chat_traces partitions back into a single table...")
+
+    op.execute("CREATE TABLE chat_traces_unpartitioned (LIKE chat_traces INCLUDING DEFAULTS)")
+    op.execute("INSERT INTO chat_traces_unpartitioned SELECT * FROM chat_traces")
+
+    op.execute("ALTER SEQUENCE chat_traces_id_seq OWNED BY NONE")
+    # Dropping the parent drops every attached partition
+    op.drop_table('chat_traces')
+    op.rename_table('chat_traces_unpartitioned', 'chat_traces')
+    op.execute("ALTER SEQUENCE chat_traces_id_seq OWNED BY chat_traces.id")
+
+    op.create_primary_key('chat_traces_pkey', 'chat_traces', ['id'])
+    _add_foreign_keys('chat_traces')
+
+    print("  Creating indexes for 'chat_traces'...")
+    _create_indexes('chat_traces')
+
+    print("✅ chat_traces is a single unpartitioned table again")
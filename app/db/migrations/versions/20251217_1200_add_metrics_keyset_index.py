@@ -0,0 +1,48 @@
+"""Add keyset pagination index for metrics listing
+
+Revision ID: 20251217_metrics_keyset_index
+Revises: 20251216_partition_chat_traces
+Create Date: 2025-12-17
+
+GET /metrics orders by (metric_date DESC, platform_id, item_id) and pages
+with a cursor on that key. This index lets PostgreSQL seek straight to the
+cursor position and read rows already in order, so deep pages cost the same
+as the first one. It supersedes idx_metrics_date_platform, which is a
+left-prefix of it.
+
+Built CONCURRENTLY so the migration does not block metrics sync writes.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251217_metrics_keyset_index'
+down_revision = '20251216_partition_chat_traces'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the (metric_date DESC, platform_id, item_id) index on metrics."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_date_platform_item "
+            "ON metrics (metric_date DESC, platform_id, item_id)"
+        )
+        # Left-prefix of idx_metrics_date_platform_item, only adds write cost
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_metrics_date_platform")
+
+    print("✅ Added keyset pagination index to metrics")
+
+
+def downgrade() -> None:
+    """Restore idx_metrics_date_platform and drop the keyset index."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_metrics_date_platform "
+            "ON metrics (metric_date, platform_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_metrics_date_platform_item")
+
+    print("✅ Removed keyset pagination index from metrics")
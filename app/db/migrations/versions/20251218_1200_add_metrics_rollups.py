@@ -0,0 +1,87 @@
+"""Add metrics_rollups table for aggregated metrics
+
+Revision ID: 20251218_metrics_rollups
+Revises: 20251217_metrics_keyset_index
+Create Date: 2025-12-18
+
+Pre-aggregates metrics per (platform_id, item_type) at day, ISO week and
+month grain. /metrics/aggregated reads whole months and weeks from here and
+only the edge days from the daily rollups, instead of scanning every raw
+metrics row in the range. The campaign sync keeps the table current; this
+migration backfills it from existing metrics.
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '20251218_metrics_rollups'
+down_revision = '20251217_metrics_keyset_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create metrics_rollups and backfill it from metrics."""
+    op.create_table('metrics_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('grain', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('platform_id', sa.Integer(), nullable=False),
+    sa.Column('item_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('clicks', sa.Integer(), nullable=False),
+    sa.Column('impressions', sa.Integer(), nullable=False),
+    sa.Column('leads', sa.Integer(), nullable=False),
+    sa.Column('spent', sa.Float(), nullable=False),
+    sa.Column('conversions', sa.Integer(), nullable=False),
+    sa.Column('conv_val', sa.Float(), nullable=False),
+    sa.Column('reach_max_day', sa.Integer(), nullable=True),
+    sa.Column('reach_sum', sa.Integer(), nullable=False),
+    sa.Column('source_rows', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['platform_id'], ['digital_assets.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('grain', 'platform_id', 'item_type', 'period_start', name='uq_metrics_rollups_key')
+    )
+    op.create_index('idx_metrics_rollups_grain_period', 'metrics_rollups', ['grain', 'period_start', 'platform_id'], unique=False)
+
+    # Backfill: daily rollups from raw metrics, then week/month from the daily rows
+    op.execute("""
+        INSERT INTO metrics_rollups (
+            created_at, updated_at, grain, period_start, platform_id, item_type,
+            clicks, impressions, leads, spent, conversions, conv_val,
+            reach_max_day, reach_sum, source_rows
+        )
+        SELECT NOW(), NOW(), 'day', metric_date, platform_id, item_type,
+               COALESCE(SUM(clicks), 0), COALESCE(SUM(impressions), 0), COALESCE(SUM(leads), 0),
+               COALESCE(SUM(spent), 0), COALESCE(SUM(conversions), 0), COALESCE(SUM(conv_val), 0),
+               MAX(reach), COALESCE(SUM(reach), 0), COUNT(*)
+        FROM metrics
+        GROUP BY metric_date, platform_id, item_type
+    """)
+    for grain in ('week', 'month'):
+        op.execute(f"""
+            INSERT INTO metrics_rollups (
+                created_at, updated_at, grain, period_start, platform_id, item_type,
+                clicks, impressions, leads, spent, conversions, conv_val,
+                reach_max_day, reach_sum, source_rows
+            )
+            SELECT NOW(), NOW(), '{grain}', date_trunc('{grain}', period_start)::date, platform_id, item_type,
+                   SUM(clicks), SUM(impressions), SUM(leads), SUM(spent), SUM(conversions), SUM(conv_val),
+                   MAX(reach_max_day), SUM(reach_sum), SUM(source_rows)
+            FROM metrics_rollups
+            WHERE grain = 'day'
+            GROUP BY date_trunc('{grain}', period_start), platform_id, item_type
+        """)
+
+    print("✅ Created metrics_rollups and backfilled from metrics")
+
+
+def downgrade() -> None:
+    """Drop metrics_rollups."""
+    op.drop_index('idx_metrics_rollups_grain_period', table_name='metrics_rollups')
+    op.drop_table('metrics_rollups')
+
+    print("✅ Dropped metrics_rollups")
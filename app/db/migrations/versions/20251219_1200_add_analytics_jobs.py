@@ -0,0 +1,60 @@
+"""Add analytics_jobs table for the durable job queue
+
+Revision ID: 20251219_analytics_jobs
+Revises: 20251218_metrics_rollups
+Create Date: 2025-12-19
+
+Long analytics runs are stored here and executed by standalone workers
+(scripts/run_job_worker.py). Workers claim due rows with
+SELECT ... FOR UPDATE SKIP LOCKED; idx_analytics_jobs_claim keeps that scan
+on (status, run_after).
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '20251219_analytics_jobs'
+down_revision = '20251218_metrics_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create analytics_jobs."""
+    op.create_table('analytics_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('job_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('campaigner_id', sa.Integer(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('lease_owner', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['campaigner_id'], ['campaigners.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_analytics_jobs_job_type'), 'analytics_jobs', ['job_type'], unique=False)
+    op.create_index(op.f('ix_analytics_jobs_campaigner_id'), 'analytics_jobs', ['campaigner_id'], unique=False)
+    op.create_index('idx_analytics_jobs_claim', 'analytics_jobs', ['status', 'run_after'], unique=False)
+
+    print("✅ Created analytics_jobs")
+
+
+def downgrade() -> None:
+    """Drop analytics_jobs."""
+    op.drop_index('idx_analytics_jobs_claim', table_name='analytics_jobs')
+    op.drop_index(op.f('ix_analytics_jobs_campaigner_id'), table_name='analytics_jobs')
+    op.drop_index(op.f('ix_analytics_jobs_job_type'), table_name='analytics_jobs')
+    op.drop_table('analytics_jobs')
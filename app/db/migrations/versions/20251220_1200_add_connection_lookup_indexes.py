@@ -0,0 +1,48 @@
+"""Add composite indexes for connection lookups
+
+Revision ID: 20251220_connection_lookup_idx
+Revises: 20251219_analytics_jobs
+Create Date: 2025-12-20
+
+app/utils/connection_utils loads a customer's non-revoked connections with
+their digital assets, most recently updated first, and filters assets by
+(customer_id, provider, asset_type, is_active). connections had no index on
+customer_id at all, and the digital_assets unique key only covers
+(customer_id, external_id, asset_type).
+
+Built CONCURRENTLY so the migration does not block OAuth callbacks and token
+refreshes writing to connections.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251220_connection_lookup_idx'
+down_revision = '20251219_analytics_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the connections and digital_assets lookup indexes."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_connections_customer_asset_revoked_updated "
+            "ON connections (customer_id, digital_asset_id, revoked, updated_at DESC)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_digital_assets_customer_provider_type_active "
+            "ON digital_assets (customer_id, provider, asset_type, is_active)"
+        )
+
+    print("✅ Added connection lookup indexes")
+
+
+def downgrade() -> None:
+    """Drop the connection lookup indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_digital_assets_customer_provider_type_active")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_connections_customer_asset_revoked_updated")
+
+    print("✅ Removed connection lookup indexes")
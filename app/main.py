@@ -8,6 +8,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import asyncio
 import time
 
 # Load environment variables from .env file
@@ -19,11 +20,12 @@ from datetime import datetime, timezone
 
 from app.config import get_settings
 from app.config.database import init_database
-from app.config.logging import setup_logging, get_logger
+from app.config.logging import setup_logging, shutdown_logging, get_logger
 from app.api import api_router
 from app.api.v1.routes.health import router as health_router
 from app.api.v1.routes.websocket import router as websocket_router
 from app.core.security import verify_api_key
+from app.utils.connection_utils import connection_lookup_scope
 
 logger = get_logger("main")
 
@@ -60,9 +62,36 @@ async def lifespan(app: FastAPI):
     logger.info("✅ All required environment variables are present")
 
     init_database()
+
+    # Warm the agent config registry so the first analysis doesn't pay for it
+    try:
+        from app.core.agent_config_registry import agent_config_registry
+        agent_config_registry.snapshot()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not preload agent configs: {str(e)}")
+
+    from app.core.websocket_backplane import create_backplane
+    from app.core.websocket_manager import connection_manager
+    backplane = create_backplane(settings)
+    if backplane is not None:
+        await connection_manager.start_backplane(backplane)
+
     yield
     # Shutdown
-    pass
+    try:
+        await connection_manager.drain(timeout=5)
+    except asyncio.TimeoutError:
+        logger.warning("⚠️ WebSocket send queues not drained before shutdown")
+    await connection_manager.stop_backplane()
+    from app.services.crew_execution_pool import crew_execution_pool
+    await crew_execution_pool.shutdown()
+    from app.config.langfuse_config import LangfuseConfig
+    LangfuseConfig.shutdown()
+    logger.info("✅ Langfuse traces flushed")
+    from app.services.detailed_execution_logger import shutdown_detailed_loggers
+    shutdown_detailed_loggers()
+    logger.info("✅ Detailed execution logs flushed")
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -91,6 +120,12 @@ def create_app() -> FastAPI:
         logger.debug(f"📤 {request.method} {request.url.path} - Status: {response.status_code} - Time: {process_time:.3f}s")
         return response
 
+    # Repeated connection lookups within one request share one query per customer
+    @app.middleware("http")
+    async def scope_connection_lookups(request: Request, call_next):
+        with connection_lookup_scope():
+            return await call_next(request)
+
     # Add CORS middleware (including WebSocket support)
     app.add_middleware(
         CORSMiddleware,
@@ -10,11 +10,12 @@ from .users import (
 from .agents import AgentConfig, RoutingRule
 from .analytics import (
     DigitalAsset, Connection, KpiGoal, KpiValue, UserPropertySelection, KpiCatalog, KpiSettings,
-    AssetType, AuthType, Audience, Metrics
+    AssetType, AuthType, Audience, Metrics, MetricsRollup
 )
 from .customer_data import RTMTable, QuestionsTable
 from .chat_feedback import ChatFeedback, FeedbackType
 from .tasks import Task, TaskPriority, TaskStatus
+from .jobs import AnalyticsJob, JobStatus
 
 __all__ = [
     # Base
@@ -29,7 +30,7 @@ __all__ = [
 
     # Analytics and assets
     "DigitalAsset", "Connection", "KpiGoal", "KpiValue", "UserPropertySelection", "KpiCatalog", "KpiSettings",
-    "AssetType", "AuthType", "Audience", "Metrics",
+    "AssetType", "AuthType", "Audience", "Metrics", "MetricsRollup",
 
     # Customer data tables
     "RTMTable", "QuestionsTable",
@@ -38,5 +39,8 @@ __all__ = [
     "ChatFeedback", "FeedbackType",
 
     # Tasks
-    "Task", "TaskPriority", "TaskStatus"
+    "Task", "TaskPriority", "TaskStatus",
+
+    # Background jobs
+    "AnalyticsJob", "JobStatus"
 ]
@@ -63,6 +63,8 @@ class DigitalAsset(BaseModel, table=True):
     __table_args__ = (
         UniqueConstraint('customer_id', 'external_id', 'asset_type',
                         name='uq_digital_asset_customer_external_type'),
+        # Per-customer platform lookups in app/utils/connection_utils
+        Index('idx_digital_assets_customer_provider_type_active', 'customer_id', 'provider', 'asset_type', 'is_active'),
     )
 
 
@@ -98,6 +100,12 @@ class Connection(BaseModel, table=True):
     failure_count: int = Field(default=0, description="Number of consecutive failures")
     failure_reason: Optional[str] = Field(default=None, max_length=255, description="Reason for last failure (e.g., 'token_refresh_failed', 'mcp_validation_failed', 'invalid_credentials')")
 
+    __table_args__ = (
+        # Per-customer connection lookups in app/utils/connection_utils, most recently updated first
+        Index('idx_connections_customer_asset_revoked_updated', 'customer_id', 'digital_asset_id', 'revoked', 'updated_at',
+              postgresql_ops={'updated_at': 'DESC'}),
+    )
+
 
 class KpiCatalog(BaseModel, table=True):
     """Standardized KPI definitions for different sub-customer types"""
@@ -333,5 +341,39 @@ class Metrics(BaseModel, table=True):
         Index('idx_metrics_date', 'metric_date'),
         Index('idx_metrics_item_id', 'item_id'),
         Index('idx_metrics_platform_id', 'platform_id'),
-        Index('idx_metrics_date_platform', 'metric_date', 'platform_id'),
+        # Matches GET /metrics ordering (metric_date DESC, platform_id, item_id) for keyset pagination
+        Index('idx_metrics_date_platform_item', 'metric_date', 'platform_id', 'item_id', postgresql_ops={'metric_date': 'DESC'}),
+    )
+
+
+class MetricsRollup(BaseModel, table=True):
+    """
+    Pre-aggregated metrics per platform and item type.
+
+    One row per (grain, platform_id, item_type, period_start), where grain is
+    'day', 'week' (ISO week, period_start is the Monday) or 'month'
+    (period_start is the 1st). Kept in sync with the metrics table by
+    app.services.metrics_rollup_service and read by /metrics/aggregated.
+    """
+    __tablename__ = "metrics_rollups"
+
+    grain: str = Field(max_length=10, description="'day', 'week' or 'month'")
+    period_start: date = Field(description="First day of the rolled-up period")
+    platform_id: int = Field(foreign_key="digital_assets.id", description="Digital asset (platform) ID")
+    item_type: str = Field(max_length=20, description="Type: 'ad' or 'ad_group'")
+
+    # Decomposable aggregates: sums add up across periods, reach_max_day takes the max
+    clicks: int = Field(default=0)
+    impressions: int = Field(default=0)
+    leads: int = Field(default=0)
+    spent: float = Field(default=0.0)
+    conversions: int = Field(default=0)
+    conv_val: float = Field(default=0.0)
+    reach_max_day: Optional[int] = Field(default=None, description="Highest single-day reach of any item")
+    reach_sum: int = Field(default=0, description="Sum of daily reach")
+    source_rows: int = Field(default=0, description="Number of metrics rows aggregated")
+
+    __table_args__ = (
+        UniqueConstraint('grain', 'platform_id', 'item_type', 'period_start', name='uq_metrics_rollups_key'),
+        Index('idx_metrics_rollups_grain_period', 'grain', 'period_start', 'platform_id'),
     )
@@ -9,7 +9,7 @@ from datetime import datetime
 from typing import Optional, Dict, Any
 from enum import Enum
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import Index, JSON, Text
+from sqlalchemy import Index, JSON, Text, text
 from sqlalchemy.dialects import postgresql
 from .base import BaseModel
 
@@ -133,6 +133,9 @@ class ChatTrace(BaseModel, table=True):
       }
     """
 
+    # On PostgreSQL this table is range-partitioned by month on created_at and its
+    # primary key is (id, created_at); partitions are managed by migration
+    # 20251216_partition_chat_traces and ChatTracePartitionService.
     __tablename__ = "chat_traces"
 
     # Core identification
@@ -171,7 +174,22 @@ class ChatTrace(BaseModel, table=True):
         Index('idx_chat_traces_customer_id', 'customer_id'),
         Index('idx_chat_traces_session_id', 'session_id'),
         Index('idx_chat_traces_created_at', 'created_at'),
-        Index('idx_chat_traces_thread_record', 'thread_id', 'record_type'),  # Composite for filtering
+        # Per-thread event reads: WHERE thread_id = ? AND record_type = ? ORDER BY sequence_number
+        Index('idx_chat_traces_thread_record_seq', 'thread_id', 'record_type', 'sequence_number'),
+        # Trace listings: WHERE record_type = 'conversation' AND created_at >= ? ORDER BY created_at DESC
+        Index(
+            'idx_chat_traces_conversation_created_at',
+            'created_at',
+            postgresql_where=text("record_type = 'conversation'"),
+            sqlite_where=text("record_type = 'conversation'"),
+        ),
+        # Status filters: WHERE record_type = 'conversation' AND data->>'status' = ?
+        # JSONB operator syntax, so only emitted for PostgreSQL
+        Index(
+            'idx_chat_traces_conversation_status',
+            text("(data->>'status')"),
+            postgresql_where=text("record_type = 'conversation'"),
+        ).ddl_if(dialect='postgresql'),
     ]
 
     # Only add GIN index when using PostgreSQL (JSONB)
@@ -182,6 +200,9 @@ class ChatTrace(BaseModel, table=True):
         )
 
     __table_args__ = tuple(_indexes)
+    # Drop the helper from the class namespace; otherwise pydantic registers it as a
+    # private attribute and deep-copies every Index (and its Table) on each instantiation
+    del _indexes
 
     # Convenience properties for accessing common fields in data JSON
     # These provide backwards compatibility and better developer experience
@@ -0,0 +1,63 @@
+"""
+Durable job queue models.
+
+Long analytics runs (DialogCX analyses, metrics syncs) are stored as jobs and
+executed by standalone workers, so they survive API redeploys and can be
+scaled separately from the API pods.
+"""
+
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Optional
+from sqlalchemy import Index, Text
+from sqlmodel import Field, Column, JSON
+from .base import BaseModel
+
+
+class JobStatus(str, Enum):
+    """Job lifecycle states"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+TERMINAL_JOB_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class AnalyticsJob(BaseModel, table=True):
+    """
+    A unit of background work claimed by one worker at a time.
+
+    Workers lease due jobs with SELECT ... FOR UPDATE SKIP LOCKED and extend
+    the lease with heartbeats; a job whose lease expires is picked up again.
+    """
+    __tablename__ = "analytics_jobs"
+    __table_args__ = (
+        Index("idx_analytics_jobs_claim", "status", "run_after"),
+    )
+
+    job_type: str = Field(max_length=50, index=True, description="Handler name, e.g. 'metrics_sync'")
+    payload: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON), description="Handler arguments")
+    status: str = Field(default=JobStatus.QUEUED.value, max_length=20, description="queued, running, succeeded, failed, cancelled")
+    campaigner_id: Optional[int] = Field(default=None, foreign_key="campaigners.id", index=True,
+                                         description="Campaigner who submitted the job")
+
+    # Retry bookkeeping
+    attempts: int = Field(default=0, description="Leases taken so far")
+    max_attempts: int = Field(default=3)
+    run_after: datetime = Field(default_factory=lambda: datetime.now(timezone.utc),
+                                description="Not leased before this time (retry backoff)")
+
+    # Lease
+    lease_owner: Optional[str] = Field(default=None, max_length=100, description="Worker ID holding the lease")
+    lease_expires_at: Optional[datetime] = Field(default=None)
+    heartbeat_at: Optional[datetime] = Field(default=None)
+    cancel_requested: bool = Field(default=False)
+
+    # Outcome
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
+    result: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    last_error: Optional[str] = Field(default=None, sa_column=Column(Text))
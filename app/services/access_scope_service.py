@@ -0,0 +1,212 @@
+"""
+Access Scope Service
+Resolves which customers and platforms (digital assets) a campaigner may read,
+for the metrics and dashboard routes.
+
+Scopes are cached per campaigner for a short TTL and dropped whenever a
+customer, assignment or digital asset is committed through the ORM in this
+process. Other workers pick up changes when their TTL expires.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.config.cache_registry import cache_stats, register_cache, register_invalidation
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.models.analytics import DigitalAsset
+from app.models.users import Campaigner, Customer, CustomerCampaignerAssignment, UserRole
+
+logger = get_logger(__name__)
+
+SCOPE_MODELS = (Customer, CustomerCampaignerAssignment, DigitalAsset)
+
+
+class ScopeAccessDenied(Exception):
+    """Raised when a campaigner asks for a customer or platform outside their scope."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """Customers a campaigner may read and the platform IDs that belong to each."""
+    campaigner_id: int
+    platforms_by_customer: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+
+    @property
+    def customer_ids(self) -> List[int]:
+        return list(self.platforms_by_customer)
+
+    def platform_ids(self) -> List[int]:
+        return [pid for pids in self.platforms_by_customer.values() for pid in pids]
+
+
+class AccessScopeResolver:
+    """
+    TTL cache of campaigner → customer/platform scopes.
+
+    OWNER callers are unrestricted; only their customer → platform lookups
+    are cached. ADMIN scopes cover the agency's customers, CAMPAIGNER and
+    VIEWER scopes their active assignments.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._scopes: Dict[tuple, Tuple[float, AccessScope]] = {}
+        self._customer_platforms: Dict[int, Tuple[float, Tuple[int, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _ttl(self) -> float:
+        return self.ttl_seconds if self.ttl_seconds is not None else get_settings().access_scope_cache_ttl_seconds
+
+    def _cache_get(self, cache: dict, key):
+        with self._lock:
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            cache.pop(key, None)
+            self.misses += 1
+            return None
+
+    def _cache_put(self, cache: dict, key, value) -> None:
+        ttl = self._ttl()
+        if ttl <= 0:
+            return
+        with self._lock:
+            if len(cache) >= self.max_entries:
+                cache.clear()
+            cache[key] = (time.monotonic() + ttl, value)
+
+    def get_scope(self, session: Session, campaigner: Campaigner) -> AccessScope:
+        """Return the (possibly cached) scope of a non-OWNER campaigner."""
+        # Role and agency are part of the key so a changed user never reuses an old scope
+        key = (campaigner.id, campaigner.role, campaigner.agency_id)
+        scope = self._cache_get(self._scopes, key)
+        if scope is not None:
+            return scope
+
+        if campaigner.role == UserRole.ADMIN:
+            customer_ids = session.exec(
+                select(Customer.id).where(Customer.agency_id == campaigner.agency_id)
+            ).all()
+        else:
+            customer_ids = session.exec(
+                select(CustomerCampaignerAssignment.customer_id).where(
+                    CustomerCampaignerAssignment.campaigner_id == campaigner.id,
+                    CustomerCampaignerAssignment.is_active == True
+                )
+            ).all()
+
+        platforms_by_customer: Dict[int, List[int]] = {customer_id: [] for customer_id in customer_ids}
+        if customer_ids:
+            rows = session.exec(
+                select(DigitalAsset.customer_id, DigitalAsset.id).where(DigitalAsset.customer_id.in_(customer_ids))
+            ).all()
+            for customer_id, asset_id in rows:
+                platforms_by_customer[customer_id].append(asset_id)
+
+        scope = AccessScope(
+            campaigner_id=campaigner.id,
+            platforms_by_customer={cid: tuple(pids) for cid, pids in platforms_by_customer.items()},
+        )
+        self._cache_put(self._scopes, key, scope)
+        return scope
+
+    def get_customer_platform_ids(self, session: Session, customer_id: int) -> List[int]:
+        """Return the (possibly cached) platform IDs of one customer."""
+        platform_ids = self._cache_get(self._customer_platforms, customer_id)
+        if platform_ids is None:
+            platform_ids = tuple(session.exec(
+                select(DigitalAsset.id).where(DigitalAsset.customer_id == customer_id)
+            ).all())
+            self._cache_put(self._customer_platforms, customer_id, platform_ids)
+        return list(platform_ids)
+
+    def resolve_platform_ids(
+        self,
+        session: Session,
+        campaigner: Campaigner,
+        customer_id: Optional[int] = None,
+        platform_id: Optional[int] = None,
+    ) -> Optional[List[int]]:
+        """
+        Resolve the platform IDs a request may read.
+
+        Args:
+            session: Database session (used only on a cache miss)
+            campaigner: Authenticated caller
+            customer_id: Optional customer filter from the request
+            platform_id: Optional platform filter from the request
+
+        Returns:
+            None if unrestricted (OWNER without filters), otherwise the allowed
+            platform IDs; an empty list means there is nothing to return
+
+        Raises:
+            ScopeAccessDenied: If customer_id or platform_id is outside the caller's scope
+        """
+        if campaigner.role == UserRole.OWNER:
+            if platform_id:
+                return [platform_id]
+            if customer_id:
+                return self.get_customer_platform_ids(session, customer_id)
+            return None
+
+        scope = self.get_scope(session, campaigner)
+        if not scope.platforms_by_customer:
+            return []
+
+        if customer_id:
+            if customer_id not in scope.platforms_by_customer:
+                raise ScopeAccessDenied("You do not have access to this customer's metrics")
+            platform_ids = list(scope.platforms_by_customer[customer_id])
+        else:
+            platform_ids = scope.platform_ids()
+
+        if not platform_ids:
+            return []
+
+        if platform_id:
+            if platform_id not in platform_ids:
+                raise ScopeAccessDenied("You do not have access to this platform's metrics")
+            return [platform_id]
+        return platform_ids
+
+    def invalidate(self) -> None:
+        """Drop every cached scope."""
+        with self._lock:
+            self._scopes.clear()
+            self._customer_platforms.clear()
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return cache_stats(
+                len(self._scopes) + len(self._customer_platforms), self.hits, self.misses,
+                invalidations=self.invalidations,
+            )
+
+
+access_scope_resolver = register_cache("access_scope", AccessScopeResolver())
+
+
+def _invalidate_on_commit(_changes) -> None:
+    access_scope_resolver.invalidate()
+    logger.debug("🔄 [Access Scope] Cache invalidated after customer/assignment/asset change")
+
+
+# Drop cached scopes once assignment/asset changes are committed
+register_invalidation("access_scope", SCOPE_MODELS, after_commit=_invalidate_on_commit)
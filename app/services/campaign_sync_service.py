@@ -16,6 +16,7 @@ from app.config.database import get_session
 from app.models.analytics import KpiGoal, KpiValue, Connection, DigitalAsset, AssetType
 from app.services.google_ads_service import GoogleAdsService
 from app.services.facebook_service import FacebookService
+from app.services.metrics_rollup_service import mark_metrics_changed
 from app.utils.connection_utils import get_google_ads_connections, get_facebook_connections
 
 
@@ -1222,6 +1223,8 @@ class CampaignSyncService:
                     logger.warning(f"   ⚠️  Error processing ad {row.ad_group_ad.ad.id}: {row_error}")
                     continue
 
+            # Upserts bypass the ORM, so tell the rollup maintenance which days changed
+            mark_metrics_changed(session, platform.id, sync_dates)
             session.commit()
             logger.info(f"   ✅ Processed {metrics_count} Google Ads records")
             return metrics_count
@@ -1420,6 +1423,8 @@ class CampaignSyncService:
                 url = data.get('paging', {}).get('next')
                 params = None  # Next URL already has params
 
+            # Upserts bypass the ORM, so tell the rollup maintenance which days changed
+            mark_metrics_changed(session, platform.id, sync_dates)
             session.commit()
             logger.info(f"   ✅ Processed {metrics_count} Facebook Ads records")
             return metrics_count
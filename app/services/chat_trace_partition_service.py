@@ -0,0 +1,252 @@
+"""
+Partition maintenance and retention for the chat_traces table.
+
+chat_traces is range-partitioned by month on created_at (see migration
+20251216_partition_chat_traces). This service:
+- Keeps empty partitions ready for the upcoming months
+- Keeps the DEFAULT partition empty by moving any rows it caught into a new
+  partition for their month (PostgreSQL refuses to create a partition whose
+  range has rows in DEFAULT)
+- Expires partitions older than the retention window by dropping them, or by
+  detaching and renaming them to chat_traces_archive_YYYY_MM for archiving
+
+Both operations are catalog-only (O(1) per partition) rather than DELETE scans.
+Intended to run daily from the internal scheduled endpoint in /traces.
+"""
+
+import re
+from datetime import date
+from typing import Optional, Dict, Any, List
+
+from sqlmodel import Session
+from sqlalchemy import text
+
+from app.config.database import get_engine
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+PARENT_TABLE = "chat_traces"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_PATTERN = re.compile(r"^chat_traces_p(\d{4})_(\d{2})$")
+
+
+def add_months(month_start: date, months: int) -> date:
+    """Return the first day of the month `months` after `month_start` (may be negative)."""
+    month_index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month_start: date) -> str:
+    """Return the partition table name for a month, e.g. chat_traces_p2025_12."""
+    return f"{PARENT_TABLE}_p{month_start:%Y_%m}"
+
+
+def archive_name(month_start: date) -> str:
+    """Return the archive table name for a detached month partition."""
+    return f"{PARENT_TABLE}_archive_{month_start:%Y_%m}"
+
+
+def parse_partition_month(name: str) -> Optional[date]:
+    """Return the month covered by a partition name, or None for other tables (e.g. default)."""
+    match = PARTITION_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_partition_months(
+    partition_months: List[date],
+    retention_months: int,
+    today: Optional[date] = None
+) -> List[date]:
+    """
+    Select partitions that fall entirely outside the retention window.
+
+    Args:
+        partition_months: Months that currently have a partition
+        retention_months: Number of months to keep, including the current month
+        today: Reference date (defaults to today)
+
+    Returns:
+        Sorted list of months whose partitions should be expired
+    """
+    current_month = (today or date.today()).replace(day=1)
+    cutoff = add_months(current_month, -(retention_months - 1))
+    return sorted(month for month in partition_months if month < cutoff)
+
+
+class ChatTracePartitionService:
+    """Maintains monthly chat_traces partitions and applies retention."""
+
+    def __init__(self, session: Optional[Session] = None):
+        """
+        Initialize ChatTracePartitionService.
+
+        Args:
+            session: Optional SQLModel session. If not provided, a session is created per run.
+        """
+        self.session = session
+        self._should_close_session = session is None
+
+    def _get_session(self) -> Session:
+        """Get or create a database session."""
+        if self.session:
+            return self.session
+        return Session(get_engine())
+
+    def _close_session(self, session: Session):
+        """Close session if it was created internally."""
+        if self._should_close_session and session:
+            session.close()
+
+    def is_partitioned(self, session: Session) -> bool:
+        """Check whether chat_traces is a partitioned table (PostgreSQL with migration applied)."""
+        if session.get_bind().dialect.name != "postgresql":
+            return False
+
+        result = session.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table_name AND c.relnamespace = 'public'::regnamespace"
+            ),
+            {"table_name": PARENT_TABLE}
+        ).first()
+        return result is not None
+
+    def list_partition_months(self, session: Session) -> List[date]:
+        """Return the months that currently have an attached partition."""
+        rows = session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = :table_name"
+            ),
+            {"table_name": PARENT_TABLE}
+        ).all()
+
+        months = [parse_partition_month(row[0]) for row in rows]
+        return sorted(month for month in months if month is not None)
+
+    def default_partition_months(self, session: Session) -> List[date]:
+        """Return the months the DEFAULT partition holds rows for."""
+        rows = session.execute(
+            text(f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {DEFAULT_PARTITION}")
+        ).all()
+        return sorted(row[0] for row in rows)
+
+    def ensure_future_partitions(self, session: Session, months_ahead: int, today: Optional[date] = None) -> List[str]:
+        """
+        Create any missing partitions from the current month through `months_ahead` months.
+
+        Also creates a partition for every month the DEFAULT partition caught
+        rows for, moving those rows into it so DEFAULT stays empty.
+
+        Returns:
+            Names of partitions that were created
+        """
+        current_month = (today or date.today()).replace(day=1)
+        existing = set(self.list_partition_months(session))
+        caught = set(self.default_partition_months(session))
+        upcoming = {add_months(current_month, offset) for offset in range(months_ahead + 1)}
+
+        created = []
+        for month in sorted((upcoming | caught) - existing):
+            name = partition_name(month)
+            bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            if month in caught:
+                moved = self._create_from_default(session, name, month, bounds)
+                logger.info(f"🔄 [ChatTracePartitions] Moved {moved} rows from {DEFAULT_PARTITION} into {name}")
+            else:
+                session.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} {bounds}"))
+            created.append(name)
+
+        return created
+
+    @staticmethod
+    def _create_from_default(session: Session, name: str, month: date, bounds: str) -> int:
+        """Create a month partition from the DEFAULT partition's rows for that month."""
+        # Built detached, filled, then attached: the range can't be attached
+        # while DEFAULT still holds rows for it
+        session.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        moved = session.execute(
+            text(
+                f"WITH moved AS ("
+                f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :month_start AND created_at < :month_end "
+                f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+            ),
+            {"month_start": month, "month_end": add_months(month, 1)}
+        ).rowcount
+        session.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} {bounds}"))
+        return moved
+
+    def expire_partitions(
+        self,
+        session: Session,
+        retention_months: int,
+        archive: bool = False,
+        today: Optional[date] = None
+    ) -> List[str]:
+        """
+        Drop (or detach and archive) partitions older than the retention window.
+
+        Returns:
+            Names of partitions that were expired
+        """
+        expired = expired_partition_months(self.list_partition_months(session), retention_months, today)
+
+        names = []
+        for month in expired:
+            name = partition_name(month)
+            if archive:
+                session.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+                session.execute(text(f"ALTER TABLE {name} RENAME TO {archive_name(month)}"))
+            else:
+                session.execute(text(f"DROP TABLE {name}"))
+            names.append(name)
+
+        return names
+
+    def run_maintenance(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Create upcoming partitions and apply retention using application settings.
+
+        Returns:
+            Summary dictionary with created and expired partition names
+        """
+        settings = get_settings()
+        session = self._get_session()
+        try:
+            if not self.is_partitioned(session):
+                logger.info("ℹ️ [ChatTracePartitions] chat_traces is not partitioned, skipping maintenance")
+                return {"partitioned": False, "created": [], "expired": [], "archived": False}
+
+            created = self.ensure_future_partitions(session, settings.chat_traces_partitions_ahead, today)
+            expired = self.expire_partitions(
+                session,
+                settings.chat_traces_retention_months,
+                archive=settings.chat_traces_archive_expired,
+                today=today
+            )
+            session.commit()
+
+            logger.info(
+                f"✅ [ChatTracePartitions] Maintenance complete: created={created}, "
+                f"{'archived' if settings.chat_traces_archive_expired else 'dropped'}={expired}"
+            )
+            return {
+                "partitioned": True,
+                "created": created,
+                "expired": expired,
+                "archived": settings.chat_traces_archive_expired
+            }
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"❌ [ChatTracePartitions] Maintenance failed: {e}")
+            raise
+        finally:
+            self._close_session(session)
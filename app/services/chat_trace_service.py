@@ -11,7 +11,7 @@ This service provides a unified interface for:
 All records stored in single `chat_traces` table with type-specific JSON data.
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List, Tuple
 from sqlmodel import Session, select, func
 from sqlalchemy import and_, or_
@@ -23,12 +23,56 @@ from app.config.langfuse_config import LangfuseConfig
 from app.config.database import get_engine
 
 try:
-    from langfuse import Langfuse
-    from langfuse.client import StatefulTraceClient as LangfuseTrace
+    import langfuse  # noqa: F401
     LANGFUSE_AVAILABLE = True
 except ImportError:
     LANGFUSE_AVAILABLE = False
-    LangfuseTrace = None
+
+# Child records are written after their conversation, but allow for clock skew
+# between instances when bounding created_at for partition pruning
+CHILD_RECORD_CLOCK_SKEW = timedelta(days=1)
+
+# Child record types returned by the thread events API
+EVENT_RECORD_TYPES = (
+    RecordType.MESSAGE,
+    RecordType.AGENT_STEP,
+    RecordType.TOOL_USAGE,
+    RecordType.CREWAI_EXECUTION,
+)
+
+# data fields holding prompts, logs or tool payloads; only returned on demand
+LARGE_DATA_FIELDS = ("tool_input", "tool_output", "crewai_input_prompt", "crewai_log")
+LARGE_METADATA_FIELDS = ("system_prompt", "agent_backstory")
+
+
+def project_trace_data(data: Dict[str, Any], include_large_fields: bool = False) -> Dict[str, Any]:
+    """
+    Project a chat trace data dict for API responses.
+
+    Args:
+        data: ChatTrace.data dictionary
+        include_large_fields: Return the data unchanged when True
+
+    Returns:
+        Copy of data without large fields; names of non-empty omitted fields
+        are listed under "omitted_fields"
+    """
+    if include_large_fields:
+        return dict(data)
+
+    projected = {key: value for key, value in data.items() if key not in LARGE_DATA_FIELDS}
+    omitted = [key for key in LARGE_DATA_FIELDS if data.get(key)]
+
+    metadata = data.get("extra_metadata")
+    if isinstance(metadata, dict) and any(key in metadata for key in LARGE_METADATA_FIELDS):
+        projected["extra_metadata"] = {
+            key: value for key, value in metadata.items() if key not in LARGE_METADATA_FIELDS
+        }
+        omitted.extend(f"extra_metadata.{key}" for key in LARGE_METADATA_FIELDS if metadata.get(key))
+
+    if omitted:
+        projected["omitted_fields"] = omitted
+    return projected
 
 
 class ChatTraceService:
@@ -55,6 +99,33 @@ class ChatTraceService:
         if self._should_close_session and session:
             session.close()
 
+    @staticmethod
+    def thread_records_filter(conversation: ChatTrace, record_type: Any):
+        """
+        Build the WHERE clause for a conversation's child records.
+
+        Bounds created_at from below by the conversation's creation time so PostgreSQL
+        can prune chat_traces partitions from before the conversation started.
+
+        Args:
+            conversation: CONVERSATION record the children belong to
+            record_type: Record type to select, or a list/tuple of record types
+
+        Returns:
+            SQLAlchemy boolean clause
+        """
+        if isinstance(record_type, (list, tuple, set)):
+            type_condition = ChatTrace.record_type.in_(list(record_type))
+        else:
+            type_condition = ChatTrace.record_type == record_type
+        conditions = [
+            ChatTrace.thread_id == conversation.thread_id,
+            type_condition
+        ]
+        if isinstance(conversation.created_at, datetime):
+            conditions.append(ChatTrace.created_at >= conversation.created_at - CHILD_RECORD_CLOCK_SKEW)
+        return and_(*conditions)
+
     @staticmethod
     def count_tokens(text: str, model: str = "gpt-4") -> int:
         """
@@ -85,7 +156,7 @@ class ChatTraceService:
         campaigner_id: int,
         customer_id: Optional[int] = None,
         metadata: Optional[Dict] = None
-    ) -> Tuple[ChatTrace, Optional[LangfuseTrace]]:
+    ) -> Tuple[ChatTrace, Optional[str]]:
         """
         Create a new conversation record with optional Langfuse trace.
 
@@ -96,7 +167,7 @@ class ChatTraceService:
             metadata: Optional metadata dictionary
 
         Returns:
-            Tuple of (ChatTrace conversation record, Optional[LangfuseTrace])
+            Tuple of (ChatTrace conversation record, Langfuse trace ID or None)
         """
         session = self._get_session()
         try:
@@ -111,31 +182,24 @@ class ChatTraceService:
             ).first()
 
             if existing:
-                langfuse_trace = self._get_langfuse_trace(existing.langfuse_trace_id) if existing.langfuse_trace_id else None
-                return existing, langfuse_trace
+                return existing, existing.langfuse_trace_id
 
             # Create Langfuse trace
-            langfuse_trace = None
             langfuse_trace_id = None
             langfuse_trace_url = None
 
             if LANGFUSE_AVAILABLE:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        langfuse_trace = langfuse.trace(
-                            name="chat_conversation",
-                            session_id=thread_id,
-                            user_id=str(campaigner_id),
-                            metadata={
-                                "thread_id": thread_id,
-                                "campaigner_id": campaigner_id,
-                                "customer_id": customer_id,
-                                **(metadata or {})
-                            }
-                        )
-                        langfuse_trace_id = langfuse_trace.id if hasattr(langfuse_trace, 'id') else None
-                        langfuse_trace_url = langfuse_trace.get_trace_url() if hasattr(langfuse_trace, 'get_trace_url') else None
+                    langfuse_trace_id, langfuse_trace_url = self._start_langfuse_trace(
+                        thread_id,
+                        campaigner_id,
+                        metadata={
+                            "thread_id": thread_id,
+                            "campaigner_id": campaigner_id,
+                            "customer_id": customer_id,
+                            **(metadata or {})
+                        }
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to create Langfuse trace: {e}")
 
@@ -172,7 +236,7 @@ class ChatTraceService:
 
             print(f"✅ Created conversation: thread_id={thread_id}, id={conversation.id}")
 
-            return conversation, langfuse_trace
+            return conversation, langfuse_trace_id
 
         except Exception as e:
             session.rollback()
@@ -317,14 +381,11 @@ class ChatTraceService:
             # Update Langfuse trace
             if LANGFUSE_AVAILABLE and conversation.langfuse_trace_id:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        trace = self._get_langfuse_trace(conversation.langfuse_trace_id)
-                        if trace:
-                            trace.update(
-                                output={"status": status, "final_intent": final_intent},
-                                metadata={"completed_at": datetime.now(timezone.utc).isoformat()}
-                            )
+                    self._update_langfuse_trace(
+                        conversation.langfuse_trace_id,
+                        output={"status": status, "final_intent": final_intent},
+                        metadata={"completed_at": datetime.now(timezone.utc).isoformat()}
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to update Langfuse trace: {e}")
 
@@ -377,10 +438,7 @@ class ChatTraceService:
             # Get sequence number (count of messages so far)
             message_count = session.exec(
                 select(func.count(ChatTrace.id)).where(
-                    and_(
-                        ChatTrace.thread_id == thread_id,
-                        ChatTrace.record_type == RecordType.MESSAGE
-                    )
+                    self.thread_records_filter(conversation, RecordType.MESSAGE)
                 )
             ).one()
 
@@ -396,18 +454,15 @@ class ChatTraceService:
             langfuse_generation_id = None
             if LANGFUSE_AVAILABLE and role == "assistant" and conversation.langfuse_trace_id:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        trace = self._get_langfuse_trace(conversation.langfuse_trace_id)
-                        if trace:
-                            generation = trace.generation(
-                                name="assistant_message",
-                                input=content,
-                                model=model,
-                                usage={"total": tokens_used} if tokens_used else None,
-                                metadata=metadata or {}
-                            )
-                            langfuse_generation_id = generation.id if hasattr(generation, 'id') else None
+                    langfuse_generation_id = self._record_langfuse_observation(
+                        conversation.langfuse_trace_id,
+                        as_type="generation",
+                        name="assistant_message",
+                        input=content,
+                        model=model,
+                        usage_details={"total": tokens_used} if tokens_used else None,
+                        metadata=metadata or {}
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to create Langfuse generation: {e}")
 
@@ -500,10 +555,7 @@ class ChatTraceService:
             # Get sequence number
             step_count = session.exec(
                 select(func.count(ChatTrace.id)).where(
-                    and_(
-                        ChatTrace.thread_id == thread_id,
-                        ChatTrace.record_type == RecordType.AGENT_STEP
-                    )
+                    self.thread_records_filter(conversation, RecordType.AGENT_STEP)
                 )
             ).one()
 
@@ -511,21 +563,17 @@ class ChatTraceService:
             langfuse_span_id = None
             if LANGFUSE_AVAILABLE and conversation.langfuse_trace_id:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        trace = self._get_langfuse_trace(conversation.langfuse_trace_id)
-                        if trace:
-                            span = trace.span(
-                                name=f"{step_type}_{agent_name or 'agent'}",
-                                input={"step_type": step_type, "content": content},
-                                metadata={
-                                    "agent_name": agent_name,
-                                    "agent_role": agent_role,
-                                    "task_index": task_index,
-                                    **(metadata or {})
-                                }
-                            )
-                            langfuse_span_id = span.id if hasattr(span, 'id') else None
+                    langfuse_span_id = self._record_langfuse_observation(
+                        conversation.langfuse_trace_id,
+                        name=f"{step_type}_{agent_name or 'agent'}",
+                        input={"step_type": step_type, "content": content},
+                        metadata={
+                            "agent_name": agent_name,
+                            "agent_role": agent_role,
+                            "task_index": task_index,
+                            **(metadata or {})
+                        }
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to create Langfuse span: {e}")
 
@@ -609,10 +657,7 @@ class ChatTraceService:
             # Get sequence number
             step_count = session.exec(
                 select(func.count(ChatTrace.id)).where(
-                    and_(
-                        ChatTrace.thread_id == thread_id,
-                        ChatTrace.record_type == RecordType.AGENT_STEP
-                    )
+                    self.thread_records_filter(conversation, RecordType.AGENT_STEP)
                 )
             ).one()
 
@@ -620,20 +665,16 @@ class ChatTraceService:
             langfuse_span_id = None
             if LANGFUSE_AVAILABLE and conversation.langfuse_trace_id:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        trace = self._get_langfuse_trace(conversation.langfuse_trace_id)
-                        if trace:
-                            span = trace.span(
-                                name=f"initialization_{chatbot_name}",
-                                input={"chatbot_name": chatbot_name, "llm_model": llm_model},
-                                metadata={
-                                    "system_prompt": system_prompt,
-                                    "llm_model": llm_model,
-                                    **(metadata or {})
-                                }
-                            )
-                            langfuse_span_id = span.id if hasattr(span, 'id') else None
+                    langfuse_span_id = self._record_langfuse_observation(
+                        conversation.langfuse_trace_id,
+                        name=f"initialization_{chatbot_name}",
+                        input={"chatbot_name": chatbot_name, "llm_model": llm_model},
+                        metadata={
+                            "system_prompt": system_prompt,
+                            "llm_model": llm_model,
+                            **(metadata or {})
+                        }
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to create Langfuse span: {e}")
 
@@ -733,10 +774,7 @@ class ChatTraceService:
             # Get sequence number
             step_count = session.exec(
                 select(func.count(ChatTrace.id)).where(
-                    and_(
-                        ChatTrace.thread_id == thread_id,
-                        ChatTrace.record_type == RecordType.AGENT_STEP
-                    )
+                    self.thread_records_filter(conversation, RecordType.AGENT_STEP)
                 )
             ).one()
 
@@ -744,27 +782,23 @@ class ChatTraceService:
             langfuse_span_id = None
             if LANGFUSE_AVAILABLE and conversation.langfuse_trace_id:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        trace = self._get_langfuse_trace(conversation.langfuse_trace_id)
-                        if trace:
-                            span = trace.span(
-                                name=f"crew_agent_init_{agent_name}",
-                                input={
-                                    "agent_name": agent_name,
-                                    "agent_role": agent_role,
-                                    "llm_model": llm_model
-                                },
-                                metadata={
-                                    "agent_goal": agent_goal,
-                                    "agent_backstory": agent_backstory,
-                                    "tools": tools,
-                                    "allow_delegation": allow_delegation,
-                                    "task_description": task_description,
-                                    **(metadata or {})
-                                }
-                            )
-                            langfuse_span_id = span.id if hasattr(span, 'id') else None
+                    langfuse_span_id = self._record_langfuse_observation(
+                        conversation.langfuse_trace_id,
+                        name=f"crew_agent_init_{agent_name}",
+                        input={
+                            "agent_name": agent_name,
+                            "agent_role": agent_role,
+                            "llm_model": llm_model
+                        },
+                        metadata={
+                            "agent_goal": agent_goal,
+                            "agent_backstory": agent_backstory,
+                            "tools": tools,
+                            "allow_delegation": allow_delegation,
+                            "task_description": task_description,
+                            **(metadata or {})
+                        }
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to create Langfuse span: {e}")
 
@@ -885,10 +919,7 @@ class ChatTraceService:
             # Get sequence number
             tool_count = session.exec(
                 select(func.count(ChatTrace.id)).where(
-                    and_(
-                        ChatTrace.thread_id == thread_id,
-                        ChatTrace.record_type == RecordType.TOOL_USAGE
-                    )
+                    self.thread_records_filter(conversation, RecordType.TOOL_USAGE)
                 )
             ).one()
 
@@ -900,22 +931,18 @@ class ChatTraceService:
             langfuse_span_id = None
             if LANGFUSE_AVAILABLE and conversation.langfuse_trace_id:
                 try:
-                    langfuse = LangfuseConfig.get_client()
-                    if langfuse:
-                        trace = self._get_langfuse_trace(conversation.langfuse_trace_id)
-                        if trace:
-                            span = trace.span(
-                                name=f"tool_{tool_name}",
-                                input={"tool_input": tool_input_str},
-                                output={"tool_output": tool_output_str, "success": success},
-                                metadata={
-                                    "tool_name": tool_name,
-                                    "error": error,
-                                    "latency_ms": latency_ms,
-                                    **(metadata or {})
-                                }
-                            )
-                            langfuse_span_id = span.id if hasattr(span, 'id') else None
+                    langfuse_span_id = self._record_langfuse_observation(
+                        conversation.langfuse_trace_id,
+                        name=f"tool_{tool_name}",
+                        input={"tool_input": tool_input_str},
+                        output={"tool_output": tool_output_str, "success": success},
+                        metadata={
+                            "tool_name": tool_name,
+                            "error": error,
+                            "latency_ms": latency_ms,
+                            **(metadata or {})
+                        }
+                    )
                 except Exception as e:
                     print(f"⚠️ Failed to create Langfuse span: {e}")
 
@@ -1140,10 +1167,7 @@ class ChatTraceService:
             if include_messages:
                 messages = session.exec(
                     select(ChatTrace).where(
-                        and_(
-                            ChatTrace.thread_id == thread_id,
-                            ChatTrace.record_type == RecordType.MESSAGE
-                        )
+                        self.thread_records_filter(conversation, RecordType.MESSAGE)
                     ).order_by(ChatTrace.sequence_number)
                 ).all()
                 result["messages"] = [
@@ -1158,10 +1182,7 @@ class ChatTraceService:
             if include_steps:
                 steps = session.exec(
                     select(ChatTrace).where(
-                        and_(
-                            ChatTrace.thread_id == thread_id,
-                            ChatTrace.record_type == RecordType.AGENT_STEP
-                        )
+                        self.thread_records_filter(conversation, RecordType.AGENT_STEP)
                     ).order_by(ChatTrace.sequence_number)
                 ).all()
                 result["agent_steps"] = [
@@ -1177,10 +1198,7 @@ class ChatTraceService:
             if include_tools:
                 tools = session.exec(
                     select(ChatTrace).where(
-                        and_(
-                            ChatTrace.thread_id == thread_id,
-                            ChatTrace.record_type == RecordType.TOOL_USAGE
-                        )
+                        self.thread_records_filter(conversation, RecordType.TOOL_USAGE)
                     ).order_by(ChatTrace.sequence_number)
                 ).all()
                 result["tool_usages"] = [
@@ -1196,10 +1214,7 @@ class ChatTraceService:
             if include_crewai:
                 crewai_records = session.exec(
                     select(ChatTrace).where(
-                        and_(
-                            ChatTrace.thread_id == thread_id,
-                            ChatTrace.record_type == RecordType.CREWAI_EXECUTION
-                        )
+                        self.thread_records_filter(conversation, RecordType.CREWAI_EXECUTION)
                     ).order_by(ChatTrace.created_at)
                 ).all()
                 result["crewai_executions"] = [
@@ -1217,20 +1232,137 @@ class ChatTraceService:
         finally:
             self._close_session(session)
 
+    def get_thread_events(
+        self,
+        thread_id: str,
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        record_types: Optional[List[str]] = None,
+        include_large_fields: bool = False
+    ) -> Optional[Dict]:
+        """
+        Get one page of a conversation's events in insertion order.
+
+        Events are messages, agent steps, tool usages and CrewAI executions, ordered
+        by id. Pass the returned next_cursor as after_id to get the next page; live
+        UIs can poll with their last cursor to receive only new events.
+
+        Args:
+            thread_id: Thread identifier
+            after_id: Only return events with id greater than this cursor
+            limit: Maximum number of events to return
+            record_types: Optional subset of event record types
+            include_large_fields: Include tool payloads, prompts and logs in event data
+
+        Returns:
+            Dictionary with conversation summary, events, next_cursor and has_more,
+            or None if the conversation is not found
+        """
+        session = self._get_session()
+        try:
+            conversation = self.get_conversation(thread_id, session=session)
+            if not conversation:
+                return None
+
+            query = select(ChatTrace).where(
+                self.thread_records_filter(conversation, list(record_types or EVENT_RECORD_TYPES))
+            )
+            if after_id is not None:
+                query = query.where(ChatTrace.id > after_id)
+
+            # Fetch one extra row to know whether another page exists
+            records = session.exec(query.order_by(ChatTrace.id).limit(limit + 1)).all()
+            has_more = len(records) > limit
+            records = records[:limit]
+
+            events = [
+                {
+                    "id": record.id,
+                    "record_type": record.record_type,
+                    "created_at": record.created_at.isoformat() if record.created_at else None,
+                    "sequence_number": record.sequence_number,
+                    "langfuse_span_id": record.langfuse_span_id,
+                    **project_trace_data(record.data, include_large_fields)
+                }
+                for record in records
+            ]
+
+            return {
+                "conversation": {
+                    "id": conversation.id,
+                    "thread_id": conversation.thread_id,
+                    "status": conversation.data.get("status"),
+                    "message_count": conversation.data.get("message_count", 0),
+                    "agent_step_count": conversation.data.get("agent_step_count", 0),
+                    "tool_usage_count": conversation.data.get("tool_usage_count", 0),
+                    "updated_at": conversation.updated_at.isoformat() if conversation.updated_at else None
+                },
+                "events": events,
+                "next_cursor": records[-1].id if records else after_id,
+                "has_more": has_more
+            }
+
+        finally:
+            self._close_session(session)
+
+    def get_trace_event(self, thread_id: str, event_id: int) -> Optional[Dict]:
+        """
+        Get a single event of a conversation with all data fields.
+
+        Used to load fields omitted by get_thread_events on demand.
+
+        Args:
+            thread_id: Thread identifier
+            event_id: ChatTrace record id
+
+        Returns:
+            Event dictionary, or None if not found in this thread
+        """
+        session = self._get_session()
+        try:
+            conversation = self.get_conversation(thread_id, session=session)
+            if not conversation:
+                return None
+
+            record = session.exec(
+                select(ChatTrace).where(
+                    and_(
+                        self.thread_records_filter(conversation, list(EVENT_RECORD_TYPES)),
+                        ChatTrace.id == event_id
+                    )
+                )
+            ).first()
+            if not record:
+                return None
+
+            return {
+                "id": record.id,
+                "record_type": record.record_type,
+                "created_at": record.created_at.isoformat() if record.created_at else None,
+                "sequence_number": record.sequence_number,
+                "session_id": record.session_id,
+                "langfuse_span_id": record.langfuse_span_id,
+                **record.data
+            }
+
+        finally:
+            self._close_session(session)
+
     # ===== Langfuse Integration =====
 
     def get_or_create_langfuse_trace(
         self,
         thread_id: str
-    ) -> Optional[LangfuseTrace]:
+    ) -> Optional[str]:
         """
-        Get or create a Langfuse trace for a conversation.
+        Get or create the Langfuse trace for a conversation.
 
         Args:
             thread_id: Thread identifier
 
         Returns:
-            LangfuseTrace or None if Langfuse not available or conversation not found
+            Langfuse trace ID, or None if Langfuse is not available or the
+            conversation is not found
         """
         if not LANGFUSE_AVAILABLE:
             return None
@@ -1241,60 +1373,100 @@ class ChatTraceService:
             return None
 
         if conversation.langfuse_trace_id:
-            return self._get_langfuse_trace(conversation.langfuse_trace_id)
+            return conversation.langfuse_trace_id
 
         # Create new trace
         try:
-            langfuse = LangfuseConfig.get_client()
-            if langfuse:
-                trace = langfuse.trace(
-                    name="chat_conversation",
-                    session_id=thread_id,
-                    user_id=str(conversation.campaigner_id),
-                    metadata={"thread_id": thread_id}
-                )
-
+            trace_id, trace_url = self._start_langfuse_trace(
+                thread_id,
+                conversation.campaigner_id,
+                metadata={"thread_id": thread_id}
+            )
+            if trace_id:
                 # Update conversation with trace info
                 session = self._get_session()
                 try:
-                    conversation.langfuse_trace_id = trace.id if hasattr(trace, 'id') else None
-                    conversation.langfuse_trace_url = trace.get_trace_url() if hasattr(trace, 'get_trace_url') else None
+                    conversation.langfuse_trace_id = trace_id
+                    conversation.langfuse_trace_url = trace_url
                     session.add(conversation)
                     session.commit()
                 finally:
                     self._close_session(session)
 
-                return trace
+            return trace_id
         except Exception as e:
             print(f"⚠️ Failed to create Langfuse trace: {e}")
             return None
 
-    def _get_langfuse_trace(self, trace_id: str) -> Optional[LangfuseTrace]:
-        """Get a Langfuse trace by ID."""
-        if not LANGFUSE_AVAILABLE:
+    def _start_langfuse_trace(
+        self,
+        thread_id: str,
+        campaigner_id: int,
+        metadata: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Start a Langfuse trace for a conversation.
+
+        Returns:
+            Tuple of (trace ID, trace URL), or (None, None) without a client
+        """
+        langfuse = LangfuseConfig.get_client()
+        if not langfuse:
+            return None, None
+
+        trace_id = langfuse.create_trace_id()
+        root = langfuse.start_span(trace_context={"trace_id": trace_id}, name="chat_conversation", metadata=metadata)
+        root.update_trace(
+            name="chat_conversation",
+            session_id=thread_id,
+            user_id=str(campaigner_id),
+            metadata=metadata
+        )
+        root.end()
+        return trace_id, langfuse.get_trace_url(trace_id=trace_id)
+
+    def _record_langfuse_observation(self, trace_id: str, name: str, **fields) -> Optional[str]:
+        """
+        Record a finished span or generation (as_type="generation") on a trace.
+
+        The trace is continued locally from its stored ID via the trace context,
+        so nothing is fetched from the Langfuse API.
+
+        Returns:
+            The observation ID, or None without a client
+        """
+        langfuse = LangfuseConfig.get_client()
+        if not langfuse:
             return None
 
-        try:
-            langfuse = LangfuseConfig.get_client()
-            if langfuse and hasattr(langfuse, 'get_trace'):
-                return langfuse.get_trace(trace_id)
-        except Exception as e:
-            print(f"⚠️ Failed to get Langfuse trace: {e}")
+        observation = langfuse.start_observation(trace_context={"trace_id": trace_id}, name=name, **fields)
+        observation.end()
+        return observation.id
+
+    def _update_langfuse_trace(self, trace_id: str, **fields) -> None:
+        """Update trace-level output/metadata of an existing trace."""
+        langfuse = LangfuseConfig.get_client()
+        if not langfuse:
+            return
 
-        return None
+        span = langfuse.start_span(trace_context={"trace_id": trace_id}, name="chat_conversation_update")
+        span.update_trace(**fields)
+        span.end()
 
     def flush_langfuse(self):
-        """Flush pending Langfuse traces."""
+        """
+        Schedule a flush of pending Langfuse traces.
+
+        Non-blocking: the flush runs on LangfuseConfig's background flusher thread,
+        which also flushes on an interval and at application shutdown.
+        """
         if not LANGFUSE_AVAILABLE:
             return
 
         try:
-            langfuse = LangfuseConfig.get_client()
-            if langfuse and hasattr(langfuse, 'flush'):
-                langfuse.flush()
-                print("✅ Flushed Langfuse traces")
+            LangfuseConfig.request_flush()
         except Exception as e:
-            print(f"⚠️ Failed to flush Langfuse: {e}")
+            print(f"⚠️ Failed to schedule Langfuse flush: {e}")
 
 
 class CrewCallbacks:
@@ -0,0 +1,294 @@
+"""
+Crew Execution Pool
+Bounded queue and worker pool for CrewAI analysis runs.
+
+Routes submit a job and return immediately. A fixed number of worker
+coroutines take jobs in submission order, skipping jobs whose tenant is
+already at its concurrency limit, so one busy campaigner cannot occupy every
+worker. Blocking work (crew.kickoff(), synchronous DB calls) is run through
+run_blocking() on the pool's own thread pool, keeping the event loop free for
+WebSocket heartbeats and other requests.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+
+logger = get_logger(__name__)
+
+
+class CrewPoolFull(Exception):
+    """Raised when the pool's queue is at capacity."""
+
+
+@dataclass
+class CrewJob:
+    """A queued or running crew execution."""
+    job_id: str
+    tenant: Any
+    func: Callable[..., Awaitable[Any]]
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+    finished: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "tenant": self.tenant,
+            "status": self.status,
+            "queue_wait_seconds": round(self.started_at - self.submitted_at, 3) if self.started_at else None,
+            "run_seconds": round(self.finished_at - self.started_at, 3) if self.started_at and self.finished_at else None,
+            "error": self.error,
+        }
+
+
+def _summary(samples: Deque[float]) -> Optional[dict]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "avg_seconds": round(sum(ordered) / len(ordered), 3),
+        "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_seconds": round(ordered[-1], 3),
+    }
+
+
+class CrewExecutionPool:
+    """
+    Bounded pool of crew workers with per-tenant concurrency limits.
+
+    Workers are started lazily on the running event loop at the first submit.
+    Finished jobs are kept (up to `history`) so their status can be looked up.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        per_tenant_limit: Optional[int] = None,
+        history: int = 1000
+    ):
+        settings = get_settings()
+        self.workers = workers or settings.max_concurrent_analyses
+        self.max_queue = max_queue or settings.crew_pool_max_queue
+        self.per_tenant_limit = per_tenant_limit or settings.crew_pool_per_tenant_limit
+        self.history = history
+        self._pending: Deque[CrewJob] = deque()
+        self._jobs: Dict[str, CrewJob] = {}
+        self._finished: Deque[str] = deque()
+        self._running_by_tenant: Dict[Any, int] = defaultdict(int)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._shutting_down = False
+        self._worker_tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queue_waits: Deque[float] = deque(maxlen=history)
+        self._run_times: Deque[float] = deque(maxlen=history)
+        self._counters = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker_tasks:
+            return
+        if self._loop is not None and self._loop is not loop:
+            # Previous loop is gone (e.g. a closed test client); its jobs cannot run
+            logger.warning("⚠️ [Crew Pool] Event loop changed - dropping jobs from the previous loop")
+            self._pending.clear()
+            self._running_by_tenant.clear()
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._shutting_down = False
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crew-worker")
+        self._worker_tasks = [
+            loop.create_task(self._worker(index), name=f"crew-pool-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"🏊 [Crew Pool] Started {self.workers} workers "
+                    f"(queue={self.max_queue}, per_tenant={self.per_tenant_limit})")
+
+    async def shutdown(self) -> None:
+        """Cancel queued and running jobs and stop the workers."""
+        self._shutting_down = True
+        for job in list(self._pending):
+            self._finish(job, "cancelled", error="Pool shut down")
+        self._pending.clear()
+        for task in self._worker_tasks:
+            task.cancel()
+        if self._worker_tasks:
+            await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        tenant: Any,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        job_id: Optional[str] = None,
+        **kwargs
+    ) -> CrewJob:
+        """
+        Queue `await func(*args, **kwargs)` for a tenant.
+
+        Args:
+            tenant: Concurrency-limit key (e.g. campaigner ID)
+            func: Coroutine function to run
+            job_id: Optional ID (defaults to a random UUID)
+
+        Returns:
+            The queued CrewJob
+
+        Raises:
+            CrewPoolFull: If max_queue jobs are already waiting
+        """
+        self._ensure_started()
+        if len(self._pending) >= self.max_queue:
+            self._counters["rejected"] += 1
+            raise CrewPoolFull(f"Crew queue is full ({self.max_queue} jobs waiting)")
+
+        job = CrewJob(job_id=job_id or uuid.uuid4().hex, tenant=tenant, func=func, args=args, kwargs=kwargs)
+        self._jobs[job.job_id] = job
+        self._pending.append(job)
+        self._counters["submitted"] += 1
+        self._notify()
+        logger.info(f"📥 [Crew Pool] Queued job {job.job_id} for tenant {tenant} (queue depth {len(self._pending)})")
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        A running job is cancelled at its next await; a crew.kickoff() already
+        executing in a worker thread runs to completion but its result is dropped.
+
+        Returns:
+            True if the job was queued or running
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        if job.status == "queued":
+            self._pending.remove(job)
+            self._finish(job, "cancelled", error="Cancelled before start")
+            return True
+        if job.task is not None:
+            job.task.cancel()
+        return True
+
+    def get_job(self, job_id: str) -> Optional[CrewJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> CrewJob:
+        """Wait until a job finished (completed, failed or cancelled)."""
+        job = self._jobs[job_id]
+        await asyncio.wait_for(job.finished.wait(), timeout)
+        return job
+
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        """Run a blocking callable on the pool's worker threads."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crew-worker")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _notify(self) -> None:
+        self._wakeup.set()
+
+    async def _next_job(self) -> CrewJob:
+        while True:
+            # Oldest job whose tenant has a free slot; no await between scan and clear
+            for job in self._pending:
+                if self._running_by_tenant[job.tenant] < self.per_tenant_limit:
+                    self._pending.remove(job)
+                    self._running_by_tenant[job.tenant] += 1
+                    return job
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._next_job()
+            job.status = "running"
+            job.started_at = time.monotonic()
+            self._queue_waits.append(job.started_at - job.submitted_at)
+            job.task = asyncio.create_task(job.func(*job.args, **job.kwargs))
+            try:
+                job.result = await job.task
+                self._finish(job, "completed")
+            except asyncio.CancelledError:
+                if self._shutting_down:
+                    job.task.cancel()
+                    self._finish(job, "cancelled", error="Pool shut down")
+                    raise
+                self._finish(job, "cancelled", error="Cancelled while running")
+            except Exception as e:
+                logger.error(f"❌ [Crew Pool] Job {job.job_id} failed: {str(e)}")
+                self._finish(job, "failed", error=str(e))
+            finally:
+                self._running_by_tenant[job.tenant] -= 1
+                if self._running_by_tenant[job.tenant] <= 0:
+                    del self._running_by_tenant[job.tenant]
+                self._notify()
+
+    def _finish(self, job: CrewJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.monotonic()
+        if job.started_at is not None:
+            self._run_times.append(job.finished_at - job.started_at)
+        self._counters[status] += 1
+        job.finished.set()
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.history:
+            self._jobs.pop(self._finished.popleft(), None)
+        logger.info(f"🏁 [Crew Pool] Job {job.job_id} {status}")
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": len(self._pending),
+            "max_queue": self.max_queue,
+            "running": sum(self._running_by_tenant.values()),
+            "running_by_tenant": {str(tenant): count for tenant, count in self._running_by_tenant.items()},
+            "per_tenant_limit": self.per_tenant_limit,
+            **self._counters,
+            "queue_wait": _summary(self._queue_waits),
+            "run_time": _summary(self._run_times),
+        }
+
+
+crew_execution_pool = CrewExecutionPool()
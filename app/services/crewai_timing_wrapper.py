@@ -5,6 +5,7 @@ Wraps CrewAI components to automatically track timing and create detailed logs
 
 import time
 import json
+import threading
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from crewai import Agent, Task, Crew, Process
@@ -719,6 +720,8 @@ class CrewAITimingWrapper:
         self.session_id = session_id
         self.analysis_id = analysis_id
         self.timing_service = timing_service
+        self.specialist_timings: List[Dict[str, Any]] = []
+        self._timings_lock = threading.Lock()
     
     def create_timed_agent(self, **agent_kwargs) -> TimedAgent:
         """Create a timed agent"""
@@ -740,6 +743,44 @@ class CrewAITimingWrapper:
             verbose=verbose
         )
     
+    def run_specialist(self, agent: TimedAgent, task: Task) -> Dict[str, Any]:
+        """
+        Run one specialist task as its own single-agent crew and record its timing.
+
+        Used when specialists run concurrently; safe to call from several threads.
+        Never raises - a failed specialist is reported with success=False.
+        """
+        crew = self.create_timed_crew(agents=[agent], tasks=[task])
+        entry = {
+            "agent": agent.role,
+            "started_at": datetime.now(timezone.utc).isoformat()
+        }
+        started = time.perf_counter()
+        try:
+            entry["output"] = str(crew.kickoff())
+            entry["success"] = True
+            entry["error"] = None
+        except Exception as e:
+            logger.error(f"❌ Specialist {agent.role} failed: {str(e)}")
+            entry["output"] = None
+            entry["success"] = False
+            entry["error"] = str(e)
+        entry["duration_seconds"] = round(time.perf_counter() - started, 3)
+
+        with self._timings_lock:
+            self.specialist_timings.append(entry)
+        logger.info(f"⏱️ Specialist {agent.role} finished in {entry['duration_seconds']:.2f}s (success: {entry['success']})")
+        return entry
+
+    def get_specialist_timings(self) -> List[Dict[str, Any]]:
+        """Per-specialist timings (without outputs), slowest first"""
+        with self._timings_lock:
+            timings = [
+                {key: value for key, value in entry.items() if key != "output"}
+                for entry in self.specialist_timings
+            ]
+        return sorted(timings, key=lambda entry: entry["duration_seconds"], reverse=True)
+
     def create_customer_log(self, user_intent: str, original_query: str, 
                            crewai_input_prompt: str, master_answer: str, 
                            campaigner_id: int = None, customer_id: int = None, success: bool = True, 
@@ -747,6 +788,9 @@ class CrewAITimingWrapper:
         """Create customer log entry with detailed execution logs"""
         # Get detailed execution log
         execution_log = self.timing_service.get_timing_breakdown(self.session_id)
+        specialist_timings = self.get_specialist_timings()
+        if specialist_timings:
+            execution_log["specialist_timings"] = specialist_timings
         crewai_log = json.dumps(execution_log, indent=2)
         
         # Create customer log
@@ -1,16 +1,30 @@
 """
 Detailed Execution Logger - Captures comprehensive CrewAI execution logs
 Mirrors terminal output for complete debugging visibility
+
+Log entries are buffered in memory and written in batches, so CrewAI's
+execution thread never waits on a per-event commit. Buffers are flushed:
+- by a background thread every detailed_log_flush_interval_seconds
+- as soon as a buffer reaches detailed_log_batch_size entries
+- synchronously on crew completion/error, before reads, and on cleanup
+
+Each buffer is bounded (detailed_log_max_buffered); entries beyond that are
+dropped and counted instead of growing memory without limit. A batch that
+fails to write is put back at the front of its buffer and retried up to
+detailed_log_flush_retries times before its entries are counted as failed.
 """
 
 import json
 import time
+from collections import deque
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from threading import Lock
 import uuid
 
+from app.config.background_flusher import BackgroundFlusher
 from app.config.database import get_session
+from app.config.settings import get_settings
 try:
     from app.models.agents import DetailedExecutionLog
 except ImportError:
@@ -25,15 +39,31 @@ logger = get_logger("services.detailed_logger")
 class DetailedExecutionLogger:
     """
     Comprehensive execution logger that captures all CrewAI execution details
-    similar to what's shown in terminal output
+    similar to what's shown in terminal output.
+
+    log_* methods return the entry's sequence number immediately; database ids
+    are assigned when the buffer is flushed. Parent links are tracked by
+    sequence number and resolved to parent_log_id at flush time.
     """
     
-    def __init__(self, session_id: str, analysis_id: Optional[str] = None):
+    def __init__(self, session_id: str, analysis_id: Optional[str] = None,
+                 batch_size: Optional[int] = None, max_buffered: Optional[int] = None):
+        settings = get_settings()
         self.session_id = session_id
         self.analysis_id = analysis_id
         self.sequence_counter = 0
         self.lock = Lock()
         self.log_stack = []  # Stack to track hierarchy
+        self.batch_size = batch_size or settings.detailed_log_batch_size
+        self.max_buffered = max_buffered or settings.detailed_log_max_buffered
+        self._buffer = deque()
+        self._flush_lock = Lock()  # Serializes flushes so batches land in sequence order
+        self._persisted_ids: Dict[int, int] = {}  # sequence_number -> detailed_execution_logs.id
+        self.flush_retries = settings.detailed_log_flush_retries
+        self._attempts: Dict[int, int] = {}  # sequence_number -> failed writes so far
+        self.persisted_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
         
     def _get_next_sequence(self) -> int:
         """Get next sequence number for this session"""
@@ -41,23 +71,129 @@ class DetailedExecutionLogger:
             self.sequence_counter += 1
             return self.sequence_counter
     
-    def _save_log_entry(self, log_data: Dict[str, Any]) -> int:
-        """Save log entry to database"""
-        try:
-            # Check if DetailedExecutionLog is a real model (table exists)
-            if not hasattr(DetailedExecutionLog, '__tablename__'):
-                logger.debug("DetailedExecutionLog table not available - skipping database save")
-                return None
-                
-            with get_session() as session:
-                log_entry = DetailedExecutionLog(**log_data)
-                session.add(log_entry)
-                session.commit()
-                session.refresh(log_entry)
-                return log_entry.id
-        except Exception as e:
-            logger.error(f"Failed to save detailed log entry: {str(e)}")
+    def _save_log_entry(self, log_data: Dict[str, Any]) -> Optional[int]:
+        """Buffer a log entry for batched persistence.
+
+        Returns:
+            The entry's sequence number, or None if the table is unavailable
+            or the buffer is full and the entry was dropped
+        """
+        # Check if DetailedExecutionLog is a real model (table exists)
+        if not hasattr(DetailedExecutionLog, '__tablename__'):
+            logger.debug("DetailedExecutionLog table not available - skipping database save")
             return None
+
+        with self.lock:
+            if len(self._buffer) >= self.max_buffered:
+                self.dropped_count += 1
+                dropped = self.dropped_count
+            else:
+                self._buffer.append(log_data)
+                dropped = 0
+            buffered = len(self._buffer)
+
+        if dropped:
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning(
+                    f"⚠️ [DetailedLogger] Buffer full for session {self.session_id}, "
+                    f"dropped {dropped} log entries so far"
+                )
+            return None
+
+        if buffered >= self.batch_size:
+            _get_flusher().request_flush()
+        return log_data["sequence_number"]
+
+    def flush(self) -> int:
+        """Write all buffered entries to the database in a single transaction.
+
+        Returns:
+            Number of entries persisted
+        """
+        with self._flush_lock:
+            with self.lock:
+                batch = list(self._buffer)
+                self._buffer.clear()
+            if not batch:
+                return 0
+
+            try:
+                with get_session() as session:
+                    entries = []
+                    unresolved_parents = []
+                    for log_data in batch:
+                        data = dict(log_data)
+                        parent_sequence = data.pop("parent_sequence", None)
+                        entry = DetailedExecutionLog(**data)
+                        if parent_sequence is not None:
+                            entry.parent_log_id = self._persisted_ids.get(parent_sequence)
+                            if entry.parent_log_id is None:
+                                unresolved_parents.append((entry, parent_sequence))
+                        entries.append(entry)
+
+                    session.add_all(entries)
+                    session.flush()
+
+                    # Parents written in this same batch only get ids on flush
+                    batch_ids = {entry.sequence_number: entry.id for entry in entries}
+                    for entry, parent_sequence in unresolved_parents:
+                        entry.parent_log_id = batch_ids.get(parent_sequence)
+
+                    session.commit()
+
+                self._persisted_ids.update(batch_ids)
+                self.persisted_count += len(batch)
+                for sequence in batch_ids:
+                    self._attempts.pop(sequence, None)
+                return len(batch)
+
+            except Exception as e:
+                self._requeue(batch, e)
+                return 0
+
+    def _requeue(self, batch: List[Dict[str, Any]], error: Exception) -> None:
+        """Put a failed batch back at the front of the buffer for the next flush.
+
+        Each entry is retried up to flush_retries times; after that it is
+        counted as failed. Requeued entries go ahead of anything buffered
+        since, and the buffer bound still applies: the newest entries beyond
+        max_buffered are dropped.
+        """
+        retry = []
+        failed = 0
+        for log_data in batch:
+            sequence = log_data["sequence_number"]
+            attempts = self._attempts.get(sequence, 0) + 1
+            if attempts > self.flush_retries:
+                self._attempts.pop(sequence, None)
+                failed += 1
+            else:
+                self._attempts[sequence] = attempts
+                retry.append(log_data)
+
+        with self.lock:
+            self._buffer.extendleft(reversed(retry))
+            overflow = max(len(self._buffer) - self.max_buffered, 0)
+            for _ in range(overflow):
+                self._attempts.pop(self._buffer.pop()["sequence_number"], None)
+            self.dropped_count += overflow
+        self.failed_count += failed
+
+        logger.error(
+            f"Failed to save {len(batch)} detailed log entries "
+            f"({len(retry)} requeued, {failed} given up): {str(error)}"
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return buffer and persistence counters for this session"""
+        with self.lock:
+            buffered = len(self._buffer)
+        return {
+            "buffered": buffered,
+            "persisted": self.persisted_count,
+            "dropped": self.dropped_count,
+            "failed": self.failed_count
+        }
     
     def log_crew_start(self, crew_name: str = "crew", agents: List[str] = None, 
                       tasks: List[str] = None, process: str = "sequential") -> int:
@@ -84,14 +220,14 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
-        self.log_stack.append({"type": "crew", "id": log_id, "name": crew_name})
-        return log_id
+        sequence = self._save_log_entry(log_data)
+        self.log_stack.append({"type": "crew", "sequence": sequence, "name": crew_name})
+        return sequence
     
     def log_task_start(self, task_id: str, task_description: str, 
                       assigned_agent: str = None) -> int:
         """Log task start - └── 📋 Task: task_id"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -99,7 +235,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "task_start",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 1,
             "task_id": task_id,
             "agent_name": assigned_agent,
@@ -117,13 +253,13 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
-        self.log_stack.append({"type": "task", "id": log_id, "name": task_id})
-        return log_id
+        sequence = self._save_log_entry(log_data)
+        self.log_stack.append({"type": "task", "sequence": sequence, "name": task_id})
+        return sequence
     
     def log_agent_start(self, agent_name: str, task_description: str = None) -> int:
         """Log agent start - 🤖 Agent Started"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -131,7 +267,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "agent_start",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 2,
             "agent_name": agent_name,
             "status": "executing",
@@ -148,13 +284,13 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
-        self.log_stack.append({"type": "agent", "id": log_id, "name": agent_name})
-        return log_id
+        sequence = self._save_log_entry(log_data)
+        self.log_stack.append({"type": "agent", "sequence": sequence, "name": agent_name})
+        return sequence
     
     def log_agent_thinking(self, agent_name: str, thought: str = None) -> int:
         """Log agent thinking - └── 🧠 Thinking..."""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -162,7 +298,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "agent_thinking",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 3,
             "agent_name": agent_name,
             "status": "thinking",
@@ -183,7 +319,7 @@ class DetailedExecutionLogger:
     def log_tool_execution_start(self, agent_name: str, tool_name: str, 
                                tool_input: str = None, attempt_number: int = 1) -> int:
         """Log tool execution start - └── 🔧 Used Tool_Name (1)"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -191,7 +327,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "tool_execution",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 3,
             "agent_name": agent_name,
             "tool_name": tool_name,
@@ -211,13 +347,13 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
-        self.log_stack.append({"type": "tool", "id": log_id, "name": tool_name})
-        return log_id
+        sequence = self._save_log_entry(log_data)
+        self.log_stack.append({"type": "tool", "sequence": sequence, "name": tool_name})
+        return sequence
     
     def log_tool_input(self, tool_name: str, tool_input: str) -> int:
         """Log tool input details - Tool Input section"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -225,7 +361,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "tool_input",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 4,
             "tool_name": tool_name,
             "status": "input",
@@ -247,7 +383,7 @@ class DetailedExecutionLogger:
     def log_tool_output(self, tool_name: str, tool_output: str, 
                        duration_ms: int = None) -> int:
         """Log tool output details - Tool Output section"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -255,7 +391,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "tool_output",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 4,
             "tool_name": tool_name,
             "status": "completed",
@@ -279,7 +415,7 @@ class DetailedExecutionLogger:
     def log_tool_error(self, agent_name: str, tool_name: str, error_message: str, 
                       tool_input: str = None, attempt_number: int = 1) -> int:
         """Log tool error - └── 🔧 Failed Tool_Name (1)"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -287,7 +423,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "tool_error",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 3,
             "agent_name": agent_name,
             "tool_name": tool_name,
@@ -314,7 +450,7 @@ class DetailedExecutionLogger:
     def log_delegation(self, agent_name: str, delegated_to: str, task: str, 
                       context: str = None) -> int:
         """Log delegation attempt"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -322,7 +458,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "delegation",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 3,
             "agent_name": agent_name,
             "status": "delegating",
@@ -345,7 +481,7 @@ class DetailedExecutionLogger:
     
     def log_agent_final_answer(self, agent_name: str, final_answer: str) -> int:
         """Log agent final answer - ✅ Agent Final Answer"""
-        parent_log_id = self.log_stack[-1]["id"] if self.log_stack else None
+        parent_sequence = self.log_stack[-1]["sequence"] if self.log_stack else None
         
         log_data = {
             "session_id": self.session_id,
@@ -353,7 +489,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "final_answer",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 2,
             "agent_name": agent_name,
             "status": "completed",
@@ -370,18 +506,18 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
+        sequence = self._save_log_entry(log_data)
         
         # Pop agent from stack
         if self.log_stack and self.log_stack[-1]["type"] == "agent":
             self.log_stack.pop()
         
-        return log_id
+        return sequence
     
     def log_task_complete(self, task_id: str, assigned_agent: str, 
                          duration_ms: int = None, tools_used: List[str] = None) -> int:
         """Log task completion - Task Completion"""
-        parent_log_id = self.log_stack[0]["id"] if self.log_stack else None  # Crew level
+        parent_sequence = self.log_stack[0]["sequence"] if self.log_stack else None  # Crew level
         
         log_data = {
             "session_id": self.session_id,
@@ -389,7 +525,7 @@ class DetailedExecutionLogger:
             "timestamp": datetime.now(timezone.utc),
             "sequence_number": self._get_next_sequence(),
             "log_type": "task_complete",
-            "parent_log_id": parent_log_id,
+            "parent_sequence": parent_sequence,
             "depth_level": 1,
             "task_id": task_id,
             "agent_name": assigned_agent,
@@ -409,13 +545,13 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
+        sequence = self._save_log_entry(log_data)
         
         # Pop task from stack
         if self.log_stack and self.log_stack[-1]["type"] == "task":
             self.log_stack.pop()
         
-        return log_id
+        return sequence
     
     def log_crew_complete(self, crew_name: str, final_output: str, 
                          duration_seconds: float = None) -> int:
@@ -444,12 +580,15 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
+        sequence = self._save_log_entry(log_data)
         
         # Clear stack
         self.log_stack.clear()
+
+        # Crew is done - persist everything it logged
+        self.flush()
         
-        return log_id
+        return sequence
     
     def log_crew_error(self, crew_name: str, error_message: str, 
                       duration_seconds: float = None) -> int:
@@ -478,12 +617,15 @@ class DetailedExecutionLogger:
             "is_collapsible": True
         }
         
-        log_id = self._save_log_entry(log_data)
+        sequence = self._save_log_entry(log_data)
         
         # Clear stack
         self.log_stack.clear()
+
+        # Crew is done - persist everything it logged
+        self.flush()
         
-        return log_id
+        return sequence
     
     def get_execution_logs(self, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get all execution logs for this session"""
@@ -493,6 +635,9 @@ class DetailedExecutionLogger:
                 logger.warning("DetailedExecutionLog table not available - returning empty logs")
                 return []
                 
+            # Make sure buffered entries are visible to the query
+            self.flush()
+
             with get_session() as session:
                 logs = session.query(DetailedExecutionLog).filter(
                     DetailedExecutionLog.session_id == self.session_id
@@ -530,6 +675,29 @@ class DetailedExecutionLogger:
 # Global detailed logger instances
 _detailed_loggers: Dict[str, DetailedExecutionLogger] = {}
 _logger_lock = Lock()
+_flusher: Optional[BackgroundFlusher] = None
+
+
+def flush_all_detailed_loggers() -> int:
+    """Flush the buffers of every registered detailed logger"""
+    with _logger_lock:
+        loggers = list(_detailed_loggers.values())
+    return sum(detailed_logger.flush() for detailed_logger in loggers)
+
+
+def _get_flusher() -> BackgroundFlusher:
+    """Return the shared background flusher, creating and starting it on first use"""
+    global _flusher
+    with _logger_lock:
+        if _flusher is None:
+            _flusher = BackgroundFlusher(
+                flush_all_detailed_loggers,
+                interval_seconds=get_settings().detailed_log_flush_interval_seconds,
+                name="detailed-log-flusher"
+            )
+        flusher = _flusher
+    flusher.start()
+    return flusher
 
 
 def get_detailed_logger(session_id: str, analysis_id: str = None) -> DetailedExecutionLogger:
@@ -537,11 +705,43 @@ def get_detailed_logger(session_id: str, analysis_id: str = None) -> DetailedExe
     with _logger_lock:
         if session_id not in _detailed_loggers:
             _detailed_loggers[session_id] = DetailedExecutionLogger(session_id, analysis_id)
-        return _detailed_loggers[session_id]
+        detailed_logger = _detailed_loggers[session_id]
+    _get_flusher()
+    return detailed_logger
 
 
 def cleanup_detailed_logger(session_id: str):
-    """Cleanup detailed logger for session"""
+    """Flush and cleanup detailed logger for session"""
+    with _logger_lock:
+        detailed_logger = _detailed_loggers.pop(session_id, None)
+    if detailed_logger is not None:
+        detailed_logger.flush()
+        stats = detailed_logger.get_stats()
+        if stats["dropped"] or stats["failed"]:
+            logger.warning(
+                f"⚠️ [DetailedLogger] Session {session_id} lost log entries: "
+                f"dropped={stats['dropped']}, failed={stats['failed']}"
+            )
+
+
+def get_detailed_logger_stats() -> Dict[str, int]:
+    """Aggregate counters across all registered detailed loggers"""
+    with _logger_lock:
+        loggers = list(_detailed_loggers.values())
+    totals = {"sessions": len(loggers), "buffered": 0, "persisted": 0, "dropped": 0, "failed": 0}
+    for detailed_logger in loggers:
+        for key, value in detailed_logger.get_stats().items():
+            totals[key] += value
+    return totals
+
+
+def shutdown_detailed_loggers():
+    """Stop the background flusher and persist anything still buffered"""
+    global _flusher
     with _logger_lock:
-        if session_id in _detailed_loggers:
-            del _detailed_loggers[session_id]
+        flusher = _flusher
+        _flusher = None
+    if flusher is not None:
+        flusher.stop()
+    else:
+        flush_all_detailed_loggers()
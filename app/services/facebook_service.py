@@ -7,7 +7,6 @@ import json
 import requests
 from datetime import datetime, timedelta, timezone
 import os
-import asyncio
 from typing import Dict, Any, Optional, List
 from sqlmodel import select, and_
 
@@ -16,14 +15,12 @@ from app.models.analytics import DigitalAsset, Connection, AssetType, AuthType
 from app.models.users import Campaigner
 from app.core.security import get_secret_key
 from app.utils.security_utils import get_token_crypto
+from app.core.oauth.refresh_lock import connection_refresh_lock
 
 
 class FacebookService:
     """Service for managing Facebook OAuth and data fetching"""
 
-    # Class-level refresh locks to prevent simultaneous token refresh attempts
-    _refresh_locks = {}
-
     # Facebook OAuth scopes - comprehensive set for marketing and analytics
     # Note: Advanced permissions require Facebook App Review or Business Manager access
     FACEBOOK_SCOPES = [
@@ -675,13 +672,15 @@ class FacebookService:
                 connection.expires_at
                 and connection.expires_at < datetime.now(timezone.utc) + buffer_time
             ):
-                # Use refresh lock to prevent simultaneous refresh attempts
-                if connection_id not in self._refresh_locks:
-                    self._refresh_locks[connection_id] = asyncio.Lock()
-
-                async with self._refresh_locks[connection_id]:
+                # Return the pooled DB connection before waiting; waiters could otherwise exhaust the pool
+                session.close()
+                # Single-flight across workers: one caller refreshes, the others wait and reuse its token
+                async with connection_refresh_lock.hold(connection_id):
                     # Double-check if token still needs refresh (another process might have refreshed it)
-                    session.refresh(connection)  # Reload from DB
+                    result = session.exec(statement).first()
+                    if not result:
+                        raise ValueError(f"Connection {connection_id} not found")
+                    connection, asset = result
                     if not (
                         connection.expires_at
                         and connection.expires_at < datetime.now(timezone.utc) + buffer_time
@@ -971,13 +970,15 @@ class FacebookService:
                 connection.expires_at
                 and connection.expires_at < datetime.now(timezone.utc) + buffer_time
             ):
-                # Use refresh lock to prevent simultaneous refresh attempts
-                if connection_id not in self._refresh_locks:
-                    self._refresh_locks[connection_id] = asyncio.Lock()
-
-                async with self._refresh_locks[connection_id]:
+                # Return the pooled DB connection before waiting; waiters could otherwise exhaust the pool
+                session.close()
+                # Single-flight across workers: one caller refreshes, the others wait and reuse its token
+                async with connection_refresh_lock.hold(connection_id):
                     # Double-check if token still needs refresh (another process might have refreshed it)
-                    session.refresh(connection)  # Reload from DB
+                    result = session.exec(statement).first()
+                    if not result:
+                        raise ValueError("Connection not found or revoked")
+                    connection, digital_asset = result
                     if not (
                         connection.expires_at
                         and connection.expires_at < datetime.now(timezone.utc) + buffer_time
@@ -6,7 +6,6 @@ Handles token storage, refresh, and Google Ads API calls
 import json
 from datetime import datetime, timedelta, timezone
 import os
-import asyncio
 from typing import Dict, Any, Optional, List
 from google.oauth2.credentials import Credentials
 from google.ads.googleads.client import GoogleAdsClient
@@ -21,6 +20,7 @@ from app.core.security import get_secret_key
 from app.config.settings import get_settings
 from app.utils.security_utils import get_token_crypto
 from app.utils.connection_utils import get_connection_for_save
+from app.core.oauth.refresh_lock import connection_refresh_lock
 
 
 # Google client functions
@@ -41,9 +41,6 @@ def get_google_client_secret() -> str:
 class GoogleAdsService:
     """Service for managing Google Ads OAuth and data fetching"""
 
-    # Class-level refresh locks to prevent simultaneous token refresh attempts
-    _refresh_locks = {}
-
     # Google Ads scopes - for advertising data access
     GOOGLE_ADS_SCOPES = [
         "https://www.googleapis.com/auth/adwords",
@@ -249,7 +246,12 @@ class GoogleAdsService:
             }
 
     async def refresh_google_ads_token(self, connection_id: int) -> Dict[str, Any]:
-        """Refresh Google Ads access token using refresh token"""
+        """
+        Refresh Google Ads access token using refresh token.
+
+        Holds the connection's refresh lock; a caller that waited while
+        another worker rotated the token gets that token without calling Google.
+        """
 
         with get_session() as session:
             # Get connection with digital asset
@@ -268,90 +270,114 @@ class GoogleAdsService:
 
             if not result:
                 raise ValueError("Connection not found or revoked")
+            rotated_at = result[0].rotated_at
+
+            # Return the pooled DB connection before waiting; waiters could otherwise exhaust the pool
+            session.close()
+            # Single-flight across workers (re-entrant for callers already holding it)
+            async with connection_refresh_lock.hold(connection_id):
+                result = session.exec(statement).first()
+                if not result:
+                    raise ValueError("Connection not found or revoked")
+
+                connection, digital_asset = result
+
+                # Rotated while we waited on the lock: reuse that token
+                if connection.rotated_at != rotated_at and not self.is_token_expired(connection.expires_at):
+                    print(f"🔄 Google Ads token was already refreshed by another process")
+                    return {
+                        "success": True,
+                        "connection_id": connection_id,
+                        "expires_at": connection.expires_at.isoformat(),
+                        "rotated_at": connection.rotated_at.isoformat(),
+                        "scopes": connection.scopes if connection.scopes else self.GOOGLE_ADS_SCOPES,
+                        "refresh_token_rotated": False,
+                        "refresh_token_hash": self._generate_token_hash(
+                            self._decrypt_token(connection.refresh_token_enc)
+                        ) if connection.refresh_token_enc else None,
+                    }
 
-            connection, digital_asset = result
-
-            # Decrypt refresh token
-            if not connection.refresh_token_enc:
-                # No stored refresh token -> must re-authorize
-                reauth_url = self.generate_reauth_url(
-                    connection_id, connection.account_email
-                )
-                raise ValueError(f"Please re-authorize: {reauth_url}")
-            refresh_token = self._decrypt_token(connection.refresh_token_enc)
-            prev_refresh_hash = self._generate_token_hash(refresh_token)
-
-            # Create credentials and refresh using stored scopes
-            stored_scopes = (
-                connection.scopes if connection.scopes else self.GOOGLE_ADS_SCOPES
-            )
-            credentials = Credentials(
-                token=None,
-                refresh_token=refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=get_google_client_id(),
-                client_secret=get_google_client_secret(),
-                scopes=stored_scopes,
-            )
-
-            try:
-                # Refresh the token
-                credentials.refresh(Request())
-
-                # Encrypt and update new access token
-                access_token_enc = self._encrypt_token(credentials.token)
-                token_hash = self._generate_token_hash(credentials.token)
-                connection.access_token_enc = access_token_enc
-                connection.token_hash = token_hash
-
-                # Only rotate refresh token if Google returned a new one
-                new_refresh_token = getattr(credentials, "refresh_token", None)
-                if new_refresh_token:
-                    connection.refresh_token_enc = self._encrypt_token(
-                        new_refresh_token
+                # Decrypt refresh token
+                if not connection.refresh_token_enc:
+                    # No stored refresh token -> must re-authorize
+                    reauth_url = self.generate_reauth_url(
+                        connection_id, connection.account_email
                     )
-                    new_refresh_hash = self._generate_token_hash(new_refresh_token)
-                    refresh_rotated = new_refresh_hash != prev_refresh_hash
-                else:
-                    # Keep existing refresh token
-                    new_refresh_hash = prev_refresh_hash
-                    refresh_rotated = False
-
-                now = datetime.now(timezone.utc)
-                connection.expires_at = now + timedelta(seconds=3600)  # 1 hour
-                connection.rotated_at = now
-                connection.last_used_at = now
-
-                session.add(connection)
-                session.commit()
+                    raise ValueError(f"Please re-authorize: {reauth_url}")
+                refresh_token = self._decrypt_token(connection.refresh_token_enc)
+                prev_refresh_hash = self._generate_token_hash(refresh_token)
 
-                print(f"✅ Google Ads token refreshed for connection {connection_id}")
-                print(f"   Expires at: {connection.expires_at}")
+                # Create credentials and refresh using stored scopes
+                stored_scopes = (
+                    connection.scopes if connection.scopes else self.GOOGLE_ADS_SCOPES
+                )
+                credentials = Credentials(
+                    token=None,
+                    refresh_token=refresh_token,
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=get_google_client_id(),
+                    client_secret=get_google_client_secret(),
+                    scopes=stored_scopes,
+                )
 
-                return {
-                    "success": True,
-                    "connection_id": connection_id,
-                    "expires_at": connection.expires_at.isoformat(),
-                    "rotated_at": connection.rotated_at.isoformat(),
-                    "scopes": stored_scopes,
-                    # Debug-safe visibility for whether refresh token changed
-                    "refresh_token_rotated": refresh_rotated,
-                    "refresh_token_hash": new_refresh_hash,
-                }
+                try:
+                    # Refresh the token
+                    credentials.refresh(Request())
+
+                    # Encrypt and update new access token
+                    access_token_enc = self._encrypt_token(credentials.token)
+                    token_hash = self._generate_token_hash(credentials.token)
+                    connection.access_token_enc = access_token_enc
+                    connection.token_hash = token_hash
+
+                    # Only rotate refresh token if Google returned a new one
+                    new_refresh_token = getattr(credentials, "refresh_token", None)
+                    if new_refresh_token:
+                        connection.refresh_token_enc = self._encrypt_token(
+                            new_refresh_token
+                        )
+                        new_refresh_hash = self._generate_token_hash(new_refresh_token)
+                        refresh_rotated = new_refresh_hash != prev_refresh_hash
+                    else:
+                        # Keep existing refresh token
+                        new_refresh_hash = prev_refresh_hash
+                        refresh_rotated = False
+
+                    now = datetime.now(timezone.utc)
+                    connection.expires_at = now + timedelta(seconds=3600)  # 1 hour
+                    connection.rotated_at = now
+                    connection.last_used_at = now
+
+                    session.add(connection)
+                    session.commit()
+
+                    print(f"✅ Google Ads token refreshed for connection {connection_id}")
+                    print(f"   Expires at: {connection.expires_at}")
+
+                    return {
+                        "success": True,
+                        "connection_id": connection_id,
+                        "expires_at": connection.expires_at.isoformat(),
+                        "rotated_at": connection.rotated_at.isoformat(),
+                        "scopes": stored_scopes,
+                        # Debug-safe visibility for whether refresh token changed
+                        "refresh_token_rotated": refresh_rotated,
+                        "refresh_token_hash": new_refresh_hash,
+                    }
 
-            except Exception as e:
-                print(
-                    f"❌ Google Ads token refresh failed for connection {connection_id}: {e}"
-                )
-                error_text = str(e)
-                # For invalid_grant or obviously bad refresh tokens -> force reauth
-                if "invalid_grant" in error_text.lower() or not refresh_token:
-                    reauth_url = self.generate_reauth_url(
-                        connection_id, connection.account_email
+                except Exception as e:
+                    print(
+                        f"❌ Google Ads token refresh failed for connection {connection_id}: {e}"
                     )
-                    raise ValueError(f"Please re-authorize: {reauth_url}")
-                # Propagate as ValueError for route to format
-                raise ValueError(f"Refresh failed: {error_text}")
+                    error_text = str(e)
+                    # For invalid_grant or obviously bad refresh tokens -> force reauth
+                    if "invalid_grant" in error_text.lower() or not refresh_token:
+                        reauth_url = self.generate_reauth_url(
+                            connection_id, connection.account_email
+                        )
+                        raise ValueError(f"Please re-authorize: {reauth_url}")
+                    # Propagate as ValueError for route to format
+                    raise ValueError(f"Refresh failed: {error_text}")
 
     def validate_refresh_token(self, refresh_token: str) -> bool:
         """
@@ -494,13 +520,14 @@ class GoogleAdsService:
             token_needs_refresh = self.is_token_expired(connection.expires_at)
 
             if token_needs_refresh:
-                # Use refresh lock to prevent simultaneous refresh attempts
-                if connection_id not in self._refresh_locks:
-                    self._refresh_locks[connection_id] = asyncio.Lock()
-
-                async with self._refresh_locks[connection_id]:
+                # Return the pooled DB connection before waiting; waiters could otherwise exhaust the pool
+                session.close()
+                # Single-flight across workers: one caller refreshes, the others wait and reuse its token
+                async with connection_refresh_lock.hold(connection_id):
                     # Double-check if token still needs refresh (another process might have refreshed it)
-                    session.refresh(connection)  # Reload from DB
+                    connection = session.get(Connection, connection_id)
+                    if not connection:
+                        raise ValueError(f"Connection {connection_id} not found")
                     if not self.is_token_expired(connection.expires_at):
                         print(
                             f"🔄 Google Ads Token was already refreshed by another process"
@@ -6,7 +6,6 @@ Handles token storage, refresh, and GA4 API calls
 import json
 from datetime import datetime, timedelta, timezone
 import os
-import asyncio
 from typing import Dict, Any, Optional, List
 import requests
 from google.oauth2.credentials import Credentials
@@ -30,6 +29,7 @@ from app.core.security import get_secret_key
 from app.config.settings import get_settings
 from app.utils.security_utils import get_token_crypto
 from app.utils.connection_utils import get_connection_for_save
+from app.core.oauth.refresh_lock import connection_refresh_lock
 
 # Google client functions
 def get_google_client_id() -> str:
@@ -46,9 +46,6 @@ def get_google_client_secret() -> str:
 class GoogleAnalyticsService:
     """Service for managing Google Analytics OAuth and data fetching"""
     
-    # Class-level refresh locks to prevent simultaneous token refresh attempts
-    _refresh_locks = {}
-    
     # In-memory property cache: {cache_key: {properties: [...], timestamp: datetime}}
     _property_cache = {}
     
@@ -250,7 +247,12 @@ class GoogleAnalyticsService:
             }
     
     async def refresh_ga_token(self, connection_id: int) -> Dict[str, Any]:
-        """Refresh Google Analytics access token using refresh token"""
+        """
+        Refresh Google Analytics access token using refresh token.
+
+        Holds the connection's refresh lock; a caller that waited while
+        another worker rotated the token gets that token without calling Google.
+        """
         
         with get_session() as session:
             # Get connection with digital asset
@@ -263,70 +265,88 @@ class GoogleAnalyticsService:
                 )
             )
             result = session.exec(statement).first()
-            
+
             if not result:
                 raise ValueError("Connection not found or revoked")
+            rotated_at = result[0].rotated_at
+
+            # Return the pooled DB connection before waiting; waiters could otherwise exhaust the pool
+            session.close()
+            # Single-flight across workers (re-entrant for callers already holding it)
+            async with connection_refresh_lock.hold(connection_id):
+                result = session.exec(statement).first()
+                if not result:
+                    raise ValueError("Connection not found or revoked")
+
+                connection, digital_asset = result
+
+                # Rotated while we waited on the lock: reuse that token
+                if connection.rotated_at != rotated_at and not self.is_ga_token_expired(connection.expires_at):
+                    print(f"🔄 GA4 Token was already refreshed by another process")
+                    return {
+                        "access_token": self._decrypt_token(connection.access_token_enc),
+                        "expires_at": connection.expires_at.isoformat(),
+                        "rotated_at": connection.rotated_at.isoformat()
+                    }
             
-            connection, digital_asset = result
-            
-            # Decrypt refresh token
-            refresh_token = self._decrypt_token(connection.refresh_token_enc)
+                # Decrypt refresh token
+                refresh_token = self._decrypt_token(connection.refresh_token_enc)
             
-            # Create credentials and refresh using stored scopes
-            stored_scopes = connection.scopes if connection.scopes else self.GA4_SCOPES
-            credentials = Credentials(
-                token=None,
-                refresh_token=refresh_token,
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=get_google_client_id(),
-                client_secret=get_google_client_secret(),
-                scopes=stored_scopes
-            )
+                # Create credentials and refresh using stored scopes
+                stored_scopes = connection.scopes if connection.scopes else self.GA4_SCOPES
+                credentials = Credentials(
+                    token=None,
+                    refresh_token=refresh_token,
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=get_google_client_id(),
+                    client_secret=get_google_client_secret(),
+                    scopes=stored_scopes
+                )
             
-            try:
-                # Refresh the token
-                credentials.refresh(Request())
+                try:
+                    # Refresh the token
+                    credentials.refresh(Request())
                 
-                # Encrypt new tokens
-                access_token_enc = self._encrypt_token(credentials.token)
-                refresh_token_enc = self._encrypt_token(credentials.refresh_token)
-                token_hash = self._generate_token_hash(credentials.token)
+                    # Encrypt new tokens
+                    access_token_enc = self._encrypt_token(credentials.token)
+                    refresh_token_enc = self._encrypt_token(credentials.refresh_token)
+                    token_hash = self._generate_token_hash(credentials.token)
                 
-                # Update connection
-                connection.access_token_enc = access_token_enc
-                connection.refresh_token_enc = refresh_token_enc
-                connection.token_hash = token_hash
-                now = datetime.now(timezone.utc)
-                connection.expires_at = now + timedelta(seconds=3600)  # 1 hour
-                connection.rotated_at = now
-                connection.last_used_at = now
+                    # Update connection
+                    connection.access_token_enc = access_token_enc
+                    connection.refresh_token_enc = refresh_token_enc
+                    connection.token_hash = token_hash
+                    now = datetime.now(timezone.utc)
+                    connection.expires_at = now + timedelta(seconds=3600)  # 1 hour
+                    connection.rotated_at = now
+                    connection.last_used_at = now
                 
-                session.add(connection)
-                session.commit()
+                    session.add(connection)
+                    session.commit()
                 
-                return {
-                    "access_token": credentials.token,
-                    "expires_at": connection.expires_at.isoformat(),
-                    "rotated_at": connection.rotated_at.isoformat()
-                }
+                    return {
+                        "access_token": credentials.token,
+                        "expires_at": connection.expires_at.isoformat(),
+                        "rotated_at": connection.rotated_at.isoformat()
+                    }
                 
-            except Exception as e:
-                # If refresh fails (invalid_scope, expired refresh token, etc.)
-                print(f"⚠️ Token refresh failed for connection {connection_id}: {e}")
+                except Exception as e:
+                    # If refresh fails (invalid_scope, expired refresh token, etc.)
+                    print(f"⚠️ Token refresh failed for connection {connection_id}: {e}")
                 
-                # Try automatic token renewal first
-                try:
-                    print(f"🔄 Attempting automatic token renewal for connection {connection_id}...")
-                    renewed = await self.automatic_token_renewal(connection_id, connection, digital_asset)
-                    if renewed:
-                        print(f"✅ Automatic token renewal successful!")
-                        return renewed
-                except Exception as renewal_error:
-                    print(f"❌ Automatic renewal failed: {renewal_error}")
+                    # Try automatic token renewal first
+                    try:
+                        print(f"🔄 Attempting automatic token renewal for connection {connection_id}...")
+                        renewed = await self.automatic_token_renewal(connection_id, connection, digital_asset)
+                        if renewed:
+                            print(f"✅ Automatic token renewal successful!")
+                            return renewed
+                    except Exception as renewal_error:
+                        print(f"❌ Automatic renewal failed: {renewal_error}")
                 
-                # If automatic renewal fails, generate re-auth URL and fail clearly
-                reauth_url = self.generate_reauth_url(connection_id, connection.account_email)
-                raise ValueError(f"GA4 token refresh failed. Please re-authorize your Google Analytics connection: {reauth_url}")
+                    # If automatic renewal fails, generate re-auth URL and fail clearly
+                    reauth_url = self.generate_reauth_url(connection_id, connection.account_email)
+                    raise ValueError(f"GA4 token refresh failed. Please re-authorize your Google Analytics connection: {reauth_url}")
 
     def generate_reauth_url(self, connection_id: int, user_email: str) -> str:
         """Generate a new OAuth URL for re-authorization when refresh tokens are invalid"""
@@ -657,13 +677,14 @@ class GoogleAnalyticsService:
             token_needs_refresh = self.is_ga_token_expired(connection.expires_at)
             
             if token_needs_refresh:
-                # Use refresh lock to prevent simultaneous refresh attempts
-                if connection_id not in self._refresh_locks:
-                    self._refresh_locks[connection_id] = asyncio.Lock()
-                
-                async with self._refresh_locks[connection_id]:
+                # Return the pooled DB connection before waiting; waiters could otherwise exhaust the pool
+                session.close()
+                # Single-flight across workers: one caller refreshes, the others wait and reuse its token
+                async with connection_refresh_lock.hold(connection_id):
                     # Double-check if token still needs refresh (another process might have refreshed it)
-                    connection = session.exec(statement).first()  # Reload from DB
+                    connection = session.exec(statement).first()
+                    if not connection:
+                        raise ValueError("Connection not found or revoked")
                     if not self.is_ga_token_expired(connection.expires_at):
                         print(f"🔄 GA4 Token was already refreshed by another process")
                     else:
@@ -677,7 +698,7 @@ class GoogleAnalyticsService:
                         try:
                             await self.refresh_ga_token(connection_id)
                             # Reload connection
-                            connection = session.exec(statement).first()
+                            session.refresh(connection)
                             print(f"✅ GA4 Token refreshed successfully")
                         except Exception as refresh_error:
                             print(f"❌ GA4 Token refresh failed: {refresh_error}")
@@ -0,0 +1,38 @@
+"""
+Job Handlers
+Executors for the durable job queue's job types.
+
+Imported by the job worker to register the handlers; payloads are the
+keyword arguments the API routes stored when enqueueing.
+"""
+
+from typing import Any, Dict
+
+from app.services.job_queue import job_failure_notifier, job_handler
+
+METRICS_SYNC_JOB = "metrics_sync"
+DIALOGCX_ANALYSIS_JOB = "dialogcx_analysis"
+
+
+@job_handler(METRICS_SYNC_JOB)
+def run_metrics_sync(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Metrics sync for one customer (or all customers when customer_id is None)."""
+    from app.services.campaign_sync_service import CampaignSyncService
+
+    return CampaignSyncService().sync_metrics_new(customer_id=payload.get("customer_id"))
+
+
+@job_handler(DIALOGCX_ANALYSIS_JOB)
+async def run_dialogcx_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """DialogCX crew analysis; the result is delivered through the WebSocket backplane."""
+    from app.api.v1.routes.webhooks import _run_dialogcx_analysis_job
+
+    return await _run_dialogcx_analysis_job(**payload)
+
+
+@job_failure_notifier(DIALOGCX_ANALYSIS_JOB)
+async def notify_dialogcx_analysis_failed(payload: Dict[str, Any], error: str) -> None:
+    """The worker running the analysis died; tell the user instead of leaving them waiting."""
+    from app.api.v1.routes.webhooks import _send_dialogcx_analysis_error
+
+    await _send_dialogcx_analysis_error(payload["dialogcx_session_id"], error)
@@ -0,0 +1,414 @@
+"""
+Durable Job Queue
+Postgres-backed queue for long analytics runs (DialogCX analyses, metrics syncs).
+
+Jobs are rows in analytics_jobs. API routes enqueue them and return a job ID;
+standalone workers (scripts/run_job_worker.py) lease due jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so several workers can poll the same table
+without handing out a job twice. A leased job carries a lease expiry that the
+worker extends with heartbeats; if the worker dies, the lease runs out and
+another worker picks the job up again. Failed attempts are retried with
+exponential backoff until max_attempts, and the handler result is stored on
+the row for status polling. A job whose lease expires on its last attempt is
+failed by the next lease call; its job type's failure notifier (if any) then
+tells the user, since the handler never got to.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlmodel import Session, select
+
+from app.config.database import get_session
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.models.jobs import AnalyticsJob, JobStatus, TERMINAL_JOB_STATUSES
+
+logger = get_logger(__name__)
+
+# job_type -> handler(payload) registered with @job_handler
+_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def job_handler(job_type: str):
+    """Register a function (sync or async) that executes jobs of `job_type`."""
+    def decorator(func: Callable[[Dict[str, Any]], Any]):
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[Callable[[Dict[str, Any]], Any]]:
+    return _handlers.get(job_type)
+
+
+# job_type -> notifier(payload, error) registered with @job_failure_notifier
+_failure_notifiers: Dict[str, Callable[[Dict[str, Any], str], Any]] = {}
+
+
+def job_failure_notifier(job_type: str):
+    """
+    Register a function (sync or async) run when a `job_type` job fails
+    without its handler finishing (the worker died on the last attempt).
+    """
+    def decorator(func: Callable[[Dict[str, Any], str], Any]):
+        _failure_notifiers[job_type] = func
+        return func
+    return decorator
+
+
+def get_job_failure_notifier(job_type: str) -> Optional[Callable[[Dict[str, Any], str], Any]]:
+    return _failure_notifiers.get(job_type)
+
+
+def registered_job_types() -> List[str]:
+    return sorted(_handlers)
+
+
+@dataclass
+class LeasedJob:
+    """Snapshot of a job handed to a worker."""
+    id: int
+    job_type: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+    campaigner_id: Optional[int] = None
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _json_safe(value: Any) -> Any:
+    """Round-trip through JSON so results with datetimes/Decimals fit a JSON column."""
+    if value is None:
+        return None
+    return json.loads(json.dumps(value, default=str))
+
+
+def job_to_dict(job: AnalyticsJob) -> dict:
+    """Public view of a job for status endpoints."""
+    return {
+        "job_id": job.id,
+        "job_type": job.job_type,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "cancel_requested": job.cancel_requested,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "run_after": job.run_after.isoformat() if job.run_after else None,
+        "result": job.result,
+        "error": job.last_error,
+    }
+
+
+class JobQueue:
+    """
+    Enqueue, lease, heartbeat, complete and retry analytics jobs.
+
+    Every method uses its own short transaction from `session_factory`, so no
+    row lock is held while a handler runs; ownership is tracked by
+    lease_owner/lease_expires_at instead.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = get_session,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff_base_seconds: Optional[float] = None,
+        backoff_max_seconds: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.job_queue_lease_seconds
+        self.max_attempts = max_attempts or settings.job_queue_max_attempts
+        self.backoff_base_seconds = backoff_base_seconds or settings.job_queue_backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds or settings.job_queue_backoff_max_seconds
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Optional[Dict[str, Any]] = None,
+        campaigner_id: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        delay_seconds: float = 0
+    ) -> int:
+        """
+        Store a new job.
+
+        Returns:
+            The job ID
+        """
+        job = AnalyticsJob(
+            job_type=job_type,
+            payload=_json_safe(payload or {}),
+            campaigner_id=campaigner_id,
+            max_attempts=max_attempts or self.max_attempts,
+            run_after=_now() + timedelta(seconds=delay_seconds)
+        )
+        with self.session_factory() as session:
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+            job_id = job.id
+        logger.info(f"📥 [Job Queue] Enqueued {job_type} job {job_id}")
+        return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a job.
+
+        A queued job is cancelled immediately; a running job is flagged and
+        its worker stops it at the next heartbeat.
+
+        Returns:
+            True if the job was queued or running
+        """
+        with self.session_factory() as session:
+            job = session.exec(
+                select(AnalyticsJob).where(AnalyticsJob.id == job_id).with_for_update()
+            ).first()
+            if job is None or job.status in TERMINAL_JOB_STATUSES:
+                return False
+            if job.status == JobStatus.QUEUED:
+                job.status = JobStatus.CANCELLED.value
+                job.finished_at = _now()
+                job.last_error = "Cancelled before start"
+            else:
+                job.cancel_requested = True
+            job.updated_at = _now()
+            session.add(job)
+            session.commit()
+        logger.info(f"🛑 [Job Queue] Cancel requested for job {job_id}")
+        return True
+
+    def get(self, job_id: int) -> Optional[dict]:
+        with self.session_factory() as session:
+            job = session.get(AnalyticsJob, job_id)
+            return job_to_dict(job) if job else None
+
+    def get_owner(self, job_id: int) -> Optional[int]:
+        """campaigner_id of a job (None if unknown or system-submitted)."""
+        with self.session_factory() as session:
+            return session.exec(
+                select(AnalyticsJob.campaigner_id).where(AnalyticsJob.id == job_id)
+            ).first()
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def lease(
+        self,
+        worker_id: str,
+        job_types: Optional[Sequence[str]] = None,
+        limit: int = 1,
+        on_abandoned: Optional[Callable[[LeasedJob, str], None]] = None
+    ) -> List[LeasedJob]:
+        """
+        Claim up to `limit` due jobs for a worker.
+
+        Due jobs are queued jobs past run_after, plus running jobs whose lease
+        expired (their worker died). Rows locked by another worker's lease
+        transaction are skipped rather than waited on. Expired jobs with no
+        attempts left are failed instead, and passed to `on_abandoned` with
+        the error once the transaction commits.
+        """
+        now = _now()
+        due = or_(
+            and_(AnalyticsJob.status == JobStatus.QUEUED.value, AnalyticsJob.run_after <= now),
+            and_(AnalyticsJob.status == JobStatus.RUNNING.value, AnalyticsJob.lease_expires_at < now)
+        )
+        statement = select(AnalyticsJob).where(due)
+        if job_types:
+            statement = statement.where(AnalyticsJob.job_type.in_(list(job_types)))
+        statement = (
+            statement.order_by(AnalyticsJob.run_after, AnalyticsJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        leased: List[LeasedJob] = []
+        abandoned: List[Tuple[LeasedJob, str]] = []
+        with self.session_factory() as session:
+            for job in session.exec(statement).all():
+                if job.status == JobStatus.RUNNING:
+                    logger.warning(f"⚠️ [Job Queue] Lease of job {job.id} held by {job.lease_owner} expired")
+                    if job.cancel_requested:
+                        self._finish(job, JobStatus.CANCELLED, error="Cancelled while running")
+                        session.add(job)
+                        continue
+                    if job.attempts >= job.max_attempts:
+                        error = f"Lease expired after {job.attempts} attempts"
+                        self._finish(job, JobStatus.FAILED, error=error)
+                        session.add(job)
+                        abandoned.append((self._snapshot(job), error))
+                        continue
+
+                job.status = JobStatus.RUNNING.value
+                job.attempts += 1
+                job.lease_owner = worker_id
+                job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+                job.heartbeat_at = now
+                job.started_at = job.started_at or now
+                job.updated_at = now
+                session.add(job)
+                leased.append(self._snapshot(job))
+            session.commit()
+
+        for job in leased:
+            logger.info(f"🔒 [Job Queue] {worker_id} leased {job.job_type} job {job.id} (attempt {job.attempts})")
+        for job, error in abandoned:
+            logger.error(f"❌ [Job Queue] Job {job.id} failed: {error}")
+            if on_abandoned is not None:
+                on_abandoned(job, error)
+        return leased
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Extend a job's lease.
+
+        Returns:
+            False if the worker no longer owns the job or a cancel was
+            requested; the worker should stop running it.
+        """
+        now = _now()
+        with self.session_factory() as session:
+            job = self._owned(session, job_id, worker_id)
+            if job is None:
+                return False
+            job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+            job.heartbeat_at = now
+            job.updated_at = now
+            session.add(job)
+            session.commit()
+            return not job.cancel_requested
+
+    def complete(self, job_id: int, worker_id: str, result: Any = None) -> bool:
+        """Store a job's result and mark it succeeded. False if the lease was lost."""
+        with self.session_factory() as session:
+            job = self._owned(session, job_id, worker_id)
+            if job is None:
+                logger.warning(f"⚠️ [Job Queue] {worker_id} lost job {job_id} before completing it")
+                return False
+            job.result = _json_safe(result)
+            self._finish(job, JobStatus.SUCCEEDED)
+            session.add(job)
+            session.commit()
+        logger.info(f"✅ [Job Queue] Job {job_id} succeeded")
+        return True
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """
+        Record a failed attempt.
+
+        The job is re-queued with exponential backoff while attempts remain
+        (and `retry` is True), otherwise marked failed.
+
+        Returns:
+            The job's new status, or None if the lease was lost
+        """
+        with self.session_factory() as session:
+            job = self._owned(session, job_id, worker_id)
+            if job is None:
+                return None
+            if retry and not job.cancel_requested and job.attempts < job.max_attempts:
+                delay = self.backoff_seconds(job.attempts)
+                job.status = JobStatus.QUEUED.value
+                job.run_after = _now() + timedelta(seconds=delay)
+                job.lease_owner = None
+                job.lease_expires_at = None
+                job.last_error = error
+                job.updated_at = _now()
+                logger.warning(f"🔁 [Job Queue] Job {job_id} attempt {job.attempts} failed: {error}; "
+                               f"retrying in {delay:.0f}s")
+            else:
+                self._finish(job, JobStatus.FAILED, error=error)
+                logger.error(f"❌ [Job Queue] Job {job_id} failed after {job.attempts} attempts: {error}")
+            session.add(job)
+            session.commit()
+            return job.status
+
+    def mark_cancelled(self, job_id: int, worker_id: str) -> bool:
+        """Worker acknowledgement that it stopped a job after a cancel request."""
+        with self.session_factory() as session:
+            job = self._owned(session, job_id, worker_id)
+            if job is None:
+                return False
+            self._finish(job, JobStatus.CANCELLED, error="Cancelled while running")
+            session.add(job)
+            session.commit()
+        logger.info(f"🛑 [Job Queue] Job {job_id} cancelled")
+        return True
+
+    def backoff_seconds(self, attempts: int) -> float:
+        """Delay before the next attempt: capped exponential backoff with jitter."""
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** max(attempts - 1, 0)))
+        # Jitter spreads retries of jobs that failed together (e.g. a provider outage)
+        return delay * random.uniform(0.5, 1.0)
+
+    def get_stats(self) -> dict:
+        with self.session_factory() as session:
+            rows = session.exec(
+                select(AnalyticsJob.status, func.count(AnalyticsJob.id)).group_by(AnalyticsJob.status)
+            ).all()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({status: count for status, count in rows})
+        return {
+            "jobs_by_status": counts,
+            "lease_seconds": self.lease_seconds,
+            "registered_job_types": registered_job_types(),
+        }
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _owned(session: Session, job_id: int, worker_id: str) -> Optional[AnalyticsJob]:
+        return session.exec(
+            select(AnalyticsJob)
+            .where(
+                AnalyticsJob.id == job_id,
+                AnalyticsJob.status == JobStatus.RUNNING.value,
+                AnalyticsJob.lease_owner == worker_id
+            )
+            .with_for_update()
+        ).first()
+
+    @staticmethod
+    def _snapshot(job: AnalyticsJob) -> LeasedJob:
+        return LeasedJob(
+            id=job.id,
+            job_type=job.job_type,
+            payload=dict(job.payload or {}),
+            attempts=job.attempts,
+            max_attempts=job.max_attempts,
+            campaigner_id=job.campaigner_id
+        )
+
+    @staticmethod
+    def _finish(job: AnalyticsJob, status: JobStatus, error: Optional[str] = None) -> None:
+        now = _now()
+        job.status = status.value
+        job.finished_at = now
+        job.lease_owner = None
+        job.lease_expires_at = None
+        job.updated_at = now
+        if error is not None:
+            job.last_error = error
+
+
+job_queue = JobQueue()
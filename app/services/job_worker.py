@@ -0,0 +1,204 @@
+"""
+Job Worker
+Standalone process that executes jobs from the durable job queue.
+
+Run with scripts/run_job_worker.py. Each worker leases up to `concurrency`
+jobs at a time, runs their handlers (sync handlers in a thread), and
+heartbeats every lease_seconds / 3 while a handler runs. A failed heartbeat
+means the lease was lost or the job was cancelled, and the handler is
+cancelled. WebSocket messages sent by handlers reach API workers through the
+configured WebSocket backplane. When token_refresher_enabled is set, the
+worker also runs the background OAuth token refresher.
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import signal
+import socket
+import uuid
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.services.job_queue import JobQueue, LeasedJob, get_job_failure_notifier, get_job_handler, job_queue
+
+logger = get_logger(__name__)
+
+
+class JobWorker:
+    """Polls the job queue and runs leased jobs concurrently."""
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        job_types: Optional[Sequence[str]] = None
+    ):
+        settings = get_settings()
+        self.queue = queue or job_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency or settings.job_worker_concurrency
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.job_worker_poll_seconds
+        self.job_types = list(job_types) if job_types else None
+        self._running: Set[asyncio.Task] = set()
+        self._stopping: Optional[asyncio.Event] = None
+
+    @property
+    def heartbeat_seconds(self) -> float:
+        return self.queue.lease_seconds / 3
+
+    async def run(self) -> None:
+        """Lease and run jobs until stop() is called, then wait for running jobs."""
+        self._stopping = asyncio.Event()
+        logger.info(f"👷 [Job Worker] {self.worker_id} started (concurrency={self.concurrency}, "
+                    f"job_types={self.job_types or 'all'})")
+        while not self._stopping.is_set():
+            leased = []
+            free = self.concurrency - len(self._running)
+            if free > 0:
+                try:
+                    leased = await self._lease(free)
+                except Exception as e:
+                    logger.error(f"❌ [Job Worker] Lease failed: {str(e)}")
+            for job in leased:
+                task = asyncio.create_task(self.execute(job), name=f"job-{job.id}")
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            if leased and len(self._running) < self.concurrency:
+                continue  # More jobs may be due
+            await self._idle()
+
+        if self._running:
+            logger.info(f"⏳ [Job Worker] Waiting for {len(self._running)} running jobs")
+            await asyncio.gather(*self._running, return_exceptions=True)
+        logger.info(f"👋 [Job Worker] {self.worker_id} stopped")
+
+    async def _idle(self) -> None:
+        """Sleep until the poll interval passes, a job finishes, or stop() is called."""
+        waiters = {asyncio.create_task(self._stopping.wait())}
+        waiters.update(self._running)
+        try:
+            await asyncio.wait(waiters, timeout=self.poll_seconds, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                if waiter not in self._running:
+                    waiter.cancel()
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run_once(self) -> int:
+        """Lease whatever is due (up to concurrency), run it to completion; returns the job count."""
+        leased = await self._lease(self.concurrency)
+        await asyncio.gather(*(self.execute(job) for job in leased))
+        return len(leased)
+
+    async def _lease(self, limit: int) -> List[LeasedJob]:
+        """Lease due jobs, notifying users of jobs failed because their last lease expired."""
+        abandoned: List[Tuple[LeasedJob, str]] = []
+        leased = await asyncio.to_thread(self.queue.lease, self.worker_id, self.job_types, limit,
+                                         lambda job, error: abandoned.append((job, error)))
+        for job, error in abandoned:
+            await self._notify_failed(job, error)
+        return leased
+
+    async def _notify_failed(self, job: LeasedJob, error: str) -> None:
+        notifier = get_job_failure_notifier(job.job_type)
+        if notifier is None:
+            return
+        try:
+            if inspect.iscoroutinefunction(notifier):
+                await notifier(job.payload, error)
+            else:
+                await asyncio.to_thread(notifier, job.payload, error)
+        except Exception as e:
+            logger.error(f"❌ [Job Worker] Failure notification for job {job.id} failed: {str(e)}")
+
+    async def execute(self, job: LeasedJob) -> None:
+        """Run one leased job, heartbeating until it finishes, and record the outcome."""
+        handler = get_job_handler(job.job_type)
+        if handler is None:
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id,
+                                    f"No handler registered for job type '{job.job_type}'", False)
+            return
+
+        task = asyncio.create_task(self._call(handler, job.payload))
+        stopped = False
+        while not task.done():
+            done, _ = await asyncio.wait({task}, timeout=self.heartbeat_seconds)
+            if done:
+                break
+            try:
+                keep_running = await asyncio.to_thread(self.queue.heartbeat, job.id, self.worker_id)
+            except Exception as e:
+                # Transient DB error: keep running, the lease covers a few missed beats
+                logger.warning(f"⚠️ [Job Worker] Heartbeat for job {job.id} failed: {str(e)}")
+                continue
+            if not keep_running:
+                logger.warning(f"🛑 [Job Worker] Stopping job {job.id}: lease lost or cancel requested")
+                stopped = True
+                task.cancel()
+
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not stopped:
+                raise
+            await asyncio.to_thread(self.queue.mark_cancelled, job.id, self.worker_id)
+            return
+        except Exception as e:
+            logger.error(f"❌ [Job Worker] Job {job.id} ({job.job_type}) raised: {str(e)}")
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, str(e))
+            return
+        await asyncio.to_thread(self.queue.complete, job.id, self.worker_id, result)
+
+    @staticmethod
+    async def _call(handler, payload: dict) -> Any:
+        if inspect.iscoroutinefunction(handler):
+            return await handler(payload)
+        return await asyncio.to_thread(handler, payload)
+
+
+async def _serve(worker: JobWorker) -> None:
+    from app.core.websocket_backplane import create_backplane
+    from app.core.websocket_manager import connection_manager
+    from app.services.token_refresh_scheduler import token_refresh_scheduler
+
+    backplane = create_backplane(get_settings())
+    if backplane is not None:
+        await connection_manager.start_backplane(backplane)
+    else:
+        logger.warning("⚠️ [Job Worker] No WebSocket backplane configured - "
+                       "results will only reach clients through DialogCX events")
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass
+    if get_settings().token_refresher_enabled:
+        token_refresh_scheduler.start()
+    try:
+        await worker.run()
+    finally:
+        await token_refresh_scheduler.stop()
+        await connection_manager.drain(timeout=5)
+        await connection_manager.stop_backplane()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a durable job queue worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs run at once")
+    parser.add_argument("--job-type", action="append", dest="job_types",
+                        help="Only lease this job type (repeatable)")
+    args = parser.parse_args(argv)
+
+    import app.services.job_handlers  # noqa: F401 - registers handlers
+
+    asyncio.run(_serve(JobWorker(concurrency=args.concurrency, job_types=args.job_types)))
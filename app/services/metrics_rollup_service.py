@@ -0,0 +1,289 @@
+"""
+Metrics Rollup Service
+Maintains metrics_rollups (day / ISO week / month per platform and item type)
+and plans /metrics/aggregated queries against them.
+
+Rollups are kept current incrementally:
+- Core upserts (campaign sync) call mark_metrics_changed() for the dates they wrote
+- ORM inserts/updates/deletes of Metrics are picked up by the cache registry's
+  flush hook (app/config/cache_registry.py)
+Affected rollups are rebuilt in the same transaction, just before it commits.
+Rebuilt rows are upserted on the rollup key, so transactions rebuilding the
+same periods concurrently don't collide on uq_metrics_rollups_key.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import and_, delete, func, inspect, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.config.cache_registry import mark_changed, register_invalidation
+from app.config.logging import get_logger
+from app.models.analytics import Metrics, MetricsRollup
+
+logger = get_logger(__name__)
+
+GRAIN_DAY = "day"
+GRAIN_WEEK = "week"
+GRAIN_MONTH = "month"
+
+# Cache registry name under which (platform_id, date) pairs await a rollup refresh
+ROLLUP_INVALIDATION = "metrics_rollups"
+
+ROLLUP_SUM_COLUMNS = ("clicks", "impressions", "leads", "spent", "conversions", "conv_val")
+
+# Columns of uq_metrics_rollups_key, the upsert conflict target
+ROLLUP_KEY_COLUMNS = ("grain", "platform_id", "item_type", "period_start")
+
+
+def period_start(grain: str, day: date) -> date:
+    """Return the first day of the period containing `day` (ISO weeks start on Monday)."""
+    if grain == GRAIN_WEEK:
+        return day - timedelta(days=day.weekday())
+    if grain == GRAIN_MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def period_end(grain: str, start: date) -> date:
+    """Return the last day of the period starting at `start`."""
+    if grain == GRAIN_WEEK:
+        return start + timedelta(days=6)
+    if grain == GRAIN_MONTH:
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    return start
+
+
+def plan_rollup_segments(start_date: date, end_date: date) -> List[Tuple[str, date, date]]:
+    """
+    Cover [start_date, end_date] with the coarsest rollups that fit.
+
+    Whole months are read from monthly rollups, whole ISO weeks in the
+    remaining gaps from weekly rollups, and the edges from daily rollups.
+
+    Returns:
+        List of (grain, first_period_start, last_period_start) runs, in date order
+    """
+    return _plan_segments(start_date, end_date, (GRAIN_MONTH, GRAIN_WEEK, GRAIN_DAY))
+
+
+def _plan_segments(start_date: date, end_date: date, grains: Tuple[str, ...]) -> List[Tuple[str, date, date]]:
+    if start_date > end_date:
+        return []
+    grain = grains[0]
+    if grain == GRAIN_DAY:
+        return [(GRAIN_DAY, start_date, end_date)]
+
+    # First whole period starting on/after start_date, last one ending on/before end_date
+    first = period_start(grain, start_date)
+    if first < start_date:
+        first = period_end(grain, first) + timedelta(days=1)
+    last = period_start(grain, end_date)
+    if period_end(grain, last) > end_date:
+        last = period_start(grain, last - timedelta(days=1))
+    if first > last:
+        return _plan_segments(start_date, end_date, grains[1:])
+
+    return (
+        _plan_segments(start_date, first - timedelta(days=1), grains[1:])
+        + [(grain, first, last)]
+        + _plan_segments(period_end(grain, last) + timedelta(days=1), end_date, grains[1:])
+    )
+
+
+def rollup_segment_conditions(start_date: date, end_date: date) -> list:
+    """Return one WHERE clause per planned segment, to be OR-ed together."""
+    return [
+        and_(
+            MetricsRollup.grain == grain,
+            MetricsRollup.period_start >= first,
+            MetricsRollup.period_start <= last,
+        )
+        for grain, first, last in plan_rollup_segments(start_date, end_date)
+    ]
+
+
+def mark_metrics_changed(session: Session, platform_id: int, dates: Iterable[date]) -> None:
+    """
+    Record metric dates written outside the ORM (e.g. INSERT ... ON CONFLICT)
+    so their rollups are rebuilt when the session commits.
+    """
+    mark_changed(session, ROLLUP_INVALIDATION, ((platform_id, day) for day in dates))
+
+
+def refresh_rollups(session: Session, changes: Dict[int, Set[date]]) -> int:
+    """
+    Rebuild daily, weekly and monthly rollups for the given platform dates.
+
+    Daily rollups are recomputed from raw metrics over the changed date span;
+    weekly and monthly rollups are recomputed from the daily rollups over the
+    full periods that contain a changed date.
+
+    Returns:
+        Number of rollup rows written
+    """
+    written = 0
+    now = datetime.now(timezone.utc)
+
+    for platform_id, dates in changes.items():
+        if not dates:
+            continue
+        first_day, last_day = min(dates), max(dates)
+
+        # Daily rollups from raw metrics
+        daily_rows = session.execute(
+            select(
+                Metrics.metric_date,
+                Metrics.item_type,
+                *[func.coalesce(func.sum(getattr(Metrics, column)), 0) for column in ROLLUP_SUM_COLUMNS],
+                func.max(Metrics.reach),
+                func.coalesce(func.sum(Metrics.reach), 0),
+                func.count(),
+            )
+            .where(
+                Metrics.platform_id == platform_id,
+                Metrics.metric_date >= first_day,
+                Metrics.metric_date <= last_day,
+            )
+            .group_by(Metrics.metric_date, Metrics.item_type)
+        ).all()
+
+        day_values = [
+            _rollup_values(GRAIN_DAY, row[0], platform_id, row[1], row[2:], now)
+            for row in daily_rows
+        ]
+        written += _replace_rollups(session, GRAIN_DAY, platform_id, first_day, last_day, day_values)
+
+        # Weekly and monthly rollups from the daily rollups
+        for grain in (GRAIN_WEEK, GRAIN_MONTH):
+            span_start = period_start(grain, first_day)
+            span_end = period_end(grain, period_start(grain, last_day))
+
+            daily_in_span = session.execute(
+                select(
+                    MetricsRollup.period_start,
+                    MetricsRollup.item_type,
+                    *[getattr(MetricsRollup, column) for column in ROLLUP_SUM_COLUMNS],
+                    MetricsRollup.reach_max_day,
+                    MetricsRollup.reach_sum,
+                    MetricsRollup.source_rows,
+                ).where(
+                    MetricsRollup.grain == GRAIN_DAY,
+                    MetricsRollup.platform_id == platform_id,
+                    MetricsRollup.period_start >= span_start,
+                    MetricsRollup.period_start <= span_end,
+                )
+            ).all()
+
+            buckets: Dict[Tuple[date, str], list] = {}
+            for row in daily_in_span:
+                key = (period_start(grain, row[0]), row[1])
+                totals = buckets.get(key)
+                if totals is None:
+                    buckets[key] = list(row[2:])
+                    continue
+                for i in range(len(ROLLUP_SUM_COLUMNS)):
+                    totals[i] += row[2 + i]
+                reach_index = len(ROLLUP_SUM_COLUMNS)
+                if row[2 + reach_index] is not None:
+                    current = totals[reach_index]
+                    totals[reach_index] = row[2 + reach_index] if current is None else max(current, row[2 + reach_index])
+                totals[reach_index + 1] += row[2 + reach_index + 1]
+                totals[reach_index + 2] += row[2 + reach_index + 2]
+
+            period_values = [
+                _rollup_values(grain, start, platform_id, item_type, totals, now)
+                for (start, item_type), totals in buckets.items()
+            ]
+            written += _replace_rollups(session, grain, platform_id, span_start, span_end, period_values)
+
+    return written
+
+
+def _replace_rollups(
+    session: Session, grain: str, platform_id: int, first: date, last: date, values: List[dict]
+) -> int:
+    """
+    Make the stored rollups of one grain and platform in [first, last] equal `values`.
+
+    Rows are upserted on the rollup key (a concurrent rebuild of the same
+    periods updates rather than violates it); rollups whose source metrics
+    are gone are deleted.
+    """
+    if values:
+        dialect = session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(MetricsRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY_COLUMNS),
+            set_={
+                column: stmt.excluded[column]
+                for column in values[0]
+                if column not in ROLLUP_KEY_COLUMNS and column != "created_at"
+            },
+        )
+        session.execute(stmt, values)
+
+    stale = delete(MetricsRollup).where(
+        MetricsRollup.grain == grain,
+        MetricsRollup.platform_id == platform_id,
+        MetricsRollup.period_start >= first,
+        MetricsRollup.period_start <= last,
+    )
+    if values:
+        stale = stale.where(
+            tuple_(MetricsRollup.period_start, MetricsRollup.item_type).not_in(
+                [(row["period_start"], row["item_type"]) for row in values]
+            )
+        )
+    session.execute(stale)
+    return len(values)
+
+
+def _rollup_values(grain: str, start: date, platform_id: int, item_type: str, aggregates, now: datetime) -> dict:
+    """Build an insert row from (sums..., reach_max_day, reach_sum, source_rows)."""
+    values = {
+        "grain": grain,
+        "period_start": start,
+        "platform_id": platform_id,
+        "item_type": item_type,
+        "created_at": now,
+        "updated_at": now,
+    }
+    values.update(zip(ROLLUP_SUM_COLUMNS, aggregates[:len(ROLLUP_SUM_COLUMNS)]))
+    values["reach_max_day"], values["reach_sum"], values["source_rows"] = aggregates[len(ROLLUP_SUM_COLUMNS):]
+    return values
+
+
+# ---------------------------------------------------------------------------
+# Keep rollups in step with ORM writes to Metrics
+# ---------------------------------------------------------------------------
+
+def _changed_metric_days(obj: Metrics) -> Iterable[Tuple[int, date]]:
+    if obj.platform_id is None or obj.metric_date is None:
+        return ()
+    dates = {obj.metric_date}
+    # A moved row also changes the rollup it came from
+    history = inspect(obj).attrs.metric_date.history
+    dates.update(d for d in history.deleted or () if d is not None)
+    return ((obj.platform_id, day) for day in dates)
+
+
+def _refresh_pending_rollups(session: Session, changed: Set[Tuple[int, date]]) -> None:
+    changes: Dict[int, Set[date]] = defaultdict(set)
+    for platform_id, day in changed:
+        changes[platform_id].add(day)
+    written = refresh_rollups(session, changes)
+    logger.debug(f"📊 [Metrics Rollups] Rebuilt {written} rollup rows for {len(changes)} platform(s)")
+
+
+# Affected rollups are rebuilt in the committing transaction
+register_invalidation(
+    ROLLUP_INVALIDATION, (Metrics,),
+    collect=_changed_metric_days,
+    before_commit=_refresh_pending_rollups,
+)
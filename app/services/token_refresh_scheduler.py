@@ -0,0 +1,289 @@
+"""
+Token Refresh Scheduler
+Refreshes OAuth access tokens before they expire, off the request path.
+
+Every interval the scheduler scans connections whose expires_at falls within
+the lead window and refreshes them through the provider services
+(GoogleAnalyticsService, GoogleAdsService, FacebookService), so analytics
+requests almost always find a valid token. Refreshes run with bounded
+concurrency, a random start delay (so workers and instances scanning at the
+same moment don't hit the same connection together) and a per-provider rate
+limit on the token endpoints (GA4 and Google Ads share Google's).
+
+The scheduler runs in the job worker process (scripts/run_job_worker.py), not
+in the API, so each deployment scans once per worker rather than once per
+uvicorn worker. The provider refreshers block on HTTP and database calls, so
+each refresh runs on its own thread and event loop.
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlmodel import Session, and_, select
+
+from app.config.database import get_session
+from app.config.logging import get_logger
+from app.config.settings import get_settings
+from app.core.oauth.refresh_lock import connection_refresh_lock
+from app.models.analytics import AssetType, AuthType, Connection, DigitalAsset
+
+logger = get_logger(__name__)
+
+GA4_ASSET_TYPES = (AssetType.GA4, AssetType.ANALYTICS)
+GOOGLE_ADS_ASSET_TYPES = (AssetType.GOOGLE_ADS, AssetType.GOOGLE_ADS_CAPS)
+# Generic SOCIAL_MEDIA/ADVERTISING assets are Facebook only by provider
+FACEBOOK_ASSET_TYPES = (AssetType.FACEBOOK_ADS, AssetType.FACEBOOK_ADS_CAPS)
+
+# Token endpoint each platform refreshes against (rate limits apply per endpoint)
+PLATFORM_PROVIDERS = {"ga4": "google", "google_ads": "google", "facebook": "facebook"}
+
+# FacebookService.refresh_facebook_token only extends tokens within 5 minutes
+# of expiry; scanning earlier would just touch the row
+PLATFORM_LEAD_SECONDS = {"facebook": 240}
+
+
+def connection_platform(asset_type: Any, provider: Optional[str]) -> Optional[str]:
+    """Map a digital asset to the refresher platform ('ga4', 'google_ads', 'facebook')."""
+    if provider and provider.lower() in ("facebook", "meta"):
+        return "facebook"
+    if asset_type in GA4_ASSET_TYPES:
+        return "ga4"
+    if asset_type in GOOGLE_ADS_ASSET_TYPES:
+        return "google_ads"
+    if asset_type in FACEBOOK_ASSET_TYPES:
+        return "facebook"
+    return None
+
+
+def _expires_within(expires_at: Optional[datetime], seconds: float) -> bool:
+    if expires_at is None:
+        return False
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at <= datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def _default_refreshers() -> Dict[str, Callable[[int], Awaitable[Any]]]:
+    from app.services.facebook_service import FacebookService
+    from app.services.google_ads_service import GoogleAdsService
+    from app.services.google_analytics_service import GoogleAnalyticsService
+
+    return {
+        "ga4": GoogleAnalyticsService().refresh_ga_token,
+        "google_ads": GoogleAdsService().refresh_google_ads_token,
+        "facebook": FacebookService().refresh_facebook_token,
+    }
+
+
+class ProviderRateLimiter:
+    """Spaces calls to one token endpoint to at most `per_minute`."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> float:
+        """Wait for the next free slot; returns the seconds waited."""
+        now = time.monotonic()
+        # Reserve the slot before sleeping so concurrent callers queue up behind it
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class TokenRefreshScheduler:
+    """Background loop that refreshes soon-to-expire OAuth connections."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = get_session,
+        refreshers: Optional[Dict[str, Callable[[int], Awaitable[Any]]]] = None,
+        interval_seconds: Optional[float] = None,
+        lead_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        jitter_seconds: Optional[float] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        max_failures: int = 3
+    ):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self._refreshers = refreshers
+        self.interval_seconds = interval_seconds or settings.token_refresher_interval_seconds
+        self.lead_seconds = lead_seconds or settings.token_refresher_lead_seconds
+        self.batch_size = batch_size or settings.token_refresher_batch_size
+        self.concurrency = concurrency or settings.token_refresher_concurrency
+        self.jitter_seconds = jitter_seconds if jitter_seconds is not None else settings.token_refresher_jitter_seconds
+        self.max_failures = max_failures
+        rate_limits = rate_limits or {
+            "google": settings.token_refresher_google_per_minute,
+            "facebook": settings.token_refresher_facebook_per_minute,
+        }
+        self._limiters = {provider: ProviderRateLimiter(limit) for provider, limit in rate_limits.items()}
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"scans": 0, "refreshed": 0, "failed": 0, "skipped": 0, "rate_limited_seconds": 0.0}
+
+    @property
+    def refreshers(self) -> Dict[str, Callable[[int], Awaitable[Any]]]:
+        if self._refreshers is None:
+            self._refreshers = _default_refreshers()
+        return self._refreshers
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def find_due(self) -> List[Tuple[int, str]]:
+        """
+        Connections expiring within the lead window, soonest first.
+
+        Revoked connections, connections awaiting re-authorization and
+        connections that failed max_failures times in a row are left to the
+        request path and the reconnect flow.
+        """
+        horizon = datetime.now(timezone.utc) + timedelta(seconds=self.lead_seconds)
+        statement = (
+            select(Connection.id, Connection.expires_at, DigitalAsset.asset_type, DigitalAsset.provider)
+            .join(DigitalAsset, Connection.digital_asset_id == DigitalAsset.id)
+            .where(
+                and_(
+                    Connection.revoked == False,
+                    Connection.needs_reauth == False,
+                    Connection.auth_type == AuthType.OAUTH2,
+                    Connection.failure_count < self.max_failures,
+                    Connection.expires_at != None,
+                    Connection.expires_at <= horizon,
+                    DigitalAsset.is_active == True
+                )
+            )
+            .order_by(Connection.expires_at)
+            .limit(self.batch_size)
+        )
+        with self.session_factory() as session:
+            rows = session.exec(statement).all()
+
+        due = []
+        for connection_id, expires_at, asset_type, provider in rows:
+            platform = connection_platform(asset_type, provider)
+            if platform is None:
+                continue
+            if not _expires_within(expires_at, PLATFORM_LEAD_SECONDS.get(platform, self.lead_seconds)):
+                continue
+            due.append((connection_id, platform))
+        return due
+
+    def _still_due(self, connection_id: int, platform: str) -> bool:
+        with self.session_factory() as session:
+            connection = session.get(Connection, connection_id)
+            return bool(
+                connection
+                and not connection.revoked
+                and _expires_within(connection.expires_at, PLATFORM_LEAD_SECONDS.get(platform, self.lead_seconds))
+            )
+
+    # ------------------------------------------------------------------
+    # Refreshing
+    # ------------------------------------------------------------------
+
+    async def run_once(self) -> Dict[str, int]:
+        """Scan once and refresh every due connection; returns this pass's counts."""
+        due = await asyncio.to_thread(self.find_due)
+        self._stats["scans"] += 1
+        if not due:
+            return {"due": 0, "refreshed": 0, "failed": 0, "skipped": 0}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        outcomes = await asyncio.gather(*(
+            self._refresh_one(connection_id, platform, semaphore) for connection_id, platform in due
+        ))
+        summary = {"due": len(due)}
+        for outcome in ("refreshed", "failed", "skipped"):
+            summary[outcome] = outcomes.count(outcome)
+        logger.info(f"🔄 [Token Refresher] {summary['refreshed']} refreshed, {summary['failed']} failed, "
+                    f"{summary['skipped']} already fresh ({len(due)} due)")
+        return summary
+
+    async def _refresh_one(self, connection_id: int, platform: str, semaphore: asyncio.Semaphore) -> str:
+        from app.utils.connection_failure_utils import record_connection_failure
+
+        if self.jitter_seconds > 0:
+            await asyncio.sleep(random.uniform(0, self.jitter_seconds))
+        async with semaphore:
+            limiter = self._limiters.get(PLATFORM_PROVIDERS[platform])
+            if limiter is not None:
+                self._stats["rate_limited_seconds"] += await limiter.acquire()
+
+            try:
+                # The provider refreshers block (credentials.refresh(), sync sessions)
+                # despite being async, so each one runs on its own thread and loop
+                outcome = await asyncio.to_thread(self._refresh_blocking, connection_id, platform)
+            except Exception as e:
+                logger.warning(f"⚠️ [Token Refresher] {platform} connection {connection_id} refresh failed: {str(e)}")
+                await asyncio.to_thread(record_connection_failure, connection_id, "token_refresh_failed")
+                self._stats["failed"] += 1
+                return "failed"
+
+            self._stats[outcome] += 1
+            if outcome == "refreshed":
+                logger.debug(f"✅ [Token Refresher] Refreshed {platform} connection {connection_id}")
+            return outcome
+
+    def _refresh_blocking(self, connection_id: int, platform: str) -> str:
+        """Run one locked refresh to completion on the calling (worker) thread."""
+        return asyncio.run(self._refresh_locked(connection_id, platform))
+
+    async def _refresh_locked(self, connection_id: int, platform: str) -> str:
+        # Same single-flight lock as the request path, so a request and the
+        # scheduler never refresh one connection at the same time
+        async with connection_refresh_lock.hold(connection_id):
+            # Another worker (or a request) may have refreshed it while we waited
+            if not self._still_due(connection_id, platform):
+                return "skipped"
+            await self.refreshers[platform](connection_id)
+            return "refreshed"
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="token-refresher")
+            logger.info(f"🔄 [Token Refresher] Started (every {self.interval_seconds}s, "
+                        f"lead {self.lead_seconds}s, concurrency {self.concurrency})")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [Token Refresher] Scan failed: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            "rate_limited_seconds": round(self._stats["rate_limited_seconds"], 3),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+token_refresh_scheduler = TokenRefreshScheduler()
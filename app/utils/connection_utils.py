@@ -3,15 +3,188 @@ Connection utilities for database connection management
 Centralizes connection-related operations
 """
 
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import chain
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import copy
 import logging
+import threading
+import time
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session as SASession, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import select, and_
+from app.config.cache_registry import has_pending, register_invalidation
 from app.config.database import get_session
+from app.config.settings import get_settings
 from app.models.analytics import Connection, DigitalAsset, AssetType, AuthType
 
 logger = logging.getLogger(__name__)
 
 
+# ========================================
+# Request-scoped Connection Lookups
+# ========================================
+
+class ConnectionLookupScope:
+    """
+    Request-scoped identity map for the connection lookups below.
+
+    The first lookup for a (customer, campaigner) pair loads all of that
+    pair's non-revoked connections with their digital assets in one query,
+    most recently updated first. Later lookups in the same scope filter those
+    rows in memory. Callers always get their own copies: detached ones, or
+    ones attached to the session they passed in.
+
+    Any flush that writes a Connection or DigitalAsset clears the scope, and
+    sessions holding such uncommitted writes bypass it so they keep seeing
+    their own changes. Loaded rows are reused for at most max_age_seconds,
+    so long requests (e.g. a synchronous metrics sync) still pick up writes
+    made by other processes.
+    """
+
+    def __init__(self, max_age_seconds: Optional[float] = None):
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None
+            else get_settings().connection_lookup_scope_max_age_seconds
+        )
+        self._rows: Dict[Tuple[int, int], Tuple[float, List[Tuple[Connection, DigitalAsset]]]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.closed = False
+        self.queries = 0
+        self.hits = 0
+
+    def rows(self, customer_id: int, campaigner_id: int) -> List[Tuple[Connection, DigitalAsset]]:
+        """Non-revoked (Connection, DigitalAsset) rows of a customer/campaigner pair (do not modify)."""
+        key = (customer_id, campaigner_id)
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.max_age_seconds:
+                self.hits += 1
+                return entry[1]
+            generation = self._generation
+
+        # Served by idx_connections_customer_asset_revoked_updated; callers that
+        # filter on DigitalAsset.customer_id check it on the rows in memory
+        statement = select(Connection, DigitalAsset).join(
+            DigitalAsset, Connection.digital_asset_id == DigitalAsset.id
+        ).where(
+            and_(
+                Connection.customer_id == customer_id,
+                Connection.campaigner_id == campaigner_id,
+                Connection.revoked == False
+            )
+        ).order_by(Connection.updated_at.desc(), Connection.id.desc())
+
+        # Own session, so the rows are detached once it closes
+        loaded_at = time.monotonic()
+        with get_session() as session:
+            rows = [tuple(row) for row in session.exec(statement).all()]
+
+        with self._lock:
+            self.queries += 1
+            # A write during the load means the rows may already be stale
+            if not self.closed and generation == self._generation:
+                self._rows[key] = (loaded_at, rows)
+        return rows
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._generation += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self.closed = True
+
+
+_lookup_scope: ContextVar[Optional[ConnectionLookupScope]] = ContextVar("connection_lookup_scope", default=None)
+
+# Cache registry name; sessions with pending changes under it hold uncommitted writes
+_LOOKUP_INVALIDATION = "connection_lookups"
+
+
+@contextmanager
+def connection_lookup_scope() -> Iterator[ConnectionLookupScope]:
+    """Collapse repeated connection lookups within the block (e.g. one HTTP request) into one query each."""
+    scope = ConnectionLookupScope()
+    token = _lookup_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _lookup_scope.reset(token)
+        scope.close()
+        if scope.queries or scope.hits:
+            logger.debug(f"🔗 Connection lookups: {scope.queries} queries, {scope.hits} served from scope")
+
+
+def _active_scope(session: Optional[Any] = None) -> Optional[ConnectionLookupScope]:
+    scope = _lookup_scope.get()
+    if scope is None or scope.closed:
+        return None
+    if isinstance(session, SASession) and (
+        has_pending(session, _LOOKUP_INVALIDATION)
+        or _touches_connections(chain(session.new, session.dirty, session.deleted))
+    ):
+        return None
+    return scope
+
+
+def _touches_connections(instances) -> bool:
+    return any(isinstance(instance, (Connection, DigitalAsset)) for instance in instances)
+
+
+def _invalidate_scope_on_write() -> None:
+    scope = _lookup_scope.get()
+    if scope is not None:
+        scope.invalidate()
+
+
+# Any flushed Connection/DigitalAsset write clears the current scope at once
+register_invalidation(_LOOKUP_INVALIDATION, (Connection, DigitalAsset), on_flush=_invalidate_scope_on_write)
+
+
+def _detached_copy(instance):
+    mapper = sa_inspect(instance).mapper
+    clone = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(clone, attr.key, copy.deepcopy(getattr(instance, attr.key)))
+    make_transient_to_detached(clone)
+    return clone
+
+
+def _scoped_instance(instance, session: Optional[Any] = None):
+    """A copy of a scope row for the caller: attached to `session` when given, detached otherwise."""
+    if session is None:
+        return _detached_copy(instance)
+    existing = session.identity_map.get(sa_inspect(instance).identity_key)
+    if existing is not None:
+        return existing
+    clone = _detached_copy(instance)
+    session.add(clone)
+    return clone
+
+
+def _scoped_asset_connections(
+    campaigner_id: int,
+    customer_id: int,
+    provider: str,
+    asset_type: AssetType
+) -> Optional[List[tuple]]:
+    """Provider/asset-type filtered (Connection, DigitalAsset) copies from the active scope, or None without one."""
+    scope = _active_scope()
+    if scope is None:
+        return None
+    return [
+        (_scoped_instance(conn), _scoped_instance(asset))
+        for conn, asset in scope.rows(customer_id, campaigner_id)
+        if conn.customer_id == customer_id and asset.provider == provider and asset.asset_type == asset_type
+    ]
+
+
 def get_facebook_connections(campaigner_id: int, customer_id: int, asset_type: str = "SOCIAL_MEDIA") -> List[tuple]:
     """
     Get Facebook connections for user/subclient with priority for real Page IDs
@@ -24,40 +197,42 @@ def get_facebook_connections(campaigner_id: int, customer_id: int, asset_type: s
     Returns:
         List of (Connection, DigitalAsset) tuples
     """
-    with get_session() as session:
-        statement = select(Connection, DigitalAsset).join(
-            DigitalAsset, Connection.digital_asset_id == DigitalAsset.id
-        ).where(
-            and_(
-                Connection.campaigner_id == campaigner_id,
-                Connection.customer_id == customer_id,  # Now direct on connections table
-                DigitalAsset.provider == "Facebook",
-                DigitalAsset.asset_type == getattr(AssetType, asset_type),
-                Connection.revoked == False
+    results = _scoped_asset_connections(campaigner_id, customer_id, "Facebook", getattr(AssetType, asset_type))
+    if results is None:
+        with get_session() as session:
+            statement = select(Connection, DigitalAsset).join(
+                DigitalAsset, Connection.digital_asset_id == DigitalAsset.id
+            ).where(
+                and_(
+                    Connection.campaigner_id == campaigner_id,
+                    Connection.customer_id == customer_id,  # Now direct on connections table
+                    DigitalAsset.provider == "Facebook",
+                    DigitalAsset.asset_type == getattr(AssetType, asset_type),
+                    Connection.revoked == False
+                )
             )
-        )
-        
-        results = session.exec(statement).all()
-        
-        # Separate real Page IDs from fake ones
-        real_page_connections = []
-        fake_page_connections = []
+            
+            results = session.exec(statement).all()
         
-        for conn, asset in results:
-            if asset.asset_id and not asset.asset_id.startswith("fake_"):
-                real_page_connections.append((conn, asset))
-            else:
-                fake_page_connections.append((conn, asset))
-        
-        # Always return real Page ID connections first, never fake ones
-        if real_page_connections:
-            logger.info(f"✅ Using {len(real_page_connections)} REAL Facebook Page ID(s)")
-            return real_page_connections
-        elif fake_page_connections:
-            logger.warning(f"⚠️ Found {len(fake_page_connections)} fake Facebook Page ID(s) - These will cause API errors!")
-            return []  # Return empty list to avoid using fake Page IDs
+    # Separate real Page IDs from fake ones
+    real_page_connections = []
+    fake_page_connections = []
+    
+    for conn, asset in results:
+        if asset.asset_id and not asset.asset_id.startswith("fake_"):
+            real_page_connections.append((conn, asset))
         else:
-            return results
+            fake_page_connections.append((conn, asset))
+    
+    # Always return real Page ID connections first, never fake ones
+    if real_page_connections:
+        logger.info(f"✅ Using {len(real_page_connections)} REAL Facebook Page ID(s)")
+        return real_page_connections
+    elif fake_page_connections:
+        logger.warning(f"⚠️ Found {len(fake_page_connections)} fake Facebook Page ID(s) - These will cause API errors!")
+        return []  # Return empty list to avoid using fake Page IDs
+    else:
+        return results
 
 
 def get_ga4_connections(campaigner_id: int, customer_id: int) -> List[tuple]:
@@ -71,6 +246,10 @@ def get_ga4_connections(campaigner_id: int, customer_id: int) -> List[tuple]:
     Returns:
         List of (Connection, DigitalAsset) tuples
     """
+    results = _scoped_asset_connections(campaigner_id, customer_id, "Google Analytics", AssetType.ANALYTICS)
+    if results is not None:
+        return results
+
     with get_session() as session:
         statement = select(Connection, DigitalAsset).join(
             DigitalAsset, Connection.digital_asset_id == DigitalAsset.id
@@ -98,6 +277,10 @@ def get_google_ads_connections(campaigner_id: int, customer_id: int) -> List[tup
     Returns:
         List of (Connection, DigitalAsset) tuples
     """
+    results = _scoped_asset_connections(campaigner_id, customer_id, "Google Ads", AssetType.ADVERTISING)
+    if results is not None:
+        return results
+
     with get_session() as session:
         statement = select(Connection, DigitalAsset).join(
             DigitalAsset, Connection.digital_asset_id == DigitalAsset.id
@@ -253,6 +436,13 @@ def get_active_connection(
     Returns:
         Connection if found and not revoked, None otherwise
     """
+    scope = _active_scope(session)
+    if scope is not None:
+        for conn, asset in scope.rows(customer_id, campaigner_id):
+            if conn.digital_asset_id == digital_asset_id and conn.customer_id == customer_id:
+                return _scoped_instance(conn, session)
+        return None
+
     close_session = False
     if session is None:
         session = get_session()
@@ -267,7 +457,7 @@ def get_active_connection(
                 Connection.campaigner_id == campaigner_id,
                 Connection.revoked != True
             )
-        )
+        ).order_by(Connection.updated_at.desc())  # Most recently updated first
         return session.exec(statement).first()
     finally:
         if close_session:
@@ -293,6 +483,27 @@ def get_connection_by_platform(
     Returns:
         Connection if found, None otherwise
     """
+    # Map platform to asset type
+    platform_to_asset_type = {
+        'google_analytics': AssetType.ANALYTICS,
+        'google_ads': AssetType.ADVERTISING,
+        'facebook': AssetType.SOCIAL_MEDIA,
+        'facebook_ads': AssetType.SOCIAL_MEDIA,  # Alias
+    }
+
+    asset_type = platform_to_asset_type.get(platform)
+    if not asset_type:
+        logger.warning(f"Unknown platform: {platform}")
+        return None
+
+    # Lookups without a customer span customers and are not scoped
+    scope = _active_scope(session) if customer_id is not None else None
+    if scope is not None:
+        for conn, asset in scope.rows(customer_id, campaigner_id):
+            if asset.asset_type == asset_type and asset.is_active and asset.customer_id == customer_id:
+                return _scoped_instance(conn, session)
+        return None
+
     close_session = False
     if session is None:
         session = get_session()
@@ -300,18 +511,6 @@ def get_connection_by_platform(
         session.__enter__()
 
     try:
-        # Map platform to asset type
-        platform_to_asset_type = {
-            'google_analytics': AssetType.ANALYTICS,
-            'google_ads': AssetType.ADVERTISING,
-            'facebook': AssetType.SOCIAL_MEDIA,
-            'facebook_ads': AssetType.SOCIAL_MEDIA,  # Alias
-        }
-
-        asset_type = platform_to_asset_type.get(platform)
-        if not asset_type:
-            logger.warning(f"Unknown platform: {platform}")
-            return None
 
         # Build where conditions
         conditions = [
@@ -328,7 +527,7 @@ def get_connection_by_platform(
         statement = select(Connection).join(
             DigitalAsset,
             Connection.digital_asset_id == DigitalAsset.id
-        ).where(and_(*conditions))
+        ).where(and_(*conditions)).order_by(Connection.updated_at.desc())  # Most recently updated first
 
         return session.exec(statement).first()
     finally:
@@ -396,6 +595,18 @@ def get_all_active_connections(
     Returns:
         List of all active connections
     """
+    scope = _active_scope(session)
+    if scope is not None:
+        connections = [
+            conn for conn, asset in scope.rows(customer_id, campaigner_id)
+            if asset.customer_id == customer_id and asset.is_active
+        ]
+        # Most recently used first; never-used ones lead, as NULLs do in PostgreSQL's DESC ordering
+        never_used = [conn for conn in connections if conn.last_used_at is None]
+        used = sorted((conn for conn in connections if conn.last_used_at is not None),
+                      key=lambda conn: conn.last_used_at, reverse=True)
+        return [_scoped_instance(conn, session) for conn in never_used + used]
+
     close_session = False
     if session is None:
         session = get_session()
@@ -0,0 +1,217 @@
+"""
+Vectorized derived metrics and performance scores for aggregated metrics
+Column-at-a-time equivalent of the per-row calculation in /metrics/aggregated
+"""
+
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Order matters: scores are accumulated in this order, like calculate_metric_score
+HIGHER_IS_BETTER = ("cvr", "ctr")
+LOWER_IS_BETTER = ("cpa", "cpc", "cpm", "cpl")
+
+# Column layout of aggregated rows after the group-by columns
+AGGREGATE_COLUMNS = (
+    "clicks", "impressions", "leads", "spent", "conversions", "conv_val", "reach_min", "reach_max"
+)
+
+# |x * 100 - nearest half| below this is treated as a potential rounding tie
+_TIE_TOLERANCE = 1e-6
+
+
+def round2(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 2 decimals with the same results as Python's round(x, 2).
+
+    np.round scales by 100 first, which can differ from Python's correctly
+    rounded result for values sitting on a .xx5 tie; those few are rounded
+    in Python.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < _TIE_TOLERANCE
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: Optional[float] = None) -> np.ndarray:
+    """numerator / denominator (* scale), rounded; NaN where denominator is missing or <= 0."""
+    valid = denominator > 0
+    result = np.full(numerator.shape, np.nan)
+    quotient = numerator[valid] / denominator[valid]
+    if scale is not None:
+        quotient = quotient * scale
+    result[valid] = round2(quotient)
+    return result
+
+
+def compute_derived_metrics(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compute CPA, CVR, CTR, CPC, CPM, CPL and frequency bounds from summed columns.
+
+    Args:
+        columns: float arrays keyed by AGGREGATE_COLUMNS (NaN for NULL)
+
+    Returns:
+        Dict of float arrays, NaN where the metric is undefined
+    """
+    clicks, impressions = columns["clicks"], columns["impressions"]
+    spent, conversions, leads = columns["spent"], columns["conversions"], columns["leads"]
+
+    with np.errstate(invalid="ignore"):
+        return {
+            "cpa": _ratio(spent, conversions),
+            "cvr": _ratio(conversions, clicks, 100),
+            "ctr": _ratio(clicks, impressions, 100),
+            "cpc": _ratio(spent, clicks),
+            "cpm": _ratio(spent, impressions, 1000),
+            "cpl": _ratio(spent, leads),
+            # reach_max bounds frequency from below, reach_min from above
+            "frequency_min": _ratio(impressions, columns["reach_max"]),
+            "frequency_max": _ratio(impressions, columns["reach_min"]),
+        }
+
+
+def compute_scores(derived: Dict[str, np.ndarray], weights: Dict[str, float], normalizer: float) -> np.ndarray:
+    """
+    Weighted performance score per row (0-100 scale), NaN where no metric is available.
+
+    Higher-is-better metrics (CVR, CTR) contribute min(value, 100); cost metrics
+    contribute 100 / (1 + value) when positive.
+    """
+    size = len(next(iter(derived.values())))
+    score = np.zeros(size)
+    total_weight = np.zeros(size)
+
+    with np.errstate(invalid="ignore"):
+        for metric in HIGHER_IS_BETTER:
+            values = derived[metric]
+            present = ~np.isnan(values)
+            score = score + np.where(present, weights[metric] * np.minimum(values, 100), 0.0)
+            total_weight = total_weight + np.where(present, weights[metric], 0.0)
+
+        for metric in LOWER_IS_BETTER:
+            values = derived[metric]
+            present = values > 0
+            score = score + np.where(present, weights[metric] * (100 / (1 + values)), 0.0)
+            total_weight = total_weight + np.where(present, weights[metric], 0.0)
+
+    scored = total_weight > 0
+    if normalizer == 0 and scored.any():
+        raise ZeroDivisionError("metric_score_normalizer must not be 0")
+
+    result = np.full(size, np.nan)
+    result[scored] = round2((score[scored] / total_weight[scored]) / normalizer)
+    return result
+
+
+def calculate_metric_score(metrics_dict, weights, normalizer):
+    """
+    Calculate a weighted score for the given metrics (single row; see compute_scores).
+
+    For "higher is better" metrics (CVR, CTR): use value directly (normalized to 0-100 scale)
+    For "lower is better" metrics (CPA, CPC, CPM, CPL): invert using (100 - normalized_value)
+
+    Args:
+        metrics_dict: Dict with metric values (cpa, cvr, ctr, cpc, cpm, cpl)
+        weights: Dict with weight for each metric
+        normalizer: Divider to normalize the final score
+
+    Returns:
+        float: Weighted score (0-100 scale)
+    """
+    score = 0.0
+    total_weight = 0.0
+
+    # Higher is better metrics (already in % or can be used directly)
+    if metrics_dict.get("cvr") is not None:
+        # CVR is already 0-100 (percentage)
+        score += weights["cvr"] * min(metrics_dict["cvr"], 100)
+        total_weight += weights["cvr"]
+
+    if metrics_dict.get("ctr") is not None:
+        # CTR is already 0-100 (percentage)
+        score += weights["ctr"] * min(metrics_dict["ctr"], 100)
+        total_weight += weights["ctr"]
+
+    # Lower is better metrics (cost metrics) - invert them
+    # We'll use a simple inversion: if value exists, contribute to score based on how low it is
+    # For costs, we'll normalize using: 100 / (1 + value) which gives higher scores for lower costs
+    if metrics_dict.get("cpa") is not None and metrics_dict["cpa"] > 0:
+        normalized_cpa = 100 / (1 + metrics_dict["cpa"])
+        score += weights["cpa"] * normalized_cpa
+        total_weight += weights["cpa"]
+
+    if metrics_dict.get("cpc") is not None and metrics_dict["cpc"] > 0:
+        normalized_cpc = 100 / (1 + metrics_dict["cpc"])
+        score += weights["cpc"] * normalized_cpc
+        total_weight += weights["cpc"]
+
+    if metrics_dict.get("cpm") is not None and metrics_dict["cpm"] > 0:
+        normalized_cpm = 100 / (1 + metrics_dict["cpm"])
+        score += weights["cpm"] * normalized_cpm
+        total_weight += weights["cpm"]
+
+    if metrics_dict.get("cpl") is not None and metrics_dict["cpl"] > 0:
+        normalized_cpl = 100 / (1 + metrics_dict["cpl"])
+        score += weights["cpl"] * normalized_cpl
+        total_weight += weights["cpl"]
+
+    # Calculate weighted average and apply normalizer
+    if total_weight > 0:
+        final_score = (score / total_weight) / normalizer
+        return round(final_score, 2)
+    else:
+        return None
+
+
+def score_aggregated_rows(
+    rows: Sequence[Sequence], offset: int, weights: Dict[str, float], normalizer: float
+) -> Dict[str, List[Optional[float]]]:
+    """
+    Derived metrics and scores for aggregated query rows.
+
+    Args:
+        rows: Result rows; columns from `offset` follow AGGREGATE_COLUMNS
+        offset: Number of leading group-by columns
+        weights: Metric weights from _get_metric_weights_and_normalizer
+        normalizer: Score normalizer from _get_metric_weights_and_normalizer
+
+    Returns:
+        Dict of Python lists (None where undefined) for cpa, cvr, ctr, cpc, cpm,
+        cpl, frequency_min, frequency_max and score, in row order
+    """
+    if not rows:
+        return {name: [] for name in (*LOWER_IS_BETTER, *HIGHER_IS_BETTER, "frequency_min", "frequency_max", "score")}
+
+    columns = {
+        name: _column_array(rows, offset + i)
+        for i, name in enumerate(AGGREGATE_COLUMNS)
+    }
+
+    derived = compute_derived_metrics(columns)
+    derived["score"] = compute_scores(derived, weights, normalizer)
+
+    return {name: _to_optional_list(values) for name, values in derived.items()}
+
+
+def _column_array(rows: Sequence[Sequence], index: int) -> np.ndarray:
+    """Load one result column as a float array; NULLs (None) become NaN."""
+    try:
+        return np.fromiter(map(itemgetter(index), rows), dtype=float, count=len(rows))
+    except TypeError:
+        # Column contains NULLs (e.g. MAX(reach) with no reach data)
+        return np.array([row[index] for row in rows], dtype=float)
+
+
+def _to_optional_list(values: np.ndarray) -> List[Optional[float]]:
+    """Convert a float array to a list of Python floats with None for NaN."""
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    result = values.astype(object)
+    result[missing] = None
+    return result.tolist()
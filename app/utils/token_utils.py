@@ -14,13 +14,17 @@ logger = logging.getLogger(__name__)
 async def refresh_user_ga4_tokens(ga_service: GoogleAnalyticsService, campaigner_id: int) -> None:
     """
     Automatically refresh expired GA4 tokens for a user before executing agents.
+
+    Only connections whose token is expired or expiring soon (is_ga_token_expired)
+    are refreshed; TokenRefreshScheduler normally renews them ahead of time,
+    so this is the request path's fallback.
     
     Args:
         ga_service: GoogleAnalyticsService instance
         campaigner_id: User ID to refresh tokens for
     """
     try:
-        logger.info(f"🔄 Refreshing GA4 tokens for user {campaigner_id}")
+        logger.info(f"🔄 Checking GA4 tokens for user {campaigner_id}")
         
         # Get all GA4 connections for the user
         connections = await ga_service.get_user_ga_connections(campaigner_id)
@@ -34,6 +38,9 @@ async def refresh_user_ga4_tokens(ga_service: GoogleAnalyticsService, campaigner
             try:
                 connection_id = connection.get('connection_id')
                 if connection_id:
+                    # is_outdated is is_ga_token_expired(expires_at); leave fresh tokens alone
+                    if not connection.get('is_outdated', True):
+                        continue
                     await ga_service.refresh_ga_token(connection_id)
                     logger.info(f"✅ Refreshed GA4 token for connection {connection_id}")
                 else:
@@ -50,13 +57,17 @@ async def refresh_user_ga4_tokens(ga_service: GoogleAnalyticsService, campaigner
 async def refresh_user_google_ads_tokens(google_ads_service, campaigner_id: int) -> None:
     """
     Automatically refresh expired Google Ads tokens for a user before executing agents.
+
+    Only connections whose token is expired or expiring soon (is_token_expired)
+    are refreshed; TokenRefreshScheduler normally renews them ahead of time,
+    so this is the request path's fallback.
     
     Args:
         google_ads_service: GoogleAdsService instance
         campaigner_id: User ID to refresh tokens for
     """
     try:
-        logger.info(f"🔄 Refreshing Google Ads tokens for user {campaigner_id}")
+        logger.info(f"🔄 Checking Google Ads tokens for user {campaigner_id}")
         
         # Get all Google Ads connections for the user
         connections = await google_ads_service.get_user_google_ads_connections(campaigner_id)
@@ -70,6 +81,9 @@ async def refresh_user_google_ads_tokens(google_ads_service, campaigner_id: int)
             try:
                 connection_id = connection.get('connection_id')
                 if connection_id:
+                    # is_outdated is is_token_expired(expires_at); leave fresh tokens alone
+                    if not connection.get('is_outdated', True):
+                        continue
                     await google_ads_service.refresh_google_ads_token(connection_id)
                     logger.info(f"✅ Refreshed Google Ads token for connection {connection_id}")
                 else:
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: request latency with DEBUG logging, direct handlers vs the
+queue-based logging pipeline.
+
+Each request to the benchmark endpoint emits --lines DEBUG log
+records, roughly what a chat/crew request logs today. Output goes to a
+rotating file and to a stream, as in production.
+
+--sink-latency-ms simulates a slow stdout consumer (e.g. a blocked container
+log pipe) by sleeping on every stream flush, i.e. once per record.
+
+Usage:
+    python scripts/benchmark_logging.py [--requests 500] [--lines 200] [--sink-latency-ms 0]
+"""
+
+import argparse
+import io
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config.logging import LoggingPipeline
+
+
+def build_app(lines_per_request: int) -> FastAPI:
+    app = FastAPI()
+    bench_logger = logging.getLogger("app.benchmark")
+
+    @app.get("/work")
+    async def work():
+        for i in range(lines_per_request):
+            bench_logger.debug(f"🔍 [Benchmark] step {i} payload={{'customer_id': 42, 'metric': 'sessions'}}")
+        return {"ok": True}
+
+    return app
+
+
+class SlowStream(io.StringIO):
+    """In-memory stream whose flush takes a fixed time, like a congested pipe."""
+
+    def __init__(self, latency_seconds: float):
+        super().__init__()
+        self.latency_seconds = latency_seconds
+
+    def flush(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+
+
+def build_output_handlers(log_dir: Path, sink_latency_ms: float):
+    formatter = logging.Formatter(
+        fmt='%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    file_handler = RotatingFileHandler(log_dir / "bench.log", maxBytes=10 * 1024 * 1024, backupCount=3, encoding='utf-8')
+    stream_handler = logging.StreamHandler(SlowStream(sink_latency_ms / 1000))
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, stream_handler]
+
+
+def run(mode: str, requests: int, lines_per_request: int, sink_latency_ms: float) -> list:
+    root_logger = logging.getLogger()
+    saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+    pipeline = None
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        outputs = build_output_handlers(Path(log_dir), sink_latency_ms)
+        if mode == "queue":
+            pipeline = LoggingPipeline(queue_size=100_000)
+            for handler in outputs:
+                pipeline.add_handler(handler)
+            root_logger.handlers = [pipeline.handler]
+            pipeline.start()
+        else:
+            root_logger.handlers = outputs
+        root_logger.setLevel(logging.DEBUG)
+
+        latencies = []
+        try:
+            with TestClient(build_app(lines_per_request)) as client:
+                client.get("/work")  # Warm up
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    client.get("/work")
+                    latencies.append((time.perf_counter() - start) * 1000)
+        finally:
+            if pipeline is not None:
+                pipeline.stop()
+                dropped = pipeline.stats()["dropped_total"]
+                if dropped:
+                    print(f"   ({dropped} records dropped)")
+            root_logger.handlers, root_logger.level = saved_handlers, saved_level
+            for handler in outputs:
+                handler.close()
+
+    return latencies
+
+
+def summarize(mode: str, latencies: list) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{mode:>7}: p50={statistics.median(ordered):7.2f}ms  p95={p95:7.2f}ms  mean={statistics.mean(ordered):7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=200, help="DEBUG log lines per request")
+    parser.add_argument("--sink-latency-ms", type=float, default=0.0, help="Simulated stdout flush latency")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"LOGGING BENCHMARK: {args.requests} requests x {args.lines} DEBUG lines, "
+          f"sink latency {args.sink_latency_ms}ms")
+    print("=" * 60)
+    for mode in ("direct", "queue"):
+        summarize(mode, run(mode, args.requests, args.lines, args.sink_latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: derived metrics and scores for /metrics/aggregated rows,
+per-row Python vs the vectorized NumPy implementation.
+
+Rows are synthetic aggregation results shaped like group_by=item_id output
+(item_id, platform_id, item_type, then the summed columns). Both paths are
+checked to produce identical values before timings are reported.
+
+Usage:
+    python scripts/benchmark_metric_scoring.py [--groups 100000] [--repeat 5]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.utils.metric_scoring import calculate_metric_score, score_aggregated_rows
+
+WEIGHTS = {"cpa": 0.25, "cvr": 0.20, "ctr": 0.15, "cpc": 0.15, "cpm": 0.10, "cpl": 0.15}
+GROUP_COLUMNS = 3
+
+
+def build_rows(groups: int) -> list:
+    rng = random.Random(42)
+    rows = []
+    for i in range(groups):
+        impressions = rng.randint(0, 500_000)
+        clicks = rng.randint(0, max(impressions // 20, 1))
+        reach_min = rng.choice([None, rng.randint(1, 40_000)])
+        rows.append((
+            f"ad-{i}", rng.randint(1, 500), rng.choice(["ad", "ad_group"]),
+            clicks, impressions, rng.randint(0, 200), round(rng.uniform(0, 20_000), 2),
+            rng.randint(0, 500), round(rng.uniform(0, 50_000), 2),
+            reach_min, (reach_min or 0) * rng.randint(1, 7),
+        ))
+    return rows
+
+
+def scalar(rows: list) -> dict:
+    """Per-row calculation, as get_aggregated_metrics did before vectorization"""
+    out = {name: [] for name in ("cpa", "cvr", "ctr", "cpc", "cpm", "cpl", "frequency_min", "frequency_max", "score")}
+    for row in rows:
+        clicks, impressions, leads, spent, conversions, _, reach_min, reach_max = row[GROUP_COLUMNS:]
+        cpa = round(spent / conversions, 2) if conversions and conversions > 0 else None
+        cvr = round((conversions / clicks) * 100, 2) if clicks and clicks > 0 else None
+        ctr = round((clicks / impressions) * 100, 2) if impressions and impressions > 0 else None
+        cpc = round(spent / clicks, 2) if clicks and clicks > 0 else None
+        cpm = round((spent / impressions) * 1000, 2) if impressions and impressions > 0 else None
+        cpl = round(spent / leads, 2) if leads and leads > 0 else None
+        for name, value in (("cpa", cpa), ("cvr", cvr), ("ctr", ctr), ("cpc", cpc), ("cpm", cpm), ("cpl", cpl)):
+            out[name].append(value)
+        out["frequency_min"].append(round(impressions / reach_max, 2) if reach_max and reach_max > 0 else None)
+        out["frequency_max"].append(round(impressions / reach_min, 2) if reach_min and reach_min > 0 else None)
+        out["score"].append(calculate_metric_score(
+            {"cpa": cpa, "cvr": cvr, "ctr": ctr, "cpc": cpc, "cpm": cpm, "cpl": cpl}, WEIGHTS, 1.0
+        ))
+    return out
+
+
+def vectorized(rows: list) -> dict:
+    return score_aggregated_rows(rows, GROUP_COLUMNS, WEIGHTS, 1.0)
+
+
+def time_it(fn, rows: list, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.groups)
+    if scalar(rows) != vectorized(rows):
+        print("❌ Scalar and vectorized results differ")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"METRIC SCORING BENCHMARK: {args.groups} groups, {args.repeat} runs")
+    print("=" * 60)
+    for name, fn in (("scalar", scalar), ("numpy", vectorized)):
+        timings = time_it(fn, rows, args.repeat)
+        print(f"{name:>7}: median={statistics.median(timings):8.1f}ms  min={min(timings):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Durable job queue worker.
+
+Leases analytics jobs (DialogCX analyses, metrics syncs) from the
+analytics_jobs table and runs them. Start as many as needed; workers on the
+same database never run a job twice at the same time.
+
+Usage:
+    python scripts/run_job_worker.py [--concurrency 2] [--job-type metrics_sync]
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.job_worker import main
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ import time
 import pytest
 import asyncio
 from typing import Generator, AsyncGenerator
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import AsyncMock, Mock, MagicMock, patch
 from sqlalchemy import create_engine
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import OperationalError
@@ -71,6 +71,20 @@ def mock_google_auth():
     _google_oauth_creds_patch.stop()
 
 
+@pytest.fixture(autouse=True)
+def clear_request_caches():
+    """Start every test with empty in-process caches (principals, access scopes, settings, agents, credentials).
+
+    Test databases are recreated per test, so IDs and tokens from one test
+    must never be served from a cache in the next.
+    """
+    import app.api.v1.routes.health  # noqa: F401 - imports every registered cache
+    from app.config.cache_registry import invalidate_caches
+
+    invalidate_caches()
+    yield
+
+
 def is_integration_test(request):
     """Check if current test is an integration test"""
     # Check if test file is in integration directory
@@ -303,3 +317,41 @@ def mock_google_ads_api():
         ]
         mock_client.return_value.get_service.return_value = mock_service
         yield mock_client
+
+
+@pytest.fixture(scope="function")
+def fake_websocket():
+    """Factory for mock WebSockets; `send` becomes send_json's side effect"""
+    def _make(send=None):
+        websocket = MagicMock()
+        websocket.accept = AsyncMock()
+        websocket.close = AsyncMock()
+        websocket.send_json = AsyncMock(side_effect=send)
+        return websocket
+
+    return _make
+
+
+@pytest.fixture(scope="function")
+def patch_get_session(db_session, monkeypatch):
+    """Point `get_session` targets at the test transaction; returns the session factory
+
+    Targets are dotted paths or (object, attribute) pairs. The factory's `opened`
+    list grows by one per session it opens.
+    """
+    def _patch(*targets):
+        opened = []
+
+        def factory():
+            opened.append(1)
+            return Session(bind=db_session.bind)
+
+        factory.opened = opened
+        for target in targets:
+            if isinstance(target, str):
+                monkeypatch.setattr(target, factory)
+            else:
+                monkeypatch.setattr(*target, factory)
+        return factory
+
+    return _patch
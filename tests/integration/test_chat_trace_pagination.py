@@ -0,0 +1,80 @@
+"""
+Integration tests for incremental, paginated chat trace history
+"""
+
+import pytest
+
+from app.models.chat_traces import RecordType
+from app.models.users import Agency, Campaigner, CustomerStatus, UserRole, UserStatus
+from app.services.chat_trace_service import ChatTraceService
+
+
+@pytest.fixture
+def trace_service(db_session):
+    """ChatTraceService bound to the test session with one conversation."""
+    agency = Agency(name="Paging Agency", email="paging@test.com", status=CustomerStatus.ACTIVE)
+    db_session.add(agency)
+    db_session.commit()
+    db_session.refresh(agency)
+
+    campaigner = Campaigner(
+        email="paging-campaigner@test.com",
+        full_name="Paging Campaigner",
+        role=UserRole.CAMPAIGNER,
+        status=UserStatus.ACTIVE,
+        agency_id=agency.id,
+    )
+    db_session.add(campaigner)
+    db_session.commit()
+    db_session.refresh(campaigner)
+
+    service = ChatTraceService(session=db_session)
+    service.create_conversation(thread_id="paging-thread", campaigner_id=campaigner.id)
+    return service
+
+
+class TestThreadEventsPagination:
+    """Test cursor pagination over a conversation's events."""
+
+    def test_pages_follow_insertion_order_across_record_types(self, trace_service):
+        trace_service.add_message("paging-thread", role="user", content="Hi")
+        trace_service.add_agent_step("paging-thread", step_type="thought", content="Thinking")
+        trace_service.add_tool_usage("paging-thread", tool_name="ga4", tool_input="q", tool_output="rows")
+        trace_service.add_message("paging-thread", role="assistant", content="Done")
+
+        first = trace_service.get_thread_events("paging-thread", limit=3)
+        second = trace_service.get_thread_events("paging-thread", after_id=first["next_cursor"], limit=3)
+
+        assert [event["record_type"] for event in first["events"]] == [
+            RecordType.MESSAGE, RecordType.AGENT_STEP, RecordType.TOOL_USAGE
+        ]
+        assert first["has_more"] is True
+        assert [event["content"] for event in second["events"]] == ["Done"]
+        assert second["has_more"] is False
+
+    def test_polling_with_cursor_returns_only_new_events(self, trace_service):
+        trace_service.add_message("paging-thread", role="user", content="Hi")
+        page = trace_service.get_thread_events("paging-thread")
+
+        empty = trace_service.get_thread_events("paging-thread", after_id=page["next_cursor"])
+        assert empty["events"] == []
+        assert empty["next_cursor"] == page["next_cursor"]
+
+        trace_service.add_message("paging-thread", role="assistant", content="Hello")
+        update = trace_service.get_thread_events("paging-thread", after_id=page["next_cursor"])
+        assert [event["content"] for event in update["events"]] == ["Hello"]
+
+    def test_large_fields_are_loaded_on_demand(self, trace_service):
+        tool = trace_service.add_tool_usage("paging-thread", tool_name="ga4", tool_input="q", tool_output="x" * 5000)
+
+        page = trace_service.get_thread_events("paging-thread", record_types=[RecordType.TOOL_USAGE])
+        event = page["events"][0]
+        assert "tool_output" not in event
+        assert event["omitted_fields"] == ["tool_input", "tool_output"]
+
+        full = trace_service.get_trace_event("paging-thread", tool.id)
+        assert full["tool_output"] == "x" * 5000
+
+    def test_unknown_thread_returns_none(self, trace_service):
+        assert trace_service.get_thread_events("missing-thread") is None
+        assert trace_service.get_trace_event("missing-thread", 1) is None
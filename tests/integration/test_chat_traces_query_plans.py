@@ -0,0 +1,146 @@
+"""
+Query-plan regression tests for chat_traces access paths.
+
+Asserts that the hot ChatTraceService and /traces queries are served by the
+dedicated chat_traces indexes rather than by a table scan, so trace reads stay
+flat as the table grows. The table is seeded with a realistic mix of record
+types and ANALYZEd, then plans are taken with EXPLAIN QUERY PLAN on SQLite and
+EXPLAIN on PostgreSQL (with sequential scans disabled, since small test tables
+would otherwise always be scanned).
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import and_, desc, func, text
+from sqlmodel import select
+
+from app.models.chat_traces import ChatTrace, RecordType
+from app.models.users import Agency, Campaigner, CustomerStatus, UserRole, UserStatus
+
+
+@pytest.fixture
+def seeded_traces(db_session):
+    """Seed chat_traces with many threads, mostly non-conversation events."""
+    agency = Agency(name="Plan Agency", email="plans@test.com", status=CustomerStatus.ACTIVE)
+    db_session.add(agency)
+    db_session.commit()
+    db_session.refresh(agency)
+
+    campaigner = Campaigner(
+        email="plans-campaigner@test.com",
+        full_name="Plan Campaigner",
+        role=UserRole.CAMPAIGNER,
+        status=UserStatus.ACTIVE,
+        agency_id=agency.id,
+    )
+    db_session.add(campaigner)
+    db_session.commit()
+    db_session.refresh(campaigner)
+
+    now = datetime.now(timezone.utc)
+    records = []
+    for thread_index in range(50):
+        thread_id = f"thread-{thread_index}"
+        created_at = now - timedelta(days=thread_index)
+        records.append(ChatTrace(
+            thread_id=thread_id,
+            record_type=RecordType.CONVERSATION.value,
+            campaigner_id=campaigner.id,
+            data={"status": "completed" if thread_index % 3 else "active"},
+            created_at=created_at,
+        ))
+        for record_type, count in (
+            (RecordType.MESSAGE, 10),
+            (RecordType.AGENT_STEP, 20),
+            (RecordType.TOOL_USAGE, 5),
+        ):
+            for sequence_number in range(count):
+                records.append(ChatTrace(
+                    thread_id=thread_id,
+                    record_type=record_type.value,
+                    campaigner_id=campaigner.id,
+                    data={"content": "x"},
+                    sequence_number=sequence_number,
+                    created_at=created_at,
+                ))
+    db_session.add_all(records)
+    db_session.commit()
+    db_session.connection().execute(text("ANALYZE"))
+    return db_session
+
+
+def _explain(db_session, statement) -> str:
+    """Return the query plan for a statement as a single string."""
+    connection = db_session.connection()
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = connection.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).all()
+        return json.dumps(rows[0][0])
+
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+class TestChatTracesQueryPlans:
+    """Verify chat_traces queries use their access-path indexes."""
+
+    def test_thread_events_use_thread_record_seq_index(self, seeded_traces):
+        """Per-thread event reads ordered by sequence_number use the composite index."""
+        statement = select(ChatTrace).where(
+            and_(
+                ChatTrace.thread_id == "thread-7",
+                ChatTrace.record_type == RecordType.MESSAGE.value
+            )
+        ).order_by(ChatTrace.sequence_number)
+
+        plan = _explain(seeded_traces, statement)
+
+        assert "idx_chat_traces_thread_record_seq" in plan
+        assert "TEMP B-TREE" not in plan  # No separate sort step on SQLite
+
+    def test_sequence_count_uses_thread_record_seq_index(self, seeded_traces):
+        """Sequence number counting in add_message/add_agent_step uses the composite index."""
+        statement = select(func.count(ChatTrace.id)).where(
+            and_(
+                ChatTrace.thread_id == "thread-7",
+                ChatTrace.record_type == RecordType.AGENT_STEP.value
+            )
+        )
+
+        plan = _explain(seeded_traces, statement)
+
+        assert "idx_chat_traces_thread_record_seq" in plan
+
+    def test_conversation_listing_uses_partial_created_at_index(self, seeded_traces):
+        """Recent conversation listing uses the partial created_at index."""
+        since = datetime.now(timezone.utc) - timedelta(days=7)
+        statement = select(ChatTrace).where(
+            and_(
+                ChatTrace.record_type == RecordType.CONVERSATION.value,
+                ChatTrace.created_at >= since
+            )
+        ).order_by(desc(ChatTrace.created_at)).limit(20)
+
+        plan = _explain(seeded_traces, statement)
+
+        assert "idx_chat_traces_conversation_created_at" in plan
+
+    def test_status_filter_uses_expression_index(self, seeded_traces):
+        """Conversation status filters use the data->>'status' expression index."""
+        if seeded_traces.connection().dialect.name != "postgresql":
+            pytest.skip("Expression index on data->>'status' is PostgreSQL-only")
+
+        statement = select(ChatTrace).where(
+            and_(
+                ChatTrace.record_type == RecordType.CONVERSATION.value,
+                ChatTrace.data["status"].astext == "completed"
+            )
+        )
+
+        plan = _explain(seeded_traces, statement)
+
+        assert "idx_chat_traces_conversation_status" in plan
@@ -6,7 +6,7 @@ Tests role-based access control, filtering, and pagination
 import pytest
 from datetime import date, timedelta
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import func, select
 from unittest.mock import patch
 from contextlib import contextmanager
 
@@ -20,8 +20,10 @@ from app.models.users import (
     UserStatus,
     CustomerStatus,
 )
-from app.models.analytics import DigitalAsset, Metrics, AssetType
+from app.models.analytics import DigitalAsset, Metrics, MetricsRollup, AssetType
 from app.core.auth import create_access_token
+from app.config.settings import get_settings
+from app.services.metrics_rollup_service import refresh_rollups
 
 
 @pytest.fixture
@@ -499,6 +501,91 @@ class TestMetricsAPIPagination:
         # Should get validation error
         assert response.status_code == 422
 
+    def test_cursor_pages_cover_all_rows_in_order(self, client, setup_test_data, db_session):
+        """Test that following next_cursor returns every row exactly once, in order"""
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        full = client.get("/api/v1/metrics?limit=100", headers=headers).json()
+        expected = [(m["metric_date"], m["platform_id"], m["item_id"]) for m in full["metrics"]]
+
+        seen = []
+        cursor = None
+        while True:
+            url = "/api/v1/metrics?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url, headers=headers).json()
+            seen.extend((m["metric_date"], m["platform_id"], m["item_id"]) for m in data["metrics"])
+            # Counted on the first page only
+            assert data["total"] == (None if cursor else 5)
+            if not data["has_more"]:
+                assert data["next_cursor"] is None
+                break
+            cursor = data["next_cursor"]
+
+        assert seen == expected
+        assert len(seen) == 5
+
+    def test_cursor_page_counts_when_requested(self, client, setup_test_data, db_session):
+        """Test that count=exact still returns the total on cursor pages"""
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        cursor = client.get("/api/v1/metrics?limit=2", headers=headers).json()["next_cursor"]
+        data = client.get(f"/api/v1/metrics?limit=2&cursor={cursor}&count=exact", headers=headers).json()
+
+        assert data["total"] == 5
+
+    def test_cursor_and_offset_are_exclusive(self, client, setup_test_data, db_session):
+        """Test that cursor cannot be combined with offset"""
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        cursor = client.get("/api/v1/metrics?limit=1", headers=headers).json()["next_cursor"]
+        response = client.get(f"/api/v1/metrics?cursor={cursor}&offset=1", headers=headers)
+
+        assert response.status_code == 400
+
+    def test_invalid_cursor(self, client, setup_test_data, db_session):
+        """Test error when providing a malformed cursor"""
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+
+        response = client.get(
+            "/api/v1/metrics?cursor=not-a-cursor",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 400
+
+    def test_count_none_skips_total(self, client, setup_test_data, db_session):
+        """Test that count=none returns no total"""
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+
+        data = client.get(
+            "/api/v1/metrics?count=none",
+            headers={"Authorization": f"Bearer {token}"}
+        ).json()
+
+        assert data["total"] is None
+        assert len(data["metrics"]) == 5
+
+    def test_count_estimated_falls_back_to_exact_outside_postgres(self, client, setup_test_data, db_session):
+        """Test that count=estimated returns the exact count on SQLite"""
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+
+        data = client.get(
+            "/api/v1/metrics?count=estimated",
+            headers={"Authorization": f"Bearer {token}"}
+        ).json()
+
+        assert data["total"] == 5
+        assert data["total_is_estimate"] is False
+
 
 class TestMetricsAPIValidation:
     """Test validation and error handling"""
@@ -1115,3 +1202,175 @@ class TestAggregatedMetricsAPI:
         # Should mention weights and normalizer
         assert "Weights:" in data["notes"]["score"]
         assert "Normalizer=" in data["notes"]["score"]
+
+
+class TestAggregatedMetricsRollups:
+    """Test that /metrics/aggregated answers the same from rollups as from raw metrics"""
+
+    def _seed_history(self, db_session, setup_test_data):
+        """Add ~10 weeks of daily metrics across two item types"""
+        asset1 = setup_test_data["asset1"]
+        start = date(2025, 1, 1)
+        rows = []
+        for offset in range(70):
+            day = start + timedelta(days=offset)
+            rows.append(Metrics(
+                metric_date=day, item_id="hist-ad", platform_id=asset1.id, item_type="ad",
+                impressions=100 + offset, clicks=10 + offset % 7, spent=12.5 + offset,
+                conversions=offset % 3, reach=80 + (offset * 37) % 50,
+            ))
+            rows.append(Metrics(
+                metric_date=day, item_id="hist-group", platform_id=asset1.id, item_type="ad_group",
+                impressions=400, clicks=20, spent=30.0, leads=offset % 2,
+            ))
+        db_session.add_all(rows)
+        db_session.commit()
+
+    def _get(self, client, token, query, rollups_enabled):
+        with patch.object(get_settings(), "metrics_rollups_enabled", rollups_enabled):
+            response = client.get(f"/api/v1/metrics/aggregated?{query}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+        return response.json()
+
+    @pytest.mark.parametrize("group_by", ["none", "platform_id", "item_type"])
+    def test_rollups_match_raw_metrics(self, client, setup_test_data, db_session, group_by):
+        self._seed_history(db_session, setup_test_data)
+        token = create_access_token(data={"sub": setup_test_data["owner"].email})
+        # Starts mid-week, covers a whole month and several whole weeks, ends mid-week
+        query = f"start_date=2025-01-03&end_date=2025-03-05&group_by={group_by}"
+
+        from_rollups = self._get(client, token, query, rollups_enabled=True)
+        from_raw = self._get(client, token, query, rollups_enabled=False)
+
+        assert from_rollups["data_source"] == "rollups"
+        assert from_raw["data_source"] == "metrics"
+        sort_key = lambda m: (m.get("platform_id") or 0, m.get("item_type") or "")
+        rollup_rows = sorted(from_rollups["aggregated_metrics"], key=sort_key)
+        raw_rows = sorted(from_raw["aggregated_metrics"], key=sort_key)
+        assert len(rollup_rows) == len(raw_rows) > 0
+        for rollup_row, raw_row in zip(rollup_rows, raw_rows):
+            assert rollup_row.keys() == raw_row.keys()
+            for key, value in raw_row.items():
+                assert rollup_row[key] == pytest.approx(value), key
+
+    def test_rollups_follow_updates_and_deletes(self, client, setup_test_data, db_session):
+        self._seed_history(db_session, setup_test_data)
+        token = create_access_token(data={"sub": setup_test_data["owner"].email})
+        query = "start_date=2025-01-01&end_date=2025-01-31&group_by=none&item_type=ad_group"
+
+        before = self._get(client, token, query, rollups_enabled=True)["aggregated_metrics"][0]
+
+        rows = db_session.exec(
+            select(Metrics).where(Metrics.item_id == "hist-group", Metrics.metric_date <= date(2025, 1, 2))
+        ).scalars().all()
+        rows[0].impressions += 1000
+        db_session.delete(rows[1])
+        db_session.commit()
+
+        after = self._get(client, token, query, rollups_enabled=True)["aggregated_metrics"][0]
+        assert after["impressions"] == before["impressions"] + 1000 - 400
+
+    def test_rebuilding_existing_rollups_upserts(self, setup_test_data, db_session):
+        self._seed_history(db_session, setup_test_data)
+        platform_id = setup_test_data["asset1"].id
+        count = lambda: db_session.exec(select(func.count()).select_from(MetricsRollup)).scalar_one()
+        stored = count()
+
+        # A second rebuild of the same periods (e.g. by a concurrent transaction) updates in place
+        written = refresh_rollups(db_session, {platform_id: {date(2025, 1, 1), date(2025, 1, 20)}})
+        db_session.commit()
+
+        assert written > 0
+        assert count() == stored
+
+    def test_item_level_queries_use_raw_metrics(self, client, setup_test_data):
+        token = create_access_token(data={"sub": setup_test_data["owner"].email})
+        today = date.today()
+
+        data = self._get(client, token, f"start_date={today}&end_date={today}&group_by=item_id", rollups_enabled=True)
+
+        assert data["data_source"] == "metrics"
+
+
+class TestMetricsExportAPI:
+    """Test the streaming export endpoint"""
+
+    @pytest.fixture
+    def export_client(self, client, db_session):
+        @contextmanager
+        def mock_get_session():
+            yield db_session
+
+        with patch('app.services.metrics_export_service.get_session', mock_get_session):
+            yield client
+
+    def test_csv_export_respects_scope_and_projection(self, export_client, setup_test_data):
+        campaigner1 = setup_test_data["campaigner1"]
+        token = create_access_token(data={"sub": campaigner1.email})
+
+        response = export_client.get(
+            "/api/v1/metrics/export?format=csv&columns=metric_date,item_id,impressions",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.strip().splitlines()
+        assert lines[0] == "metric_date,item_id,impressions"
+        # campaigner1 only sees customer1's asset (ad-1 x2, adgroup-1), oldest first
+        assert [line.split(",")[1] for line in lines[1:]] == ["adgroup-1", "ad-1", "ad-1"]
+
+    def test_arrow_export_round_trips(self, export_client, setup_test_data):
+        pa = pytest.importorskip("pyarrow")
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+
+        response = export_client.get(
+            "/api/v1/metrics/export?format=arrow&partition_by=day&columns=item_id,clicks",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        reader = pa.ipc.open_stream(response.content)
+        batches = list(reader)
+        table = pa.Table.from_batches(batches)
+        assert table.column_names == ["item_id", "clicks"]
+        assert table.num_rows == 5
+        # week_ago, yesterday and today each form their own batch
+        assert [batch.num_rows for batch in batches] == [1, 1, 3]
+
+    def test_parquet_export_round_trips(self, export_client, setup_test_data):
+        pq = pytest.importorskip("pyarrow.parquet")
+        import io
+        owner = setup_test_data["owner"]
+        token = create_access_token(data={"sub": owner.email})
+
+        response = export_client.get(
+            "/api/v1/metrics/export?format=parquet&partition_by=month",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 5
+        assert sorted(table.column("impressions").to_pylist()) == [900, 1000, 2000, 3000, 5000]
+
+    def test_unknown_column_rejected(self, export_client, setup_test_data):
+        token = create_access_token(data={"sub": setup_test_data["owner"].email})
+
+        response = export_client.get(
+            "/api/v1/metrics/export?columns=item_id,password",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 400
+
+    def test_forbidden_customer_rejected(self, export_client, setup_test_data):
+        token = create_access_token(data={"sub": setup_test_data["campaigner1"].email})
+
+        response = export_client.get(
+            f"/api/v1/metrics/export?customer_id={setup_test_data['customer3'].id}",
+            headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,120 @@
+"""
+Integration tests for cross-worker WebSocket delivery through the backplane
+
+Each ConnectionManager stands in for one worker; managers sharing an
+InMemoryBus behave like workers sharing a Postgres channel.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.websocket_backplane import (
+    InMemoryBackplane,
+    InMemoryBus,
+    NotifyPayloadAssembler,
+    create_backplane,
+    encode_notify_payloads,
+)
+from app.core.websocket_manager import ConnectionManager, SendResult
+
+
+def _sent_types(websocket):
+    return [call.args[0]["type"] for call in websocket.send_json.call_args_list]
+
+
+@pytest.fixture
+async def workers():
+    bus = InMemoryBus()
+    managers = [ConnectionManager() for _ in range(3)]
+    for manager in managers:
+        await manager.start_backplane(InMemoryBackplane(bus))
+    yield managers
+    for manager in managers:
+        await manager.stop_backplane()
+
+
+class TestCrossWorkerDelivery:
+    """Messages published on any worker reach the worker holding the socket."""
+
+    async def test_result_from_other_worker_is_delivered(self, workers, fake_websocket):
+        owner, webhook_worker, idle_worker = workers
+        websocket = fake_websocket()
+        await owner.connect(websocket, "session-1", user_id=1)
+
+        sent = await webhook_worker.send_crew_result("session-1", "answer", analysis_id="a-1")
+        await owner.drain(timeout=1)
+
+        # The sending worker holds no socket: published, delivery unconfirmed
+        assert sent == SendResult(delivered=False, published=True)
+        assert _sent_types(websocket) == ["connected", "crew_result"]
+        assert websocket.send_json.call_args.args[0]["data"]["result"] == "answer"
+
+        owner_stats = owner.get_stats()
+        assert owner_stats["remote_delivered"] == 1
+        assert owner_stats["remote_latency"]["samples"] == 1
+        assert webhook_worker.get_stats()["published"] == 1
+        assert idle_worker.get_stats()["remote_unowned"] == 1
+
+    async def test_local_socket_not_delivered_twice(self, workers, fake_websocket):
+        owner = workers[0]
+        websocket = fake_websocket()
+        await owner.connect(websocket, "session-1", user_id=1)
+
+        await owner.send_typing_indicator("session-1", is_typing=True)
+        await owner.drain(timeout=1)
+
+        assert _sent_types(websocket) == ["connected", "typing"]
+        assert owner.get_stats()["local_deliveries"] == 1
+
+    async def test_tabs_on_different_workers_all_receive(self, workers, fake_websocket):
+        first, second, sender = workers
+        tab_a, tab_b = fake_websocket(), fake_websocket()
+        await first.connect(tab_a, "session-1", user_id=1)
+        await second.connect(tab_b, "session-1", user_id=1)
+
+        await sender.send_error("session-1", "failed")
+        await first.drain(timeout=1)
+        await second.drain(timeout=1)
+
+        assert _sent_types(tab_a)[-1] == "error"
+        assert _sent_types(tab_b)[-1] == "error"
+
+    async def test_without_backplane_unknown_session_is_not_sent(self):
+        manager = ConnectionManager()
+
+        assert await manager.send_crew_result("missing", "answer", analysis_id="a-1") == SendResult()
+
+    async def test_publish_failure_is_counted(self):
+        manager = ConnectionManager()
+        backplane = InMemoryBackplane()
+        backplane.publish = AsyncMock(side_effect=ConnectionError("down"))
+        await manager.start_backplane(backplane)
+
+        assert await manager.send_crew_result("missing", "answer", analysis_id="a-1") == SendResult()
+        assert manager.get_stats()["publish_failures"] == 1
+
+
+class TestNotifyPayloads:
+    """Postgres NOTIFY chunking round-trips large envelopes."""
+
+    def test_large_envelope_round_trips(self):
+        envelope = {"session_id": "s", "message": {"type": "crew_result", "data": {"result": "é|x" * 10000}}}
+
+        payloads = encode_notify_payloads(envelope, limit=1000)
+        assembler = NotifyPayloadAssembler()
+        results = [assembler.add(payload) for payload in payloads]
+
+        assert len(payloads) > 1
+        assert all(len(payload.encode()) <= 1000 for payload in payloads)
+        assert results[:-1] == [None] * (len(payloads) - 1)
+        assert results[-1] == envelope
+
+    def test_create_backplane_from_settings(self):
+        settings = MagicMock(websocket_backplane="postgres", websocket_backplane_channel="ws",
+                             database_url="postgresql+psycopg2://user:secret@db:5432/app")
+
+        backplane = create_backplane(settings)
+
+        assert backplane.dsn == "postgresql://user:secret@db:5432/app"
+        assert backplane.channel == "ws"
+        assert create_backplane(MagicMock(websocket_backplane="none")) is None
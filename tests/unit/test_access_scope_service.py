@@ -0,0 +1,130 @@
+"""
+Unit tests for the cached access-scope resolver
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.models.analytics import AssetType, DigitalAsset
+from app.models.users import (
+    Agency,
+    Campaigner,
+    Customer,
+    CustomerCampaignerAssignment,
+    CustomerStatus,
+    UserRole,
+    UserStatus,
+)
+from app.services.access_scope_service import AccessScopeResolver, ScopeAccessDenied, access_scope_resolver
+
+
+@pytest.fixture
+def scope_data(db_session):
+    agency = Agency(name="Agency", email="agency@test.com", status=CustomerStatus.ACTIVE)
+    db_session.add(agency)
+    db_session.commit()
+
+    admin = Campaigner(email="admin@test.com", full_name="Admin", role=UserRole.ADMIN,
+                       status=UserStatus.ACTIVE, agency_id=agency.id)
+    campaigner = Campaigner(email="campaigner@test.com", full_name="Campaigner", role=UserRole.CAMPAIGNER,
+                            status=UserStatus.ACTIVE, agency_id=agency.id)
+    customers = [
+        Customer(full_name=f"Customer {i}", contact_email=f"c{i}@test.com", agency_id=agency.id,
+                 status=CustomerStatus.ACTIVE)
+        for i in range(2)
+    ]
+    db_session.add_all([admin, campaigner, *customers])
+    db_session.commit()
+
+    assets = [
+        DigitalAsset(customer_id=customer.id, asset_type=AssetType.GOOGLE_ADS, provider="Google",
+                     name=f"Ads {customer.id}", external_id=f"ads-{customer.id}", is_active=True)
+        for customer in customers
+    ]
+    db_session.add_all(assets)
+    db_session.add(CustomerCampaignerAssignment(customer_id=customers[0].id, campaigner_id=campaigner.id, is_active=True))
+    db_session.commit()
+    return {"admin": admin, "campaigner": campaigner, "customers": customers, "assets": assets}
+
+
+def _count_selects(db_session):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", before_execute)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before_execute)
+
+
+class TestResolvePlatformIds:
+    """Test scope rules per role."""
+
+    def test_admin_sees_agency_platforms(self, db_session, scope_data):
+        resolver = AccessScopeResolver(ttl_seconds=60)
+
+        platform_ids = resolver.resolve_platform_ids(db_session, scope_data["admin"])
+
+        assert sorted(platform_ids) == sorted(asset.id for asset in scope_data["assets"])
+
+    def test_campaigner_limited_to_assignments(self, db_session, scope_data):
+        resolver = AccessScopeResolver(ttl_seconds=60)
+        campaigner = scope_data["campaigner"]
+        other_customer, other_asset = scope_data["customers"][1], scope_data["assets"][1]
+
+        assert resolver.resolve_platform_ids(db_session, campaigner) == [scope_data["assets"][0].id]
+        with pytest.raises(ScopeAccessDenied):
+            resolver.resolve_platform_ids(db_session, campaigner, customer_id=other_customer.id)
+        with pytest.raises(ScopeAccessDenied):
+            resolver.resolve_platform_ids(db_session, campaigner, platform_id=other_asset.id)
+
+    def test_owner_is_unrestricted(self, db_session, scope_data):
+        resolver = AccessScopeResolver(ttl_seconds=60)
+        owner = Campaigner(id=999, email="owner@test.com", full_name="Owner", role=UserRole.OWNER)
+
+        assert resolver.resolve_platform_ids(db_session, owner) is None
+        assert resolver.resolve_platform_ids(db_session, owner, customer_id=scope_data["customers"][1].id) == [
+            scope_data["assets"][1].id
+        ]
+
+
+class TestScopeCaching:
+    """Test TTL caching and invalidation."""
+
+    def test_second_lookup_runs_no_queries(self, db_session, scope_data):
+        resolver = AccessScopeResolver(ttl_seconds=60)
+        resolver.resolve_platform_ids(db_session, scope_data["admin"])
+
+        statements, stop = _count_selects(db_session)
+        try:
+            resolver.resolve_platform_ids(db_session, scope_data["admin"])
+        finally:
+            stop()
+
+        assert statements == []
+        assert resolver.get_stats()["hits"] == 1
+
+    def test_zero_ttl_disables_cache(self, db_session, scope_data):
+        resolver = AccessScopeResolver(ttl_seconds=0)
+        resolver.resolve_platform_ids(db_session, scope_data["admin"])
+        resolver.resolve_platform_ids(db_session, scope_data["admin"])
+
+        assert resolver.get_stats()["hits"] == 0
+
+    def test_assignment_commit_invalidates_shared_resolver(self, db_session, scope_data):
+        campaigner = scope_data["campaigner"]
+        access_scope_resolver.invalidate()
+        access_scope_resolver.ttl_seconds = 60
+        try:
+            assert len(access_scope_resolver.resolve_platform_ids(db_session, campaigner)) == 1
+
+            db_session.add(CustomerCampaignerAssignment(
+                customer_id=scope_data["customers"][1].id, campaigner_id=campaigner.id, is_active=True
+            ))
+            db_session.commit()
+
+            assert len(access_scope_resolver.resolve_platform_ids(db_session, campaigner)) == 2
+        finally:
+            access_scope_resolver.ttl_seconds = None
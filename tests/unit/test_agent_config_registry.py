@@ -0,0 +1,108 @@
+"""
+Unit tests for the cached agent configuration registry
+"""
+
+import pytest
+
+from app.core.agent_config_registry import AgentConfigRegistry, agent_config_registry
+from app.core.database import db_manager
+from app.models.agents import AgentConfig
+from app.services.agent_service import AgentService
+
+
+def _add_agent(db_session, name, is_active=True):
+    agent = AgentConfig(
+        name=name,
+        role=f"{name} role",
+        goal=f"{name} goal",
+        backstory=f"{name} backstory",
+        tools='["ga4_tool"]',
+        is_active=is_active
+    )
+    db_session.add(agent)
+    db_session.commit()
+    return agent
+
+
+@pytest.fixture
+def shared_sessions(patch_get_session, monkeypatch):
+    """Point DatabaseManager and the registry at the test transaction."""
+    factory = patch_get_session((db_manager, "get_session"), "app.config.database.get_session")
+    monkeypatch.setattr(agent_config_registry, "poll_seconds", 60)
+    return factory
+
+
+class TestRegistryLookups:
+    """Lookups are served from one snapshot."""
+
+    def test_lookups_by_name_id_and_active(self, db_session):
+        master = _add_agent(db_session, "Master Agent")
+        _add_agent(db_session, "Retired Agent", is_active=False)
+        registry = AgentConfigRegistry(poll_seconds=60)
+
+        assert registry.get_by_name("Master Agent", session=db_session)["tools"] == ["ga4_tool"]
+        assert registry.get_by_name("Retired Agent", session=db_session) is None
+        assert registry.get_by_name("Retired Agent", include_inactive=True, session=db_session)["is_active"] is False
+        assert registry.get_by_id(master.id, session=db_session)["name"] == "Master Agent"
+        assert [agent["name"] for agent in registry.list_active(session=db_session)] == ["Master Agent"]
+
+        stats = registry.get_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 4
+
+    def test_callers_get_copies(self, db_session):
+        _add_agent(db_session, "Master Agent")
+        registry = AgentConfigRegistry(poll_seconds=60)
+
+        registry.get_by_name("Master Agent", session=db_session)["tools"].append("mutated")
+
+        assert registry.get_by_name("Master Agent", session=db_session)["tools"] == ["ga4_tool"]
+
+    def test_version_poll_picks_up_other_workers_changes(self, db_session):
+        _add_agent(db_session, "Master Agent")
+        registry = AgentConfigRegistry(poll_seconds=0)
+        assert len(registry.list_active(session=db_session)) == 1
+
+        # Written without going through this process's DatabaseManager
+        _add_agent(db_session, "GA4 Specialist")
+
+        assert len(registry.list_active(session=db_session)) == 2
+        assert registry.get_stats()["misses"] == 2
+
+
+class TestAgentServiceInvalidation:
+    """AgentService writes invalidate the registry."""
+
+    def test_create_toggle_and_delete_are_visible_immediately(self, shared_sessions):
+        service = AgentService()
+        assert service.get_all_agents()["total_agents"] == 0
+
+        service.create_or_update_agent({
+            "name": "Master Agent", "role": "Coordinator", "goal": "Answer", "backstory": "Experienced"
+        })
+        assert service.get_all_agents()["master_agent"]["name"] == "Master Agent"
+
+        service.toggle_agent_status("Master Agent", False)
+        assert service.get_all_agents()["total_agents"] == 0
+        assert service.get_agent_config("Master Agent") == {}
+
+        service.toggle_agent_status("Master Agent", True)
+        service.permanent_delete_agent("Master Agent")
+        assert service.get_all_agents()["total_agents"] == 0
+        assert agent_config_registry.get_stats()["invalidations"] >= 4
+
+    def test_repeated_reads_do_not_query(self, shared_sessions, db_session):
+        _add_agent(db_session, "Master Agent")
+        service = AgentService()
+        service.get_all_agents()
+        before = agent_config_registry.get_stats()
+
+        for _ in range(5):
+            service.get_all_agents()
+            service.get_agent_config("Master Agent")
+
+        after = agent_config_registry.get_stats()
+        assert after["misses"] == before["misses"]
+        assert after["version_checks"] == before["version_checks"]
+        assert after["hits"] == before["hits"] + 10
+
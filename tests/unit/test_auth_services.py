@@ -2,6 +2,7 @@
 Unit tests for authentication services
 """
 
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
@@ -12,6 +13,10 @@ from app.core.auth import (
     verify_token,
     get_current_user,
     create_user_session,
+    revoke_user_session,
+    get_principal_cache_stats,
+    principal_cache,
+    PrincipalCache,
     AuthenticationError,
 )
 from app.core.api_auth import APITokenService, verify_api_token
@@ -268,3 +273,78 @@ class TestAPITokenVerification:
 
         with pytest.raises(Exception):  # Should raise HTTPException
             verify_api_token(credentials)
+
+
+class TestPrincipalCache:
+    """Test the get_current_user principal cache"""
+
+    def _active_user(self):
+        user = Mock(spec=Campaigner)
+        user.id = 7
+        user.status = "active"
+        return user
+
+    @patch("app.core.auth.get_session")
+    def test_second_request_skips_database(self, mock_get_session, mock_settings):
+        mock_session = Mock()
+        mock_session.get.return_value = self._active_user()
+        mock_get_session.return_value.__enter__.return_value = mock_session
+        credentials = Mock()
+        credentials.credentials = create_access_token({"campaigner_id": 7})
+        hits_before = principal_cache.hits
+
+        first = get_current_user(credentials)
+        second = get_current_user(credentials)
+
+        assert first is second
+        assert mock_session.get.call_count == 1
+        assert principal_cache.hits == hits_before + 1
+        assert get_principal_cache_stats()["hit_rate"] is not None
+
+    @patch("app.core.auth.get_session")
+    def test_revoke_user_session_invalidates(self, mock_get_session, mock_settings):
+        token = create_access_token({"campaigner_id": 7})
+        user = self._active_user()
+        principal_cache.put(token, user)
+
+        revoked = Mock()
+        revoked.access_token = token
+        revoked.campaigner_id = 7
+        mock_session = Mock()
+        mock_session.exec.return_value.first.return_value = revoked
+        mock_get_session.return_value.__enter__.return_value = mock_session
+
+        assert revoke_user_session("session-token") is True
+        assert principal_cache.get(token) is None
+
+    def test_entries_do_not_outlive_token(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+
+        cache.put("expired-token", self._active_user(), token_exp=int(time.time()) - 1)
+
+        assert cache.get("expired-token") is None
+
+    def test_size_bound_evicts_least_recent(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+        for token in ("a", "b", "c"):
+            cache.put(token, self._active_user())
+
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_user_update_invalidates(self, db_session):
+        from app.models.users import Agency
+        agency = Agency(name="Agency", email="agency@test.com")
+        db_session.add(agency)
+        db_session.commit()
+        user = Campaigner(email="cached@test.com", full_name="Cached", status="active", agency_id=agency.id)
+        db_session.add(user)
+        db_session.commit()
+        principal_cache.put("token", user)
+
+        user.full_name = "Renamed"
+        db_session.add(user)
+        db_session.commit()
+
+        assert principal_cache.get("token") is None
@@ -0,0 +1,66 @@
+"""
+Unit tests for the shared background flusher thread
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+from app.config.background_flusher import BackgroundFlusher
+
+
+class TestBackgroundFlusher:
+    """Test the background flusher thread."""
+
+    def test_request_flush_runs_on_background_thread(self):
+        flushed = threading.Event()
+        flush_threads = []
+
+        def flush_fn():
+            flush_threads.append(threading.current_thread().name)
+            flushed.set()
+
+        flusher = BackgroundFlusher(flush_fn, interval_seconds=60, name="test-flusher")
+        try:
+            flusher.request_flush()
+            assert flushed.wait(timeout=5)
+            assert flush_threads[0] == "test-flusher"
+        finally:
+            flusher.stop()
+
+    def test_flushes_on_interval(self):
+        flush_fn = MagicMock()
+        flusher = BackgroundFlusher(flush_fn, interval_seconds=0.01, name="test-flusher")
+        try:
+            flusher.start()
+            for _ in range(500):
+                if flush_fn.call_count >= 2:
+                    break
+                threading.Event().wait(0.01)
+            assert flush_fn.call_count >= 2
+        finally:
+            flusher.stop()
+
+    def test_failing_flush_keeps_thread_alive(self):
+        flush_fn = MagicMock(side_effect=[RuntimeError("down"), None, None])
+        flusher = BackgroundFlusher(flush_fn, interval_seconds=0.01, name="test-flusher")
+        try:
+            flusher.start()
+            for _ in range(500):
+                if flush_fn.call_count >= 2:
+                    break
+                threading.Event().wait(0.01)
+            assert flush_fn.call_count >= 2
+            assert flusher.is_running
+        finally:
+            flush_fn.side_effect = None
+            flusher.stop()
+
+    def test_stop_does_final_flush_and_stops_thread(self):
+        flush_fn = MagicMock()
+        flusher = BackgroundFlusher(flush_fn, interval_seconds=60, name="test-flusher")
+        flusher.start()
+
+        flusher.stop()
+
+        assert not flusher.is_running
+        flush_fn.assert_called()
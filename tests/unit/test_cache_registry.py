@@ -0,0 +1,90 @@
+"""
+Unit tests for the shared cache registry and its commit-driven invalidation
+"""
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.config import cache_registry
+from app.config.cache_registry import (
+    cache_stats, get_cache_stats, has_pending, mark_changed, register_cache, register_invalidation
+)
+from app.models.settings import AppSettings
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(cache_registry, "_caches", {})
+    monkeypatch.setattr(cache_registry, "_invalidations", {})
+
+
+@pytest.fixture
+def session():
+    # Own engine: these tests commit and roll back real transactions
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[AppSettings.__table__])
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _setting(key="feature_flag", value="on"):
+    return AppSettings(key=key, value=value, value_type="str")
+
+
+class TestCacheStats:
+    """Every cache reports the same stats block."""
+
+    def test_hit_rate_and_extras(self):
+        assert cache_stats(3, 3, 1, invalidations=2) == {
+            "entries": 3, "hits": 3, "misses": 1, "hit_rate": 0.75, "invalidations": 2,
+        }
+        assert cache_stats(0, 0, 0)["hit_rate"] is None
+
+    def test_registered_caches_are_reported(self, registry):
+        class _Cache:
+            def get_stats(self):
+                return {"entries": 1}
+
+        register_cache("example", _Cache())
+
+        assert get_cache_stats() == {"example": {"entries": 1}}
+
+
+class TestInvalidation:
+    """Collected changes reach the cache only once they are committed."""
+
+    def test_after_commit_receives_collected_items(self, registry, session):
+        committed = []
+        register_invalidation("settings", (AppSettings,), collect=lambda obj: (obj.key,),
+                              after_commit=committed.append)
+
+        session.add(_setting())
+        session.flush()
+        assert has_pending(session, "settings")
+        assert committed == []
+        session.commit()
+        assert committed == [{"feature_flag"}]
+
+    def test_rollback_discards_changes(self, registry, session):
+        committed = []
+        register_invalidation("settings", (AppSettings,), after_commit=committed.append)
+
+        session.add(_setting())
+        session.flush()
+        session.rollback()
+
+        assert not has_pending(session, "settings")
+        assert committed == []
+
+    def test_before_commit_and_on_flush(self, registry, session):
+        calls = []
+        register_invalidation("rebuild", (AppSettings,),
+                              before_commit=lambda _session, items: calls.append(("before_commit", items)),
+                              on_flush=lambda: calls.append("flush"))
+
+        mark_changed(session, "rebuild", ["core-write"])
+        session.add(_setting())
+        session.commit()
+
+        assert calls == ["flush", ("before_commit", {"core-write", True})]
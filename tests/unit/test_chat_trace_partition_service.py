@@ -0,0 +1,168 @@
+"""
+Unit tests for ChatTracePartitionService
+"""
+
+import pytest
+from datetime import date, datetime
+from unittest.mock import patch, MagicMock
+
+from app.models.chat_traces import ChatTrace, RecordType
+from app.services.chat_trace_service import ChatTraceService
+from app.services.chat_trace_partition_service import (
+    ChatTracePartitionService,
+    add_months,
+    archive_name,
+    expired_partition_months,
+    parse_partition_month,
+    partition_name,
+)
+
+
+def _executed_sql(session):
+    """Return the SQL strings passed to session.execute."""
+    return [str(call.args[0]) for call in session.execute.call_args_list]
+
+
+class TestPartitionHelpers:
+    """Test partition naming and month arithmetic."""
+
+    def test_add_months_across_year_boundary(self):
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+        assert add_months(date(2025, 6, 1), -24) == date(2023, 6, 1)
+
+    def test_partition_and_archive_names(self):
+        assert partition_name(date(2025, 3, 1)) == "chat_traces_p2025_03"
+        assert archive_name(date(2025, 3, 1)) == "chat_traces_archive_2025_03"
+
+    def test_parse_partition_month(self):
+        assert parse_partition_month("chat_traces_p2025_03") == date(2025, 3, 1)
+        assert parse_partition_month("chat_traces_default") is None
+        assert parse_partition_month("chat_traces_archive_2025_03") is None
+
+    def test_expired_partition_months_keeps_retention_window(self):
+        months = [date(2024, m, 1) for m in range(1, 13)] + [date(2025, 1, 1)]
+
+        expired = expired_partition_months(months, retention_months=3, today=date(2025, 1, 15))
+
+        # Keeps Nov 2024, Dec 2024 and Jan 2025
+        assert expired == [date(2024, m, 1) for m in range(1, 11)]
+
+    def test_expired_partition_months_nothing_to_expire(self):
+        months = [date(2025, 1, 1), date(2025, 2, 1)]
+        assert expired_partition_months(months, retention_months=24, today=date(2025, 2, 1)) == []
+
+
+class TestChatTracePartitionService:
+    """Test partition maintenance against a mocked session."""
+
+    @pytest.fixture
+    def session(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, session):
+        return ChatTracePartitionService(session=session)
+
+    def test_is_partitioned_false_for_non_postgres(self, service, session):
+        session.get_bind.return_value.dialect.name = "sqlite"
+        assert service.is_partitioned(session) is False
+        session.execute.assert_not_called()
+
+    def test_ensure_future_partitions_creates_only_missing(self, service, session):
+        with patch.object(service, "list_partition_months", return_value=[date(2025, 1, 1), date(2025, 2, 1)]), \
+                patch.object(service, "default_partition_months", return_value=[]):
+            created = service.ensure_future_partitions(session, months_ahead=3, today=date(2025, 1, 10))
+
+        assert created == ["chat_traces_p2025_03", "chat_traces_p2025_04"]
+        sql = _executed_sql(session)
+        assert "PARTITION OF chat_traces FOR VALUES FROM ('2025-03-01') TO ('2025-04-01')" in sql[0]
+        assert "FROM ('2025-04-01') TO ('2025-05-01')" in sql[1]
+
+    def test_rows_caught_by_default_are_moved_into_new_partition(self, service, session):
+        session.execute.return_value.rowcount = 7
+        with patch.object(service, "list_partition_months", return_value=[date(2025, 1, 1)]), \
+                patch.object(service, "default_partition_months", return_value=[date(2024, 6, 1)]):
+            created = service.ensure_future_partitions(session, months_ahead=0, today=date(2025, 1, 10))
+
+        assert created == ["chat_traces_p2024_06"]
+        sql = _executed_sql(session)
+        assert sql[0].startswith("CREATE TABLE chat_traces_p2024_06 (LIKE chat_traces")
+        assert "DELETE FROM chat_traces_default" in sql[1]
+        assert "INSERT INTO chat_traces_p2024_06" in sql[1]
+        assert sql[2] == (
+            "ALTER TABLE chat_traces ATTACH PARTITION chat_traces_p2024_06 "
+            "FOR VALUES FROM ('2024-06-01') TO ('2024-07-01')"
+        )
+        assert session.execute.call_args_list[1].args[1] == {
+            "month_start": date(2024, 6, 1), "month_end": date(2024, 7, 1)
+        }
+
+    def test_expire_partitions_drops_by_default(self, service, session):
+        with patch.object(service, "list_partition_months", return_value=[date(2022, 12, 1), date(2025, 1, 1)]):
+            expired = service.expire_partitions(session, retention_months=24, today=date(2025, 1, 10))
+
+        assert expired == ["chat_traces_p2022_12"]
+        assert _executed_sql(session) == ["DROP TABLE chat_traces_p2022_12"]
+
+    def test_expire_partitions_detaches_when_archiving(self, service, session):
+        with patch.object(service, "list_partition_months", return_value=[date(2022, 12, 1)]):
+            service.expire_partitions(session, retention_months=24, archive=True, today=date(2025, 1, 10))
+
+        assert _executed_sql(session) == [
+            "ALTER TABLE chat_traces DETACH PARTITION chat_traces_p2022_12",
+            "ALTER TABLE chat_traces_p2022_12 RENAME TO chat_traces_archive_2022_12",
+        ]
+
+    def test_run_maintenance_skips_unpartitioned_table(self, service, session):
+        with patch.object(service, "is_partitioned", return_value=False):
+            result = service.run_maintenance()
+
+        assert result["partitioned"] is False
+        session.commit.assert_not_called()
+
+    def test_run_maintenance_commits_and_reports(self, service, session):
+        with patch.object(service, "is_partitioned", return_value=True), \
+                patch.object(service, "ensure_future_partitions", return_value=["chat_traces_p2025_04"]), \
+                patch.object(service, "expire_partitions", return_value=["chat_traces_p2022_12"]):
+            result = service.run_maintenance()
+
+        assert result["created"] == ["chat_traces_p2025_04"]
+        assert result["expired"] == ["chat_traces_p2022_12"]
+        session.commit.assert_called_once()
+
+    def test_run_maintenance_rolls_back_on_error(self, service, session):
+        with patch.object(service, "is_partitioned", return_value=True), \
+                patch.object(service, "ensure_future_partitions", side_effect=RuntimeError("lock timeout")):
+            with pytest.raises(RuntimeError):
+                service.run_maintenance()
+
+        session.rollback.assert_called_once()
+
+
+class TestThreadRecordsFilter:
+    """Test the partition-pruning filter used for per-thread queries."""
+
+    def test_filter_bounds_created_at_by_conversation_start(self):
+        conversation = ChatTrace(
+            thread_id="thread-1",
+            record_type=RecordType.CONVERSATION,
+            campaigner_id=1,
+            data={},
+            created_at=datetime(2025, 3, 10, 12, 0, 0)
+        )
+
+        clause = ChatTraceService.thread_records_filter(conversation, RecordType.MESSAGE)
+        compiled = str(clause.compile(compile_kwargs={"literal_binds": True}))
+
+        assert "chat_traces.thread_id = 'thread-1'" in compiled
+        assert "chat_traces.created_at >= '2025-03-09 12:00:00'" in compiled
+
+    def test_filter_without_created_at_has_no_bound(self):
+        conversation = MagicMock(spec=ChatTrace)
+        conversation.thread_id = "thread-1"
+        conversation.created_at = None
+
+        clause = ChatTraceService.thread_records_filter(conversation, RecordType.MESSAGE)
+
+        assert "created_at" not in str(clause)
@@ -7,7 +7,7 @@ from unittest.mock import patch, MagicMock, Mock
 from datetime import datetime
 from sqlmodel import Session
 
-from app.services.chat_trace_service import ChatTraceService
+from app.services.chat_trace_service import ChatTraceService, project_trace_data
 from app.models.chat_traces import ChatTrace, RecordType
 
 
@@ -105,9 +105,8 @@ class TestChatTraceService:
         self, mock_langfuse_config, service, mock_session
     ):
         """Test successful conversation creation."""
-        # Mock Langfuse config
-        mock_config = MagicMock()
-        mock_langfuse_config.return_value = mock_config
+        # No Langfuse client configured
+        mock_langfuse_config.get_client.return_value = None
 
         # Mock database operations
         mock_conversation = MagicMock(spec=ChatTrace)
@@ -480,7 +479,7 @@ class TestChatTraceService:
     def test_get_or_create_langfuse_trace_with_langfuse(
         self, mock_langfuse_config, service
     ):
-        """Test getting/creating Langfuse trace when Langfuse is available."""
+        """Test creating a Langfuse trace when Langfuse is available."""
         # Mock conversation
         mock_conversation = MagicMock(spec=ChatTrace)
         mock_conversation.langfuse_trace_id = None  # No existing trace
@@ -488,20 +487,42 @@ class TestChatTraceService:
 
         # Mock Langfuse
         mock_langfuse = MagicMock()
-        mock_trace = MagicMock()
-        mock_langfuse.trace.return_value = mock_trace
+        mock_langfuse.create_trace_id.return_value = "trace-1"
+        mock_langfuse.get_trace_url.return_value = "https://langfuse/trace-1"
         mock_langfuse_config.get_client.return_value = mock_langfuse
 
         with patch.object(service, "get_conversation", return_value=mock_conversation):
             result = service.get_or_create_langfuse_trace("test_thread")
 
-            assert result == mock_trace
-            mock_langfuse.trace.assert_called_once_with(
-                name="chat_conversation",
-                session_id="test_thread",
-                user_id="1",  # Should be string of campaigner_id
-                metadata={"thread_id": "test_thread"},
-            )
+        assert result == "trace-1"
+        assert mock_conversation.langfuse_trace_id == "trace-1"
+        assert mock_conversation.langfuse_trace_url == "https://langfuse/trace-1"
+        mock_langfuse.start_span.assert_called_once_with(
+            trace_context={"trace_id": "trace-1"},
+            name="chat_conversation",
+            metadata={"thread_id": "test_thread"},
+        )
+        mock_langfuse.start_span.return_value.update_trace.assert_called_once_with(
+            name="chat_conversation",
+            session_id="test_thread",
+            user_id="1",  # Should be string of campaigner_id
+            metadata={"thread_id": "test_thread"},
+        )
+        mock_langfuse.start_span.return_value.end.assert_called_once()
+
+    @patch("app.services.chat_trace_service.LANGFUSE_AVAILABLE", True)
+    @patch("app.services.chat_trace_service.LangfuseConfig")
+    def test_get_or_create_langfuse_trace_reuses_stored_id(
+        self, mock_langfuse_config, service
+    ):
+        """Test an existing trace is continued from its stored ID."""
+        mock_conversation = MagicMock(spec=ChatTrace)
+        mock_conversation.langfuse_trace_id = "trace-1"
+
+        with patch.object(service, "get_conversation", return_value=mock_conversation):
+            assert service.get_or_create_langfuse_trace("test_thread") == "trace-1"
+
+        mock_langfuse_config.get_client.assert_not_called()
 
     @patch("app.services.chat_trace_service.LANGFUSE_AVAILABLE", False)
     def test_get_or_create_langfuse_trace_without_langfuse(self, service):
@@ -512,17 +533,69 @@ class TestChatTraceService:
 
     @patch("app.services.chat_trace_service.LangfuseConfig")
     def test_flush_langfuse_with_langfuse(self, mock_langfuse_config, service):
-        """Test flushing Langfuse when available."""
+        """Test flushing Langfuse when available schedules a background flush."""
         with patch("app.services.chat_trace_service.LANGFUSE_AVAILABLE", True):
             mock_langfuse = MagicMock()
             mock_langfuse_config.get_client.return_value = mock_langfuse
 
             service.flush_langfuse()
 
-            mock_langfuse.flush.assert_called_once()
+            mock_langfuse_config.request_flush.assert_called_once()
+            mock_langfuse.flush.assert_not_called()
+
+    @patch("app.services.chat_trace_service.LangfuseConfig")
+    def test_record_observation_continues_trace_by_id(self, mock_langfuse_config, service):
+        """Test observations attach to the stored trace ID without fetching the trace."""
+        mock_langfuse = MagicMock()
+        mock_langfuse.start_observation.return_value.id = "obs-1"
+        mock_langfuse_config.get_client.return_value = mock_langfuse
+
+        result = service._record_langfuse_observation(
+            "trace-1", as_type="generation", name="assistant_message", input="Hi"
+        )
+
+        assert result == "obs-1"
+        mock_langfuse.start_observation.assert_called_once_with(
+            trace_context={"trace_id": "trace-1"}, name="assistant_message", as_type="generation", input="Hi"
+        )
+        mock_langfuse.start_observation.return_value.end.assert_called_once()
 
     def test_flush_langfuse_without_langfuse(self, service):
         """Test flushing Langfuse when not available."""
         with patch("app.services.chat_trace_service.LANGFUSE_AVAILABLE", False):
             # Should not raise exception
             service.flush_langfuse()
+
+
+class TestProjectTraceData:
+    """Test projection of large data fields for API responses."""
+
+    def test_omits_large_fields_by_default(self):
+        data = {"tool_name": "ga4", "tool_input": "{...}", "tool_output": "x" * 10000, "success": True}
+
+        projected = project_trace_data(data)
+
+        assert projected == {"tool_name": "ga4", "success": True, "omitted_fields": ["tool_input", "tool_output"]}
+
+    def test_omits_large_metadata_fields(self):
+        data = {
+            "step_type": "initialization",
+            "extra_metadata": {"llm_model": "gemini", "system_prompt": "You are..."}
+        }
+
+        projected = project_trace_data(data)
+
+        assert projected["extra_metadata"] == {"llm_model": "gemini"}
+        assert projected["omitted_fields"] == ["extra_metadata.system_prompt"]
+        # Source data is not modified
+        assert data["extra_metadata"]["system_prompt"] == "You are..."
+
+    def test_include_large_fields_returns_everything(self):
+        data = {"tool_output": "result", "extra_metadata": {"system_prompt": "p"}}
+
+        assert project_trace_data(data, include_large_fields=True) == data
+
+    def test_small_records_unchanged(self):
+        data = {"role": "user", "content": "Hello", "extra_metadata": {}}
+
+        assert project_trace_data(data) == data
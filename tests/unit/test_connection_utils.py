@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 from unittest.mock import Mock, MagicMock, patch
 
 from app.utils.connection_utils import (
+    connection_lookup_scope,
+    get_ga4_connections,
     get_connection_for_save,
     get_active_connection,
     get_connection_by_platform,
@@ -447,3 +449,94 @@ class TestQueryCorrectness:
 
         # Verify exec was called (query was executed with filters)
         assert mock_session.exec.called
+
+
+class TestConnectionLookupScope:
+    """Lookups inside a scope share one query per customer/campaigner."""
+
+    @pytest.fixture
+    def session_factory(self, patch_get_session):
+        return patch_get_session("app.utils.connection_utils.get_session")
+
+    @pytest.fixture
+    def analytics_connection(self, db_session):
+        asset = DigitalAsset(customer_id=10, asset_type=AssetType.ANALYTICS, provider="Google Analytics",
+                             name="GA", external_id="ga-scope")
+        db_session.add(asset)
+        db_session.commit()
+        connection = Connection(digital_asset_id=asset.id, customer_id=10, campaigner_id=50,
+                                auth_type=AuthType.OAUTH2, account_email="first@example.com")
+        db_session.add(connection)
+        db_session.commit()
+        return asset.id, connection.id
+
+    def test_repeated_lookups_use_one_query(self, session_factory, analytics_connection):
+        asset_id, connection_id = analytics_connection
+
+        with connection_lookup_scope() as scope:
+            active = get_active_connection(digital_asset_id=asset_id, customer_id=10, campaigner_id=50)
+            by_platform = get_connection_by_platform("google_analytics", campaigner_id=50, customer_id=10)
+            all_active = get_all_active_connections(customer_id=10, campaigner_id=50)
+            ga4 = get_ga4_connections(campaigner_id=50, customer_id=10)
+
+        assert active.id == by_platform.id == connection_id
+        assert [conn.id for conn in all_active] == [connection_id]
+        assert [(conn.id, asset.id) for conn, asset in ga4] == [(connection_id, asset_id)]
+        assert scope.queries == 1
+        assert scope.hits == 3
+
+    def test_callers_get_independent_copies(self, session_factory, analytics_connection):
+        asset_id, _ = analytics_connection
+
+        with connection_lookup_scope():
+            first = get_active_connection(digital_asset_id=asset_id, customer_id=10, campaigner_id=50)
+            first.account_email = "changed@example.com"
+            second = get_active_connection(digital_asset_id=asset_id, customer_id=10, campaigner_id=50)
+
+        assert second is not first
+        assert second.account_email == "first@example.com"
+
+    def test_write_through_session_invalidates_scope(self, session_factory, analytics_connection):
+        asset_id, _ = analytics_connection
+
+        with connection_lookup_scope() as scope:
+            with session_factory() as session:
+                connection = get_active_connection(digital_asset_id=asset_id, customer_id=10,
+                                                   campaigner_id=50, session=session)
+                connection.revoked = True
+                session.add(connection)
+                session.commit()
+
+            assert get_active_connection(digital_asset_id=asset_id, customer_id=10, campaigner_id=50) is None
+            assert scope.queries == 2
+
+    def test_session_with_pending_writes_bypasses_scope(self, session_factory, analytics_connection):
+        asset_id, _ = analytics_connection
+
+        with connection_lookup_scope() as scope:
+            get_all_active_connections(customer_id=10, campaigner_id=50)
+            with session_factory() as session:
+                asset = DigitalAsset(customer_id=10, asset_type=AssetType.ANALYTICS, provider="Google Analytics",
+                                     name="GA 2", external_id="ga-scope-2")
+                session.add(asset)
+                session.flush()
+                session.add(Connection(digital_asset_id=asset.id, customer_id=10, campaigner_id=50,
+                                       auth_type=AuthType.OAUTH2))
+                session.flush()
+
+                # Uncommitted rows are only visible to this session
+                assert len(get_all_active_connections(customer_id=10, campaigner_id=50, session=session)) == 2
+                session.commit()
+
+        assert scope.queries == 1
+
+    def test_rows_older_than_max_age_are_reloaded(self, session_factory, analytics_connection):
+        asset_id, _ = analytics_connection
+
+        with connection_lookup_scope() as scope:
+            get_active_connection(digital_asset_id=asset_id, customer_id=10, campaigner_id=50)
+            scope.max_age_seconds = 0
+            get_active_connection(digital_asset_id=asset_id, customer_id=10, campaigner_id=50)
+
+        assert scope.queries == 2
+        assert scope.hits == 0
@@ -0,0 +1,133 @@
+"""
+Unit tests for the bounded crew execution pool
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.crew_execution_pool import CrewExecutionPool, CrewPoolFull
+
+
+@pytest.fixture
+async def pool():
+    pool = CrewExecutionPool(workers=2, max_queue=3, per_tenant_limit=1)
+    yield pool
+    await pool.shutdown()
+
+
+class _Gate:
+    """Coroutine factory whose runs block until released; tracks concurrency."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+
+    async def run(self, name):
+        self.started.append(name)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.release.wait()
+            return name
+        finally:
+            self.running -= 1
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestScheduling:
+    """Concurrency bounds and per-tenant fairness."""
+
+    async def test_runs_at_most_worker_count_jobs(self, pool):
+        gate = _Gate()
+        jobs = [pool.submit(tenant, gate.run, f"job-{tenant}") for tenant in range(3)]
+        await _settle()
+
+        assert gate.max_running == 2
+        assert pool.get_stats()["queue_depth"] == 1
+
+        gate.release.set()
+        results = [(await pool.wait(job.job_id, timeout=1)).result for job in jobs]
+
+        assert results == ["job-0", "job-1", "job-2"]
+        assert pool.get_stats()["completed"] == 3
+        assert pool.get_stats()["queue_wait"]["samples"] == 3
+
+    async def test_busy_tenant_does_not_block_others(self, pool):
+        gate = _Gate()
+        pool.submit("tenant-a", gate.run, "a1")
+        pool.submit("tenant-a", gate.run, "a2")
+        pool.submit("tenant-b", gate.run, "b1")
+        await _settle()
+
+        # Second worker skips a2 (tenant-a at its limit) and takes b1
+        assert gate.started == ["a1", "b1"]
+        assert pool.get_stats()["running_by_tenant"] == {"tenant-a": 1, "tenant-b": 1}
+        gate.release.set()
+
+    async def test_full_queue_rejects(self, pool):
+        gate = _Gate()
+        for i in range(2):
+            pool.submit(f"running-{i}", gate.run, i)
+        await _settle()
+        for i in range(3):
+            pool.submit(f"queued-{i}", gate.run, i)
+
+        with pytest.raises(CrewPoolFull):
+            pool.submit("extra", gate.run, "extra")
+        assert pool.get_stats()["rejected"] == 1
+        gate.release.set()
+
+    async def test_failed_job_records_error(self, pool):
+        async def boom():
+            raise ValueError("bad config")
+
+        job = pool.submit("tenant", boom)
+        await pool.wait(job.job_id, timeout=1)
+
+        assert job.status == "failed"
+        assert job.error == "bad config"
+
+
+class TestCancellation:
+    """Queued and running jobs can be cancelled."""
+
+    async def test_cancel_queued_job(self, pool):
+        gate = _Gate()
+        pool.submit("tenant", gate.run, "first")
+        queued = pool.submit("tenant", gate.run, "second")
+        await _settle()
+
+        assert pool.cancel(queued.job_id) is True
+        assert queued.status == "cancelled"
+        gate.release.set()
+        await _settle()
+        assert "second" not in gate.started
+
+    async def test_cancel_running_job(self, pool):
+        gate = _Gate()
+        job = pool.submit("tenant", gate.run, "only")
+        await _settle()
+
+        assert pool.cancel(job.job_id) is True
+        await pool.wait(job.job_id, timeout=1)
+
+        assert job.status == "cancelled"
+        assert pool.get_stats()["running"] == 0
+        assert pool.cancel(job.job_id) is False
+
+
+class TestRunBlocking:
+    """Blocking calls run off the event loop thread."""
+
+    async def test_run_blocking_uses_pool_thread(self, pool):
+        thread_name = await pool.run_blocking(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("crew-worker")
@@ -0,0 +1,130 @@
+"""
+Unit tests for batched credential fetching and the credential cache
+"""
+
+import pytest
+
+from app.core.agents.credential_cache import credential_cache
+from app.core.agents.customer_credentials import CustomerCredentialManager
+from app.models.analytics import AssetType, AuthType, Connection, DigitalAsset
+from app.utils.security_utils import get_token_crypto
+
+CUSTOMER_ID = 7
+CAMPAIGNER_ID = 3
+
+
+def _add_platform(db_session, asset_type, provider, meta, access_token, refresh_token=None):
+    crypto = get_token_crypto()
+    asset = DigitalAsset(customer_id=CUSTOMER_ID, asset_type=asset_type, provider=provider,
+                         name=f"{asset_type.value} asset", external_id=f"ext-{asset_type.value}", meta=meta)
+    db_session.add(asset)
+    db_session.commit()
+    connection = Connection(
+        digital_asset_id=asset.id,
+        customer_id=CUSTOMER_ID,
+        campaigner_id=CAMPAIGNER_ID,
+        auth_type=AuthType.OAUTH2,
+        access_token_enc=crypto.encrypt_token(access_token),
+        refresh_token_enc=crypto.encrypt_token(refresh_token) if refresh_token else None,
+        token_hash=crypto.generate_token_hash(access_token)
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return connection
+
+
+@pytest.fixture
+def sessions(patch_get_session):
+    return patch_get_session("app.core.agents.customer_credentials.get_session").opened
+
+
+@pytest.fixture
+def platforms(db_session):
+    return {
+        "ga4": _add_platform(db_session, AssetType.GA4, "Google", {"property_id": "123"},
+                             "ga-access", "1//ga-refresh"),
+        "google_ads": _add_platform(db_session, AssetType.GOOGLE_ADS, "Google", {"account_id": "456"},
+                                    "ads-access", "1//ads-refresh"),
+        "facebook": _add_platform(db_session, AssetType.FACEBOOK_ADS, "Facebook", {"ad_account_id": "act_789"},
+                                  "fb-access"),
+    }
+
+
+class TestFetchAllCredentials:
+    """All platforms are loaded with one session and one query."""
+
+    def test_returns_every_platform(self, sessions, platforms):
+        credentials = CustomerCredentialManager().fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        assert sorted(credentials["platforms"]) == ["facebook_ads", "google_ads", "google_analytics"]
+        assert credentials["google_analytics"]["refresh_token"] == "1//ga-refresh"
+        assert credentials["google_analytics"]["access_token"] == "ga-access"
+        assert credentials["google_analytics"]["property_id"] == "123"
+        assert credentials["google_ads"]["refresh_token"] == "1//ads-refresh"
+        assert credentials["google_ads"]["account_id"] == "456"
+        assert credentials["meta_ads"] == {"access_token": "fb-access", "ad_account_id": "act_789"}
+        assert len(sessions) == 1
+
+    def test_other_campaigners_connections_are_ignored(self, sessions, platforms):
+        credentials = CustomerCredentialManager().fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID + 1)
+
+        assert len(credentials["platforms"]) == 3
+        assert credentials["google_analytics"] is None
+        assert credentials["google_ads"] is None
+        assert credentials["meta_ads"] is None
+
+
+class TestCredentialCache:
+    """Repeated fetches reuse the result until tokens change."""
+
+    def test_second_fetch_skips_decryption(self, sessions, platforms, monkeypatch):
+        manager = CustomerCredentialManager()
+        first = manager.fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+        before = credential_cache.get_stats()
+
+        monkeypatch.setattr(manager, "_build_google_analytics_credentials",
+                            lambda *args: pytest.fail("credentials rebuilt on a cache hit"))
+        second = manager.fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        assert second == first
+        assert credential_cache.get_stats()["hits"] == before["hits"] + 1
+
+    def test_token_rotation_rebuilds(self, db_session, sessions, platforms):
+        manager = CustomerCredentialManager()
+        manager.fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        crypto = get_token_crypto()
+        connection = platforms["ga4"]
+        connection.access_token_enc = crypto.encrypt_token("ga-access-2")
+        connection.token_hash = crypto.generate_token_hash("ga-access-2")
+        db_session.add(connection)
+        db_session.commit()
+
+        credentials = manager.fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        assert credentials["google_analytics"]["access_token"] == "ga-access-2"
+
+    def test_revoked_connection_is_not_served(self, db_session, sessions, platforms):
+        manager = CustomerCredentialManager()
+        manager.fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        connection = platforms["facebook"]
+        connection.revoked = True
+        db_session.add(connection)
+        db_session.commit()
+
+        assert manager.fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)["meta_ads"] is None
+
+    def test_cached_tokens_are_encrypted(self, sessions, platforms):
+        CustomerCredentialManager().fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        entry = credential_cache._entries[(CUSTOMER_ID, CAMPAIGNER_ID)]
+        assert b"ga-access" not in entry[2]
+        assert b"fb-access" not in entry[2]
+
+    def test_invalidate_customer(self, sessions, platforms):
+        CustomerCredentialManager().fetch_all_credentials(CUSTOMER_ID, CAMPAIGNER_ID)
+
+        credential_cache.invalidate(CUSTOMER_ID)
+
+        assert credential_cache.get_stats()["entries"] == 0
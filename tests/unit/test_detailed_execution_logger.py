@@ -0,0 +1,175 @@
+"""
+Unit tests for batched DetailedExecutionLogger persistence
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, select
+
+from app.models.agents import DetailedExecutionLog
+from app.services import detailed_execution_logger as detailed_module
+from app.services.detailed_execution_logger import (
+    DetailedExecutionLogger,
+    cleanup_detailed_logger,
+    get_detailed_logger,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    DetailedExecutionLog.__table__.create(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sessions(engine):
+    """Route the logger's sessions to the in-memory engine and count them."""
+    opened = []
+
+    def _get_session():
+        opened.append(1)
+        return Session(engine)
+
+    with patch.object(detailed_module, "get_session", side_effect=_get_session), \
+            patch.object(detailed_module, "_get_flusher") as get_flusher:
+        yield {"opened": opened, "get_flusher": get_flusher}
+
+
+def _rows(engine):
+    with Session(engine) as session:
+        return session.exec(select(DetailedExecutionLog).order_by(DetailedExecutionLog.sequence_number)).all()
+
+
+class TestBatchedPersistence:
+    """Test buffering, flushing and parent resolution."""
+
+    def test_log_calls_return_sequence_without_touching_db(self, engine, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+
+        assert detailed_logger.log_crew_start("crew", agents=["a"], tasks=["t"]) == 1
+        assert detailed_logger.log_agent_thinking("a", "hmm") == 2
+
+        assert sessions["opened"] == []
+        assert _rows(engine) == []
+        assert detailed_logger.get_stats()["buffered"] == 2
+
+    def test_flush_writes_batch_in_one_session_and_resolves_parents(self, engine, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+        detailed_logger.log_crew_start("crew")
+        detailed_logger.log_task_start("task-1", "Analyze traffic", "analyst")
+        detailed_logger.log_agent_start("analyst")
+        detailed_logger.log_agent_thinking("analyst", "thinking")
+
+        assert detailed_logger.flush() == 4
+        assert len(sessions["opened"]) == 1
+
+        crew, task, agent, thinking = _rows(engine)
+        assert crew.parent_log_id is None
+        assert task.parent_log_id == crew.id
+        assert agent.parent_log_id == task.id
+        assert thinking.parent_log_id == agent.id
+
+    def test_parent_from_earlier_batch_is_resolved(self, engine, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+        detailed_logger.log_crew_start("crew")
+        detailed_logger.log_agent_start("analyst")
+        detailed_logger.flush()
+
+        detailed_logger.log_tool_execution_start("analyst", "ga4_tool", "{}")
+        detailed_logger.flush()
+
+        rows = _rows(engine)
+        assert rows[2].parent_log_id == rows[1].id
+
+    def test_crew_complete_flushes(self, engine, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+        detailed_logger.log_crew_start("crew")
+        detailed_logger.log_crew_complete("crew", "done", duration_seconds=1.5)
+
+        assert [row.log_type for row in _rows(engine)] == ["crew_start", "crew_complete"]
+        assert detailed_logger.get_stats()["persisted"] == 2
+
+    def test_batch_size_requests_background_flush(self, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=2)
+        detailed_logger.log_agent_thinking("a")
+        sessions["get_flusher"].return_value.request_flush.assert_not_called()
+
+        detailed_logger.log_agent_thinking("a")
+        sessions["get_flusher"].return_value.request_flush.assert_called_once()
+
+    def test_full_buffer_drops_and_counts(self, engine, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100, max_buffered=2)
+        detailed_logger.log_agent_thinking("a")
+        detailed_logger.log_agent_thinking("a")
+
+        assert detailed_logger.log_agent_thinking("a") is None
+        assert detailed_logger.get_stats()["dropped"] == 1
+
+        detailed_logger.flush()
+        assert len(_rows(engine)) == 2
+
+    def test_failed_flush_is_retried_before_counting(self, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+        detailed_logger.flush_retries = 1
+        detailed_logger.log_agent_thinking("a")
+
+        with patch.object(detailed_module, "get_session", side_effect=RuntimeError("db down")):
+            assert detailed_logger.flush() == 0
+            assert detailed_logger.get_stats()["buffered"] == 1
+            assert detailed_logger.get_stats()["failed"] == 0
+
+            assert detailed_logger.flush() == 0
+
+        assert detailed_logger.get_stats()["buffered"] == 0
+        assert detailed_logger.get_stats()["failed"] == 1
+
+    def test_requeued_batch_is_written_ahead_of_new_entries(self, engine, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+        detailed_logger.flush_retries = 1
+        detailed_logger.log_crew_start("crew")
+
+        with patch.object(detailed_module, "get_session", side_effect=RuntimeError("db down")):
+            detailed_logger.flush()
+        detailed_logger.log_agent_start("analyst")
+
+        assert detailed_logger.flush() == 2
+        crew, agent = _rows(engine)
+        assert agent.parent_log_id == crew.id
+        assert detailed_logger.get_stats()["failed"] == 0
+
+    def test_requeue_respects_buffer_bound(self, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100, max_buffered=2)
+        detailed_logger.flush_retries = 1
+        detailed_logger.log_agent_thinking("a")
+        detailed_logger.log_agent_thinking("a")
+
+        with patch.object(detailed_module, "get_session", side_effect=RuntimeError("db down")):
+            detailed_logger.flush()
+        detailed_logger.log_agent_thinking("a")
+        assert detailed_logger.get_stats()["dropped"] == 1
+
+    def test_get_execution_logs_sees_buffered_entries(self, sessions):
+        detailed_logger = DetailedExecutionLogger("session-1", batch_size=100)
+        detailed_logger.log_crew_start("crew")
+
+        logs = detailed_logger.get_execution_logs()
+
+        assert [log["log_type"] for log in logs] == ["crew_start"]
+
+    def test_cleanup_flushes_registered_logger(self, engine, sessions):
+        detailed_logger = get_detailed_logger("session-cleanup")
+        detailed_logger.log_crew_start("crew")
+
+        cleanup_detailed_logger("session-cleanup")
+
+        assert len(_rows(engine)) == 1
+        assert "session-cleanup" not in detailed_module._detailed_loggers
+
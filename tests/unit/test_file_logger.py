@@ -0,0 +1,157 @@
+"""
+Unit tests for FileLogger tail reading and log following
+"""
+
+import asyncio
+import os
+from unittest.mock import MagicMock, patch
+
+from app.api.v1.routes import logs as logs_routes
+from app.core.file_logger import LogFollower, file_logger, tail_lines
+
+
+def _write_lines(path, count, start=0):
+    with open(path, 'a', encoding='utf-8') as f:
+        for i in range(start, start + count):
+            f.write(f"2025-01-01 00:00:00 | INFO     | app | fn:1 | line {i}\n")
+
+
+class TestTailLines:
+    """Test the backwards block reader."""
+
+    def test_returns_last_lines_oldest_first(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        _write_lines(log_file, 1000)
+
+        result = tail_lines(log_file, 3, block_size=64)
+
+        assert [line.rsplit(' ', 1)[-1].strip() for line in result] == ["997", "998", "999"]
+
+    def test_reads_only_tail_blocks(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        _write_lines(log_file, 10000)
+        real_open = open
+        reads = []
+
+        def tracking_open(*args, **kwargs):
+            handle = real_open(*args, **kwargs)
+            original_read = handle.read
+            handle.read = lambda size=-1: reads.append(size) or original_read(size)
+            return handle
+
+        with patch("builtins.open", side_effect=tracking_open):
+            tail_lines(log_file, 5, block_size=1024)
+
+        assert sum(reads) <= 1024
+        assert os.path.getsize(log_file) > 100 * 1024
+
+    def test_file_shorter_than_requested(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        _write_lines(log_file, 2)
+
+        assert len(tail_lines(log_file, 50)) == 2
+
+    def test_handles_missing_trailing_newline(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("a\nb\nc", encoding='utf-8')
+
+        assert tail_lines(log_file, 2, block_size=2) == ["b\n", "c"]
+
+    def test_end_offset_limits_read(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("a\nb\nc\n", encoding='utf-8')
+
+        assert tail_lines(log_file, 5, end_offset=4) == ["a\n", "b\n"]
+
+
+class TestReadLogFile:
+    """Test read_log_file on top of the tail reader."""
+
+    def test_reverse_returns_newest_first(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("a\nb\nc\n", encoding='utf-8')
+
+        assert file_logger.read_log_file(log_file, lines=2, reverse=True) == "c\nb\n"
+
+    def test_forward_returns_first_lines(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("a\nb\nc\n", encoding='utf-8')
+
+        assert file_logger.read_log_file(log_file, lines=2, reverse=False) == "a\nb\n"
+
+
+class TestLogFollower:
+    """Test polling of appended lines across rotations."""
+
+    def test_returns_only_new_complete_lines(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("old\n", encoding='utf-8')
+        follower = LogFollower(log_file)
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("new 1\nnew 2\npart")
+        assert follower.poll() == ["new 1\n", "new 2\n"]
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("ial\n")
+        assert follower.poll() == ["partial\n"]
+        assert follower.poll() == []
+
+    def test_follows_rotation_without_losing_lines(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("first\n", encoding='utf-8')
+        follower = LogFollower(log_file)
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("before rotation\n")
+        os.rename(log_file, tmp_path / "sato.log.1")
+        log_file.write_text("after rotation\n", encoding='utf-8')
+
+        assert follower.poll() == ["before rotation\n", "after rotation\n"]
+
+    def test_truncation_restarts_from_beginning(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("a long existing line\n", encoding='utf-8')
+        follower = LogFollower(log_file)
+
+        with open(log_file, 'w', encoding='utf-8') as f:
+            f.write("x\n")
+
+        assert follower.poll() == ["x\n"]
+
+    def test_missing_file_waits_for_creation(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        follower = LogFollower(log_file)
+        assert follower.poll() == []
+
+        log_file.write_text("created\n", encoding='utf-8')
+        assert follower.poll() == ["created\n"]
+
+
+class TestFollowStream:
+    """Test the SSE generator behind /logs/tail?follow=true."""
+
+    def test_streams_backlog_then_new_lines(self, tmp_path):
+        log_file = tmp_path / "sato.log"
+        log_file.write_text("a\nb\n", encoding='utf-8')
+        request = MagicMock()
+        disconnected = iter([False, True])
+
+        async def is_disconnected():
+            return next(disconnected)
+
+        request.is_disconnected = is_disconnected
+
+        async def collect():
+            events = []
+            async for event in logs_routes._follow_log_stream(request, lines=1, poll_interval=0):
+                events.append(event)
+                if len(events) == 1:
+                    with open(log_file, 'a', encoding='utf-8') as f:
+                        f.write("c\n")
+            return events
+
+        with patch.object(file_logger, "log_file", log_file):
+            events = asyncio.run(collect())
+
+        assert events == ['data: {"line": "b"}\n\n', 'data: {"line": "c"}\n\n']
@@ -0,0 +1,254 @@
+"""
+Unit tests for the durable job queue and its worker
+"""
+
+import asyncio
+
+import pytest
+
+from app.models.jobs import AnalyticsJob
+from app.services import job_queue as job_queue_module
+from app.services.job_queue import JobQueue
+from app.services.job_worker import JobWorker
+
+
+@pytest.fixture
+def queue(patch_get_session):
+    # Each queue call opens its own session on the test transaction's connection
+    return JobQueue(
+        session_factory=patch_get_session(),
+        lease_seconds=30,
+        max_attempts=3,
+        backoff_base_seconds=10,
+        backoff_max_seconds=60
+    )
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    registry = {}
+    monkeypatch.setattr(job_queue_module, "_handlers", registry)
+    return registry
+
+
+@pytest.fixture
+def failure_notifiers(monkeypatch):
+    registry = {}
+    monkeypatch.setattr(job_queue_module, "_failure_notifiers", registry)
+    return registry
+
+
+def _expire_lease(db_session, job_id):
+    db_session.exec(
+        AnalyticsJob.__table__.update()
+        .where(AnalyticsJob.__table__.c.id == job_id)
+        .values(lease_expires_at=job_queue_module._now().replace(year=2000))
+    )
+
+
+def _make_due(db_session, job_id):
+    db_session.exec(
+        AnalyticsJob.__table__.update()
+        .where(AnalyticsJob.__table__.c.id == job_id)
+        .values(run_after=job_queue_module._now().replace(year=2000))
+    )
+
+
+class TestLeasing:
+    """Jobs are handed to one worker at a time."""
+
+    def test_lease_claims_job_once(self, queue):
+        job_id = queue.enqueue("metrics_sync", {"customer_id": 5}, campaigner_id=None)
+
+        first = queue.lease("worker-a")
+        second = queue.lease("worker-b")
+
+        assert [job.id for job in first] == [job_id]
+        assert first[0].payload == {"customer_id": 5}
+        assert first[0].attempts == 1
+        assert second == []
+        assert queue.get(job_id)["status"] == "running"
+
+    def test_lease_filters_job_types_and_limit(self, queue):
+        queue.enqueue("metrics_sync")
+        queue.enqueue("metrics_sync")
+        analysis_id = queue.enqueue("dialogcx_analysis")
+
+        leased = queue.lease("worker-a", job_types=["dialogcx_analysis"], limit=5)
+
+        assert [job.id for job in leased] == [analysis_id]
+        assert len(queue.lease("worker-a", limit=1)) == 1
+
+    def test_delayed_job_is_not_due(self, queue):
+        queue.enqueue("metrics_sync", delay_seconds=3600)
+
+        assert queue.lease("worker-a") == []
+
+    def test_expired_lease_is_taken_over(self, queue, db_session):
+        job_id = queue.enqueue("metrics_sync")
+        queue.lease("worker-a")
+        _expire_lease(db_session, job_id)
+
+        leased = queue.lease("worker-b")
+
+        assert [job.id for job in leased] == [job_id]
+        assert leased[0].attempts == 2
+        # The old worker can no longer heartbeat or complete the job
+        assert queue.heartbeat(job_id, "worker-a") is False
+        assert queue.complete(job_id, "worker-a", {"done": True}) is False
+
+    def test_expired_lease_on_last_attempt_fails_job(self, queue, db_session):
+        job_id = queue.enqueue("metrics_sync", max_attempts=1)
+        queue.lease("worker-a")
+        _expire_lease(db_session, job_id)
+
+        assert queue.lease("worker-b") == []
+        job = queue.get(job_id)
+        assert job["status"] == "failed"
+        assert "Lease expired" in job["error"]
+
+    def test_expired_lease_on_last_attempt_is_reported(self, queue, db_session):
+        job_id = queue.enqueue("dialogcx_analysis", {"dialogcx_session_id": "s-1"}, max_attempts=1)
+        queue.lease("worker-a")
+        _expire_lease(db_session, job_id)
+        abandoned = []
+
+        queue.lease("worker-b", on_abandoned=lambda job, error: abandoned.append((job.id, job.payload, error)))
+
+        assert abandoned == [(job_id, {"dialogcx_session_id": "s-1"}, "Lease expired after 1 attempts")]
+
+
+class TestOutcomes:
+    """Results, retries and cancellation."""
+
+    def test_complete_stores_result(self, queue):
+        job_id = queue.enqueue("metrics_sync")
+        queue.lease("worker-a")
+
+        assert queue.heartbeat(job_id, "worker-a") is True
+        assert queue.complete(job_id, "worker-a", {"metrics_upserted": 12}) is True
+
+        job = queue.get(job_id)
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"metrics_upserted": 12}
+        assert job["finished_at"] is not None
+
+    def test_failure_retries_with_backoff_then_fails(self, queue, db_session):
+        job_id = queue.enqueue("metrics_sync", max_attempts=2)
+        queue.lease("worker-a")
+
+        assert queue.fail(job_id, "worker-a", "API timeout") == "queued"
+        job = queue.get(job_id)
+        assert job["error"] == "API timeout"
+        assert queue.lease("worker-a") == []  # Backing off
+
+        _make_due(db_session, job_id)
+        assert queue.lease("worker-a")[0].attempts == 2
+        assert queue.fail(job_id, "worker-a", "API timeout again") == "failed"
+        assert queue.get(job_id)["status"] == "failed"
+
+    def test_backoff_grows_and_is_capped(self, queue):
+        delays = [queue.backoff_seconds(attempt) for attempt in (1, 2, 3, 10)]
+
+        assert 5 <= delays[0] <= 10
+        assert 10 <= delays[1] <= 20
+        assert 20 <= delays[2] <= 40
+        assert 30 <= delays[3] <= 60
+
+    def test_cancel_queued_and_running_jobs(self, queue):
+        queued_id = queue.enqueue("metrics_sync", delay_seconds=3600)
+        running_id = queue.enqueue("metrics_sync")
+        queue.lease("worker-a")
+
+        assert queue.cancel(queued_id) is True
+        assert queue.get(queued_id)["status"] == "cancelled"
+
+        assert queue.cancel(running_id) is True
+        assert queue.get(running_id)["status"] == "running"
+        assert queue.heartbeat(running_id, "worker-a") is False
+        assert queue.cancel(queued_id) is False
+
+    def test_stats_count_jobs_by_status(self, queue):
+        queue.enqueue("metrics_sync")
+        queue.enqueue("metrics_sync")
+        queue.lease("worker-a")
+
+        counts = queue.get_stats()["jobs_by_status"]
+        assert counts["queued"] == 1
+        assert counts["running"] == 1
+
+
+class TestJobWorker:
+    """The worker runs registered handlers and records their outcome."""
+
+    async def test_runs_sync_and_async_handlers(self, queue, handlers):
+        handlers["sync_job"] = lambda payload: {"double": payload["value"] * 2}
+
+        async def async_job(payload):
+            await asyncio.sleep(0)
+            return {"echo": payload["value"]}
+
+        handlers["async_job"] = async_job
+        sync_id = queue.enqueue("sync_job", {"value": 2})
+        async_id = queue.enqueue("async_job", {"value": "hi"})
+
+        worker = JobWorker(queue=queue, worker_id="worker-a", concurrency=2)
+        assert await worker.run_once() == 2
+
+        assert queue.get(sync_id)["result"] == {"double": 4}
+        assert queue.get(async_id)["result"] == {"echo": "hi"}
+
+    async def test_handler_error_schedules_retry(self, queue, handlers):
+        def broken(payload):
+            raise RuntimeError("provider down")
+
+        handlers["broken"] = broken
+        job_id = queue.enqueue("broken")
+
+        await JobWorker(queue=queue, worker_id="worker-a").run_once()
+
+        job = queue.get(job_id)
+        assert job["status"] == "queued"
+        assert job["error"] == "provider down"
+
+    async def test_unknown_job_type_fails_without_retry(self, queue, handlers):
+        job_id = queue.enqueue("unknown")
+
+        await JobWorker(queue=queue, worker_id="worker-a").run_once()
+
+        assert queue.get(job_id)["status"] == "failed"
+
+    async def test_cancel_request_stops_running_handler(self, queue, handlers):
+        started = asyncio.Event()
+
+        async def slow(payload):
+            started.set()
+            await asyncio.sleep(10)
+
+        handlers["slow"] = slow
+        job_id = queue.enqueue("slow")
+        queue.lease_seconds = 0.15  # heartbeat every 0.05s
+        worker = JobWorker(queue=queue, worker_id="worker-a")
+
+        run = asyncio.create_task(worker.run_once())
+        await asyncio.wait_for(started.wait(), 1)
+        queue.cancel(job_id)
+        await asyncio.wait_for(run, 2)
+
+        assert queue.get(job_id)["status"] == "cancelled"
+
+    async def test_worker_notifies_when_last_lease_expired(self, queue, handlers, failure_notifiers, db_session):
+        notified = []
+
+        async def notify(payload, error):
+            notified.append((payload["dialogcx_session_id"], error))
+
+        failure_notifiers["dialogcx_analysis"] = notify
+        job_id = queue.enqueue("dialogcx_analysis", {"dialogcx_session_id": "s-1"}, max_attempts=1)
+        queue.lease("worker-a")  # worker-a dies while running it
+        _expire_lease(db_session, job_id)
+
+        assert await JobWorker(queue=queue, worker_id="worker-b").run_once() == 0
+
+        assert notified == [("s-1", "Lease expired after 1 attempts")]
+        assert queue.get(job_id)["status"] == "failed"
@@ -0,0 +1,24 @@
+"""
+Unit tests for LangfuseConfig background flushing
+"""
+
+from unittest.mock import MagicMock, patch
+
+from app.config.langfuse_config import LangfuseConfig
+
+
+class TestLangfuseConfigFlushing:
+    """Test LangfuseConfig request_flush/shutdown wiring."""
+
+    def test_request_flush_noop_when_disabled(self):
+        with patch.object(LangfuseConfig, "_instance", None), \
+                patch.object(LangfuseConfig, "_flusher", None):
+            LangfuseConfig.request_flush()
+            assert LangfuseConfig._flusher is None
+
+    def test_shutdown_stops_flusher(self):
+        flusher = MagicMock()
+        with patch.object(LangfuseConfig, "_flusher", flusher):
+            LangfuseConfig.shutdown()
+            flusher.stop.assert_called_once()
+            assert LangfuseConfig._flusher is None
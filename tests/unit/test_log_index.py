@@ -0,0 +1,207 @@
+"""
+Unit tests for FileLogger sidecar log indexes
+"""
+
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.core.file_logger import FileLogger
+from app.core.log_index import LogIndex, LogIndexStore, parse_line_prefix
+
+
+def _line(timestamp, level, message):
+    return f"{timestamp} | {level:<8} | app | fn:1 | {message}\n"
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    return tmp_path
+
+
+@pytest.fixture
+def logger(log_dir):
+    """A FileLogger bound to a temporary directory, without touching the root logger."""
+    instance = object.__new__(FileLogger)
+    instance.log_dir = log_dir
+    instance.log_file = log_dir / "sato.log"
+    instance.index_store = LogIndexStore(log_dir)
+    return instance
+
+
+class TestParseLinePrefix:
+    """Test extraction of minute bucket and level."""
+
+    def test_formatted_line(self):
+        line = _line("2025-01-01 10:15:42", "WARNING", "slow query").encode()
+        assert parse_line_prefix(line) == ("2025-01-01 10:15", "WARNING")
+
+    def test_continuation_line(self):
+        assert parse_line_prefix(b'  File "app.py", line 1, in <module>\n') == (None, None)
+
+
+class TestLogIndex:
+    """Test building and querying a single file index."""
+
+    def test_counts_and_postings(self, log_dir):
+        log_file = log_dir / "sato.log"
+        log_file.write_text(
+            _line("2025-01-01 10:00:00", "INFO", "a")
+            + _line("2025-01-01 10:00:30", "ERROR", "b")
+            + "Traceback (most recent call last):\n"
+            + _line("2025-01-01 10:01:00", "INFO", "c"),
+            encoding='utf-8'
+        )
+
+        index = LogIndex(log_file.stat().st_ino)
+        index.extend(log_file)
+
+        assert index.line_count == 4
+        assert index.level_counts() == {"INFO": 2, "ERROR": 1}
+        assert index.minute_keys == ["2025-01-01 10:00", "2025-01-01 10:01"]
+
+    def test_extend_only_scans_appended_complete_lines(self, log_dir):
+        log_file = log_dir / "sato.log"
+        log_file.write_text(_line("2025-01-01 10:00:00", "INFO", "a") + "2025-01-01 10:0", encoding='utf-8')
+        index = LogIndex(log_file.stat().st_ino)
+
+        index.extend(log_file)
+        assert index.line_count == 1
+
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("1:00 | INFO     | app | fn:1 | b\n")
+        assert index.extend(log_file) is True
+        assert index.line_count == 2
+        assert index.extend(log_file) is False
+
+    def test_byte_range_bisects_minute_buckets(self, log_dir):
+        log_file = log_dir / "sato.log"
+        lines = [_line(f"2025-01-01 10:{minute:02d}:00", "INFO", str(minute)) for minute in range(60)]
+        log_file.write_text("".join(lines), encoding='utf-8')
+        index = LogIndex(log_file.stat().st_ino)
+        index.extend(log_file)
+
+        start, end = index.byte_range("2025-01-01 10:10", "2025-01-01 10:11")
+
+        with open(log_file, 'rb') as f:
+            f.seek(start)
+            assert f.read(end - start).decode() == lines[10] + lines[11]
+        assert index.byte_range("2025-01-02 00:00", "2025-01-02 01:00") is None
+
+
+class TestLogIndexStore:
+    """Test persistence and invalidation."""
+
+    def test_persists_and_survives_rename(self, log_dir):
+        log_file = log_dir / "sato.log"
+        log_file.write_text(_line("2025-01-01 10:00:00", "INFO", "a"), encoding='utf-8')
+        LogIndexStore(log_dir).get(log_file)
+
+        rotated = log_dir / "sato.log.1"
+        os.rename(log_file, rotated)
+        store = LogIndexStore(log_dir)
+        with patch.object(LogIndex, "extend", side_effect=AssertionError("should not rescan")):
+            index = store.get(rotated)
+
+        assert index.line_count == 1
+
+    def test_replaced_file_is_reindexed(self, log_dir):
+        log_file = log_dir / "sato.log"
+        log_file.write_text(_line("2025-01-01 10:00:00", "INFO", "a") * 3, encoding='utf-8')
+        store = LogIndexStore(log_dir)
+        store.get(log_file)
+
+        with open(log_file, 'w', encoding='utf-8') as f:
+            f.write(_line("2025-02-01 10:00:00", "ERROR", "x"))
+
+        index = store.get(log_file)
+        assert index.line_count == 1
+        assert index.level_counts() == {"ERROR": 1}
+
+    def test_prune_removes_indexes_for_deleted_files(self, log_dir):
+        log_file = log_dir / "sato.log.1"
+        log_file.write_text(_line("2025-01-01 10:00:00", "INFO", "a"), encoding='utf-8')
+        store = LogIndexStore(log_dir)
+        store.get(log_file)
+        log_file.unlink()
+
+        assert store.prune([]) == 1
+        assert list(store.index_dir.glob("*.json")) == []
+
+
+class TestFileLoggerIndexedQueries:
+    """Test FileLogger queries that go through the index."""
+
+    def _write_rotated_logs(self, log_dir):
+        (log_dir / "sato.log.1").write_text(
+            _line("2025-01-01 09:00:00", "INFO", "old info")
+            + _line("2025-01-01 09:30:00", "ERROR", "old error"),
+            encoding='utf-8'
+        )
+        (log_dir / "sato.log").write_text(
+            _line("2025-01-01 10:00:00", "INFO", "new info")
+            + _line("2025-01-01 10:05:00", "ERROR", "new error"),
+            encoding='utf-8'
+        )
+        os.utime(log_dir / "sato.log.1", (1, 1))
+
+    def test_logs_by_level_uses_postings(self, logger, log_dir):
+        self._write_rotated_logs(log_dir)
+        with open(log_dir / "sato.log", 'a', encoding='utf-8') as f:
+            f.write(_line("2025-01-01 10:06:00", "INFO", "mentions | ERROR inline"))
+
+        result = logger.get_logs_by_level("error")
+
+        assert result.splitlines() == [
+            _line("2025-01-01 10:05:00", "ERROR", "new error").rstrip(),
+            _line("2025-01-01 09:30:00", "ERROR", "old error").rstrip(),
+        ]
+
+    def test_logs_by_timerange(self, logger, log_dir):
+        self._write_rotated_logs(log_dir)
+
+        result = logger.get_logs_by_timerange(
+            start_time=datetime(2025, 1, 1, 9, 15),
+            end_time=datetime(2025, 1, 1, 10, 2)
+        )
+
+        assert "old error" in result
+        assert "new info" in result
+        assert "old info" not in result
+        assert "new error" not in result
+
+    def test_logs_by_timerange_stops_at_max_results(self, logger, log_dir):
+        with open(log_dir / "sato.log", 'w', encoding='utf-8') as f:
+            for i in range(1000):
+                f.write(_line("2025-01-01 10:00:00", "INFO", f"line {i}"))
+        real_open = open
+        read_lines = []
+
+        def tracking_open(*args, **kwargs):
+            handle = real_open(*args, **kwargs)
+            original_readline = handle.readline
+            handle.readline = lambda *a: read_lines.append(1) or original_readline(*a)
+            return handle
+
+        logger.get_log_index(log_dir / "sato.log")
+        with patch("builtins.open", side_effect=tracking_open):
+            result = logger.get_logs_by_timerange(
+                start_time=datetime(2025, 1, 1, 9, 0),
+                end_time=datetime(2025, 1, 1, 11, 0),
+                max_results=3
+            )
+
+        assert [line.rsplit(' ', 1)[-1] for line in result.splitlines()] == ["0", "1", "2"]
+        assert len(read_lines) == 3
+
+    def test_log_stats_reads_counts_from_index(self, logger, log_dir):
+        self._write_rotated_logs(log_dir)
+
+        stats = logger.get_log_stats()
+
+        assert [file_info["lines"] for file_info in stats["files"]] == [2, 2]
+        assert stats["files"][0]["level_counts"] == {"INFO": 1, "ERROR": 1}
+        # Rotated files are persisted; the active file's index stays in memory
+        assert len(list(logger.index_store.index_dir.glob("*.json"))) == 1
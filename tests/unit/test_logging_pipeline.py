@@ -0,0 +1,136 @@
+"""
+Unit tests for the queue-based logging pipeline
+"""
+
+import json
+import logging
+import queue
+import threading
+from unittest.mock import patch
+
+from app.config import logging as logging_config
+from app.config.logging import DroppingQueueHandler, JsonFormatter, LoggingPipeline, add_log_handler
+
+
+class RecordingHandler(logging.Handler):
+    """Collects formatted records and the thread that handled them."""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread().name)
+
+
+def _make_logger(name, handler):
+    test_logger = logging.getLogger(name)
+    test_logger.handlers = [handler]
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    return test_logger
+
+
+class TestDroppingQueueHandler:
+    """Test overflow behaviour and record preparation."""
+
+    def test_drops_and_counts_when_full(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        test_logger = _make_logger("tests.pipeline.drop", handler)
+
+        test_logger.info("kept")
+        test_logger.info("dropped")
+        test_logger.error("dropped too")
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == {"INFO": 1, "ERROR": 1}
+
+    def test_prepare_resolves_args_and_traceback(self):
+        handler = DroppingQueueHandler(queue.Queue())
+        test_logger = _make_logger("tests.pipeline.prepare", handler)
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            test_logger.exception("failed for %s", "customer-1")
+
+        record = handler.queue.get_nowait()
+        assert record.msg == "failed for customer-1"
+        assert record.args is None
+        assert record.exc_info is None
+        assert "ValueError: boom" in record.exc_text
+
+
+class TestLoggingPipeline:
+    """Test the listener thread end to end."""
+
+    def test_output_handlers_run_on_listener_thread(self):
+        pipeline = LoggingPipeline(queue_size=100)
+        output = RecordingHandler()
+        output.setFormatter(logging.Formatter("%(levelname)s %(funcName)s %(message)s"))
+        pipeline.add_handler(output)
+        pipeline.add_handler(output)  # Idempotent
+        test_logger = _make_logger("tests.pipeline.listener", pipeline.handler)
+
+        pipeline.start()
+        test_logger.warning("hello %s", "world")
+        pipeline.stop()
+
+        assert output.lines == ["WARNING test_output_handlers_run_on_listener_thread hello world"]
+        assert output.threads[0] != threading.current_thread().name
+
+    def test_respects_handler_level(self):
+        pipeline = LoggingPipeline(queue_size=100)
+        output = RecordingHandler()
+        output.setLevel(logging.ERROR)
+        pipeline.add_handler(output)
+        test_logger = _make_logger("tests.pipeline.level", pipeline.handler)
+
+        pipeline.start()
+        test_logger.info("skip")
+        test_logger.error("keep")
+        pipeline.stop()
+
+        assert output.lines == ["keep"]
+
+    def test_stats_report_drops(self):
+        pipeline = LoggingPipeline(queue_size=1)
+        test_logger = _make_logger("tests.pipeline.stats", pipeline.handler)
+
+        test_logger.info("one")
+        test_logger.info("two")
+
+        stats = pipeline.stats()
+        assert stats["queue_capacity"] == 1
+        assert stats["dropped_total"] == 1
+
+
+class TestJsonFormatter:
+    """Test structured output."""
+
+    def test_formats_single_json_object(self):
+        record = logging.LogRecord("app.services", logging.ERROR, "x.py", 10, "bad %s", ("input",), None, func="run")
+
+        payload = json.loads(JsonFormatter().format(record))
+
+        assert payload["severity"] == "ERROR"
+        assert payload["logger"] == "app.services"
+        assert payload["message"] == "bad input"
+        assert payload["function"] == "run"
+        assert "exception" not in payload
+
+
+class TestAddLogHandler:
+    """Test routing of output handlers."""
+
+    def test_sync_mode_attaches_to_root(self):
+        handler = RecordingHandler()
+        root_logger = logging.getLogger()
+        with patch.object(logging_config.settings, "log_async", False):
+            add_log_handler(handler)
+        try:
+            assert handler in root_logger.handlers
+        finally:
+            root_logger.removeHandler(handler)
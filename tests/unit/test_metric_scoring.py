@@ -0,0 +1,91 @@
+"""
+Unit tests for vectorized metric scoring
+"""
+
+import random
+
+import numpy as np
+
+from app.utils.metric_scoring import calculate_metric_score, round2, score_aggregated_rows
+
+WEIGHTS = {"cpa": 0.25, "cvr": 0.20, "ctr": 0.15, "cpc": 0.15, "cpm": 0.10, "cpl": 0.15}
+
+
+def scalar_row(clicks, impressions, leads, spent, conversions, conv_val, reach_min, reach_max, weights, normalizer):
+    """Per-row calculation as previously done inline in get_aggregated_metrics"""
+    cpa = round(spent / conversions, 2) if conversions and conversions > 0 else None
+    cvr = round((conversions / clicks) * 100, 2) if clicks and clicks > 0 else None
+    ctr = round((clicks / impressions) * 100, 2) if impressions and impressions > 0 else None
+    cpc = round(spent / clicks, 2) if clicks and clicks > 0 else None
+    cpm = round((spent / impressions) * 1000, 2) if impressions and impressions > 0 else None
+    cpl = round(spent / leads, 2) if leads and leads > 0 else None
+    return {
+        "cpa": cpa, "cvr": cvr, "ctr": ctr, "cpc": cpc, "cpm": cpm, "cpl": cpl,
+        "frequency_min": round(impressions / reach_max, 2) if reach_max and reach_max > 0 else None,
+        "frequency_max": round(impressions / reach_min, 2) if reach_min and reach_min > 0 else None,
+        "score": calculate_metric_score(
+            {"cpa": cpa, "cvr": cvr, "ctr": ctr, "cpc": cpc, "cpm": cpm, "cpl": cpl}, weights, normalizer
+        ),
+    }
+
+
+def random_rows(count, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        impressions = rng.choice([0, rng.randint(1, 10), rng.randint(1, 1_000_000)])
+        clicks = rng.randint(0, max(impressions, 1))
+        reach_min = rng.choice([None, 0, rng.randint(1, 50_000)])
+        rows.append((
+            f"ad-{i}",
+            clicks,
+            impressions,
+            rng.choice([0, rng.randint(1, 500)]),
+            # Mix of arbitrary floats and cent amounts that produce .xx5 ties
+            rng.choice([0, rng.uniform(0, 50_000), rng.randint(0, 10_000_000) / 1000]),
+            rng.choice([0, rng.randint(1, 2000)]),
+            rng.uniform(0, 1000),
+            reach_min,
+            (reach_min or 0) * rng.randint(1, 5),
+        ))
+    return rows
+
+
+class TestRound2:
+    """Test rounding parity with Python's round()."""
+
+    def test_matches_python_round_on_ties(self):
+        values = np.array([i / 1000 for i in range(200_000)] + [2.675, 1.005, 0.125, 1e9 + 0.005])
+
+        assert round2(values).tolist() == [round(v, 2) for v in values.tolist()]
+
+
+class TestScoreAggregatedRows:
+    """Test equivalence with the scalar per-row calculation."""
+
+    def test_matches_scalar_results(self):
+        rows = random_rows(20_000)
+
+        vectorized = score_aggregated_rows(rows, 1, WEIGHTS, 1.0)
+
+        for i, row in enumerate(rows):
+            expected = scalar_row(*row[1:], WEIGHTS, 1.0)
+            assert {name: vectorized[name][i] for name in expected} == expected, row
+
+    def test_uses_custom_weights_and_normalizer(self):
+        rows = random_rows(2_000, seed=11)
+        weights = {"cpa": 0.0, "cvr": 0.5, "ctr": 0.3, "cpc": 0.1, "cpm": 0.05, "cpl": 0.05}
+
+        vectorized = score_aggregated_rows(rows, 1, weights, 1.7)
+
+        assert vectorized["score"] == [scalar_row(*row[1:], weights, 1.7)["score"] for row in rows]
+
+    def test_rows_without_data_score_none(self):
+        result = score_aggregated_rows([(0, 0, 0, 0, 0, 0, None, 0)], 0, WEIGHTS, 1.0)
+
+        assert result["score"] == [None]
+        assert result["cpa"] == [None]
+        assert result["frequency_max"] == [None]
+
+    def test_empty_input(self):
+        assert score_aggregated_rows([], 0, WEIGHTS, 1.0)["score"] == []
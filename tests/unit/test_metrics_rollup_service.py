@@ -0,0 +1,61 @@
+"""
+Unit tests for metrics rollup period helpers and query planning
+"""
+
+from datetime import date, timedelta
+
+from app.services.metrics_rollup_service import period_end, period_start, plan_rollup_segments
+
+
+def _covered_days(segments):
+    days = []
+    for grain, first, last in segments:
+        start = first
+        while start <= last:
+            end = period_end(grain, start)
+            days.extend(start + timedelta(days=i) for i in range((end - start).days + 1))
+            start = end + timedelta(days=1)
+    return days
+
+
+class TestPeriods:
+    """Test period boundaries."""
+
+    def test_iso_week_starts_on_monday(self):
+        assert period_start("week", date(2025, 1, 1)) == date(2024, 12, 30)
+        assert period_end("week", date(2024, 12, 30)) == date(2025, 1, 5)
+
+    def test_month_bounds(self):
+        assert period_start("month", date(2024, 2, 17)) == date(2024, 2, 1)
+        assert period_end("month", date(2024, 2, 1)) == date(2024, 2, 29)
+        assert period_end("month", date(2025, 12, 1)) == date(2025, 12, 31)
+
+
+class TestPlanRollupSegments:
+    """Test covering a date range with the coarsest rollups."""
+
+    def test_short_range_uses_days(self):
+        assert plan_rollup_segments(date(2025, 1, 1), date(2025, 1, 3)) == [
+            ("day", date(2025, 1, 1), date(2025, 1, 3)),
+        ]
+
+    def test_mixed_range(self):
+        segments = plan_rollup_segments(date(2025, 1, 3), date(2025, 3, 5))
+
+        assert segments == [
+            ("day", date(2025, 1, 3), date(2025, 1, 5)),
+            ("week", date(2025, 1, 6), date(2025, 1, 20)),
+            ("day", date(2025, 1, 27), date(2025, 1, 31)),
+            ("month", date(2025, 2, 1), date(2025, 2, 1)),
+            ("day", date(2025, 3, 1), date(2025, 3, 5)),
+        ]
+
+    def test_covers_every_day_exactly_once(self):
+        for start, end in [
+            (date(2025, 1, 3), date(2025, 3, 5)),
+            (date(2024, 12, 30), date(2025, 12, 31)),
+            (date(2025, 2, 1), date(2025, 2, 1)),
+        ]:
+            days = _covered_days(plan_rollup_segments(start, end))
+            expected = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+            assert days == expected
@@ -0,0 +1,271 @@
+"""
+Unit tests for the single-flight connection refresh lock
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.oauth.refresh_lock import ConnectionRefreshLock
+from app.models.analytics import AssetType, AuthType, Connection, DigitalAsset
+from app.utils.security_utils import get_token_crypto
+
+
+class _FakeAdvisoryServer:
+    """Session-level advisory locks shared by several fake worker processes."""
+
+    def __init__(self):
+        self.held = {}
+        self.guard = threading.Lock()
+        self.unlock_error = False
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class _FakeDBConnection:
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+        self.invalidated = False
+
+    def execute(self, statement, params):
+        key = (params["namespace"], params["connection_id"])
+        with self.server.guard:
+            if "pg_try_advisory_lock" in str(statement):
+                if self.server.held.get(key) not in (None, self):
+                    return _FakeResult(False)
+                self.server.held[key] = self
+                return _FakeResult(True)
+            if self.server.unlock_error:
+                raise RuntimeError("connection lost")
+            self.server.held.pop(key, None)
+            return _FakeResult(True)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def invalidate(self):
+        self.invalidated = True
+        with self.server.guard:
+            for key, owner in list(self.server.held.items()):
+                if owner is self:
+                    del self.server.held[key]
+
+
+def _postgres_engine(server, connections):
+    def connect():
+        connection = _FakeDBConnection(server)
+        connections.append(connection)
+        return connection
+
+    return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), connect=connect)
+
+
+def _sqlite_engine():
+    return SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+
+
+class _TokenStore:
+    """Stands in for the connection row: refreshed once, then fresh for everyone."""
+
+    def __init__(self):
+        self.expired = True
+        self.refreshes = 0
+
+    async def get_token(self, lock, connection_id=1):
+        async with lock.hold(connection_id):
+            if self.expired:
+                await asyncio.sleep(0.05)
+                self.refreshes += 1
+                self.expired = False
+            return f"token-{self.refreshes}"
+
+
+class TestInProcessFallback:
+    """Non-Postgres databases serialize refreshes within the process."""
+
+    async def test_concurrent_callers_refresh_once(self):
+        lock = ConnectionRefreshLock(engine_factory=_sqlite_engine, wait_seconds=1)
+        store = _TokenStore()
+
+        tokens = await asyncio.gather(*(store.get_token(lock) for _ in range(5)))
+
+        assert store.refreshes == 1
+        assert tokens == ["token-1"] * 5
+        assert lock.get_stats()["contended"] == 4
+
+    async def test_different_connections_do_not_wait_on_each_other(self):
+        lock = ConnectionRefreshLock(engine_factory=_sqlite_engine, wait_seconds=1)
+        release = asyncio.Event()
+
+        async def hold_first():
+            async with lock.hold(1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold_first())
+        await asyncio.sleep(0)
+        async with lock.hold(2) as acquired:
+            assert acquired is True
+        release.set()
+        await holder
+
+    async def test_wait_timeout_yields_false(self):
+        lock = ConnectionRefreshLock(engine_factory=_sqlite_engine, wait_seconds=0.05)
+        release = asyncio.Event()
+
+        async def hold_first():
+            async with lock.hold(1):
+                await release.wait()
+
+        holder = asyncio.create_task(hold_first())
+        await asyncio.sleep(0)
+        async with lock.hold(1) as acquired:
+            assert acquired is False
+        release.set()
+        await holder
+        assert lock.get_stats()["timeouts"] == 1
+
+    async def test_reentrant_within_holding_task(self):
+        lock = ConnectionRefreshLock(engine_factory=_sqlite_engine, wait_seconds=0.05)
+
+        async with lock.hold(1):
+            async with lock.hold(1) as acquired:
+                assert acquired is True
+
+        assert lock.get_stats()["timeouts"] == 0
+
+    async def test_missing_database_url_falls_back(self):
+        def no_engine():
+            raise ValueError("DATABASE_URL is not configured")
+
+        lock = ConnectionRefreshLock(engine_factory=no_engine, wait_seconds=1)
+
+        async with lock.hold(1) as acquired:
+            assert acquired is True
+
+
+class TestAdvisoryLock:
+    """On Postgres, workers in different processes share the advisory lock."""
+
+    async def test_workers_refresh_once_across_processes(self):
+        server = _FakeAdvisoryServer()
+        connections = []
+        workers = [
+            ConnectionRefreshLock(engine_factory=lambda: _postgres_engine(server, connections),
+                                  wait_seconds=1, poll_seconds=0.01)
+            for _ in range(3)
+        ]
+        store = _TokenStore()
+
+        tokens = await asyncio.gather(*(store.get_token(worker) for worker in workers))
+
+        assert store.refreshes == 1
+        assert tokens == ["token-1"] * 3
+        assert server.held == {}
+        assert all(connection.closed for connection in connections)
+        assert sum(worker.get_stats()["contended"] for worker in workers) >= 1
+
+    async def test_advisory_wait_timeout_yields_false(self):
+        server = _FakeAdvisoryServer()
+        connections = []
+        other_worker = _FakeDBConnection(server)
+        other_worker.execute("SELECT pg_try_advisory_lock(:namespace, :connection_id)",
+                             {"namespace": 7301, "connection_id": 1})
+        lock = ConnectionRefreshLock(engine_factory=lambda: _postgres_engine(server, connections),
+                                     wait_seconds=0.05, poll_seconds=0.01)
+
+        async with lock.hold(1) as acquired:
+            assert acquired is False
+
+        assert lock.get_stats()["timeouts"] == 1
+        assert connections[0].closed
+
+    async def test_failed_unlock_invalidates_connection(self):
+        server = _FakeAdvisoryServer()
+        connections = []
+        lock = ConnectionRefreshLock(engine_factory=lambda: _postgres_engine(server, connections),
+                                     wait_seconds=1)
+
+        async with lock.hold(1) as acquired:
+            assert acquired is True
+            server.unlock_error = True
+
+        assert connections[0].invalidated
+        assert server.held == {}
+
+
+class TestServiceRefreshMethods:
+    """refresh_ga_token / refresh_google_ads_token take the lock themselves."""
+
+    @pytest.fixture(params=["ga4", "google_ads"])
+    def platform(self, request, db_session, patch_get_session, monkeypatch):
+        # Imported here: the service modules resolve their import cycle via app.main
+        from app.services import google_ads_service, google_analytics_service
+
+        if request.param == "ga4":
+            module, service, refresh = google_analytics_service, google_analytics_service.GoogleAnalyticsService(), "refresh_ga_token"
+            asset_type = AssetType.GA4
+        else:
+            module, service, refresh = google_ads_service, google_ads_service.GoogleAdsService(), "refresh_google_ads_token"
+            asset_type = AssetType.GOOGLE_ADS
+
+        crypto = get_token_crypto()
+        asset = DigitalAsset(customer_id=7, asset_type=asset_type, provider="Google",
+                             name="asset", external_id=f"ext-{request.param}", meta={})
+        db_session.add(asset)
+        db_session.commit()
+        connection = Connection(
+            digital_asset_id=asset.id, customer_id=7, campaigner_id=3, auth_type=AuthType.OAUTH2,
+            access_token_enc=crypto.encrypt_token("old-access"),
+            refresh_token_enc=crypto.encrypt_token("1//refresh"),
+            token_hash=crypto.generate_token_hash("old-access"),
+            expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+        )
+        db_session.add(connection)
+        db_session.commit()
+
+        lock = ConnectionRefreshLock(engine_factory=_sqlite_engine, wait_seconds=1)
+        credentials = MagicMock(token="new-access", refresh_token="1//refresh")
+        patch_get_session((module, "get_session"))
+        monkeypatch.setattr(module, "connection_refresh_lock", lock)
+        monkeypatch.setattr(module, "Credentials", MagicMock(return_value=credentials))
+        return SimpleNamespace(refresh=getattr(service, refresh), connection=connection,
+                               lock=lock, credentials=credentials)
+
+    async def test_refreshes_when_not_rotated(self, platform, db_session):
+        await platform.refresh(platform.connection.id)
+
+        platform.credentials.refresh.assert_called_once()
+        db_session.refresh(platform.connection)
+        assert get_token_crypto().decrypt_token(platform.connection.access_token_enc) == "new-access"
+
+    async def test_waiter_reuses_token_rotated_while_it_waited(self, platform, db_session):
+        async with platform.lock.hold(platform.connection.id):
+            waiter = asyncio.create_task(platform.refresh(platform.connection.id))
+            await asyncio.sleep(0.05)
+
+            # Another worker rotates the token while the waiter is queued
+            connection = platform.connection
+            connection.access_token_enc = get_token_crypto().encrypt_token("rotated-access")
+            connection.expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            connection.rotated_at = datetime.now(timezone.utc)
+            db_session.add(connection)
+            db_session.commit()
+
+        result = await waiter
+
+        platform.credentials.refresh.assert_not_called()
+        assert result["rotated_at"] == connection.rotated_at.isoformat()
@@ -0,0 +1,114 @@
+"""
+Unit tests for the cached settings layer in settings_loader
+"""
+
+from sqlalchemy import event
+
+from app.config.settings_loader import SettingsCache, get_setting_value, settings_cache
+from app.models.settings import AppSettings
+
+
+def _count_selects(db_session):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, "before_cursor_execute", before_execute)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before_execute)
+
+
+def _add_setting(db_session, key, value, value_type="string"):
+    setting = AppSettings(key=key, value=value, value_type=value_type)
+    db_session.add(setting)
+    db_session.commit()
+    return setting
+
+
+class TestSettingsCacheReads:
+    """Test typed lookups and fallbacks."""
+
+    def test_converts_database_values(self, db_session):
+        _add_setting(db_session, "use_database_config", "true", "bool")
+        _add_setting(db_session, "master_agent_max_iterations", "7", "int")
+        cache = SettingsCache(poll_seconds=60)
+
+        assert cache.get("use_database_config", session=db_session) is True
+        assert cache.get("master_agent_max_iterations", session=db_session) == 7
+
+    def test_falls_back_to_environment_then_default(self, db_session):
+        cache = SettingsCache(poll_seconds=60)
+
+        assert cache.get("metrics_export_batch_size", session=db_session) == 10000
+        assert cache.get("not_a_setting", "fallback", session=db_session) == "fallback"
+
+    def test_reads_within_poll_interval_run_no_queries(self, db_session):
+        _add_setting(db_session, "metric_weight_cpa", "0.3", "float")
+        cache = SettingsCache(poll_seconds=60)
+        cache.get("metric_weight_cpa", session=db_session)
+
+        statements, stop = _count_selects(db_session)
+        try:
+            for _ in range(5):
+                assert cache.get("metric_weight_cpa", session=db_session) == 0.3
+        finally:
+            stop()
+
+        assert statements == []
+        assert cache.get_stats()["hits"] == 5
+
+
+class TestSettingsCacheRefresh:
+    """Test version polling and commit invalidation."""
+
+    def test_unchanged_version_skips_reload(self, db_session):
+        _add_setting(db_session, "metric_weight_cpa", "0.3", "float")
+        cache = SettingsCache(poll_seconds=0)
+        cache.snapshot(db_session)
+
+        statements, stop = _count_selects(db_session)
+        try:
+            cache.snapshot(db_session)
+        finally:
+            stop()
+
+        assert len(statements) == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_version_poll_sees_out_of_band_change(self, db_session):
+        cache = SettingsCache(poll_seconds=0)
+        assert cache.get("metric_weight_cpa", 0.25, session=db_session) == 0.25
+
+        # Another worker's commit: this cache is not invalidated locally
+        db_session.add(AppSettings(key="metric_weight_cpa", value="0.4", value_type="float"))
+        db_session.flush()
+
+        assert cache.get("metric_weight_cpa", session=db_session) == 0.4
+
+    def test_commit_invalidates_shared_cache(self, db_session):
+        setting = _add_setting(db_session, "use_database_config", "false", "bool")
+        settings_cache.poll_seconds = 60
+        try:
+            assert get_setting_value(db_session, "use_database_config") is False
+
+            setting.value = "true"
+            db_session.add(setting)
+            db_session.commit()
+
+            assert get_setting_value(db_session, "use_database_config") is True
+            assert settings_cache.get_stats()["invalidations"] >= 1
+        finally:
+            settings_cache.poll_seconds = None
+
+    def test_update_bumps_updated_at(self, db_session):
+        setting = _add_setting(db_session, "metric_score_normalizer", "1", "float")
+        before = setting.updated_at
+
+        setting.value = "2"
+        db_session.add(setting)
+        db_session.commit()
+        db_session.refresh(setting)
+
+        assert setting.updated_at != before
@@ -4,7 +4,7 @@ Unit tests for OAuth token refresh functionality
 
 import pytest
 from datetime import datetime, timedelta, timezone
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from app.core.oauth.token_refresh import (
     is_token_expired,
     refresh_google_token,
@@ -162,3 +162,29 @@ class TestFacebookTokenRefresh:
         assert exc_info.value.provider == 'facebook'
         assert exc_info.value.error == 'OAuthException'
         assert 'Invalid OAuth access token' in exc_info.value.error_description
+
+
+class TestRequestPathRefresh:
+    """The per-analysis token helpers only refresh expiring tokens."""
+
+    async def test_only_outdated_connections_are_refreshed(self):
+        # Imported here: token_utils pulls in the service modules
+        from app.utils.token_utils import refresh_user_ga4_tokens, refresh_user_google_ads_tokens
+
+        ga_service = Mock()
+        ga_service.get_user_ga_connections = AsyncMock(return_value=[
+            {"connection_id": 1, "is_outdated": False},
+            {"connection_id": 2, "is_outdated": True},
+        ])
+        ga_service.refresh_ga_token = AsyncMock()
+        ads_service = Mock()
+        ads_service.get_user_google_ads_connections = AsyncMock(return_value=[
+            {"connection_id": 3, "is_outdated": False},
+        ])
+        ads_service.refresh_google_ads_token = AsyncMock()
+
+        await refresh_user_ga4_tokens(ga_service, campaigner_id=1)
+        await refresh_user_google_ads_tokens(ads_service, campaigner_id=1)
+
+        ga_service.refresh_ga_token.assert_awaited_once_with(2)
+        ads_service.refresh_google_ads_token.assert_not_awaited()
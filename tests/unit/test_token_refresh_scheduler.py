@@ -0,0 +1,149 @@
+"""
+Unit tests for the proactive OAuth token refresh scheduler
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.analytics import AssetType, AuthType, Connection, DigitalAsset
+from app.services.token_refresh_scheduler import ProviderRateLimiter, TokenRefreshScheduler
+
+
+def _add_connection(db_session, asset_type, provider, expires_in_minutes, **connection_fields):
+    asset = DigitalAsset(customer_id=1, asset_type=asset_type, provider=provider,
+                         name=f"{provider} asset", external_id=f"ext-{time.monotonic_ns()}")
+    db_session.add(asset)
+    db_session.commit()
+    connection = Connection(
+        digital_asset_id=asset.id,
+        customer_id=1,
+        campaigner_id=1,
+        auth_type=AuthType.OAUTH2,
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=expires_in_minutes),
+        **connection_fields
+    )
+    db_session.add(connection)
+    db_session.commit()
+    return connection.id
+
+
+class _Refresher:
+    """Records refresh calls and pushes expires_at forward like the real services."""
+
+    def __init__(self, session_factory, fail_ids=()):
+        self.session_factory = session_factory
+        self.fail_ids = set(fail_ids)
+        self.calls = []
+
+    async def __call__(self, connection_id):
+        self.calls.append(connection_id)
+        if connection_id in self.fail_ids:
+            raise ValueError("invalid_grant")
+        with self.session_factory() as session:
+            connection = session.get(Connection, connection_id)
+            connection.expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+            session.add(connection)
+            session.commit()
+
+
+@pytest.fixture
+def session_factory(patch_get_session):
+    return patch_get_session("app.utils.connection_failure_utils.get_session")
+
+
+def _scheduler(session_factory, refresher, **overrides):
+    options = dict(lead_seconds=600, batch_size=50, concurrency=2, jitter_seconds=0,
+                   rate_limits={"google": 0, "facebook": 0})
+    options.update(overrides)
+    return TokenRefreshScheduler(
+        session_factory=session_factory,
+        refreshers={"ga4": refresher, "google_ads": refresher, "facebook": refresher},
+        **options
+    )
+
+
+class TestFindDue:
+    """Only healthy OAuth connections inside the lead window are scanned."""
+
+    def test_selects_expiring_connections_by_platform(self, db_session, session_factory):
+        ga4 = _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=5)
+        ads = _add_connection(db_session, AssetType.GOOGLE_ADS, "Google", expires_in_minutes=-1)
+        _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=120)
+        _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=5, revoked=True)
+        _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=5, needs_reauth=True)
+        _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=5, failure_count=3)
+
+        due = _scheduler(session_factory, _Refresher(session_factory)).find_due()
+
+        assert due == [(ads, "google_ads"), (ga4, "ga4")]
+
+    def test_facebook_waits_for_its_refresh_window(self, db_session, session_factory):
+        soon = _add_connection(db_session, AssetType.ADVERTISING, "Facebook", expires_in_minutes=3)
+        _add_connection(db_session, AssetType.ADVERTISING, "Facebook", expires_in_minutes=8)
+
+        due = _scheduler(session_factory, _Refresher(session_factory)).find_due()
+
+        assert due == [(soon, "facebook")]
+
+
+class TestRunOnce:
+    """A pass refreshes due connections and records failures."""
+
+    async def test_refreshes_and_records_failures(self, db_session, session_factory):
+        ok = _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=2)
+        broken = _add_connection(db_session, AssetType.GOOGLE_ADS, "Google", expires_in_minutes=3)
+        refresher = _Refresher(session_factory, fail_ids={broken})
+        scheduler = _scheduler(session_factory, refresher)
+
+        summary = await scheduler.run_once()
+
+        assert summary == {"due": 2, "refreshed": 1, "failed": 1, "skipped": 0}
+        assert sorted(refresher.calls) == sorted([ok, broken])
+        with session_factory() as session:
+            assert session.get(Connection, broken).failure_count == 1
+
+        # Refreshed connection is no longer due; the failed one is retried next pass
+        assert await scheduler.run_once() == {"due": 1, "refreshed": 0, "failed": 1, "skipped": 0}
+
+    async def test_skips_connection_refreshed_elsewhere(self, db_session, session_factory):
+        connection_id = _add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=2)
+        refresher = _Refresher(session_factory)
+        scheduler = _scheduler(session_factory, refresher)
+        due = scheduler.find_due()
+
+        await refresher(connection_id)  # e.g. a request or another worker
+        outcome = await scheduler._refresh_one(connection_id, "ga4", asyncio.Semaphore(1))
+
+        assert outcome == "skipped"
+        assert refresher.calls == [connection_id]
+        assert due == [(connection_id, "ga4")]
+
+    async def test_blocking_refreshers_run_concurrently(self, db_session, session_factory):
+        ids = [_add_connection(db_session, AssetType.GA4, "Google", expires_in_minutes=2) for _ in range(2)]
+
+        async def blocking_refresher(connection_id):
+            time.sleep(0.2)  # like credentials.refresh(Request())
+
+        scheduler = _scheduler(session_factory, blocking_refresher)
+        started = time.monotonic()
+        outcomes = await asyncio.gather(*(scheduler._refresh_one(i, "ga4", asyncio.Semaphore(2)) for i in ids))
+
+        assert outcomes == ["refreshed", "refreshed"]
+        assert time.monotonic() - started < 0.35
+
+
+class TestProviderRateLimiter:
+    """Calls to one token endpoint are spaced out."""
+
+    async def test_spaces_calls(self):
+        limiter = ProviderRateLimiter(per_minute=1200)  # one call per 50ms
+
+        started = time.monotonic()
+        waits = [await limiter.acquire() for _ in range(3)]
+
+        assert waits[0] == 0
+        assert time.monotonic() - started >= 0.09
+        assert ProviderRateLimiter(per_minute=0).interval == 0
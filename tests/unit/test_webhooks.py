@@ -152,11 +152,11 @@ class TestWebhooksRoutes:
             # Restore original value
             webhooks_module.ENABLE_CREWAI = original_enable_crewai
 
-    @patch("app.api.v1.routes.webhooks.run_crewai_analysis_async")
+    @patch("app.api.v1.routes.webhooks.crew_execution_pool")
     def test_dialogcx_webhook_with_crewai_enabled(
-        self, mock_crewai_analysis, client
+        self, mock_crew_pool, client
     ):
-        """Test dialogcx webhook with CrewAI enabled."""
+        """Test dialogcx webhook with CrewAI enabled only queues the analysis."""
         # Temporarily set ENABLE_CREWAI to True
         import app.api.v1.routes.webhooks as webhooks_module
 
@@ -164,14 +164,6 @@ class TestWebhooksRoutes:
         webhooks_module.ENABLE_CREWAI = True
 
         try:
-            # Mock CrewAI analysis async function
-            mock_crewai_analysis.return_value = {
-                "success": True,
-                "result": "CrewAI analysis result",
-                "execution_time": 1.0,
-                "agents_used": ["master_agent"],
-            }
-
             payload = {
                 "campaigner_id": 1,
                 "customer_id": 1,
@@ -185,20 +177,108 @@ class TestWebhooksRoutes:
             assert response.status_code == 200
 
             data = response.json()
-            assert "fulfillment_response" in data
+            assert data["fulfillment_response"] == "Processing your request..."
+
+            # Verify the analysis was queued on the crew pool for this campaigner
+            mock_crew_pool.submit.assert_called_once()
+            call_args = mock_crew_pool.submit.call_args
+            assert call_args[0][0] == 1
+            assert call_args[0][1] is webhooks_module._run_dialogcx_analysis_job
+            assert call_args[1]["campaigner_id"] == 1
+            assert call_args[1]["customer_id"] == 1
+            assert call_args[1]["user_question"] == "What is the performance of my campaigns?"
+        finally:
+            # Restore original value
+            webhooks_module.ENABLE_CREWAI = original_enable_crewai
+
+    @patch("app.api.v1.routes.webhooks.get_settings")
+    @patch("app.api.v1.routes.webhooks.job_queue")
+    @patch("app.api.v1.routes.webhooks.crew_execution_pool")
+    def test_dialogcx_webhook_enqueues_durable_job(self, mock_crew_pool, mock_job_queue, mock_get_settings, client):
+        """Test dialogcx webhook stores the analysis as a durable job when enabled."""
+        import app.api.v1.routes.webhooks as webhooks_module
+
+        original_enable_crewai = webhooks_module.ENABLE_CREWAI
+        webhooks_module.ENABLE_CREWAI = True
+        mock_get_settings.return_value = MagicMock(analytics_jobs_durable=True)
+        mock_job_queue.enqueue.return_value = 42
+
+        try:
+            payload = {
+                "campaigner_id": 1,
+                "customer_id": 1,
+                "session_id": "test_session_123",
+                "user_question": "What is the performance of my campaigns?",
+                "parameters": {"data_sources": ["facebook"]},
+            }
 
-            # Verify CrewAI analysis was called
-            mock_crewai_analysis.assert_called_once()
+            response = client.post("/api/v1/webhooks/dialogcx", json=payload)
 
-            # Verify the call arguments
-            call_args = mock_crewai_analysis.call_args[1]  # Get keyword arguments
-            assert call_args["campaigner_id"] == 1
-            assert call_args["customer_id"] == 1
-            assert call_args["user_question"] == "What is the performance of my campaigns?"
+            assert response.status_code == 200
+            assert response.json()["fulfillment_response"] == "Processing your request..."
+            mock_crew_pool.submit.assert_not_called()
+            call_args = mock_job_queue.enqueue.call_args
+            assert call_args[0][0] == "dialogcx_analysis"
+            assert call_args[0][1]["dialogcx_session_id"] == "test_session_123"
+            assert call_args[1]["campaigner_id"] == 1
+        finally:
+            webhooks_module.ENABLE_CREWAI = original_enable_crewai
+
+    @patch("app.api.v1.routes.webhooks.crew_execution_pool")
+    def test_dialogcx_webhook_rejects_when_crew_pool_full(self, mock_crew_pool, client):
+        """Test dialogcx webhook answers immediately when the crew queue is full."""
+        import app.api.v1.routes.webhooks as webhooks_module
+
+        original_enable_crewai = webhooks_module.ENABLE_CREWAI
+        webhooks_module.ENABLE_CREWAI = True
+        mock_crew_pool.submit.side_effect = webhooks_module.CrewPoolFull("full")
+
+        try:
+            payload = {
+                "campaigner_id": 1,
+                "customer_id": 1,
+                "session_id": "test_session_123",
+                "user_question": "What is the performance of my campaigns?",
+                "parameters": {"data_sources": ["facebook"]},
+            }
+
+            response = client.post("/api/v1/webhooks/dialogcx", json=payload)
+
+            assert response.status_code == 200
+            assert "try again" in response.json()["fulfillment_response"]
         finally:
-            # Restore original value
             webhooks_module.ENABLE_CREWAI = original_enable_crewai
 
+    def test_crew_pool_stats_requires_admin(self, client, mock_current_user):
+        """Test crew pool stats (keyed by campaigner id) are OWNER/ADMIN only."""
+        response = client.get("/api/v1/webhooks/crew-jobs/stats")
+        assert response.status_code == 403
+
+        mock_current_user.role = "ADMIN"
+        response = client.get("/api/v1/webhooks/crew-jobs/stats")
+        assert response.status_code == 200
+        assert "running_by_tenant" in response.json()
+
+    async def test_token_refresh_runs_off_the_event_loop(self):
+        """Test async service calls run on their own loop on a pool thread."""
+        import asyncio
+        import threading
+        from app.api.v1.routes.webhooks import _run_coroutine_blocking
+        from app.services.crew_execution_pool import CrewExecutionPool
+
+        async def refresh(campaigner_id):
+            return campaigner_id, threading.get_ident(), asyncio.get_running_loop()
+
+        pool = CrewExecutionPool(workers=1)
+        try:
+            campaigner_id, thread_id, loop = await pool.run_blocking(_run_coroutine_blocking, refresh, 7)
+        finally:
+            await pool.shutdown()
+
+        assert campaigner_id == 7
+        assert thread_id != threading.get_ident()
+        assert loop is not asyncio.get_running_loop()
+
     def test_dialogcx_webhook_invalid_payload(self, client):
         """Test dialogcx webhook with invalid payload."""
         # Empty payload
@@ -226,3 +306,80 @@ class TestWebhooksRoutes:
         # Should still return 200 as the immediate response is sent
         response = client.post("/api/v1/webhooks/dialogcx", json=payload)
         assert response.status_code == 200
+
+
+class TestParallelSpecialists:
+    """Concurrent specialist execution in the webhook crew builder."""
+
+    @staticmethod
+    def _timing_wrapper(delay):
+        import threading
+        import time as time_module
+
+        lock = threading.Lock()
+        state = {"running": 0, "max_running": 0}
+
+        def run_specialist(agent, task):
+            with lock:
+                state["running"] += 1
+                state["max_running"] = max(state["max_running"], state["running"])
+            time_module.sleep(delay)
+            with lock:
+                state["running"] -= 1
+            return {"agent": agent.role, "success": True, "output": f"{agent.role} data",
+                    "error": None, "duration_seconds": delay}
+
+        wrapper = MagicMock()
+        wrapper.run_specialist.side_effect = run_specialist
+        return wrapper, state
+
+    @staticmethod
+    def _task(role):
+        task = MagicMock()
+        task.agent.role = role
+        return task
+
+    async def test_specialists_run_concurrently_within_cap(self):
+        import time as time_module
+        from app.api.v1.routes.webhooks import _run_specialists_concurrently
+
+        wrapper, state = self._timing_wrapper(delay=0.2)
+        tasks = [self._task(role) for role in ("GA4", "Google Ads", "Facebook", "Search Console")]
+
+        started = time_module.perf_counter()
+        results = await _run_specialists_concurrently(wrapper, tasks, max_concurrency=2)
+        elapsed = time_module.perf_counter() - started
+
+        assert [result["agent"] for result in results] == ["GA4", "Google Ads", "Facebook", "Search Console"]
+        assert state["max_running"] == 2
+        assert elapsed < 0.75  # two waves of 0.2s, not four
+
+    def test_merge_specialist_outputs_reports_failures(self):
+        from app.api.v1.routes.webhooks import _merge_specialist_outputs
+
+        merged = _merge_specialist_outputs([
+            {"agent": "GA4", "success": True, "output": "Sessions up 12%", "error": None},
+            {"agent": "Facebook", "success": False, "output": None, "error": "token expired"},
+        ])
+
+        assert "### GA4\nSessions up 12%" in merged
+        assert "### Facebook\nFAILED: token expired" in merged
+
+    def test_timing_wrapper_records_specialist_timings(self):
+        from app.services.crewai_timing_wrapper import CrewAITimingWrapper
+
+        wrapper = CrewAITimingWrapper(session_id="s-1", analysis_id="a-1")
+        ok_crew, failing_crew = MagicMock(), MagicMock()
+        ok_crew.kickoff.return_value = "GA4 findings"
+        failing_crew.kickoff.side_effect = RuntimeError("quota exceeded")
+        ga4, facebook = MagicMock(role="GA4"), MagicMock(role="Facebook")
+
+        with patch.object(wrapper, "create_timed_crew", side_effect=[ok_crew, failing_crew]):
+            ok = wrapper.run_specialist(ga4, MagicMock())
+            failed = wrapper.run_specialist(facebook, MagicMock())
+
+        assert ok["success"] is True and ok["output"] == "GA4 findings"
+        assert failed["success"] is False and failed["error"] == "quota exceeded"
+        timings = wrapper.get_specialist_timings()
+        assert {timing["agent"] for timing in timings} == {"GA4", "Facebook"}
+        assert all("output" not in timing and "duration_seconds" in timing for timing in timings)
@@ -0,0 +1,105 @@
+"""
+Unit tests for per-connection send queues in ConnectionManager
+"""
+
+import asyncio
+
+from app.core.websocket_manager import ConnectionManager
+
+
+def _sent(websocket):
+    return [call.args[0] for call in websocket.send_json.call_args_list]
+
+
+class TestSendQueues:
+    """Sends are queued per socket and written by writer tasks."""
+
+    async def test_slow_socket_does_not_delay_other_tabs(self, fake_websocket):
+        manager = ConnectionManager(send_timeout=5)
+        release = asyncio.Event()
+
+        async def stuck_send(message):
+            if message["type"] != "connected":
+                await release.wait()
+
+        slow, fast = fake_websocket(stuck_send), fake_websocket()
+        await manager.connect(slow, "session-1", user_id=1)
+        await manager.connect(fast, "session-1", user_id=1)
+
+        sent = await manager.send_crew_result("session-1", "answer", analysis_id="a-1")
+        assert sent.delivered is True
+        await asyncio.wait_for(manager._writers[f"session-1_{id(fast)}"].wait_idle(), 1)
+
+        assert [m["type"] for m in _sent(fast)] == ["connected", "crew_result"]
+        release.set()
+        await manager.drain(timeout=1)
+
+    async def test_send_timeout_evicts_connection(self, fake_websocket):
+        manager = ConnectionManager(send_timeout=0.05)
+
+        async def hung_send(message):
+            if message["type"] != "connected":
+                await asyncio.sleep(10)
+
+        websocket = fake_websocket(hung_send)
+        await manager.connect(websocket, "session-1", user_id=1)
+
+        await manager.send_typing_indicator("session-1", is_typing=True)
+        await asyncio.sleep(0.2)
+
+        assert manager.get_session_connection_count("session-1") == 0
+        stats = manager.get_stats()
+        assert stats["send_timeouts"] == 1
+        assert stats["evictions"] == 1
+        websocket.close.assert_awaited_once_with(code=1013)
+
+    async def test_full_queue_evicts_slow_consumer(self, fake_websocket):
+        manager = ConnectionManager(send_queue_size=3, send_timeout=5)
+        release = asyncio.Event()
+
+        async def blocked_send(message):
+            await release.wait()
+
+        websocket = fake_websocket(blocked_send)
+        await manager.connect(websocket, "session-1", user_id=1)
+        await asyncio.sleep(0)  # writer picks up the "connected" message
+
+        results = [await manager.send_error("session-1", f"error {i}") for i in range(5)]
+
+        assert [result.delivered for result in results] == [True, True, True, False, False]
+        assert manager.get_session_connection_count("session-1") == 0
+        assert manager.get_stats()["queue_overflows"] == 1
+        release.set()
+
+    async def test_progress_updates_coalesce_at_queue_tail(self, fake_websocket):
+        manager = ConnectionManager(send_timeout=5)
+        release = asyncio.Event()
+
+        async def blocked_send(message):
+            await release.wait()
+
+        websocket = fake_websocket(blocked_send)
+        await manager.connect(websocket, "session-1", user_id=1)
+        await asyncio.sleep(0)
+
+        for percentage in (10, 20, 30):
+            await manager.send_progress_update("session-1", "analyzing", percentage)
+        await manager.send_typing_indicator("session-1", is_typing=False)
+        await manager.send_progress_update("session-1", "completing", 90)
+
+        release.set()
+        await manager.drain(timeout=1)
+
+        sent = [(m["type"], m.get("data", {}).get("percentage")) for m in _sent(websocket)]
+        assert sent == [("connected", None), ("progress", 30), ("typing", None), ("progress", 90)]
+        assert manager.get_stats()["coalesced"] == 2
+
+    async def test_disconnect_stops_writer(self, fake_websocket):
+        manager = ConnectionManager(send_timeout=5)
+        websocket = fake_websocket()
+        await manager.connect(websocket, "session-1", user_id=1)
+
+        await manager.disconnect(websocket, "session-1")
+
+        assert manager._writers == {}
+        assert manager.queue_message(websocket, "session-1", {"type": "ping"}) is False